@@ -1,7 +1,7 @@
 # application.py - OL Service POS with Photo Documentation and Truck Repair Management
 # Properly organized and structured
 
-from flask import Flask, request, jsonify, send_from_directory, render_template
+from flask import Flask, request, jsonify, send_from_directory, render_template, g
 import os
 import sqlite3
 import json
@@ -11,7 +11,7 @@ from dotenv import load_dotenv
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 import uuid
-from PIL import Image
+import mimetypes
 import io
 import base64
 
@@ -28,15 +28,32 @@ logger = logging.getLogger(__name__)
 
 # Try to import database modules
 try:
-    from database.db_setup import setup_database
+    from database.bootstrap import bootstrap_database
     from database import DB_PATH
 except ImportError:
-    from database.db_setup import setup_database
+    from database.bootstrap import bootstrap_database
 
     DB_PATH = os.getenv('DB_PATH', 'data/ol_service_pos.db')
 
-# Initialize Flask application
-application = app = Flask(__name__, static_folder='static')
+from database.connection_manager import db_manager
+from database.write_coordinator import write_coordinator
+from database.parts_index import parts_index
+from database.document_sequences import document_numbers
+from database import batch_writes, damage_heatmap, damage_points, search_index, stat_counters, table_versions
+from utils.lazy_import import lazy_module
+from utils.compression import ResponseCompressor, static_variant
+from utils.conditional_get import ConditionalGet
+from utils.field_selection import FieldSelector, parse_fields
+from utils.pagination import Keyset, parse_page_args
+from utils.response_cache import ResponseCache
+from utils.streaming import stream_collection, stream_format
+
+# Pillow is only needed by the photo endpoints
+Image = lazy_module('PIL.Image')
+
+# Initialize Flask application (/static is served by serve_static, which knows the precompressed variants)
+application = app = Flask(__name__, static_folder=None)
+STATIC_DIR = os.path.join(app.root_path, 'static')
 CORS(app)
 
 # Upload configuration
@@ -57,8 +74,8 @@ os.makedirs(THUMBNAILS_DIR, exist_ok=True)
 os.makedirs(DAMAGE_REPORTS_DIR, exist_ok=True)
 os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
 
-# Initialize database
-setup_database()
+# Initialize database (no-op once the deployment has been bootstrapped)
+bootstrap_database()
 
 
 # =============================================================================
@@ -66,10 +83,80 @@ setup_database()
 # =============================================================================
 
 def get_db_connection():
-    """Get database connection with row factory"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get the request-scoped pooled database connection with row factory
+
+    The connection is checked out of the shared pool on first use in a request
+    and stored on flask.g, so every call within the same request gets the same
+    connection. It is committed (or rolled back) and returned to the pool in
+    close_db_connection().
+    """
+    if 'db' not in g:
+        g.db = db_manager.connection_pool.checkout()
+        g.db.row_factory = sqlite3.Row
+    return g.db
+
+
+# Cache for expensive aggregate endpoints, invalidated by table data versions
+response_cache = ResponseCache(lambda tables: table_versions.get_versions(get_db_connection(), tables))
+response_cache.enabled = os.getenv('RESPONSE_CACHE_ENABLED', 'True').lower() in ['true', '1', 'yes']
+
+# ETags for GET routes, from the same versions plus the database epoch
+conditional_get = ConditionalGet(
+    lambda tables: table_versions.get_versions(get_db_connection(), (table_versions.EPOCH,) + tuple(tables)))
+conditional_get.enabled = os.getenv('ETAGS_ENABLED', 'True').lower() in ['true', '1', 'yes']
+
+
+@app.after_request
+def mark_failed_request(response):
+    """Flag error responses so their database work is rolled back"""
+    if response.status_code >= 400:
+        g.db_rollback = True
+    return response
+
+
+def finalize_db_connection(conn, rollback=False):
+    """Commit or roll back a request connection and return it to the pool"""
+    try:
+        if rollback:
+            conn.rollback()
+        else:
+            conn.commit()
+    except sqlite3.Error as e:
+        logger.error(f"Error finalizing request transaction: {e}")
+        conn.rollback()
+    finally:
+        db_manager.connection_pool.checkin(conn)
+
+
+# gzip / brotli for API responses (static files are precompressed)
+compressor = ResponseCompressor.from_env()
+
+
+@app.after_request
+def compress_response(response):
+    """Compress JSON and text responses the client can decode"""
+    return compressor.compress(response)
+
+
+@app.teardown_appcontext
+def close_db_connection(exception):
+    """Finalize the request connection, unless a streamed response has taken it over"""
+    conn = g.pop('db', None)
+    if conn is None:
+        return
+    finalize_db_connection(conn, exception is not None or g.pop('db_rollback', False))
+
+
+def streamed_collection(cursor, key, fmt, **options):
+    """Streamed list response that owns the request connection until its last row is sent
+
+    The connection is taken off flask.g so teardown does not return it to the
+    pool while the cursor is still being read.
+    """
+    conn = g.pop('db')
+    g.pop('db_rollback', None)
+    return stream_collection(cursor, key, fmt,
+                             release=lambda failed: finalize_db_connection(conn, failed), **options)
 
 
 def allowed_file(filename):
@@ -98,13 +185,20 @@ def create_thumbnail(image_path, thumbnail_path, size=THUMBNAIL_SIZE):
 @app.route('/', methods=['GET'])
 def index():
     """Serve the home page"""
-    return send_from_directory('static', 'index.html')
+    return serve_static('index.html')
 
 
 @app.route('/static/<path:path>')
 def serve_static(path):
-    """Serve static files"""
-    return send_from_directory('static', path)
+    """Serve static files, using a precompressed .br/.gz variant when the client accepts it"""
+    variant, encoding = static_variant(STATIC_DIR, path)
+    if encoding is None:
+        response = send_from_directory(STATIC_DIR, path)
+    else:
+        response = send_from_directory(STATIC_DIR, variant, mimetype=mimetypes.guess_type(path)[0])
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
 
 
 @app.route('/api', methods=['GET'])
@@ -136,96 +230,132 @@ def api_info():
 # ENHANCED CUSTOMER MANAGEMENT API WITH THAI ID OCR SUPPORT
 # =============================================================================
 
-def ensure_thai_id_columns():
-    """Ensure Thai ID columns exist in customers table"""
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Get current table schema
-        cursor.execute("PRAGMA table_info(customers)")
-        columns = [col[1] for col in cursor.fetchall()]
-
-        # Add Thai ID columns if they don't exist
-        thai_columns = [
-            ('thai_id_number', 'TEXT'),
-            ('thai_name', 'TEXT'),
-            ('english_name', 'TEXT'),
-            ('date_of_birth', 'TEXT'),
-            ('id_card_address', 'TEXT'),
-            ('issue_date', 'TEXT'),
-            ('expiry_date', 'TEXT')
-        ]
-
-        for column_name, column_type in thai_columns:
-            if column_name not in columns:
-                try:
-                    cursor.execute(f"ALTER TABLE customers ADD COLUMN {column_name} {column_type}")
-                    logger.info(f"Added column {column_name} to customers table")
-                except Exception as e:
-                    logger.warning(f"Could not add column {column_name}: {e}")
-
-        conn.commit()
-        conn.close()
-
-    except Exception as e:
-        logger.error(f"Error ensuring Thai ID columns: {e}")
-
-
-# Initialize Thai ID columns on startup
-ensure_thai_id_columns()
+CUSTOMER_LIST_FIELDS = FieldSelector('customers', 'c', computed={
+    'name': "COALESCE(c.first_name || ' ' || c.last_name, c.first_name, '')",
+    'vehicle_count': "(SELECT COUNT(*) FROM vehicles v WHERE v.customer_id = c.id)",
+})
 
 
 @app.route('/api/customers', methods=['GET'])
+@conditional_get.etag(tables=['customers', 'vehicles'])
 def get_customers():
     """Get all customers with computed name field and Thai ID support"""
     try:
         search_term = request.args.get('search', '').strip()
+        page = parse_page_args(request.args)
+        fields = parse_fields(request.args)
+        keyset = Keyset('c.first_name', 'c.last_name', 'c.id', descending=False)
 
         conn = get_db_connection()
         cursor = conn.cursor()
 
+        query = f"""
+            SELECT {CUSTOMER_LIST_FIELDS.select_sql(conn, fields)}
+                   {keyset.select_sql()}
+            FROM customers c
+            WHERE 1=1
+        """
+        params = []
+
         if search_term:
-            # Enhanced search including Thai ID fields
-            cursor.execute("""
-                SELECT c.*, 
-                       COALESCE(c.first_name || ' ' || c.last_name, c.first_name, '') as name,
-                       COUNT(v.id) as vehicle_count
-                FROM customers c
-                LEFT JOIN vehicles v ON c.id = v.customer_id
-                WHERE 
-                    c.first_name LIKE ? OR c.last_name LIKE ? OR 
-                    c.phone LIKE ? OR c.email LIKE ? OR
-                    c.thai_name LIKE ? OR c.english_name LIKE ? OR 
-                    c.thai_id_number LIKE ?
-                GROUP BY c.id
-                ORDER BY c.first_name, c.last_name
-            """, tuple([f'%{search_term}%'] * 7))
-        else:
-            cursor.execute("""
-                SELECT c.*, 
-                       COALESCE(c.first_name || ' ' || c.last_name, c.first_name, '') as name,
-                       COUNT(v.id) as vehicle_count
-                FROM customers c
-                LEFT JOIN vehicles v ON c.id = v.customer_id
-                GROUP BY c.id
-                ORDER BY c.first_name, c.last_name
-            """)
+            # Names, phone, email, Thai ID and license via the full-text index
+            match_sql, match_params = search_index.customer_filter(conn, search_term, 'c.id')
+            query += f" AND {match_sql}"
+            params.extend(match_params)
 
-        customers = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        query, params = keyset.apply(query, params, page)
+        cursor.execute(query, params)
+
+        fmt = stream_format(request)
+        if fmt:
+            return streamed_collection(cursor, 'customers', fmt, keyset=keyset, limit=page.limit,
+                                       head={"success": True}, count_key='total')
+
+        customers, next_cursor = keyset.page(cursor.fetchall(), page.limit)
 
         return jsonify({
             "success": True,
             "customers": customers,
-            "total": len(customers)
+            "total": len(customers),
+            "next_cursor": next_cursor
         })
 
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error getting customers: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+CUSTOMER_INSERT_SQL = """
+    INSERT INTO customers (
+        first_name, last_name, phone, email, address, city, state, zip_code, notes,
+        thai_id_number, thai_name, english_name, date_of_birth,
+        id_card_address, issue_date, expiry_date, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+CUSTOMER_TEXT_FIELDS = ['name', 'first_name', 'last_name', 'thai_name', 'english_name', 'id_number']
+
+
+def customer_insert_values(data):
+    """CUSTOMER_INSERT_SQL parameters for a customer request body; raises ValueError without a name"""
+    if not isinstance(data, dict):
+        raise ValueError("customer must be an object")
+    for field in CUSTOMER_TEXT_FIELDS:
+        if field in data and not isinstance(data[field], str):
+            raise ValueError(f"{field} must be a string")
+
+    # Check if this is OCR-enhanced data
+    has_ocr_data = any(key in data for key in ['id_number', 'thai_name', 'english_name', 'date_of_birth'])
+
+    # Handle name format - support both single 'name' and separate first/last names
+    if 'name' in data and data['name'].strip():
+        # Split full name into first and last
+        name_parts = data['name'].strip().split(' ', 1)
+        first_name = name_parts[0]
+        last_name = name_parts[1] if len(name_parts) > 1 else ''
+    else:
+        # Use separate first/last names
+        first_name = data.get('first_name', '').strip()
+        last_name = data.get('last_name', '').strip()
+
+    # If OCR data provided, use Thai name as primary if no manual name
+    if has_ocr_data and not first_name and data.get('thai_name'):
+        thai_name_parts = data['thai_name'].strip().split(' ', 1)
+        first_name = thai_name_parts[0]
+        last_name = thai_name_parts[1] if len(thai_name_parts) > 1 else ''
+    elif has_ocr_data and not first_name and data.get('english_name'):
+        english_name_parts = data['english_name'].strip().split(' ', 1)
+        first_name = english_name_parts[0]
+        last_name = english_name_parts[1] if len(english_name_parts) > 1 else ''
+
+    if not first_name:
+        raise ValueError("Customer name is required")
+
+    return (
+        first_name,
+        last_name,
+        data.get('phone', ''),
+        data.get('email', ''),
+        data.get('address', ''),
+        data.get('city', ''),
+        data.get('state', ''),
+        data.get('zip_code', ''),
+        data.get('notes', ''),
+        # Thai ID fields
+        data.get('id_number', '').strip(),
+        data.get('thai_name', ''),
+        data.get('english_name', ''),
+        data.get('date_of_birth', ''),
+        data.get('id_card_address', '') or data.get('address', ''),
+        data.get('issue_date', ''),
+        data.get('expiry_date', ''),
+        datetime.now().isoformat()
+    )
+
+
 @app.route('/api/customers', methods=['POST'])
 def add_customer():
     """Enhanced add customer with Thai ID OCR support"""
@@ -236,18 +366,19 @@ def add_customer():
         data = request.get_json()
         logger.info(f"Received customer data: {data}")
 
-        # Check if this is OCR-enhanced data
-        has_ocr_data = any(key in data for key in ['id_number', 'thai_name', 'english_name', 'date_of_birth'])
+        try:
+            values = customer_insert_values(data)
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
 
         # Check for duplicate Thai ID if provided
-        thai_id = data.get('id_number', '').strip()
+        thai_id = values[9]
         if thai_id:
             conn = get_db_connection()
             cursor = conn.cursor()
             cursor.execute("SELECT id, first_name, last_name FROM customers WHERE thai_id_number = ?", (thai_id,))
             existing = cursor.fetchone()
             if existing:
-                conn.close()
                 return jsonify({
                     "success": False,
                     "error": f"Customer with Thai ID {thai_id} already exists",
@@ -256,62 +387,12 @@ def add_customer():
                         "name": f"{existing['first_name']} {existing['last_name']}".strip()
                     }
                 }), 409
-            conn.close()
-
-        # Handle name format - support both single 'name' and separate first/last names
-        if 'name' in data and data['name'].strip():
-            # Split full name into first and last
-            name_parts = data['name'].strip().split(' ', 1)
-            first_name = name_parts[0]
-            last_name = name_parts[1] if len(name_parts) > 1 else ''
-        else:
-            # Use separate first/last names
-            first_name = data.get('first_name', '').strip()
-            last_name = data.get('last_name', '').strip()
-
-        # If OCR data provided, use Thai name as primary if no manual name
-        if has_ocr_data and not first_name and data.get('thai_name'):
-            thai_name_parts = data['thai_name'].strip().split(' ', 1)
-            first_name = thai_name_parts[0]
-            last_name = thai_name_parts[1] if len(thai_name_parts) > 1 else ''
-        elif has_ocr_data and not first_name and data.get('english_name'):
-            english_name_parts = data['english_name'].strip().split(' ', 1)
-            first_name = english_name_parts[0]
-            last_name = english_name_parts[1] if len(english_name_parts) > 1 else ''
-
-        if not first_name:
-            return jsonify({"success": False, "error": "Customer name is required"}), 400
 
         conn = get_db_connection()
         cursor = conn.cursor()
 
         # Insert customer with Thai ID fields
-        cursor.execute("""
-            INSERT INTO customers (
-                first_name, last_name, phone, email, address, city, state, zip_code, notes,
-                thai_id_number, thai_name, english_name, date_of_birth, 
-                id_card_address, issue_date, expiry_date, created_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            first_name,
-            last_name,
-            data.get('phone', ''),
-            data.get('email', ''),
-            data.get('address', ''),
-            data.get('city', ''),
-            data.get('state', ''),
-            data.get('zip_code', ''),
-            data.get('notes', ''),
-            # Thai ID fields
-            thai_id,
-            data.get('thai_name', ''),
-            data.get('english_name', ''),
-            data.get('date_of_birth', ''),
-            data.get('id_card_address', '') or data.get('address', ''),
-            data.get('issue_date', ''),
-            data.get('expiry_date', ''),
-            datetime.now().isoformat()
-        ))
+        cursor.execute(CUSTOMER_INSERT_SQL, values)
 
         customer_id = cursor.lastrowid
         conn.commit()
@@ -325,8 +406,6 @@ def add_customer():
         """, (customer_id,))
         new_customer = dict(cursor.fetchone())
 
-        conn.close()
-
         logger.info(f"Customer created successfully: {new_customer}")
 
         return jsonify({
@@ -341,49 +420,58 @@ def add_customer():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+CUSTOMER_DETAIL_FIELDS = FieldSelector('customers', computed={
+    'name': "COALESCE(first_name || ' ' || last_name, first_name, '')",
+}, derived=['vehicles', 'recent_services', 'registration_date'], required=['created_at'])
+
+
 @app.route('/api/customers/<int:customer_id>', methods=['GET'])
+@conditional_get.etag(tables=['customers', 'vehicles', 'services'])
 def get_customer(customer_id):
     """Get specific customer with Thai ID information"""
     try:
+        fields = parse_fields(request.args)
+
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        cursor.execute("""
-            SELECT *, 
-                   COALESCE(first_name || ' ' || last_name, first_name, '') as name
+        cursor.execute(f"""
+            SELECT {CUSTOMER_DETAIL_FIELDS.select_sql(conn, fields)}
             FROM customers 
             WHERE id = ?
         """, (customer_id,))
         customer = cursor.fetchone()
 
         if not customer:
-            conn.close()
             return jsonify({"success": False, "error": "Customer not found"}), 404
 
         customer_data = dict(customer)
 
         # Get vehicles
-        cursor.execute('SELECT * FROM vehicles WHERE customer_id = ?', (customer_id,))
-        customer_data['vehicles'] = [dict(row) for row in cursor.fetchall()]
+        if FieldSelector.wants(fields, 'vehicles'):
+            cursor.execute('SELECT * FROM vehicles WHERE customer_id = ?', (customer_id,))
+            customer_data['vehicles'] = [dict(row) for row in cursor.fetchall()]
 
         # Get recent services
-        cursor.execute("""
-            SELECT s.*, v.make || ' ' || v.model as vehicle_info
-            FROM services s
-            LEFT JOIN vehicles v ON s.vehicle_id = v.id
-            WHERE s.customer_id = ? ORDER BY s.created_at DESC LIMIT 10
-        """, (customer_id,))
-        customer_data['recent_services'] = [dict(row) for row in cursor.fetchall()]
+        if FieldSelector.wants(fields, 'recent_services'):
+            cursor.execute("""
+                SELECT s.*, v.make || ' ' || v.model as vehicle_info
+                FROM services s
+                LEFT JOIN vehicles v ON s.vehicle_id = v.id
+                WHERE s.customer_id = ? ORDER BY s.created_at DESC LIMIT 10
+            """, (customer_id,))
+            customer_data['recent_services'] = [dict(row) for row in cursor.fetchall()]
 
         # Add registration_date for compatibility
         customer_data['registration_date'] = customer_data['created_at']
 
-        conn.close()
         return jsonify({
             "success": True,
-            "customer": customer_data
+            "customer": FieldSelector.project(customer_data, fields)
         })
 
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error getting customer: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
@@ -403,7 +491,6 @@ def update_customer(customer_id):
         # Check exists
         cursor.execute("SELECT id FROM customers WHERE id = ?", (customer_id,))
         if not cursor.fetchone():
-            conn.close()
             return jsonify({"success": False, "error": "Customer not found"}), 404
 
         # Check for duplicate Thai ID if being updated
@@ -413,7 +500,6 @@ def update_customer(customer_id):
                 WHERE thai_id_number = ? AND id != ?
             """, (data['thai_id_number'], customer_id))
             if cursor.fetchone():
-                conn.close()
                 return jsonify({
                     "success": False,
                     "error": "Another customer already has this Thai ID number"
@@ -452,7 +538,6 @@ def update_customer(customer_id):
             cursor.execute(f"UPDATE customers SET {', '.join(update_fields)} WHERE id = ?", params)
             conn.commit()
 
-        conn.close()
         return jsonify({
             "success": True,
             "message": "Customer updated successfully"
@@ -474,7 +559,6 @@ def delete_customer(customer_id):
         cursor.execute("SELECT first_name, last_name FROM customers WHERE id = ?", (customer_id,))
         customer = cursor.fetchone()
         if not customer:
-            conn.close()
             return jsonify({"success": False, "error": "Customer not found"}), 404
 
         customer_name = f"{customer['first_name']} {customer['last_name']}".strip()
@@ -482,7 +566,6 @@ def delete_customer(customer_id):
         # Check dependencies
         cursor.execute("SELECT COUNT(*) FROM vehicles WHERE customer_id = ?", (customer_id,))
         if cursor.fetchone()[0] > 0:
-            conn.close()
             return jsonify({
                 "success": False,
                 "error": "Cannot delete customer with vehicles"
@@ -490,7 +573,6 @@ def delete_customer(customer_id):
 
         cursor.execute("DELETE FROM customers WHERE id = ?", (customer_id,))
         conn.commit()
-        conn.close()
 
         return jsonify({
             "success": True,
@@ -507,6 +589,7 @@ def delete_customer(customer_id):
 # =============================================================================
 
 @app.route('/api/customers/search', methods=['GET'])
+@conditional_get.etag(tables=['customers', 'vehicles'])
 def search_customers():
     """Enhanced search customers including Thai names and ID"""
     try:
@@ -522,20 +605,15 @@ def search_customers():
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        cursor.execute("""
+        match_sql, match_params = search_index.customer_filter(conn, search_term, 'c.id')
+        cursor.execute(f"""
             SELECT c.*, 
                    COALESCE(c.first_name || ' ' || c.last_name, c.first_name, '') as name,
-                   COUNT(v.id) as vehicle_count
+                   (SELECT COUNT(*) FROM vehicles v WHERE v.customer_id = c.id) as vehicle_count
             FROM customers c
-            LEFT JOIN vehicles v ON c.id = v.customer_id
-            WHERE 
-                c.first_name LIKE ? OR c.last_name LIKE ? OR 
-                c.phone LIKE ? OR c.email LIKE ? OR
-                c.thai_name LIKE ? OR c.english_name LIKE ? OR 
-                c.thai_id_number LIKE ?
-            GROUP BY c.id
+            WHERE {match_sql}
             ORDER BY c.first_name, c.last_name
-        """, tuple([f'%{search_term}%'] * 7))
+        """, match_params)
 
         customers = [dict(row) for row in cursor.fetchall()]
 
@@ -543,8 +621,6 @@ def search_customers():
         for customer in customers:
             customer['registration_date'] = customer['created_at']
 
-        conn.close()
-
         return jsonify({
             "success": True,
             "customers": customers,
@@ -557,7 +633,41 @@ def search_customers():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@app.route('/api/search', methods=['GET'])
+def unified_search():
+    """Ranked search across customers, vehicles, repair quotes and insurance claims"""
+    try:
+        query = request.args.get('q', '').strip()
+        limit = request.args.get('limit', search_index.DEFAULT_LIMIT, type=int)
+        types = [t.strip() for t in request.args.get('types', '').split(',') if t.strip()]
+
+        if not query:
+            return jsonify({
+                "success": True,
+                "results": [],
+                "message": "No search term provided"
+            })
+
+        conn = get_db_connection()
+        if not search_index.is_available(conn):
+            return jsonify({"success": False, "error": "Search index is not available"}), 503
+
+        results = search_index.search(conn, query, kinds=types or None, limit=limit)
+
+        return jsonify({
+            "success": True,
+            "results": results,
+            "total": len(results),
+            "query": query
+        })
+
+    except Exception as e:
+        logger.error(f"Error in unified search: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 @app.route('/api/customers/thai-id/<thai_id>', methods=['GET'])
+@conditional_get.etag(tables=['customers'])
 def get_customer_by_thai_id(thai_id):
     """Get customer by Thai ID number"""
     try:
@@ -574,7 +684,6 @@ def get_customer_by_thai_id(thai_id):
         customer = cursor.fetchone()
 
         if not customer:
-            conn.close()
             return jsonify({
                 "success": False,
                 "error": "Customer with this Thai ID not found"
@@ -583,8 +692,6 @@ def get_customer_by_thai_id(thai_id):
         customer_dict = dict(customer)
         customer_dict['registration_date'] = customer_dict['created_at']
 
-        conn.close()
-
         return jsonify({
             "success": True,
             "customer": customer_dict
@@ -627,7 +734,6 @@ def validate_thai_id():
         """, (thai_id,))
 
         existing_customer = cursor.fetchone()
-        conn.close()
 
         if existing_customer:
             return jsonify({
@@ -651,62 +757,18 @@ def validate_thai_id():
 
 
 @app.route('/api/customers/statistics', methods=['GET'])
+@conditional_get.etag(tables=['customers'], period=60)
+@response_cache.cached(tables=['customers'])
 def get_customer_statistics():
     """Get customer statistics including Thai ID usage"""
     try:
         conn = get_db_connection()
-        cursor = conn.cursor()
-
-        stats = {}
+        counters = stat_counters.get_customer_statistics(conn)
 
-        # Total customers
-        cursor.execute("SELECT COUNT(*) as count FROM customers")
-        stats['total_customers'] = cursor.fetchone()['count']
-
-        # Customers with Thai ID
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM customers 
-            WHERE thai_id_number IS NOT NULL AND thai_id_number != ''
-        """)
-        stats['with_thai_id'] = cursor.fetchone()['count']
-
-        # Customers with phone
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM customers 
-            WHERE phone IS NOT NULL AND phone != ''
-        """)
-        stats['with_phone'] = cursor.fetchone()['count']
-
-        # Customers with email
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM customers 
-            WHERE email IS NOT NULL AND email != ''
-        """)
-        stats['with_email'] = cursor.fetchone()['count']
-
-        # New customers last 30 days
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM customers 
-            WHERE created_at >= datetime('now', '-30 days')
-        """)
-        stats['new_last_30_days'] = cursor.fetchone()['count']
-
-        # New customers last 90 days
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM customers 
-            WHERE created_at >= datetime('now', '-90 days')
-        """)
-        stats['new_last_90_days'] = cursor.fetchone()['count']
-
-        # Calculate Thai ID usage percentage
-        if stats['total_customers'] > 0:
-            stats['thai_id_percentage'] = round(
-                (stats['with_thai_id'] / stats['total_customers']) * 100, 1
-            )
-        else:
-            stats['thai_id_percentage'] = 0
-
-        conn.close()
+        stats = {key: counters[key] for key in (
+            'total_customers', 'with_thai_id', 'with_phone', 'with_email',
+            'new_last_30_days', 'new_last_90_days', 'thai_id_percentage',
+        )}
 
         return jsonify({
             "success": True,
@@ -725,38 +787,45 @@ def get_customer_statistics():
 # =============================================================================
 
 
+VEHICLE_LIST_FIELDS = FieldSelector('vehicles', 'v', computed={
+    'customer_name': "COALESCE(c.first_name || ' ' || c.last_name, c.first_name, 'Unknown Customer')",
+    'customer_phone': "c.phone",
+    'customer_email': "c.email",
+    'photo_id': "vp.id",
+}, derived=['photo_url', 'thumbnail_url', 'photos'], required=['photo_id'])
+
+
 @app.route('/api/vehicles', methods=['GET'])
+@conditional_get.etag(tables=['vehicles', 'customers', 'vehicle_photos'])
 def get_vehicles():
     """Get all vehicles with photo information"""
     try:
         customer_id = request.args.get('customer_id')
+        page = parse_page_args(request.args)
+        fields = parse_fields(request.args)
+        keyset = Keyset('v.id')
+
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        query = """
-            SELECT v.*, 
-                   COALESCE(c.first_name || ' ' || c.last_name, c.first_name, 'Unknown Customer') as customer_name,
-                   c.phone as customer_phone,
-                   c.email as customer_email,
-                   vp.id as photo_id
+        query = f"""
+            SELECT {VEHICLE_LIST_FIELDS.select_sql(conn, fields)}
+                   {keyset.select_sql()}
             FROM vehicles v
             LEFT JOIN customers c ON v.customer_id = c.id
             LEFT JOIN vehicle_photos vp ON v.id = vp.vehicle_id AND vp.is_primary = 1
+            WHERE 1=1
         """
         params = []
 
         if customer_id:
-            query += " WHERE v.customer_id = ?"
+            query += " AND v.customer_id = ?"
             params.append(customer_id)
 
-        query += " ORDER BY v.id DESC"
-
+        query, params = keyset.apply(query, params, page)
         cursor.execute(query, params)
-        vehicles = []
-
-        for row in cursor.fetchall():
-            vehicle = dict(row)
 
+        def add_photo_urls(vehicle):
             # Add photo URL if primary photo exists
             if vehicle['photo_id']:
                 vehicle['photo_url'] = f'/api/photos/{vehicle["photo_id"]}'
@@ -765,11 +834,19 @@ def get_vehicles():
 
             # Remove photo-specific fields
             vehicle.pop('photo_id', None)
+            return FieldSelector.project(vehicle, fields)
+
+        fmt = stream_format(request)
+        if fmt:
+            return streamed_collection(cursor, 'vehicles', fmt, keyset=keyset, limit=page.limit,
+                                       transform=add_photo_urls)
 
-            vehicles.append(vehicle)
+        rows, next_cursor = keyset.page(cursor.fetchall(), page.limit)
+        vehicles = [add_photo_urls(vehicle) for vehicle in rows]
 
-        conn.close()
-        return jsonify({"vehicles": vehicles})
+        return jsonify({"vehicles": vehicles, "next_cursor": next_cursor})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error getting vehicles: {e}")
         return jsonify({"error": str(e)}), 500
@@ -777,18 +854,25 @@ def get_vehicles():
 
 
 
+VEHICLE_DETAIL_FIELDS = FieldSelector('vehicles', 'v', computed={
+    'customer_name': "COALESCE(c.first_name || ' ' || c.last_name, c.first_name, 'Unknown Customer')",
+    'customer_phone': "c.phone",
+    'customer_email': "c.email",
+}, derived=['services', 'photo_count', 'photo_url', 'thumbnail_url'])
+
+
 @app.route('/api/vehicles/<int:vehicle_id>', methods=['GET'])
+@conditional_get.etag(tables=['vehicles', 'customers', 'services', 'vehicle_photos'])
 def get_vehicle(vehicle_id):
     """Get specific vehicle with photo information"""
     try:
+        fields = parse_fields(request.args)
+
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        cursor.execute("""
-            SELECT v.*, 
-                   COALESCE(c.first_name || ' ' || c.last_name, c.first_name, 'Unknown Customer') as customer_name,
-                   c.phone as customer_phone,
-                   c.email as customer_email
+        cursor.execute(f"""
+            SELECT {VEHICLE_DETAIL_FIELDS.select_sql(conn, fields)}
             FROM vehicles v
             LEFT JOIN customers c ON v.customer_id = c.id
             WHERE v.id = ?
@@ -796,38 +880,66 @@ def get_vehicle(vehicle_id):
 
         vehicle = cursor.fetchone()
         if not vehicle:
-            conn.close()
             return jsonify({"error": "Vehicle not found"}), 404
 
         vehicle_data = dict(vehicle)
 
         # Get services
-        cursor.execute("SELECT * FROM services WHERE vehicle_id = ? ORDER BY created_at DESC", (vehicle_id,))
-        vehicle_data['services'] = [dict(row) for row in cursor.fetchall()]
+        if FieldSelector.wants(fields, 'services'):
+            cursor.execute("SELECT * FROM services WHERE vehicle_id = ? ORDER BY created_at DESC", (vehicle_id,))
+            vehicle_data['services'] = [dict(row) for row in cursor.fetchall()]
 
         # Get photo count and primary photo
-        cursor.execute("SELECT COUNT(*) FROM vehicle_photos WHERE vehicle_id = ?", (vehicle_id,))
-        vehicle_data['photo_count'] = cursor.fetchone()[0]
+        if FieldSelector.wants(fields, 'photo_count'):
+            cursor.execute("SELECT COUNT(*) FROM vehicle_photos WHERE vehicle_id = ?", (vehicle_id,))
+            vehicle_data['photo_count'] = cursor.fetchone()[0]
 
         # Get primary photo
-        cursor.execute("""
-            SELECT id FROM vehicle_photos 
-            WHERE vehicle_id = ? AND is_primary = 1 
-            ORDER BY created_at DESC LIMIT 1
-        """, (vehicle_id,))
+        if FieldSelector.wants(fields, 'photo_url') or FieldSelector.wants(fields, 'thumbnail_url'):
+            cursor.execute("""
+                SELECT id FROM vehicle_photos 
+                WHERE vehicle_id = ? AND is_primary = 1 
+                ORDER BY timestamp DESC LIMIT 1
+            """, (vehicle_id,))
 
-        primary_photo = cursor.fetchone()
-        if primary_photo:
-            vehicle_data['photo_url'] = f'/api/photos/{primary_photo["id"]}'
-            vehicle_data['thumbnail_url'] = f'/api/photos/{primary_photo["id"]}/thumbnail'
+            primary_photo = cursor.fetchone()
+            if primary_photo:
+                vehicle_data['photo_url'] = f'/api/photos/{primary_photo["id"]}'
+                vehicle_data['thumbnail_url'] = f'/api/photos/{primary_photo["id"]}/thumbnail'
 
-        conn.close()
-        return jsonify(vehicle_data)
+        return jsonify(FieldSelector.project(vehicle_data, fields))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error getting vehicle: {e}")
         return jsonify({"error": str(e)}), 500
 
 
+VEHICLE_INSERT_SQL = """
+    INSERT INTO vehicles (customer_id, make, model, year, vin, license_plate, color, mileage, vehicle_type, notes)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def vehicle_insert_values(data, customer_id=None):
+    """VEHICLE_INSERT_SQL parameters for a vehicle request body; raises ValueError if a field is missing"""
+    if not isinstance(data, dict):
+        raise ValueError("vehicle must be an object")
+    if customer_id is not None:
+        data = dict(data, customer_id=customer_id)
+
+    for field in ['customer_id', 'make', 'model']:
+        if field not in data:
+            raise ValueError(f"{field} is required")
+
+    return (
+        data['customer_id'], data['make'], data['model'],
+        data.get('year'), data.get('vin', ''), data.get('license_plate', ''),
+        data.get('color', ''), data.get('mileage', 0),
+        data.get('vehicle_type', 'car'), data.get('notes', '')
+    )
+
+
 @app.route('/api/vehicles', methods=['POST'])
 def add_vehicle():
     """Add new vehicle"""
@@ -836,23 +948,14 @@ def add_vehicle():
             return jsonify({"error": "Request must be JSON"}), 400
 
         data = request.get_json()
-        required_fields = ['customer_id', 'make', 'model']
-
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"{field} is required"}), 400
+        try:
+            values = vehicle_insert_values(data)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
         conn = get_db_connection()
         cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO vehicles (customer_id, make, model, year, vin, license_plate, color, mileage, vehicle_type, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            data['customer_id'], data['make'], data['model'],
-            data.get('year'), data.get('vin', ''), data.get('license_plate', ''),
-            data.get('color', ''), data.get('mileage', 0),
-            data.get('vehicle_type', 'car'), data.get('notes', '')
-        ))
+        cursor.execute(VEHICLE_INSERT_SQL, values)
 
         vehicle_id = cursor.lastrowid
         conn.commit()
@@ -864,7 +967,6 @@ def add_vehicle():
         """, (vehicle_id,))
 
         new_vehicle = dict(cursor.fetchone())
-        conn.close()
 
         return jsonify({
             "message": "Vehicle created successfully",
@@ -888,7 +990,6 @@ def update_vehicle(vehicle_id):
 
         cursor.execute("SELECT id FROM vehicles WHERE id = ?", (vehicle_id,))
         if not cursor.fetchone():
-            conn.close()
             return jsonify({"error": "Vehicle not found"}), 404
 
         update_fields = []
@@ -910,7 +1011,6 @@ def update_vehicle(vehicle_id):
             cursor.execute(f"UPDATE vehicles SET {', '.join(update_fields)} WHERE id = ?", params)
             conn.commit()
 
-        conn.close()
         return jsonify({"message": "Vehicle updated successfully"})
     except Exception as e:
         logger.error(f"Error updating vehicle: {e}")
@@ -926,17 +1026,14 @@ def delete_vehicle(vehicle_id):
 
         cursor.execute("SELECT id FROM vehicles WHERE id = ?", (vehicle_id,))
         if not cursor.fetchone():
-            conn.close()
             return jsonify({"error": "Vehicle not found"}), 404
 
         cursor.execute("SELECT COUNT(*) FROM services WHERE vehicle_id = ?", (vehicle_id,))
         if cursor.fetchone()[0] > 0:
-            conn.close()
             return jsonify({"error": "Cannot delete vehicle with services"}), 400
 
         cursor.execute("DELETE FROM vehicles WHERE id = ?", (vehicle_id,))
         conn.commit()
-        conn.close()
         return jsonify({"message": "Vehicle deleted successfully"})
     except Exception as e:
         logger.error(f"Error deleting vehicle: {e}")
@@ -947,7 +1044,14 @@ def delete_vehicle(vehicle_id):
 # SERVICE MANAGEMENT API
 # =============================================================================
 
+SERVICE_LIST_FIELDS = FieldSelector('services', 's', computed={
+    'customer_name': "c.name",
+    'vehicle_info': "v.make || ' ' || v.model || ' (' || v.year || ')'",
+})
+
+
 @app.route('/api/services', methods=['GET'])
+@conditional_get.etag(tables=['services', 'customers', 'vehicles'])
 def get_services():
     """Get all services"""
     try:
@@ -955,13 +1059,16 @@ def get_services():
         vehicle_id = request.args.get('vehicle_id')
         customer_id = request.args.get('customer_id')
         service_type = request.args.get('service_type')
+        page = parse_page_args(request.args)
+        fields = parse_fields(request.args)
+        keyset = Keyset('s.created_at', 's.id')
 
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        query = """
-            SELECT s.*, c.name as customer_name,
-                   v.make || ' ' || v.model || ' (' || v.year || ')' as vehicle_info
+        query = f"""
+            SELECT {SERVICE_LIST_FIELDS.select_sql(conn, fields)}
+                   {keyset.select_sql()}
             FROM services s
             LEFT JOIN customers c ON s.customer_id = c.id
             LEFT JOIN vehicles v ON s.vehicle_id = v.id
@@ -982,27 +1089,43 @@ def get_services():
             query += " AND s.service_type = ?"
             params.append(service_type)
 
-        query += " ORDER BY s.created_at DESC"
-
+        query, params = keyset.apply(query, params, page)
         cursor.execute(query, params)
-        services = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return jsonify({"services": services})
+
+        fmt = stream_format(request)
+        if fmt:
+            return streamed_collection(cursor, 'services', fmt, keyset=keyset, limit=page.limit)
+
+        services, next_cursor = keyset.page(cursor.fetchall(), page.limit)
+        return jsonify({"services": services, "next_cursor": next_cursor})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error getting services: {e}")
         return jsonify({"error": str(e)}), 500
 
 
+SERVICE_DETAIL_FIELDS = FieldSelector('services', 's', computed={
+    'customer_name': "c.name",
+    'customer_phone': "c.phone",
+    'vehicle_info': "v.make || ' ' || v.model",
+    'license_plate': "v.license_plate",
+}, derived=['items', 'photo_count', 'material_forms_count', 'quotes_count'], required=['service_type'])
+
+
 @app.route('/api/services/<int:service_id>', methods=['GET'])
+@conditional_get.etag(tables=['services', 'customers', 'vehicles', 'service_items', 'vehicle_photos',
+                                 'material_forms', 'repair_quotes'])
 def get_service(service_id):
     """Get specific service"""
     try:
+        fields = parse_fields(request.args)
+
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        cursor.execute("""
-            SELECT s.*, c.name as customer_name, c.phone as customer_phone,
-                   v.make || ' ' || v.model as vehicle_info, v.license_plate
+        cursor.execute(f"""
+            SELECT {SERVICE_DETAIL_FIELDS.select_sql(conn, fields)}
             FROM services s
             LEFT JOIN customers c ON s.customer_id = c.id
             LEFT JOIN vehicles v ON s.vehicle_id = v.id
@@ -1011,34 +1134,61 @@ def get_service(service_id):
 
         service = cursor.fetchone()
         if not service:
-            conn.close()
             return jsonify({"error": "Service not found"}), 404
 
         service_data = dict(service)
 
         # Get service items
-        cursor.execute("SELECT * FROM service_items WHERE service_id = ?", (service_id,))
-        service_data['items'] = [dict(row) for row in cursor.fetchall()]
+        if FieldSelector.wants(fields, 'items'):
+            cursor.execute("SELECT * FROM service_items WHERE service_id = ?", (service_id,))
+            service_data['items'] = [dict(row) for row in cursor.fetchall()]
 
         # Get photo count
-        cursor.execute("SELECT COUNT(*) FROM vehicle_photos WHERE service_id = ?", (service_id,))
-        service_data['photo_count'] = cursor.fetchone()[0]
+        if FieldSelector.wants(fields, 'photo_count'):
+            cursor.execute("SELECT COUNT(*) FROM vehicle_photos WHERE service_id = ?", (service_id,))
+            service_data['photo_count'] = cursor.fetchone()[0]
 
         # Truck repair data
         if service_data.get('service_type') == 'truck_repair':
-            cursor.execute("SELECT COUNT(*) FROM material_forms WHERE service_id = ?", (service_id,))
-            service_data['material_forms_count'] = cursor.fetchone()[0]
+            if FieldSelector.wants(fields, 'material_forms_count'):
+                cursor.execute("SELECT COUNT(*) FROM material_forms WHERE service_id = ?", (service_id,))
+                service_data['material_forms_count'] = cursor.fetchone()[0]
 
-            cursor.execute("SELECT COUNT(*) FROM repair_quotes WHERE service_id = ?", (service_id,))
-            service_data['quotes_count'] = cursor.fetchone()[0]
+            if FieldSelector.wants(fields, 'quotes_count'):
+                cursor.execute("SELECT COUNT(*) FROM repair_quotes WHERE service_id = ?", (service_id,))
+                service_data['quotes_count'] = cursor.fetchone()[0]
 
-        conn.close()
-        return jsonify(service_data)
+        return jsonify(FieldSelector.project(service_data, fields))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error getting service: {e}")
         return jsonify({"error": str(e)}), 500
 
 
+SERVICE_INSERT_SQL = """
+    INSERT INTO services (customer_id, vehicle_id, service_type, description, status,
+                          estimated_cost, scheduled_date, priority, notes)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def service_insert_values(data):
+    """SERVICE_INSERT_SQL parameters for a service request body; raises ValueError if a field is missing"""
+    if not isinstance(data, dict):
+        raise ValueError("service must be an object")
+    for field in ['customer_id', 'vehicle_id', 'service_type']:
+        if field not in data:
+            raise ValueError(f"{field} is required")
+
+    return (
+        data['customer_id'], data['vehicle_id'], data['service_type'],
+        data.get('description', ''), data.get('status', 'pending'),
+        data.get('estimated_cost', 0.0), data.get('scheduled_date'),
+        data.get('priority', 'normal'), data.get('notes', '')
+    )
+
+
 @app.route('/api/services', methods=['POST'])
 def add_service():
     """Add new service"""
@@ -1047,24 +1197,14 @@ def add_service():
             return jsonify({"error": "Request must be JSON"}), 400
 
         data = request.get_json()
-        required_fields = ['customer_id', 'vehicle_id', 'service_type']
-
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"{field} is required"}), 400
+        try:
+            values = service_insert_values(data)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
         conn = get_db_connection()
         cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO services (customer_id, vehicle_id, service_type, description, status, 
-                                estimated_cost, scheduled_date, priority, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            data['customer_id'], data['vehicle_id'], data['service_type'],
-            data.get('description', ''), data.get('status', 'pending'),
-            data.get('estimated_cost', 0.0), data.get('scheduled_date'),
-            data.get('priority', 'normal'), data.get('notes', '')
-        ))
+        cursor.execute(SERVICE_INSERT_SQL, values)
 
         service_id = cursor.lastrowid
         conn.commit()
@@ -1079,7 +1219,6 @@ def add_service():
         """, (service_id,))
 
         new_service = dict(cursor.fetchone())
-        conn.close()
 
         return jsonify({
             "message": "Service created successfully",
@@ -1103,7 +1242,6 @@ def update_service(service_id):
 
         cursor.execute("SELECT id FROM services WHERE id = ?", (service_id,))
         if not cursor.fetchone():
-            conn.close()
             return jsonify({"error": "Service not found"}), 404
 
         update_fields = []
@@ -1126,7 +1264,6 @@ def update_service(service_id):
             cursor.execute(f"UPDATE services SET {', '.join(update_fields)} WHERE id = ?", params)
             conn.commit()
 
-        conn.close()
         return jsonify({"message": "Service updated successfully"})
     except Exception as e:
         logger.error(f"Error updating service: {e}")
@@ -1142,18 +1279,103 @@ def delete_service(service_id):
 
         cursor.execute("SELECT id FROM services WHERE id = ?", (service_id,))
         if not cursor.fetchone():
-            conn.close()
             return jsonify({"error": "Service not found"}), 404
 
         cursor.execute("DELETE FROM services WHERE id = ?", (service_id,))
         conn.commit()
-        conn.close()
         return jsonify({"message": "Service deleted successfully"})
     except Exception as e:
         logger.error(f"Error deleting service: {e}")
         return jsonify({"error": str(e)}), 500
 
 
+# =============================================================================
+# BATCH WRITE API
+# =============================================================================
+
+def insert_batch_customer(conn, data):
+    """Insert one customer of a batch, with its vehicles if given"""
+    values = customer_insert_values(data)
+    thai_id = values[9]
+    if thai_id and conn.execute("SELECT 1 FROM customers WHERE thai_id_number = ?", (thai_id,)).fetchone():
+        raise ValueError(f"Customer with Thai ID {thai_id} already exists")
+
+    customer_id = conn.execute(CUSTOMER_INSERT_SQL, values).lastrowid
+
+    vehicles = data.get('vehicles') or []
+    if not isinstance(vehicles, list):
+        raise ValueError("vehicles must be a list")
+    if not vehicles:
+        return {"id": customer_id}
+
+    values = []
+    for index, vehicle in enumerate(vehicles):
+        try:
+            values.append(vehicle_insert_values(vehicle, customer_id))
+        except ValueError as e:
+            raise ValueError(f"vehicles[{index}]: {e}")
+
+    conn.executemany(VEHICLE_INSERT_SQL, values)
+    vehicle_ids = [row[0] for row in conn.execute(
+        "SELECT id FROM vehicles WHERE customer_id = ? ORDER BY id", (customer_id,))]
+    return {"id": customer_id, "vehicle_ids": vehicle_ids}
+
+
+def insert_batch_vehicle(conn, data):
+    """Insert one vehicle of a batch"""
+    return {"id": conn.execute(VEHICLE_INSERT_SQL, vehicle_insert_values(data)).lastrowid}
+
+
+def insert_batch_service(conn, data):
+    """Insert one service of a batch"""
+    return {"id": conn.execute(SERVICE_INSERT_SQL, service_insert_values(data)).lastrowid}
+
+
+def batch_create(insert_item, name):
+    """Run a batch request body ({"items": [...], "atomic": false})"""
+    try:
+        if not request.is_json:
+            return jsonify({"success": False, "error": "Request must be JSON"}), 400
+
+        data = request.get_json()
+        if not isinstance(data, dict):
+            return jsonify({"success": False, "error": "Request body must be a JSON object"}), 400
+        items = data.get('items')
+        atomic = bool(data.get('atomic', False))
+
+        summary = batch_writes.summarize(batch_writes.run_batch(items, insert_item, atomic=atomic))
+        logger.info(f"Batch {name}: {summary['created']} created, {summary['failed']} failed")
+
+        # 207: some items were rejected, the rest were committed
+        return jsonify(summary), (201 if summary['failed'] == 0 else 207)
+
+    except batch_writes.BatchItemError as e:
+        return jsonify({"success": False, "error": str(e), "failed_index": e.index}), 400
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error creating {name} batch: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route('/api/batch/customers', methods=['POST'])
+def batch_create_customers():
+    """Create many customers (each optionally with a vehicles list) in one transaction"""
+    return batch_create(insert_batch_customer, 'customers')
+
+
+@app.route('/api/batch/vehicles', methods=['POST'])
+def batch_create_vehicles():
+    """Create many vehicles in one transaction"""
+    return batch_create(insert_batch_vehicle, 'vehicles')
+
+
+@app.route('/api/batch/services', methods=['POST'])
+def batch_create_services():
+    """Create many services in one transaction"""
+    return batch_create(insert_batch_service, 'services')
+
+
 # =============================================================================
 # PHOTO MANAGEMENT API
 # =============================================================================
@@ -1209,53 +1431,55 @@ def upload_photo():
         if not vehicle_id or not customer_id:
             return jsonify({'error': 'vehicle_id and customer_id are required'}), 400
 
-        # Insert photo record
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        # Insert photo record through the single-writer queue
+        def insert_photo(write_conn):
+            cursor = write_conn.cursor()
 
-        cursor.execute("""
-            INSERT INTO vehicle_photos (
+            cursor.execute("""
+                INSERT INTO vehicle_photos (
+                    vehicle_id, customer_id, service_id, category, angle, description,
+                    filename, file_path, file_size, mime_type, thumbnail_path,
+                    created_by, image_width, image_height
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
                 vehicle_id, customer_id, service_id, category, angle, description,
-                filename, file_path, file_size, mime_type, thumbnail_path,
+                filename, filename, file_size, file.mimetype, thumbnail_filename,
                 created_by, image_width, image_height
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            vehicle_id, customer_id, service_id, category, angle, description,
-            filename, filename, file_size, file.mimetype, thumbnail_filename,
-            created_by, image_width, image_height
-        ))
+            ))
 
-        photo_id = cursor.lastrowid
+            new_photo_id = cursor.lastrowid
 
-        # Add to session if session_id provided
-        if session_id:
-            # Get current photo count for sequence order
-            cursor.execute("""
-                SELECT COUNT(*) FROM session_photos WHERE session_id = ?
-            """, (session_id,))
-            sequence_order = cursor.fetchone()[0]
+            # Add to session if session_id provided
+            if session_id:
+                # Get current photo count for sequence order
+                cursor.execute("""
+                    SELECT COUNT(*) FROM session_photos WHERE session_id = ?
+                """, (session_id,))
+                sequence_order = cursor.fetchone()[0]
 
-            # Link photo to session
-            cursor.execute("""
-                INSERT INTO session_photos (session_id, photo_id, sequence_order)
-                VALUES (?, ?, ?)
-            """, (session_id, photo_id, sequence_order))
+                # Link photo to session
+                cursor.execute("""
+                    INSERT INTO session_photos (session_id, photo_id, sequence_order)
+                    VALUES (?, ?, ?)
+                """, (session_id, new_photo_id, sequence_order))
 
-            # Update session photo count
-            cursor.execute("""
-                UPDATE photo_sessions
-                SET total_photos = total_photos + 1
-                WHERE id = ?
-            """, (session_id,))
+                # Update session photo count
+                cursor.execute("""
+                    UPDATE photo_sessions
+                    SET total_photos = total_photos + 1
+                    WHERE id = ?
+                """, (session_id,))
 
-        conn.commit()
+            return new_photo_id
+
+        photo_id = write_coordinator.run(insert_photo)
 
         # Get the created photo record
+        conn = get_db_connection()
+        cursor = conn.cursor()
         cursor.execute("SELECT * FROM vehicle_photos WHERE id = ?", (photo_id,))
         photo = dict(cursor.fetchone())
 
-        conn.close()
-
         return jsonify({
             'success': True,
             'photo': photo,
@@ -1279,10 +1503,8 @@ def get_photo(photo_id):
         photo = cursor.fetchone()
 
         if not photo:
-            conn.close()
             return jsonify({"error": "Photo not found"}), 404
 
-        conn.close()
         return send_from_directory(app.config['UPLOAD_FOLDER'], photo['filename'])
 
     except Exception as e:
@@ -1301,10 +1523,8 @@ def get_photo_thumbnail(photo_id):
         result = cursor.fetchone()
 
         if not result or not result['thumbnail_path']:
-            conn.close()
             return jsonify({"error": "Thumbnail not found"}), 404
 
-        conn.close()
         return send_from_directory(app.config['THUMBNAILS_FOLDER'], result['thumbnail_path'])
 
     except Exception as e:
@@ -1323,10 +1543,8 @@ def get_photo_info(photo_id):
         photo = cursor.fetchone()
 
         if not photo:
-            conn.close()
             return jsonify({"error": "Photo not found"}), 404
 
-        conn.close()
         return jsonify(dict(photo))
 
     except Exception as e:
@@ -1334,35 +1552,51 @@ def get_photo_info(photo_id):
         return jsonify({"error": str(e)}), 500
 
 
+VEHICLE_PHOTO_FIELDS = FieldSelector('vehicle_photos', derived=['photo_url', 'thumbnail_url'])
+
+
 @app.route('/api/vehicles/<int:vehicle_id>/photos', methods=['GET'])
+@conditional_get.etag(tables=['vehicle_photos'])
 def get_vehicle_photos(vehicle_id):
     """Get all photos for a specific vehicle"""
     try:
         category = request.args.get('category')
+        page = parse_page_args(request.args)
+        fields = parse_fields(request.args)
+        keyset = Keyset('timestamp', 'id')
 
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        query = "SELECT * FROM vehicle_photos WHERE vehicle_id = ?"
+        query = f"SELECT {VEHICLE_PHOTO_FIELDS.select_sql(conn, fields)}{keyset.select_sql()} " \
+                f"FROM vehicle_photos WHERE vehicle_id = ?"
         params = [vehicle_id]
 
         if category:
             query += " AND category = ?"
             params.append(category)
 
-        query += " ORDER BY timestamp DESC"
-
+        query, params = keyset.apply(query, params, page)
         cursor.execute(query, params)
-        photos = [dict(row) for row in cursor.fetchall()]
 
-        # Add URLs for each photo
-        for photo in photos:
+        def add_photo_urls(photo):
             photo['photo_url'] = f'/api/photos/{photo["id"]}'
             photo['thumbnail_url'] = f'/api/photos/{photo["id"]}/thumbnail'
+            return FieldSelector.project(photo, fields)
+
+        fmt = stream_format(request)
+        if fmt:
+            return streamed_collection(cursor, 'photos', fmt, keyset=keyset, limit=page.limit,
+                                       transform=add_photo_urls)
 
-        conn.close()
-        return jsonify({"photos": photos})
+        photos, next_cursor = keyset.page(cursor.fetchall(), page.limit)
+
+        # Add URLs for each photo
+        photos = [add_photo_urls(photo) for photo in photos]
+        return jsonify({"photos": photos, "next_cursor": next_cursor})
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error getting vehicle photos: {e}")
         return jsonify({"error": str(e)}), 500
@@ -1402,7 +1636,6 @@ def upload_vehicle_photo():
         vehicle = cursor.fetchone()
 
         if not vehicle:
-            conn.close()
             return jsonify({'error': 'Vehicle not found'}), 404
 
         customer_id = vehicle['customer_id']
@@ -1463,8 +1696,6 @@ def upload_vehicle_photo():
         photo['url'] = f'/api/photos/{photo_id}'
         photo['thumbnail_url'] = f'/api/photos/{photo_id}/thumbnail'
 
-        conn.close()
-
         return jsonify({
             'success': True,
             'message': 'Photo uploaded successfully',
@@ -1477,6 +1708,7 @@ def upload_vehicle_photo():
 
 
 @app.route('/api/vehicles/<int:vehicle_id>/details', methods=['GET'])
+@conditional_get.etag(tables=['vehicles', 'customers', 'vehicle_photos'])
 def get_vehicle_details(vehicle_id):
     """Get detailed vehicle information (matches frontend expectation)"""
     try:
@@ -1496,16 +1728,15 @@ def get_vehicle_details(vehicle_id):
 
         vehicle = cursor.fetchone()
         if not vehicle:
-            conn.close()
             return jsonify({"error": "Vehicle not found"}), 404
 
         vehicle_data = dict(vehicle)
 
-        # Get primary photo
+        # Get primary photo (the newest one if none is marked primary)
         cursor.execute("""
             SELECT * FROM vehicle_photos 
-            WHERE vehicle_id = ? AND is_primary = 1 
-            ORDER BY created_at DESC LIMIT 1
+            WHERE vehicle_id = ? 
+            ORDER BY is_primary DESC, timestamp DESC LIMIT 1
         """, (vehicle_id,))
 
         primary_photo = cursor.fetchone()
@@ -1518,7 +1749,6 @@ def get_vehicle_details(vehicle_id):
         photo_count = cursor.fetchone()
         vehicle_data['photo_count'] = photo_count['count'] if photo_count else 0
 
-        conn.close()
         return jsonify({
             "success": True,
             "vehicle": vehicle_data
@@ -1530,6 +1760,7 @@ def get_vehicle_details(vehicle_id):
 
 
 @app.route('/api/vehicles/<int:vehicle_id>/service-history', methods=['GET'])
+@conditional_get.etag(tables=['vehicles', 'customers', 'services'])
 def get_vehicle_service_history(vehicle_id):
     """Get service history for a vehicle (matches frontend expectation)"""
     try:
@@ -1541,7 +1772,6 @@ def get_vehicle_service_history(vehicle_id):
         # Check if vehicle exists
         cursor.execute("SELECT id FROM vehicles WHERE id = ?", (vehicle_id,))
         if not cursor.fetchone():
-            conn.close()
             return jsonify({"error": "Vehicle not found"}), 404
 
         # Get service history
@@ -1580,7 +1810,6 @@ def get_vehicle_service_history(vehicle_id):
             }
             formatted_records.append(formatted_record)
 
-        conn.close()
         return jsonify({
             "success": True,
             "service_records": formatted_records
@@ -1611,7 +1840,6 @@ def get_vehicle_photos_enhanced(vehicle_id):
 
         vehicle = cursor.fetchone()
         if not vehicle:
-            conn.close()
             return jsonify({"error": "Vehicle not found"}), 404
 
         # Get photos
@@ -1622,7 +1850,7 @@ def get_vehicle_photos_enhanced(vehicle_id):
             query += " AND category = ?"
             params.append(category)
 
-        query += " ORDER BY is_primary DESC, created_at DESC"
+        query += " ORDER BY is_primary DESC, timestamp DESC"
 
         cursor.execute(query, params)
         photos = [dict(row) for row in cursor.fetchall()]
@@ -1632,7 +1860,6 @@ def get_vehicle_photos_enhanced(vehicle_id):
             photo['url'] = f'/api/photos/{photo["id"]}'
             photo['thumbnail_url'] = f'/api/photos/{photo["id"]}/thumbnail'
 
-        conn.close()
         return jsonify({
             "success": True,
             "photos": photos,
@@ -1656,7 +1883,6 @@ def delete_vehicle_photo(photo_id):
         photo = cursor.fetchone()
 
         if not photo:
-            conn.close()
             return jsonify({"error": "Photo not found"}), 404
 
         # Delete files from filesystem
@@ -1675,7 +1901,6 @@ def delete_vehicle_photo(photo_id):
         # Delete from database
         cursor.execute("DELETE FROM vehicle_photos WHERE id = ?", (photo_id,))
         conn.commit()
-        conn.close()
 
         return jsonify({
             "success": True,
@@ -1701,7 +1926,6 @@ def set_primary_vehicle_photo(photo_id):
         photo = cursor.fetchone()
 
         if not photo:
-            conn.close()
             return jsonify({"error": "Photo not found"}), 404
 
         vehicle_id = photo['vehicle_id']
@@ -1721,7 +1945,6 @@ def set_primary_vehicle_photo(photo_id):
         """, (photo_id,))
 
         conn.commit()
-        conn.close()
 
         return jsonify({
             "success": True,
@@ -1733,38 +1956,6 @@ def set_primary_vehicle_photo(photo_id):
         return jsonify({"error": str(e)}), 500
 
 
-# =============================================================================
-# DATABASE SCHEMA UPDATE (Run this once to add missing columns)
-# =============================================================================
-
-def update_vehicle_photos_table():
-    """Update vehicle_photos table to add missing columns"""
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Add missing columns if they don't exist
-        try:
-            cursor.execute("ALTER TABLE vehicle_photos ADD COLUMN is_primary INTEGER DEFAULT 0")
-        except:
-            pass  # Column already exists
-
-        try:
-            cursor.execute("ALTER TABLE vehicle_photos ADD COLUMN caption TEXT")
-        except:
-            pass  # Column already exists
-
-        conn.commit()
-        conn.close()
-        logger.info("Vehicle photos table updated successfully")
-
-    except Exception as e:
-        logger.error(f"Error updating vehicle photos table: {e}")
-
-
-# Call this function when the app starts
-update_vehicle_photos_table()
-
 # =============================================================================
 # TRUCK REPAIR MANAGEMENT API
 # =============================================================================
@@ -1808,26 +1999,24 @@ def create_material_form():
 
         form_id = cursor.lastrowid
 
-        # Insert form items
-        for item in data['items']:
-            cursor.execute("""
-                INSERT INTO material_form_items (
-                    form_id, item_number, material_description, material_code,
-                    quantity, unit, unit_cost, total_cost
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                form_id,
-                item.get('item_number', 1),
-                item.get('material_description', ''),
-                item.get('material_code', ''),
-                item.get('quantity', 0),
-                item.get('unit', ''),
-                item.get('unit_cost', 0.0),
-                item.get('total_cost', 0.0)
-            ))
+        # Insert form items in one statement
+        cursor.executemany("""
+            INSERT INTO material_form_items (
+                form_id, item_number, material_description, material_code,
+                quantity, unit, unit_cost, total_cost
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(
+            form_id,
+            item.get('item_number', 1),
+            item.get('material_description', ''),
+            item.get('material_code', ''),
+            item.get('quantity', 0),
+            item.get('unit', ''),
+            item.get('unit_cost', 0.0),
+            item.get('total_cost', 0.0)
+        ) for item in data['items']])
 
         conn.commit()
-        conn.close()
 
         return jsonify({
             "message": "Material form created successfully",
@@ -1839,61 +2028,84 @@ def create_material_form():
         return jsonify({"error": str(e)}), 500
 
 
+MATERIAL_FORM_LIST_FIELDS = FieldSelector('material_forms', 'mf', computed={
+    'item_count': "(SELECT COUNT(*) FROM material_form_items mfi WHERE mfi.form_id = mf.id)",
+})
+
+
 @app.route('/api/forms', methods=['GET'])
+@conditional_get.etag(tables=['material_forms', 'material_form_items'])
 def get_material_forms():
     """Get all material forms"""
     try:
+        page = parse_page_args(request.args)
+        fields = parse_fields(request.args)
+        keyset = Keyset('mf.created_at', 'mf.id')
+
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        cursor.execute("""
-            SELECT mf.*, COUNT(mfi.id) as item_count
+        query, params = keyset.apply(f"""
+            SELECT {MATERIAL_FORM_LIST_FIELDS.select_sql(conn, fields)}
+                   {keyset.select_sql()}
             FROM material_forms mf
-            LEFT JOIN material_form_items mfi ON mf.id = mfi.form_id
-            GROUP BY mf.id
-            ORDER BY mf.created_at DESC
-        """)
+            WHERE 1=1
+        """, [], page)
+        cursor.execute(query, params)
 
-        forms = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        fmt = stream_format(request)
+        if fmt:
+            return streamed_collection(cursor, 'forms', fmt, keyset=keyset, limit=page.limit)
 
-        return jsonify({"forms": forms})
+        forms, next_cursor = keyset.page(cursor.fetchall(), page.limit)
 
+        return jsonify({"forms": forms, "next_cursor": next_cursor})
+
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error getting material forms: {e}")
         return jsonify({"error": str(e)}), 500
 
 
+MATERIAL_FORM_DETAIL_FIELDS = FieldSelector('material_forms', derived=['items'])
+
+
 @app.route('/api/forms/<int:form_id>', methods=['GET'])
+@conditional_get.etag(tables=['material_forms', 'material_form_items'])
 def get_material_form(form_id):
     """Get a specific material form with items"""
     try:
+        fields = parse_fields(request.args)
+
         conn = get_db_connection()
         cursor = conn.cursor()
 
         # Get form details
-        cursor.execute("SELECT * FROM material_forms WHERE id = ?", (form_id,))
+        cursor.execute(f"SELECT {MATERIAL_FORM_DETAIL_FIELDS.select_sql(conn, fields)} "
+                       f"FROM material_forms WHERE id = ?", (form_id,))
         form = cursor.fetchone()
 
         if not form:
-            conn.close()
             return jsonify({"error": "Form not found"}), 404
 
         form_data = dict(form)
 
         # Get form items
-        cursor.execute("""
-            SELECT * FROM material_form_items 
-            WHERE form_id = ? 
-            ORDER BY item_number
-        """, (form_id,))
+        if FieldSelector.wants(fields, 'items'):
+            cursor.execute("""
+                SELECT * FROM material_form_items 
+                WHERE form_id = ? 
+                ORDER BY item_number
+            """, (form_id,))
 
-        items = [dict(row) for row in cursor.fetchall()]
-        form_data['items'] = items
+            items = [dict(row) for row in cursor.fetchall()]
+            form_data['items'] = items
 
-        conn.close()
         return jsonify(form_data)
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error getting material form: {e}")
         return jsonify({"error": str(e)}), 500
@@ -1914,7 +2126,6 @@ def update_material_form(form_id):
         # Check if form exists
         cursor.execute("SELECT id FROM material_forms WHERE id = ?", (form_id,))
         if not cursor.fetchone():
-            conn.close()
             return jsonify({"error": "Form not found"}), 404
 
         # Update form
@@ -1938,7 +2149,6 @@ def update_material_form(form_id):
             cursor.execute(query, params)
             conn.commit()
 
-        conn.close()
         return jsonify({"message": "Material form updated successfully"})
 
     except Exception as e:
@@ -1956,7 +2166,7 @@ def create_quote():
         data = request.get_json()
 
         # Validate required fields
-        required_fields = ['quote_number', 'quote_date', 'items']
+        required_fields = ['quote_date', 'items']
         for field in required_fields:
             if field not in data:
                 return jsonify({"error": f"{field} is required"}), 400
@@ -1964,50 +2174,57 @@ def create_quote():
         if not data['items'] or len(data['items']) == 0:
             return jsonify({"error": "At least one item is required"}), 400
 
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Insert quote
-        cursor.execute("""
-            INSERT INTO repair_quotes (
-                quote_number, vehicle_registration, chassis_number, engine_number,
-                damage_date, quote_date, customer_name, vehicle_make, vehicle_model,
-                vehicle_year, vehicle_color, repair_type, total_amount, tax_amount,
-                discount_amount, final_amount, status, service_id, created_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            data['quote_number'],
-            data.get('vehicle_registration', ''),
-            data.get('chassis_number', ''),
-            data.get('engine_number', ''),
-            data.get('damage_date'),
-            data['quote_date'],
-            data.get('customer_name', ''),
-            data.get('vehicle_make', ''),
-            data.get('vehicle_model', ''),
-            data.get('vehicle_year'),
-            data.get('vehicle_color', ''),
-            data.get('repair_type', 'general'),
-            data.get('total_amount', 0),
-            data.get('tax_amount', 0),
-            data.get('discount_amount', 0),
-            data.get('final_amount', 0),
-            data.get('status', 'new'),
-            data.get('service_id'),
-            datetime.now().isoformat()
-        ))
+        # Insert the quote and its items in one queued write
+        def insert_quote(write_conn):
+            cursor = write_conn.cursor()
 
-        quote_id = cursor.lastrowid
+            # Quotes sent without a number get the next one in the same transaction,
+            # so a failed insert gives it back; a number sent with the quote (usually
+            # the previewed one) moves the sequence past it
+            if data.get('quote_number'):
+                quote_number = document_numbers.record('quote', data['quote_number'], conn=write_conn)
+            else:
+                quote_number = document_numbers.next('quote', conn=write_conn)
 
-        # Insert quote items
-        for item in data['items']:
             cursor.execute("""
+                INSERT INTO repair_quotes (
+                    quote_number, vehicle_registration, chassis_number, engine_number,
+                    damage_date, quote_date, customer_name, vehicle_make, vehicle_model,
+                    vehicle_year, vehicle_color, repair_type, total_amount, tax_amount,
+                    discount_amount, final_amount, status, service_id, created_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                quote_number,
+                data.get('vehicle_registration', ''),
+                data.get('chassis_number', ''),
+                data.get('engine_number', ''),
+                data.get('damage_date'),
+                data['quote_date'],
+                data.get('customer_name', ''),
+                data.get('vehicle_make', ''),
+                data.get('vehicle_model', ''),
+                data.get('vehicle_year'),
+                data.get('vehicle_color', ''),
+                data.get('repair_type', 'general'),
+                data.get('total_amount', 0),
+                data.get('tax_amount', 0),
+                data.get('discount_amount', 0),
+                data.get('final_amount', 0),
+                data.get('status', 'new'),
+                data.get('service_id'),
+                datetime.now().isoformat()
+            ))
+
+            new_quote_id = cursor.lastrowid
+
+            # Insert quote items in one statement
+            cursor.executemany("""
                 INSERT INTO repair_quote_items (
                     quote_id, item_number, part_code, description, color,
                     side, quantity, unit_price, total_price, category
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                quote_id,
+            """, [(
+                new_quote_id,
                 item.get('item_number', 1),
                 item.get('part_code', ''),
                 item.get('description', ''),
@@ -2017,77 +2234,103 @@ def create_quote():
                 item.get('unit_price', 0),
                 item.get('total_price', 0),
                 item.get('category', 'parts')
-            ))
+            ) for item in data['items']])
 
-        conn.commit()
-        conn.close()
+            return new_quote_id, quote_number
+
+        quote_id, quote_number = write_coordinator.run(insert_quote)
 
         return jsonify({
             "message": "Quote created successfully",
             "id": quote_id,
-            "quote_number": data['quote_number']
+            "quote_number": quote_number
         }), 201
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error creating quote: {e}")
         return jsonify({"error": str(e)}), 500
 
 
+QUOTE_LIST_FIELDS = FieldSelector('repair_quotes', 'rq', computed={
+    'item_count': "(SELECT COUNT(*) FROM repair_quote_items rqi WHERE rqi.quote_id = rq.id)",
+})
+
+
 @app.route('/api/quotes', methods=['GET'])
+@conditional_get.etag(tables=['repair_quotes', 'repair_quote_items'])
 def get_quotes():
     """Get all repair quotes"""
     try:
+        page = parse_page_args(request.args)
+        fields = parse_fields(request.args)
+        keyset = Keyset('rq.created_at', 'rq.id')
+
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        cursor.execute("""
-            SELECT rq.*, COUNT(rqi.id) as item_count
+        query, params = keyset.apply(f"""
+            SELECT {QUOTE_LIST_FIELDS.select_sql(conn, fields)}
+                   {keyset.select_sql()}
             FROM repair_quotes rq
-            LEFT JOIN repair_quote_items rqi ON rq.id = rqi.quote_id
-            GROUP BY rq.id
-            ORDER BY rq.created_at DESC
-        """)
+            WHERE 1=1
+        """, [], page)
+        cursor.execute(query, params)
+
+        fmt = stream_format(request)
+        if fmt:
+            return streamed_collection(cursor, 'quotes', fmt, keyset=keyset, limit=page.limit)
 
-        quotes = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        quotes, next_cursor = keyset.page(cursor.fetchall(), page.limit)
 
-        return jsonify({"quotes": quotes})
+        return jsonify({"quotes": quotes, "next_cursor": next_cursor})
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error getting quotes: {e}")
         return jsonify({"error": str(e)}), 500
 
 
+QUOTE_DETAIL_FIELDS = FieldSelector('repair_quotes', derived=['items'])
+
+
 @app.route('/api/quotes/<int:quote_id>', methods=['GET'])
+@conditional_get.etag(tables=['repair_quotes', 'repair_quote_items'])
 def get_quote(quote_id):
     """Get a specific quote with items"""
     try:
+        fields = parse_fields(request.args)
+
         conn = get_db_connection()
         cursor = conn.cursor()
 
         # Get quote details
-        cursor.execute("SELECT * FROM repair_quotes WHERE id = ?", (quote_id,))
+        cursor.execute(f"SELECT {QUOTE_DETAIL_FIELDS.select_sql(conn, fields)} "
+                       f"FROM repair_quotes WHERE id = ?", (quote_id,))
         quote = cursor.fetchone()
 
         if not quote:
-            conn.close()
             return jsonify({"error": "Quote not found"}), 404
 
         quote_data = dict(quote)
 
         # Get quote items
-        cursor.execute("""
-            SELECT * FROM repair_quote_items 
-            WHERE quote_id = ? 
-            ORDER BY item_number
-        """, (quote_id,))
+        if FieldSelector.wants(fields, 'items'):
+            cursor.execute("""
+                SELECT * FROM repair_quote_items 
+                WHERE quote_id = ? 
+                ORDER BY item_number
+            """, (quote_id,))
 
-        items = [dict(row) for row in cursor.fetchall()]
-        quote_data['items'] = items
+            items = [dict(row) for row in cursor.fetchall()]
+            quote_data['items'] = items
 
-        conn.close()
         return jsonify(quote_data)
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error getting quote: {e}")
         return jsonify({"error": str(e)}), 500
@@ -2109,7 +2352,6 @@ def update_quote(quote_id):
         # Check if quote exists
         cursor.execute("SELECT id FROM repair_quotes WHERE id = ?", (quote_id,))
         if not cursor.fetchone():
-            conn.close()
             return jsonify({"error": "Quote not found"}), 404
 
         # Update quote
@@ -2136,7 +2378,6 @@ def update_quote(quote_id):
             cursor.execute(query, params)
             conn.commit()
 
-        conn.close()
         return jsonify({"message": "Quote updated successfully"})
 
     except Exception as e:
@@ -2146,49 +2387,29 @@ def update_quote(quote_id):
 
 @app.route('/api/quotes/generate-number', methods=['GET'])
 def generate_quote_number():
-    """Generate a new quote number"""
+    """Preview the next quote number"""
     try:
         # Convert to integers since request.args.get() returns strings
         year = int(request.args.get('year', datetime.now().year))
         month = int(request.args.get('month', datetime.now().month))
 
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Get the last quote number for the given year/month
-        cursor.execute("""
-                SELECT quote_number FROM repair_quotes 
-                WHERE quote_number LIKE ?
-                ORDER BY created_at DESC 
-                LIMIT 1
-            """, (f"Q{str(year)[2:]}{month:02d}%",))
-
-        result = cursor.fetchone()
-        conn.close()
-
-        if result:
-            # Extract the sequence number and increment
-            last_number = result['quote_number']
-            try:
-                sequence = int(last_number[-4:]) + 1
-            except (ValueError, IndexError):
-                sequence = 1
-        else:
-            sequence = 1
-
-        # Generate new quote number
-        quote_number = f"Q{str(year)[2:]}{month:02d}{sequence:04d}"
+        # Only a preview: the number is allocated when the quote is inserted,
+        # so opening the form does not burn a number
+        quote_number = document_numbers.preview('quote', when=datetime(year, month, 1))
 
         return jsonify({
             "quote_number": quote_number
         })
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error generating quote number: {e}")
         return jsonify({"error": str(e)}), 500
 
 
 @app.route('/api/truck-parts', methods=['GET'])
+@conditional_get.etag(tables=['truck_parts_inventory'])
 def get_truck_parts():
     """Get truck parts inventory"""
     try:
@@ -2206,16 +2427,16 @@ def get_truck_parts():
             params.append(category)
 
         if search:
-            query += " AND (part_name_thai LIKE ? OR part_name_english LIKE ? OR part_code LIKE ?)"
-            search_param = f"%{search}%"
-            params.extend([search_param, search_param, search_param])
+            # Substring match on names and code via the in-memory parts index
+            part_ids = parts_index.match_ids(conn, search)
+            query += f" AND id IN ({', '.join('?' for _ in part_ids) or 'NULL'})"
+            params.extend(part_ids)
 
         query += " ORDER BY part_name_thai"
 
         cursor.execute(query, params)
         parts = [dict(row) for row in cursor.fetchall()]
 
-        conn.close()
         return jsonify({"parts": parts})
 
     except Exception as e:
@@ -2223,7 +2444,32 @@ def get_truck_parts():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/api/truck-parts/suggest', methods=['GET'])
+def suggest_truck_parts():
+    """Top matching parts for the quote editor's type-ahead"""
+    try:
+        query = request.args.get('q', '').strip()
+        limit = request.args.get('limit', 10, type=int)
+        category = request.args.get('category')
+
+        if not query:
+            return jsonify({"suggestions": [], "total": 0})
+
+        conn = get_db_connection()
+        suggestions = parts_index.suggest(conn, query, limit=limit, category=category)
+
+        return jsonify({
+            "suggestions": suggestions,
+            "total": len(suggestions)
+        })
+
+    except Exception as e:
+        logger.error(f"Error suggesting truck parts: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
 @app.route('/api/truck-parts/<int:part_id>', methods=['GET'])
+@conditional_get.etag(tables=['truck_parts_inventory'])
 def get_truck_part(part_id):
     """Get a specific truck part"""
     try:
@@ -2234,10 +2480,8 @@ def get_truck_part(part_id):
         part = cursor.fetchone()
 
         if not part:
-            conn.close()
             return jsonify({"error": "Part not found"}), 404
 
-        conn.close()
         return jsonify(dict(part))
 
     except Exception as e:
@@ -2288,7 +2532,9 @@ def add_truck_part():
         cursor.execute("SELECT * FROM truck_parts_inventory WHERE id = ?", (part_id,))
         new_part = dict(cursor.fetchone())
 
-        conn.close()
+        # Key the new part now rather than on the next suggestion request
+        parts_index.refresh(conn)
+
         return jsonify({
             "message": "Part added successfully",
             "part": new_part
@@ -2306,6 +2552,7 @@ def add_truck_part():
 # =============================================================================
 
 @app.route('/api/settings', methods=['GET'])
+@conditional_get.etag(tables=['settings'])
 def get_settings():
     """Get application settings"""
     try:
@@ -2320,7 +2567,6 @@ def get_settings():
             cursor.execute("SELECT * FROM settings ORDER BY category, key")
 
         settings = [dict(row) for row in cursor.fetchall()]
-        conn.close()
 
         return jsonify({"settings": settings})
 
@@ -2358,7 +2604,6 @@ def update_setting():
         ))
 
         conn.commit()
-        conn.close()
 
         return jsonify({"message": "Setting updated successfully"})
 
@@ -2371,20 +2616,31 @@ def update_setting():
 # DAMAGE REPORTS API
 # =============================================================================
 
+DAMAGE_REPORT_FIELDS = FieldSelector('damage_reports', 'dr', computed={
+    'customer_name': "c.name",
+    'vehicle_info': "v.make || ' ' || v.model",
+    # Points are rows of damage_points; the API keeps returning them as a JSON array
+    'damage_points': damage_points.points_json_sql('dr'),
+})
+
+
 @app.route('/api/damage-reports', methods=['GET'])
+@conditional_get.etag(tables=['damage_reports', 'damage_points', 'customers', 'vehicles'])
 def get_damage_reports():
     """Get all damage reports"""
     try:
         customer_id = request.args.get('customer_id')
         vehicle_id = request.args.get('vehicle_id')
+        page = parse_page_args(request.args)
+        fields = parse_fields(request.args)
+        keyset = Keyset('dr.created_at', 'dr.id')
 
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        query = """
-                SELECT dr.*, 
-                       c.name as customer_name,
-                       v.make || ' ' || v.model as vehicle_info
+        query = f"""
+                SELECT {DAMAGE_REPORT_FIELDS.select_sql(conn, fields)}
+                       {keyset.select_sql()}
                 FROM damage_reports dr
                 LEFT JOIN customers c ON dr.customer_id = c.id
                 LEFT JOIN vehicles v ON dr.vehicle_id = v.id
@@ -2400,14 +2656,19 @@ def get_damage_reports():
             query += " AND dr.vehicle_id = ?"
             params.append(vehicle_id)
 
-        query += " ORDER BY dr.created_at DESC"
-
+        query, params = keyset.apply(query, params, page)
         cursor.execute(query, params)
-        reports = [dict(row) for row in cursor.fetchall()]
 
-        conn.close()
-        return jsonify({"reports": reports})
+        fmt = stream_format(request)
+        if fmt:
+            return streamed_collection(cursor, 'reports', fmt, keyset=keyset, limit=page.limit)
+
+        reports, next_cursor = keyset.page(cursor.fetchall(), page.limit)
+
+        return jsonify({"reports": reports, "next_cursor": next_cursor})
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error getting damage reports: {e}")
         return jsonify({"error": str(e)}), 500
@@ -2431,27 +2692,30 @@ def create_damage_report():
         cursor = conn.cursor()
 
         cursor.execute("""
-                INSERT INTO damage_reports (customer_id, vehicle_id, vehicle_type, damage_points, 
+                INSERT INTO damage_reports (customer_id, vehicle_id, vehicle_type,
                                           total_estimated_cost, notes, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                VALUES (?, ?, ?, ?, ?, ?)
             """, (
             data['customer_id'],
             data['vehicle_id'],
             data['vehicle_type'],
-            json.dumps(data.get('damage_points', [])),
-            data.get('total_estimated_cost', 0.0),
+            0.0,
             data.get('notes', ''),
             data.get('status', 'active')
         ))
 
         report_id = cursor.lastrowid
+
+        # The points add their costs to the report total; an explicit total wins
+        damage_points.insert_points(conn, report_id, data.get('damage_points') or [])
+        if 'total_estimated_cost' in data:
+            cursor.execute("UPDATE damage_reports SET total_estimated_cost = ? WHERE id = ?",
+                           (data['total_estimated_cost'], report_id))
         conn.commit()
 
         # Get the created report
-        cursor.execute("""
-                SELECT dr.*, 
-                       c.name as customer_name,
-                       v.make || ' ' || v.model as vehicle_info
+        cursor.execute(f"""
+                SELECT {DAMAGE_REPORT_FIELDS.select_sql(conn, None)}
                 FROM damage_reports dr
                 LEFT JOIN customers c ON dr.customer_id = c.id
                 LEFT JOIN vehicles v ON dr.vehicle_id = v.id
@@ -2460,28 +2724,30 @@ def create_damage_report():
 
         new_report = dict(cursor.fetchone())
 
-        conn.close()
         return jsonify({
             "message": "Damage report created successfully",
             "report": new_report
         }), 201
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error creating damage report: {e}")
         return jsonify({"error": str(e)}), 500
 
 
 @app.route('/api/damage-reports/<int:report_id>', methods=['GET'])
+@conditional_get.etag(tables=['damage_reports', 'damage_points', 'customers', 'vehicles'])
 def get_damage_report(report_id):
     """Get a specific damage report"""
     try:
+        fields = parse_fields(request.args)
+
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        cursor.execute("""
-                SELECT dr.*, 
-                       c.name as customer_name,
-                       v.make || ' ' || v.model as vehicle_info
+        cursor.execute(f"""
+                SELECT {DAMAGE_REPORT_FIELDS.select_sql(conn, fields)}
                 FROM damage_reports dr
                 LEFT JOIN customers c ON dr.customer_id = c.id
                 LEFT JOIN vehicles v ON dr.vehicle_id = v.id
@@ -2491,21 +2757,18 @@ def get_damage_report(report_id):
         report = cursor.fetchone()
 
         if not report:
-            conn.close()
             return jsonify({"error": "Damage report not found"}), 404
 
         report_data = dict(report)
 
-        # Parse damage_points JSON
-        if report_data['damage_points']:
-            try:
-                report_data['damage_points'] = json.loads(report_data['damage_points'])
-            except json.JSONDecodeError:
-                report_data['damage_points'] = []
+        # damage_points comes from json_group_array, so it is always a valid array
+        if 'damage_points' in report_data:
+            report_data['damage_points'] = json.loads(report_data['damage_points'])
 
-        conn.close()
         return jsonify(report_data)
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error getting damage report: {e}")
         return jsonify({"error": str(e)}), 500
@@ -2526,17 +2789,16 @@ def update_damage_report(report_id):
         # Check if report exists
         cursor.execute("SELECT id FROM damage_reports WHERE id = ?", (report_id,))
         if not cursor.fetchone():
-            conn.close()
             return jsonify({"error": "Damage report not found"}), 404
 
+        # Replacing the points adjusts the total; an explicit total below wins
+        if 'damage_points' in data:
+            damage_points.replace_points(conn, report_id, data['damage_points'] or [])
+
         # Update report
         update_fields = []
         params = []
 
-        if 'damage_points' in data:
-            update_fields.append("damage_points = ?")
-            params.append(json.dumps(data['damage_points']))
-
         if 'total_estimated_cost' in data:
             update_fields.append("total_estimated_cost = ?")
             params.append(data['total_estimated_cost'])
@@ -2549,7 +2811,7 @@ def update_damage_report(report_id):
             update_fields.append("status = ?")
             params.append(data['status'])
 
-        if update_fields:
+        if update_fields or 'damage_points' in data:
             update_fields.append("updated_at = ?")
             params.append(datetime.now().isoformat())
 
@@ -2558,91 +2820,89 @@ def update_damage_report(report_id):
             cursor.execute(query, params)
             conn.commit()
 
-        conn.close()
         return jsonify({"message": "Damage report updated successfully"})
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error updating damage report: {e}")
         return jsonify({"error": str(e)}), 500
 
 
 # =============================================================================
-# STATISTICS AND DASHBOARD API
+# DAMAGE ANALYTICS API
 # =============================================================================
 
-@app.route('/api/dashboard/stats', methods=['GET'])
-def get_dashboard_stats():
-    """Get dashboard statistics"""
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        stats = {}
+_template_manager = None
 
-        # Customer stats
-        cursor.execute("SELECT COUNT(*) FROM customers")
-        stats['total_customers'] = cursor.fetchone()[0]
 
-        # Vehicle stats
-        cursor.execute("SELECT COUNT(*) FROM vehicles")
-        stats['total_vehicles'] = cursor.fetchone()[0]
+def get_template_manager():
+    """Vehicle template manager, created on first use"""
+    global _template_manager
+    if _template_manager is None:
+        from services.vehicle_templates import VehicleTemplateManager
+        _template_manager = VehicleTemplateManager(os.path.join(app.root_path, 'assets', 'vehicle_templates'))
+    return _template_manager
 
-        cursor.execute("SELECT COUNT(*) FROM vehicles WHERE vehicle_type = 'truck'")
-        stats['total_trucks'] = cursor.fetchone()[0]
 
-        # Service stats
-        cursor.execute("SELECT COUNT(*) FROM services")
-        stats['total_services'] = cursor.fetchone()[0]
+@app.route('/api/damage-analytics/heatmap', methods=['GET'])
+@conditional_get.etag(tables=['damage_points', 'damage_reports'])
+def get_damage_heatmap():
+    """Damage hotspot grid for a vehicle type and view, as JSON counts or a PNG overlay
 
-        cursor.execute("SELECT COUNT(*) FROM services WHERE status = 'pending'")
-        stats['pending_services'] = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM services WHERE status = 'in_progress'")
-        stats['active_services'] = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM services WHERE status = 'completed'")
-        stats['completed_services'] = cursor.fetchone()[0]
-
-        # Truck repair stats
-        cursor.execute("SELECT COUNT(*) FROM services WHERE service_type = 'truck_repair'")
-        stats['truck_repair_services'] = cursor.fetchone()[0]
+    Without vehicle_type, lists the (vehicle_type, view) pairs that have points.
+    """
+    try:
+        conn = get_db_connection()
+        vehicle_type = request.args.get('vehicle_type')
+        if not vehicle_type:
+            return jsonify({"heatmaps": damage_heatmap.list_heatmaps(conn)})
 
-        cursor.execute("SELECT COUNT(*) FROM material_forms")
-        stats['material_forms'] = cursor.fetchone()[0]
+        view = request.args.get('view', 'side')
+        bins = request.args.get('bins', damage_heatmap.HEATMAP_BINS, type=int)
+        grid = damage_heatmap.load_grid(conn, vehicle_type, view, bins)
 
-        cursor.execute("SELECT COUNT(*) FROM repair_quotes")
-        stats['repair_quotes'] = cursor.fetchone()[0]
+        if request.args.get('format') == 'png':
+            from services.heatmap_renderer import render_overlay
+            template_path = get_template_manager().get_template_path(vehicle_type.lower(), view)
+            png = render_overlay(grid, str(template_path) if template_path else None,
+                                 width=request.args.get('width', type=int))
+            return app.response_class(png, mimetype='image/png')
 
-        # Photo stats
-        cursor.execute("SELECT COUNT(*) FROM vehicle_photos")
-        stats['total_photos'] = cursor.fetchone()[0]
+        return jsonify({
+            "success": True,
+            "vehicle_type": vehicle_type,
+            "view": view,
+            "bins": bins,
+            "total": int(grid.sum()),
+            "max": int(grid.max()),
+            "counts": grid.tolist()  # rows are y, columns x
+        })
 
-        cursor.execute("SELECT COUNT(*) FROM photo_sessions")
-        stats['photo_sessions'] = cursor.fetchone()[0]
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error building damage heatmap: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
 
-        # Revenue stats
-        cursor.execute("SELECT SUM(actual_cost) FROM services WHERE status = 'completed'")
-        result = cursor.fetchone()[0]
-        stats['total_revenue'] = result if result else 0
 
-        cursor.execute("SELECT SUM(final_amount) FROM repair_quotes WHERE status = 'approved'")
-        result = cursor.fetchone()[0]
-        stats['quote_revenue'] = result if result else 0
+# =============================================================================
+# STATISTICS AND DASHBOARD API
+# =============================================================================
 
-        # Recent activity
-        cursor.execute("""
-                SELECT COUNT(*) FROM services 
-                WHERE created_at >= datetime('now', '-7 days')
-            """)
-        stats['services_this_week'] = cursor.fetchone()[0]
+@app.route('/api/dashboard/stats', methods=['GET'])
+@conditional_get.etag(tables=['customers', 'vehicles', 'services', 'material_forms', 'repair_quotes',
+                                 'vehicle_photos', 'photo_sessions'], period=60)
+@response_cache.cached(tables=['customers', 'vehicles', 'services', 'material_forms', 'repair_quotes',
+                               'vehicle_photos', 'photo_sessions'])
+def get_dashboard_stats():
+    """Get dashboard statistics"""
+    try:
+        conn = get_db_connection()
 
-        cursor.execute("""
-                SELECT COUNT(*) FROM customers 
-                WHERE created_at >= datetime('now', '-30 days')
-            """)
-        stats['new_customers_this_month'] = cursor.fetchone()[0]
+        # Counters are kept current by triggers (database/stat_counters.py)
+        stats = stat_counters.get_dashboard_stats(conn)
 
-        conn.close()
         return jsonify({"stats": stats})
 
     except Exception as e:
@@ -2651,6 +2911,8 @@ def get_dashboard_stats():
 
 
 @app.route('/api/dashboard/recent-activity', methods=['GET'])
+@conditional_get.etag(tables=['services', 'customers', 'vehicles', 'repair_quotes', 'material_forms'])
+@response_cache.cached(tables=['services', 'customers', 'vehicles', 'repair_quotes', 'material_forms'])
 def get_recent_activity():
     """Get recent activity for dashboard"""
     try:
@@ -2689,7 +2951,6 @@ def get_recent_activity():
 
         recent_forms = [dict(row) for row in cursor.fetchall()]
 
-        conn.close()
         return jsonify({
             "recent_services": recent_services,
             "recent_quotes": recent_quotes,
@@ -2705,7 +2966,16 @@ def get_recent_activity():
 # ENHANCED PAYMENT MANAGEMENT API
 # =============================================================================
 
+PAYMENT_LIST_FIELDS = FieldSelector('payments', 'p', computed={
+    'customer_name': "COALESCE(c.first_name || ' ' || c.last_name, c.first_name, 'Unknown')",
+    'service_type': "s.service_type",
+    'service_description': "s.description",
+    'vehicle_info': "v.make || ' ' || v.model",
+})
+
+
 @app.route('/api/payments', methods=['GET'])
+@conditional_get.etag(tables=['payments', 'customers', 'services', 'vehicles'])
 def get_payments():
     """Get all payments with enhanced filtering"""
     try:
@@ -2714,15 +2984,16 @@ def get_payments():
         payment_method = request.args.get('payment_method')
         date_from = request.args.get('date_from')
         date_to = request.args.get('date_to')
+        page = parse_page_args(request.args)
+        fields = parse_fields(request.args)
+        keyset = Keyset('p.created_at', 'p.id')
 
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        query = """
-            SELECT p.*, 
-                   COALESCE(c.first_name || ' ' || c.last_name, c.first_name, 'Unknown') as customer_name,
-                   s.service_type, s.description as service_description,
-                   v.make || ' ' || v.model as vehicle_info
+        query = f"""
+            SELECT {PAYMENT_LIST_FIELDS.select_sql(conn, fields)}
+                   {keyset.select_sql()}
             FROM payments p
             LEFT JOIN customers c ON p.customer_id = c.id
             LEFT JOIN services s ON p.service_id = s.id
@@ -2751,13 +3022,19 @@ def get_payments():
             query += " AND DATE(p.created_at) <= ?"
             params.append(date_to)
 
-        query += " ORDER BY p.created_at DESC"
-
+        query, params = keyset.apply(query, params, page)
         cursor.execute(query, params)
-        payments = [dict(row) for row in cursor.fetchall()]
-        conn.close()
 
-        return jsonify({"success": True, "payments": payments})
+        fmt = stream_format(request)
+        if fmt:
+            return streamed_collection(cursor, 'payments', fmt, keyset=keyset, limit=page.limit,
+                                       head={"success": True})
+
+        payments, next_cursor = keyset.page(cursor.fetchall(), page.limit)
+
+        return jsonify({"success": True, "payments": payments, "next_cursor": next_cursor})
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error getting payments: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
@@ -2775,49 +3052,55 @@ def create_payment():
             if field not in data:
                 return jsonify({"success": False, "error": f"{field} is required"}), 400
 
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Generate receipt number
         now = datetime.now()
-        receipt_number = f"REC-{now.strftime('%Y%m%d')}-{now.strftime('%H%M%S')}"
 
-        cursor.execute("""
-            INSERT INTO payments (
-                service_id, customer_id, vehicle_id, payment_method,
-                amount, fees, total_amount, status, processed_date, receipt_number, notes
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            data['service_id'],
-            data['customer_id'],
-            data.get('vehicle_id'),
-            data['payment_method'],
-            data['amount'],
-            data.get('fees', 0.0),
-            data['total_amount'],
-            'completed',
-            now.isoformat(),
-            receipt_number,
-            data.get('notes', '')
-        ))
+        # Insert the payment and update the service in one queued write
+        def insert_payment(write_conn):
+            cursor = write_conn.cursor()
 
-        payment_id = cursor.lastrowid
+            # Numbers are allocated in the same transaction, so a failed insert gives them back
+            payment_number = document_numbers.next('payment', now, conn=write_conn)
+            receipt_number = document_numbers.next('receipt', now, conn=write_conn)
 
-        # Update service status if payment is complete
-        if data.get('update_service_status', True):
             cursor.execute("""
-                UPDATE services 
-                SET status = 'completed', actual_cost = ?, completed_date = ?
-                WHERE id = ?
-            """, (data['total_amount'], now.isoformat(), data['service_id']))
+                INSERT INTO payments (
+                    payment_number, service_id, customer_id, vehicle_id, payment_method,
+                    amount, fees, total_amount, status, processed_date, receipt_number, notes
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                payment_number,
+                data['service_id'],
+                data['customer_id'],
+                data.get('vehicle_id'),
+                data['payment_method'],
+                data['amount'],
+                data.get('fees', 0.0),
+                data['total_amount'],
+                'completed',
+                now.isoformat(),
+                receipt_number,
+                data.get('notes', '')
+            ))
 
-        conn.commit()
-        conn.close()
+            new_payment_id = cursor.lastrowid
+
+            # Update service status if payment is complete
+            if data.get('update_service_status', True):
+                cursor.execute("""
+                    UPDATE services 
+                    SET status = 'completed', actual_cost = ?, completed_date = ?
+                    WHERE id = ?
+                """, (data['total_amount'], now.isoformat(), data['service_id']))
+
+            return new_payment_id, payment_number, receipt_number
+
+        payment_id, payment_number, receipt_number = write_coordinator.run(insert_payment)
 
         return jsonify({
             "success": True,
             "message": "Payment created successfully",
             "payment_id": payment_id,
+            "payment_number": payment_number,
             "receipt_number": receipt_number
         }), 201
 
@@ -2827,6 +3110,7 @@ def create_payment():
 
 
 @app.route('/api/payments/pending-services', methods=['GET'])
+@conditional_get.etag(tables=['services', 'customers', 'vehicles', 'payments'])
 def get_pending_services():
     """Get services that need payment"""
     try:
@@ -2847,7 +3131,6 @@ def get_pending_services():
         """)
 
         services = [dict(row) for row in cursor.fetchall()]
-        conn.close()
 
         return jsonify({
             "success": True,
@@ -2860,37 +3143,15 @@ def get_pending_services():
 
 
 @app.route('/api/payments/statistics', methods=['GET'])
+@conditional_get.etag(tables=['payments', 'services'], period=60)
+@response_cache.cached(tables=['payments', 'services'])
 def get_payment_statistics():
     """Get payment statistics for dashboard"""
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        stats = {}
-
-        # Today's revenue
-        cursor.execute("""
-            SELECT SUM(total_amount) FROM payments 
-            WHERE DATE(created_at) = DATE('now') AND status = 'completed'
-        """)
-        result = cursor.fetchone()[0]
-        stats['today_revenue'] = result or 0
-
-        # This month's revenue
-        cursor.execute("""
-            SELECT SUM(total_amount) FROM payments 
-            WHERE strftime('%Y-%m', created_at) = strftime('%Y-%m', 'now') 
-            AND status = 'completed'
-        """)
-        result = cursor.fetchone()[0]
-        stats['month_revenue'] = result or 0
-
-        # Payment count today
-        cursor.execute("""
-            SELECT COUNT(*) FROM payments 
-            WHERE DATE(created_at) = DATE('now')
-        """)
-        stats['payments_today'] = cursor.fetchone()[0]
+        stats = stat_counters.get_payment_statistics(conn)
 
         # Pending payments
         cursor.execute("""
@@ -2909,7 +3170,6 @@ def get_payment_statistics():
         """)
         stats['payment_methods'] = [dict(row) for row in cursor.fetchall()]
 
-        conn.close()
         return jsonify({
             "success": True,
             "statistics": stats
@@ -2939,7 +3199,6 @@ def get_insurance_claims():
         """)
 
         claims = [dict(row) for row in cursor.fetchall()]
-        conn.close()
 
         return jsonify({"success": True, "claims": claims})
     except Exception as e:
@@ -2947,6 +3206,64 @@ def get_insurance_claims():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@app.route('/api/insurance-claims', methods=['POST'])
+def create_insurance_claim():
+    """Create an insurance claim with the next claim number"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"success": False, "error": "No data provided"}), 400
+
+        required_fields = ['customer_id', 'vehicle_id', 'insurance_company']
+        for field in required_fields:
+            if not data.get(field):
+                return jsonify({"success": False, "error": f"Missing required field: {field}"}), 400
+
+        now = datetime.now()
+
+        def insert_claim(write_conn):
+            claim_number = document_numbers.next('claim', now, conn=write_conn)
+            cursor = write_conn.execute("""
+                INSERT INTO insurance_claims (
+                    claim_number, service_id, customer_id, vehicle_id, insurance_company,
+                    policy_number, claim_type, incident_date, incident_location,
+                    incident_description, police_report_number, claim_amount, deductible,
+                    status, submitted_date, notes
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                claim_number,
+                data.get('service_id'),
+                data['customer_id'],
+                data['vehicle_id'],
+                data['insurance_company'],
+                data.get('policy_number', ''),
+                data.get('claim_type', 'repair'),
+                data.get('incident_date'),
+                data.get('incident_location', ''),
+                data.get('incident_description', ''),
+                data.get('police_report_number', ''),
+                data.get('claim_amount', 0.0),
+                data.get('deductible', 0.0),
+                data.get('status', 'pending'),
+                now.isoformat(),
+                data.get('notes', '')
+            ))
+            return cursor.lastrowid, claim_number
+
+        claim_id, claim_number = write_coordinator.run(insert_claim)
+
+        return jsonify({
+            "success": True,
+            "message": "Insurance claim created successfully",
+            "claim_id": claim_id,
+            "claim_number": claim_number
+        }), 201
+
+    except Exception as e:
+        logger.error(f"Error creating insurance claim: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 # Installment Plans endpoints
 @app.route('/api/installment-plans', methods=['GET'])
 def get_installment_plans():
@@ -2966,7 +3283,6 @@ def get_installment_plans():
         """)
 
         plans = [dict(row) for row in cursor.fetchall()]
-        conn.close()
 
         return jsonify({"success": True, "installment_plans": plans})
     except Exception as e:
@@ -2996,7 +3312,6 @@ def get_appointments():
         """, (date,))
 
         appointments = [dict(row) for row in cursor.fetchall()]
-        conn.close()
 
         return jsonify({"success": True, "appointments": appointments})
     except Exception as e:
@@ -3024,7 +3339,6 @@ def get_users():
 
         cursor.execute(query, params)
         users = [dict(row) for row in cursor.fetchall()]
-        conn.close()
 
         return jsonify({"success": True, "users": users})
     except Exception as e:
@@ -3052,7 +3366,6 @@ def get_work_orders():
         """)
 
         work_orders = [dict(row) for row in cursor.fetchall()]
-        conn.close()
 
         return jsonify({"success": True, "work_orders": work_orders})
     except Exception as e:
@@ -3090,7 +3403,6 @@ def get_estimates():
         """)
 
         estimates = [dict(row) for row in cursor.fetchall()]
-        conn.close()
 
         return jsonify({"success": True, "estimates": estimates})
     except Exception as e:
@@ -3117,7 +3429,6 @@ def get_invoices():
         """)
 
         invoices = [dict(row) for row in cursor.fetchall()]
-        conn.close()
 
         return jsonify({"success": True, "invoices": invoices})
     except Exception as e:
@@ -3143,7 +3454,6 @@ def get_warranties():
         """)
 
         warranties = [dict(row) for row in cursor.fetchall()]
-        conn.close()
 
         return jsonify({"success": True, "warranties": warranties})
     except Exception as e:
@@ -3169,7 +3479,6 @@ def get_inspections():
         """)
 
         inspections = [dict(row) for row in cursor.fetchall()]
-        conn.close()
 
         return jsonify({"success": True, "inspections": inspections})
     except Exception as e:
@@ -3195,7 +3504,6 @@ def get_quality_checks():
         """)
 
         quality_checks = [dict(row) for row in cursor.fetchall()]
-        conn.close()
 
         return jsonify({"success": True, "quality_checks": quality_checks})
     except Exception as e:
@@ -3222,6 +3530,87 @@ def get_repair_quotes_alt():
         logger.error(f"Error getting repair quotes: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
+# =============================================================================
+# DATABASE ADMINISTRATION API
+# =============================================================================
+
+@app.route('/api/admin/database/pragmas', methods=['GET'])
+def get_database_pragmas():
+    """Report the configured PRAGMA profile and the values in effect"""
+    try:
+        return jsonify({
+            "success": True,
+            "profile": db_manager.pragma_profile,
+            "configured": db_manager.connection_pool.pragmas,
+            "effective": db_manager.get_effective_pragmas(),
+            "pool": db_manager.get_pool_stats()
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting database pragmas: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route('/api/admin/database/write-queue', methods=['GET'])
+def get_write_queue_stats():
+    """Report single-writer queue depth, batching and lock wait metrics"""
+    try:
+        return jsonify({
+            "success": True,
+            "write_queue": write_coordinator.get_stats()
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting write queue stats: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route('/api/admin/stat-counters/reconcile', methods=['POST'])
+def reconcile_stat_counters():
+    """Recount the statistics counters and repair any drift (?dry_run=true to only report)"""
+    try:
+        dry_run = request.args.get('dry_run', 'false').lower() == 'true'
+        drift = stat_counters.reconcile(dry_run=dry_run)
+        return jsonify({
+            "success": True,
+            "dry_run": dry_run,
+            "drifted": len(drift),
+            "drift": drift
+        })
+
+    except Exception as e:
+        logger.error(f"Error reconciling stat counters: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route('/api/admin/response-cache', methods=['GET'])
+def get_response_cache_stats():
+    """Report response cache hits, misses and coalesced requests, and ETag 304s"""
+    try:
+        return jsonify({
+            "success": True,
+            "response_cache": response_cache.get_stats(),
+            "conditional_get": conditional_get.get_stats(),
+            "compression": compressor.get_stats()
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting response cache stats: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route('/api/admin/response-cache', methods=['DELETE'])
+def clear_response_cache():
+    """Drop every cached response"""
+    try:
+        response_cache.clear()
+        return jsonify({"success": True})
+
+    except Exception as e:
+        logger.error(f"Error clearing response cache: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 # =============================================================================
 # HEALTH CHECK AND ERROR HANDLERS
 # =============================================================================
@@ -3234,7 +3623,6 @@ def health_check():
         conn = get_db_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT 1")
-        conn.close()
 
         return jsonify({
             "status": "healthy",
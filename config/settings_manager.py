@@ -12,6 +12,52 @@ from typing import Dict, List, Any, Optional, Union
 from dotenv import load_dotenv
 
 
+# Named SQLite PRAGMA profiles applied to every new database connection.
+# Select one with [database] pragma_profile; individual values can be
+# overridden with [database] pragma_<name> keys.
+DATABASE_PRAGMA_PROFILES = {
+    'pos-default': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,  # 16MB (negative values are KiB)
+        'mmap_size': 134217728,  # 128MB
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,  # ms
+    },
+    'bulk-load': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -65536,  # 64MB
+        'mmap_size': 268435456,  # 256MB
+        'temp_store': 'MEMORY',
+        'busy_timeout': 30000,
+    },
+    'read-replica': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -32000,  # 32MB
+        'mmap_size': 268435456,  # 256MB
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+        'query_only': 'ON',
+    },
+}
+
+# Allowed values for each supported PRAGMA (int means any integer)
+DATABASE_PRAGMA_VALUES = {
+    'journal_mode': ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'),
+    'synchronous': ('OFF', 'NORMAL', 'FULL', 'EXTRA'),
+    'cache_size': int,
+    'mmap_size': int,
+    'temp_store': ('DEFAULT', 'FILE', 'MEMORY'),
+    'busy_timeout': int,
+    'query_only': ('ON', 'OFF'),
+}
+
+# PRAGMAs applied to reader connections only (not the writer or migrations)
+READER_ONLY_PRAGMAS = ('query_only',)
+
+
 class SettingsManager:
     """Centralized settings management for the POS system"""
 
@@ -38,7 +84,8 @@ class SettingsManager:
                 'path': 'data/ol_service_pos.db',
                 'backup_enabled': 'true',
                 'backup_interval': '24',  # hours
-                'max_backups': '7'
+                'max_backups': '7',
+                'pragma_profile': 'pos-default'
             },
             'ui': {
                 'theme': 'default',
@@ -207,6 +254,16 @@ class SettingsManager:
         else:
             db_errors.append("Database path not specified")
 
+        profile = self.get('database', 'pragma_profile', 'pos-default')
+        if profile not in DATABASE_PRAGMA_PROFILES:
+            db_errors.append(f"Unknown database pragma profile: {profile}")
+
+        for key in self.config.options('database'):
+            if key.startswith('pragma_') and key != 'pragma_profile':
+                name = key[len('pragma_'):]
+                if _normalize_pragma_value(name, self.get('database', key)) is None:
+                    db_errors.append(f"Invalid value for {key}")
+
         if db_errors:
             errors['database'] = db_errors
 
@@ -260,6 +317,23 @@ class SettingsManager:
 
         return errors
 
+    def get_database_pragmas(self, profile: Optional[str] = None) -> Dict[str, Any]:
+        """Get the PRAGMA values for a profile with [database] overrides applied"""
+        profile = profile or self.get('database', 'pragma_profile', 'pos-default')
+        if profile not in DATABASE_PRAGMA_PROFILES:
+            raise ValueError(f"Unknown database pragma profile: {profile} "
+                             f"(expected one of {', '.join(DATABASE_PRAGMA_PROFILES)})")
+        pragmas = dict(DATABASE_PRAGMA_PROFILES[profile])
+
+        for key in self.config.options('database'):
+            if key.startswith('pragma_') and key != 'pragma_profile':
+                name = key[len('pragma_'):]
+                value = _normalize_pragma_value(name, self.get('database', key))
+                if value is not None:
+                    pragmas[name] = value
+
+        return pragmas
+
     def get_validation_summary(self) -> str:
         """Get a human-readable summary of validation results"""
         if not self.validation_errors:
@@ -315,6 +389,7 @@ class SettingsManager:
 # Database Settings
 DATABASE_PATH=data/ol_service_pos.db
 DATABASE_BACKUP_ENABLED=true
+DB_PRAGMA_PROFILE=pos-default
 
 # UI Settings
 UI_THEME=default
@@ -344,6 +419,23 @@ CHECK_UPDATES=true
             return False
 
 
+def _normalize_pragma_value(name: str, value: Any) -> Any:
+    """Validate a PRAGMA value, returning None if the name or value is not allowed"""
+    allowed = DATABASE_PRAGMA_VALUES.get(name)
+    if allowed is None:
+        return None
+
+    if allowed is int:
+        if isinstance(value, bool) or not isinstance(value, int):
+            return None
+        return value
+
+    if isinstance(value, bool):
+        value = 'ON' if value else 'OFF'
+    value = str(value).upper()
+    return value if value in allowed else None
+
+
 def get_ui_theme() -> str:
     """Get the current UI theme"""
     return settings_manager.get('ui', 'theme', 'default')
@@ -371,6 +463,16 @@ def get_database_path() -> str:
     return settings_manager.get('database', 'path', 'data/ol_service_pos.db')
 
 
+def get_database_pragma_profile() -> str:
+    """Get the active database PRAGMA profile name"""
+    return os.getenv('DB_PRAGMA_PROFILE') or settings_manager.get('database', 'pragma_profile', 'pos-default')
+
+
+def get_database_pragmas() -> Dict[str, Any]:
+    """Get the PRAGMA values to apply to new database connections"""
+    return settings_manager.get_database_pragmas(get_database_pragma_profile())
+
+
 def is_backup_enabled() -> bool:
     """Check if automatic backup is enabled"""
     return settings_manager.get('system', 'auto_backup', True)
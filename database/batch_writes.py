@@ -0,0 +1,77 @@
+# database/batch_writes.py
+"""
+Many inserts in one request and one commit
+
+run_batch() sends a whole list of items through the write coordinator as a
+single job, so they share one BEGIN IMMEDIATE transaction and one commit.
+Each item runs inside its own savepoint: an item that fails validation or
+hits a constraint is rolled back and reported, while the rest are kept. With
+atomic=True the first failure rolls back the whole batch instead.
+
+    results = run_batch(items, insert_customer, atomic=False)
+    # [{'index': 0, 'success': True, 'id': 12}, {'index': 1, 'success': False, 'error': '...'}]
+"""
+
+import sqlite3
+import logging
+from typing import Any, Callable, Dict, List
+
+from database.write_coordinator import write_coordinator
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_ITEMS = 500
+
+
+class BatchItemError(Exception):
+    """An item of an atomic batch failed; nothing was written"""
+
+    def __init__(self, index: int, error: Exception):
+        super().__init__(f"Item {index}: {error}")
+        self.index = index
+        self.error = error
+
+
+def run_batch(items: List[Dict[str, Any]], insert_item: Callable[[sqlite3.Connection, Dict[str, Any]], Dict[str, Any]],
+              atomic: bool = False) -> List[Dict[str, Any]]:
+    """Insert every item with insert_item(conn, item) in one transaction and return per-item results
+
+    insert_item returns the fields to report for the item (e.g. its new id)
+    and raises ValueError or sqlite3.Error to reject it.
+    """
+    if not isinstance(items, list) or not items:
+        raise ValueError("items must be a non-empty list")
+    if len(items) > MAX_BATCH_ITEMS:
+        raise ValueError(f"At most {MAX_BATCH_ITEMS} items per batch")
+
+    def write(conn):
+        results = []
+        for index, item in enumerate(items):
+            conn.execute("SAVEPOINT batch_item")
+            try:
+                if not isinstance(item, dict):
+                    raise ValueError("item must be an object")
+                result = insert_item(conn, item)
+                conn.execute("RELEASE batch_item")
+                results.append({"index": index, "success": True, **result})
+            except (ValueError, sqlite3.Error) as e:
+                conn.execute("ROLLBACK TO batch_item")
+                conn.execute("RELEASE batch_item")
+                if atomic:
+                    raise BatchItemError(index, e)
+                results.append({"index": index, "success": False, "error": str(e)})
+        return results
+
+    # One job, one transaction of its own
+    return write_coordinator.run(write, group=False)
+
+
+def summarize(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Response body for a batch: counts plus per-item results"""
+    failed = sum(1 for result in results if not result['success'])
+    return {
+        "success": failed == 0,
+        "created": len(results) - failed,
+        "failed": failed,
+        "results": results,
+    }
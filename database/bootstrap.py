@@ -0,0 +1,133 @@
+# database/bootstrap.py
+"""
+One-time database bootstrap for the OL Service POS web service
+
+Schema migrations and default data (bcrypt-hashed users, settings, truck
+parts) should run once per deployment, not in every gunicorn worker. The
+bootstrap takes a host-wide lock file, brings the schema up to date and
+writes a completion marker next to the database. Later processes find the
+schema current and skip straight to serving.
+
+Run it before workers fork: gunicorn.conf.py does this from on_starting (with
+preload_app), or call it directly as a deploy step:
+    python -m database.bootstrap
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows desktop installs run a single process
+    fcntl = None
+
+from database.connection_manager import db_manager
+from database.schema_migrations import ensure_schema, get_latest_version, get_schema_version
+
+logger = logging.getLogger(__name__)
+
+
+def _marker_path() -> str:
+    """Completion marker written next to the database file"""
+    return f"{db_manager.db_path}.bootstrap.json"
+
+
+def _lock_path() -> str:
+    """Host-wide bootstrap lock file"""
+    return f"{db_manager.db_path}.bootstrap.lock"
+
+
+def read_marker() -> Optional[Dict[str, Any]]:
+    """Return the recorded bootstrap, or None if there is none"""
+    try:
+        with open(_marker_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_bootstrapped() -> bool:
+    """True if the database exists and its schema is at the newest migration
+
+    The database's own PRAGMA user_version decides; the marker only records
+    when and how the bootstrap ran, so a restored or replaced database file is
+    not mistaken for a current one.
+    """
+    if not os.path.exists(db_manager.db_path):
+        return False
+
+    # Short-lived connection so no pooled handle is carried across a fork
+    conn = db_manager.connection_pool.create_connection()
+    try:
+        return get_schema_version(conn) >= get_latest_version()
+    finally:
+        conn.close()
+
+
+def _write_marker(duration: float, migrated: bool):
+    """Atomically record a completed bootstrap"""
+    marker = {
+        'schema_version': get_latest_version(),
+        'completed_at': datetime.now().isoformat(),
+        'duration_seconds': round(duration, 3),
+        'migrated': migrated,
+        'host': socket.gethostname(),
+        'pid': os.getpid(),
+    }
+    tmp_path = f"{_marker_path()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(marker, f, indent=2)
+    os.replace(tmp_path, _marker_path())
+
+
+def bootstrap_database(force: bool = False) -> bool:
+    """Run the one-time bootstrap if it has not been done yet
+
+    Returns True if this call did the work, False if it was already done
+    (by this process or another one).
+    """
+    if not force and is_bootstrapped():
+        return False
+
+    db_dir = os.path.dirname(db_manager.db_path)
+    if db_dir:
+        os.makedirs(db_dir, exist_ok=True)
+
+    lock_file = open(_lock_path(), 'a')
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+        # Another process may have finished while we waited for the lock
+        if not force and is_bootstrapped():
+            return False
+
+        started = time.monotonic()
+        logger.info("Bootstrapping database...")
+        migrated = ensure_schema()
+        _write_marker(time.monotonic() - started, migrated)
+        logger.info(f"Database bootstrap completed in {time.monotonic() - started:.2f}s")
+        return True
+    finally:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+        lock_file.close()
+        # Don't carry open SQLite handles across a gunicorn fork
+        db_manager.connection_pool.close_all()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    try:
+        did_work = bootstrap_database(force='--force' in sys.argv[1:])
+        print("✅ Database bootstrapped" if did_work else "✅ Database already bootstrapped")
+        sys.exit(0)
+    except Exception as e:
+        print(f"❌ Database bootstrap failed: {e}")
+        sys.exit(1)
@@ -1,12 +1,18 @@
 # database/connection_manager.py
 import sqlite3
 import os
+import time
+import queue
+import atexit
 import threading
 from contextlib import contextmanager
 from typing import Optional, Dict, Any, List
 import logging
 from dotenv import load_dotenv
 
+from config.settings_manager import (get_database_pragmas, get_database_pragma_profile, DATABASE_PRAGMA_VALUES,
+                                     READER_ONLY_PRAGMAS)
+
 # Load environment variables
 load_dotenv()
 
@@ -15,6 +21,295 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+class ConnectionPool:
+    """Bounded, thread-aware pool of SQLite connections.
+
+    Connections are opened with check_same_thread=False so they can be handed
+    between threads, but a connection is only ever checked out to one thread
+    at a time and must be checked in by that thread. Nested checkouts from the
+    same thread reuse the connection the thread already holds, so code that
+    opens a connection inside another connection block cannot deadlock the
+    pool; DatabaseManager.get_connection() scopes them with a savepoint.
+
+    The pool remembers the PID that created it; after a fork (gunicorn
+    workers) the inherited connections are dropped and the child builds its
+    own.
+    """
+
+    def __init__(self, db_path: str, max_size: int = 5, timeout: float = 30.0,
+                 health_check_interval: float = 30.0, pragmas: Optional[Dict[str, Any]] = None):
+        self.db_path = db_path
+        self.pragmas = pragmas or {}
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._reset_state()
+
+    def _reset_state(self):
+        """Reset pool bookkeeping (used at startup and after a fork)"""
+        self._pid = os.getpid()
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._local = threading.local()
+        self._owners: Dict[int, int] = {}  # id(connection) -> ident of the thread holding it
+        self._stats = {
+            'checkouts': 0,
+            'checkins': 0,
+            'hits': 0,
+            'misses': 0,
+            'nested_checkouts': 0,
+            'waits': 0,
+            'wait_time_total': 0.0,
+            'timeouts': 0,
+            'health_check_failures': 0,
+            'discarded': 0,
+        }
+
+    def _check_pid(self):
+        """Drop connections inherited from a parent process"""
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    logger.info("Process fork detected, resetting connection pool")
+                    self._reset_state()
+
+    def create_connection(self, writer: bool = False) -> sqlite3.Connection:
+        """Open a new connection and run per-connection initialization once
+
+        writer connections (the write coordinator, migrations) skip
+        READER_ONLY_PRAGMAS such as the read-replica profile's query_only.
+        """
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        conn.execute("PRAGMA foreign_keys = ON")
+
+        # Values are validated against DATABASE_PRAGMA_VALUES by the settings manager
+        for name, value in self.pragmas.items():
+            if writer and name in READER_ONLY_PRAGMAS:
+                continue
+            try:
+                conn.execute(f"PRAGMA {name} = {value}")
+            except sqlite3.Error as e:
+                logger.warning(f"Could not apply PRAGMA {name} = {value}: {e}")
+        return conn
+
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        """Check that an idle connection is still usable"""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn: sqlite3.Connection):
+        """Close a connection and release its pool slot"""
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._created -= 1
+            self._stats['discarded'] += 1
+
+    def _acquire(self) -> sqlite3.Connection:
+        """Take an idle connection, open a new one, or wait for a checkin"""
+        while True:
+            try:
+                conn, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_create = self._created < self.max_size
+                    if can_create:
+                        self._created += 1
+                if can_create:
+                    try:
+                        conn = self.create_connection()
+                    except sqlite3.Error:
+                        with self._lock:
+                            self._created -= 1
+                        raise
+                    with self._lock:
+                        self._stats['misses'] += 1
+                    return conn
+
+                # Pool exhausted - wait for another thread to check in. Wake up
+                # periodically in case a slot was freed by a discarded connection.
+                conn = None
+                started = time.monotonic()
+                deadline = started + self.timeout
+                with self._lock:
+                    self._stats['waits'] += 1
+                try:
+                    while True:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            with self._lock:
+                                self._stats['timeouts'] += 1
+                            raise sqlite3.OperationalError(
+                                f"Connection pool exhausted ({self.max_size} connections in use)")
+                        try:
+                            conn, last_used = self._idle.get(timeout=min(remaining, 0.1))
+                            break
+                        except queue.Empty:
+                            with self._lock:
+                                slot_free = self._created < self.max_size
+                            if slot_free:
+                                break
+                finally:
+                    with self._lock:
+                        self._stats['wait_time_total'] += time.monotonic() - started
+                if conn is None:
+                    continue
+
+            if (time.monotonic() - last_used > self.health_check_interval
+                    and not self._is_healthy(conn)):
+                with self._lock:
+                    self._stats['health_check_failures'] += 1
+                self._discard(conn)
+                continue
+
+            with self._lock:
+                self._stats['hits'] += 1
+            return conn
+
+    def checkout(self) -> sqlite3.Connection:
+        """Check a connection out for the current thread"""
+        self._check_pid()
+
+        held = getattr(self._local, 'conn', None)
+        if held is not None:
+            self._local.depth += 1
+            with self._lock:
+                self._stats['nested_checkouts'] += 1
+            return held
+
+        conn = self._acquire()
+        self._local.conn = conn
+        self._local.depth = 1
+        with self._lock:
+            self._owners[id(conn)] = threading.get_ident()
+            self._stats['checkouts'] += 1
+        return conn
+
+    def depth(self) -> int:
+        """How many checkouts the current thread holds on its connection (0 if none)"""
+        if getattr(self._local, 'conn', None) is None:
+            return 0
+        return self._local.depth
+
+    def checkin(self, conn: sqlite3.Connection):
+        """Return a connection checked out by the current thread"""
+        if self._pid != os.getpid():
+            # Inherited from the parent process; the parent still owns it
+            return
+
+        if getattr(self._local, 'conn', None) is not conn:
+            with self._lock:
+                owner = self._owners.get(id(conn))
+            if owner is not None:
+                raise RuntimeError(f"Connection checked out by thread {owner} cannot be checked in "
+                                   f"by thread {threading.get_ident()}")
+            # Never checked out from this pool (e.g. returned twice)
+            return
+
+        self._local.depth -= 1
+        if self._local.depth > 0:
+            return
+        self._local.conn = None
+        with self._lock:
+            self._owners.pop(id(conn), None)
+
+        # Uncommitted work is rolled back, matching the old close() behaviour
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = None
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+
+        with self._lock:
+            self._stats['checkins'] += 1
+        self._idle.put((conn, time.monotonic()))
+
+    def close_all(self):
+        """Close every idle connection in the pool"""
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return a snapshot of pool usage statistics"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['max_size'] = self.max_size
+            stats['open_connections'] = self._created
+            stats['idle_connections'] = self._idle.qsize()
+
+        acquired = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / acquired, 3) if acquired else 0.0
+        stats['avg_wait_ms'] = (
+            round(stats['wait_time_total'] / stats['waits'] * 1000, 2) if stats['waits'] else 0.0
+        )
+        stats['wait_time_total'] = round(stats['wait_time_total'], 4)
+        return stats
+
+
+class NestedConnection:
+    """A checkout nested inside one with uncommitted work on the same thread
+
+    Both checkouts share one SQLite connection, so the inner block runs inside
+    a savepoint: commit() releases the inner work into the outer transaction,
+    which the outer caller still commits or rolls back, and rollback() undoes
+    the inner work alone. Everything else is the wrapped connection.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, savepoint: str):
+        object.__setattr__(self, '_conn', conn)
+        object.__setattr__(self, '_savepoint', savepoint)
+        conn.execute(f"SAVEPOINT {savepoint}")
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    def commit(self):
+        """Keep the inner work and carry on in a fresh savepoint"""
+        self._conn.execute(f"RELEASE {self._savepoint}")
+        self._conn.execute(f"SAVEPOINT {self._savepoint}")
+
+    def rollback(self):
+        """Undo the inner work since the last commit()"""
+        self._conn.execute(f"ROLLBACK TO {self._savepoint}")
+
+    def release(self, keep: bool = True):
+        """End the savepoint, leaving the inner work (or undoing it) for the outer block"""
+        try:
+            if not keep:
+                self.rollback()
+            self._conn.execute(f"RELEASE {self._savepoint}")
+        except sqlite3.Error as e:
+            # The inner block ended the outer transaction itself (raw COMMIT/ROLLBACK)
+            logger.warning(f"Savepoint {self._savepoint} already gone: {e}")
+
+
 class DatabaseManager:
     """Centralized database connection and query management"""
 
@@ -31,32 +326,68 @@ class DatabaseManager:
     def __init__(self):
         if not hasattr(self, 'initialized'):
             self.db_path = os.getenv('DB_PATH', 'data/ol_service_pos.db')
-            self.connection_pool = {}
-            self.pool_size = 5
+            self.pool_size = int(os.getenv('DB_POOL_SIZE', 5))
+            self.pragma_profile = get_database_pragma_profile()
+            self.connection_pool = ConnectionPool(self.db_path, max_size=self.pool_size,
+                                                  pragmas=get_database_pragmas())
+            atexit.register(self.connection_pool.close_all)
             self.initialized = True
 
     @contextmanager
     def get_connection(self, row_factory: bool = True):
-        """Context manager for database connections"""
+        """Context manager for pooled database connections
+
+        Inside another get_connection() block (or a request's g.db) on the same
+        thread that has uncommitted work, the block gets a NestedConnection:
+        its commit() and rollback() act on its own savepoint, never on the
+        outer caller's transaction.
+        """
         conn = None
+        nested = None
+        previous_factory = None
         try:
-            conn = sqlite3.connect(self.db_path, timeout=30.0)
+            conn = self.connection_pool.checkout()
+            previous_factory = conn.row_factory
             if row_factory:
                 conn.row_factory = sqlite3.Row
 
-            # Enable foreign key constraints
-            conn.execute("PRAGMA foreign_keys = ON")
+            depth = self.connection_pool.depth()
+            if depth > 1 and conn.in_transaction:
+                nested = NestedConnection(conn, f"nested_{depth}")
 
-            yield conn
+            yield nested or conn
+
+            if nested:
+                nested.release()
 
         except sqlite3.Error as e:
-            if conn:
+            if nested:
+                nested.release(keep=False)
+            elif conn:
                 conn.rollback()
             logger.error(f"Database error: {e}")
             raise
+        except BaseException:
+            if nested:
+                nested.release(keep=False)
+            raise
         finally:
             if conn:
-                conn.close()
+                conn.row_factory = previous_factory
+                self.connection_pool.checkin(conn)
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool statistics (checkouts, waits, hit rate)"""
+        return self.connection_pool.get_stats()
+
+    def get_effective_pragmas(self) -> Dict[str, Any]:
+        """Read back the PRAGMA values actually in effect on a pooled connection"""
+        effective = {}
+        with self.get_connection(row_factory=False) as conn:
+            for name in ['foreign_keys'] + list(DATABASE_PRAGMA_VALUES):
+                row = conn.execute(f"PRAGMA {name}").fetchone()
+                effective[name] = row[0] if row else None
+        return effective
 
     def execute_query(self, query: str, params: tuple = (), fetch_one: bool = False,
                       fetch_all: bool = False) -> Optional[Any]:
@@ -84,13 +415,15 @@ class DatabaseManager:
         """Execute multiple queries in a transaction"""
         try:
             with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("BEGIN TRANSACTION")
+                # Nested calls already run inside their own savepoint
+                if not conn.in_transaction:
+                    conn.execute("BEGIN")
 
+                cursor = conn.cursor()
                 for query, params in queries:
                     cursor.execute(query, params)
 
-                cursor.execute("COMMIT")
+                conn.commit()
                 return True
 
         except sqlite3.Error as e:
@@ -99,4 +432,4 @@ class DatabaseManager:
 
 
 # Global database manager instance
-db_manager = DatabaseManager()
\ No newline at end of file
+db_manager = DatabaseManager()
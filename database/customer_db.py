@@ -1,9 +1,12 @@
 # database/customer_db.py (Enhanced with Thai ID OCR Support)
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 import datetime
 import json
 from dataclasses import dataclass
 from database.connection_manager import db_manager
+from database.schema_migrations import ensure_schema
+from database import search_index, stat_counters
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Keyset, PageRequest, decode_cursor
 import logging
 
 logger = logging.getLogger(__name__)
@@ -158,80 +161,14 @@ class CustomerRepository:
     """Repository pattern for customer data access with Thai ID support"""
 
     def __init__(self):
-        # Add Thai ID fields to the database schema if they don't exist
-        self._ensure_thai_id_fields()
-
-    def _ensure_thai_id_fields(self):
-        """Add Thai ID and driver license fields to customers table if they don't exist"""
+        # Thai ID and driver license columns are added by schema migration 0002
         try:
-            with db_manager.get_connection() as conn:
-                cursor = conn.cursor()
-
-                # Check existing columns
-                cursor.execute("PRAGMA table_info(customers)")
-                columns = [col[1] for col in cursor.fetchall()]
-
-                # All new fields (Thai ID + Driver License)
-                new_fields = [
-                    ('thai_id_number', 'TEXT'),
-                    ('thai_name', 'TEXT'),
-                    ('english_name', 'TEXT'),
-                    ('date_of_birth', 'TEXT'),
-                    ('id_card_address', 'TEXT'),
-                    ('issue_date', 'TEXT'),
-                    ('expiry_date', 'TEXT'),
-                    ('driver_license_number', 'TEXT'),
-                    ('license_class', 'TEXT'),
-                    ('english_address', 'TEXT'),
-                    ('document_type', 'TEXT')
-                ]
-
-                for field_name, field_type in new_fields:
-                    if field_name not in columns:
-                        try:
-                            cursor.execute(f"ALTER TABLE customers ADD COLUMN {field_name} {field_type}")
-                            logger.info(f"Added column {field_name} to customers table")
-                        except Exception as e:
-                            logger.warning(f"Could not add column {field_name}: {e}")
-
-                conn.commit()
-
+            ensure_schema()
         except Exception as e:
-            logger.error(f"Error ensuring database fields: {e}")
-
-    def _ensure_driver_license_fields(self):
-        """Add driver license fields to customers table if they don't exist"""
-        try:
-            with db_manager.get_connection() as conn:
-                cursor = conn.cursor()
-
-                # Check if driver license fields exist
-                cursor.execute("PRAGMA table_info(customers)")
-                columns = [col[1] for col in cursor.fetchall()]
-
-                # Add missing driver license fields
-                driver_license_fields = [
-                    ('driver_license_number', 'TEXT'),
-                    ('license_class', 'TEXT'),
-                    ('english_address', 'TEXT'),
-                    ('document_type', 'TEXT')  # 'thai_id' or 'driver_license'
-                ]
-
-                for field_name, field_type in driver_license_fields:
-                    if field_name not in columns:
-                        try:
-                            cursor.execute(f"ALTER TABLE customers ADD COLUMN {field_name} {field_type}")
-                            logger.info(f"Added column {field_name} to customers table")
-                        except Exception as e:
-                            logger.warning(f"Could not add column {field_name}: {e}")
-
-                conn.commit()
-
-        except Exception as e:
-            logger.error(f"Error ensuring driver license fields: {e}")
+            logger.error(f"Error ensuring database schema: {e}")
 
     def get_all(self, limit: int = None, offset: int = 0) -> List[Customer]:
-        """Get all customers with pagination support"""
+        """Get all customers (prefer get_page() for paging through large lists)"""
         query = """
         SELECT 
             id, first_name, last_name, name, email, phone, address, city, state, zip_code,
@@ -242,13 +179,36 @@ class CustomerRepository:
         FROM customers 
         ORDER BY name, first_name, last_name
         """
+        params = ()
 
         if limit:
-            query += f" LIMIT {limit} OFFSET {offset}"
+            query += " LIMIT ? OFFSET ?"
+            params = (int(limit), int(offset))
 
-        results = db_manager.execute_query(query, fetch_all=True)
+        results = db_manager.execute_query(query, params, fetch_all=True)
         return [Customer.from_dict(row) for row in results] if results else []
 
+    def get_page(self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[List[Customer], Optional[str]]:
+        """Get one keyset page of customers and the cursor for the next page"""
+        keyset = Keyset('first_name', 'last_name', 'id', descending=False)
+        page = PageRequest(max(1, min(limit, MAX_PAGE_SIZE)), decode_cursor(cursor) if cursor else None)
+
+        query, params = keyset.apply(f"""
+        SELECT 
+            id, first_name, last_name, name, email, phone, address, city, state, zip_code,
+            notes, created_at, updated_at,
+            thai_id_number, thai_name, english_name, date_of_birth, 
+            id_card_address, issue_date, expiry_date,
+            driver_license_number, license_class, english_address, document_type
+            {keyset.select_sql()}
+        FROM customers
+        WHERE 1=1
+        """, [], page)
+
+        results = db_manager.execute_query(query, tuple(params), fetch_all=True) or []
+        rows, next_cursor = keyset.page(results, page.limit)
+        return [Customer.from_dict(row) for row in rows], next_cursor
+
 
     def search(self, search_term: str) -> List[Customer]:
         """Enhanced search including driver license fields"""
@@ -263,17 +223,13 @@ class CustomerRepository:
             id_card_address, issue_date, expiry_date,
             driver_license_number, license_class, english_address, document_type
         FROM customers
-        WHERE 
-            name LIKE ? OR first_name LIKE ? OR last_name LIKE ? OR 
-            phone LIKE ? OR email LIKE ? OR 
-            thai_name LIKE ? OR english_name LIKE ? OR thai_id_number LIKE ? OR
-            driver_license_number LIKE ? OR english_address LIKE ?
+        WHERE {match_sql}
         ORDER BY name, first_name, last_name
         """
 
-        search_pattern = f'%{search_term}%'
-        params = tuple([search_pattern] * 10)  # 10 search fields now
-        results = db_manager.execute_query(query, params, fetch_all=True)
+        with db_manager.get_connection(row_factory=False) as conn:
+            match_sql, params = search_index.customer_filter(conn, search_term)
+        results = db_manager.execute_query(query.format(match_sql=match_sql), tuple(params), fetch_all=True)
 
         return [Customer.from_dict(row) for row in results] if results else []
 
@@ -515,43 +471,9 @@ class CustomerRepository:
 
 
     def get_statistics(self) -> Dict[str, Any]:
-        """Enhanced statistics including driver license data"""
-        queries = {
-            'total_customers': "SELECT COUNT(*) as count FROM customers",
-            'with_thai_id': "SELECT COUNT(*) as count FROM customers WHERE thai_id_number IS NOT NULL AND thai_id_number != ''",
-            'with_driver_license': "SELECT COUNT(*) as count FROM customers WHERE driver_license_number IS NOT NULL AND driver_license_number != ''",
-            'with_phone': "SELECT COUNT(*) as count FROM customers WHERE phone IS NOT NULL AND phone != ''",
-            'with_email': "SELECT COUNT(*) as count FROM customers WHERE email IS NOT NULL AND email != ''",
-            'thai_id_only': "SELECT COUNT(*) as count FROM customers WHERE document_type = 'thai_id'",
-            'driver_license_only': "SELECT COUNT(*) as count FROM customers WHERE document_type = 'driver_license'",
-            'new_last_30_days': """
-                SELECT COUNT(*) as count FROM customers 
-                WHERE created_at >= date('now', '-30 days')
-            """,
-            'new_last_90_days': """
-                SELECT COUNT(*) as count FROM customers 
-                WHERE created_at >= date('now', '-90 days')
-            """
-        }
-
-        stats = {}
-        for key, query in queries.items():
-            result = db_manager.execute_query(query, fetch_one=True)
-            stats[key] = result['count'] if result else 0
-
-        # Calculate percentages
-        if stats['total_customers'] > 0:
-            stats['thai_id_percentage'] = round(
-                (stats['with_thai_id'] / stats['total_customers']) * 100, 1
-            )
-            stats['driver_license_percentage'] = round(
-                (stats['with_driver_license'] / stats['total_customers']) * 100, 1
-            )
-        else:
-            stats['thai_id_percentage'] = 0
-            stats['driver_license_percentage'] = 0
-
-        return stats
+        """Enhanced statistics including driver license data (read from stat_counters)"""
+        with db_manager.get_connection(row_factory=False) as conn:
+            return stat_counters.get_customer_statistics(conn)
 
     def get_top_by_revenue(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get top customers by revenue"""
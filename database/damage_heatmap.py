@@ -0,0 +1,125 @@
+# database/damage_heatmap.py
+"""
+Damage hotspot heatmaps per vehicle type and template view
+
+Every damage point falls into one cell of a HEATMAP_BINS x HEATMAP_BINS grid
+over its relative (x, y) position on the vehicle template. damage_heatmap_bins
+holds the number of points per (vehicle_type, view, cell), and triggers on
+damage_points and damage_reports (migrations 0013 and 0015) keep it current
+as points are added, moved or removed, dropping cells whose count falls to
+zero. The triggers bin a coordinate as min(CAST(v * 64 AS INTEGER), 63), so
+1.0 falls in the last cell as it does with histogram2d. Reading a heatmap is
+then one indexed range scan of at most HEATMAP_BINS² rows, however many
+inspections there are.
+
+Coarser grids (32, 16, ...) are summed from the stored one. rebuild()
+recomputes every grid from the points with numpy.histogram2d, to repair
+drift:
+    python -m database.damage_heatmap rebuild
+"""
+
+import sys
+import sqlite3
+import logging
+import argparse
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.lazy_import import lazy_module
+
+np = lazy_module('numpy')
+
+logger = logging.getLogger(__name__)
+
+HEATMAP_BINS = 64  # stored resolution, as binned by the triggers; must stay a power of two
+ALLOWED_BINS = [HEATMAP_BINS >> shift for shift in range(HEATMAP_BINS.bit_length())]
+
+# Grid for points saved without a view
+UNSPECIFIED_VIEW = 'unspecified'
+
+
+# ---------------------------------------------------------------------------
+# Full recomputation
+# ---------------------------------------------------------------------------
+
+def compute_grids(conn: sqlite3.Connection) -> Dict[Tuple[str, str], Any]:
+    """Every (vehicle_type, view) grid recomputed from damage_points with histogram2d"""
+    rows = conn.execute(f"""
+        SELECT dr.vehicle_type, COALESCE(p.view, '{UNSPECIFIED_VIEW}'), p.x, p.y
+        FROM damage_points p JOIN damage_reports dr ON dr.id = p.report_id
+    """).fetchall()
+
+    points: Dict[Tuple[str, str], Tuple[List[float], List[float]]] = {}
+    for vehicle_type, view, x, y in rows:
+        xs, ys = points.setdefault((vehicle_type, view), ([], []))
+        xs.append(x)
+        ys.append(y)
+
+    grids = {}
+    for key, (xs, ys) in points.items():
+        # Rows are y cells, columns x cells; points outside [0, 1] are dropped
+        grid, _, _ = np.histogram2d(ys, xs, bins=HEATMAP_BINS, range=[[0.0, 1.0], [0.0, 1.0]])
+        grids[key] = grid.astype(np.int64)
+    return grids
+
+
+def rebuild(conn: sqlite3.Connection) -> int:
+    """Replace the stored grids with a full recomputation (caller provides the transaction)"""
+    grids = compute_grids(conn)
+    conn.execute("DELETE FROM damage_heatmap_bins")
+    for (vehicle_type, view), grid in grids.items():
+        bin_y, bin_x = np.nonzero(grid)
+        conn.executemany(
+            "INSERT INTO damage_heatmap_bins (vehicle_type, view, bin_y, bin_x, count) VALUES (?, ?, ?, ?, ?)",
+            [(vehicle_type, view, int(cy), int(cx), int(grid[cy, cx])) for cy, cx in zip(bin_y, bin_x)]
+        )
+    return len(grids)
+
+
+# ---------------------------------------------------------------------------
+# Reads
+# ---------------------------------------------------------------------------
+
+def load_grid(conn: sqlite3.Connection, vehicle_type: str, view: str, bins: int = HEATMAP_BINS):
+    """bins x bins array of point counts (rows are y, columns x); raises ValueError for bad bins"""
+    if bins not in ALLOWED_BINS:
+        raise ValueError(f"bins must be one of {', '.join(map(str, sorted(ALLOWED_BINS)))}")
+
+    rows = conn.execute("""
+        SELECT bin_y, bin_x, count FROM damage_heatmap_bins
+        WHERE vehicle_type = ? AND view = ? AND count != 0
+    """, (vehicle_type, view)).fetchall()
+
+    grid = np.zeros((HEATMAP_BINS, HEATMAP_BINS), dtype=np.int64)
+    if rows:
+        cells = np.array(rows, dtype=np.int64)
+        grid[cells[:, 0], cells[:, 1]] = cells[:, 2]
+
+    factor = HEATMAP_BINS // bins
+    return grid.reshape(bins, factor, bins, factor).sum(axis=(1, 3))
+
+
+def list_heatmaps(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+    """(vehicle_type, view) pairs that have points, with their point counts"""
+    rows = conn.execute("""
+        SELECT vehicle_type, view, SUM(count) FROM damage_heatmap_bins
+        GROUP BY vehicle_type, view HAVING SUM(count) > 0
+        ORDER BY vehicle_type, view
+    """).fetchall()
+    return [{'vehicle_type': row[0], 'view': row[1], 'total_points': row[2]} for row in rows]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    from database.write_coordinator import write_coordinator
+
+    parser = argparse.ArgumentParser(description="Damage heatmap maintenance")
+    parser.add_argument('command', choices=['rebuild'])
+    parser.parse_args(argv)
+
+    count = write_coordinator.run(rebuild, group=False)
+    print(f"✅ Rebuilt {count} heatmap(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
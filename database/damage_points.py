@@ -0,0 +1,135 @@
+# database/damage_points.py
+"""
+Damage points stored as rows, one per marked point
+
+Points used to live in a JSON array in damage_reports.damage_points, so
+adding, moving or deleting one point meant reading, parsing and rewriting
+the whole array, and two inspectors editing the same report overwrote each
+other's points. Each point is now a row of damage_points keyed by its
+report, so a single point is inserted, updated or deleted with one indexed
+statement.
+
+damage_reports.total_estimated_cost is kept up to date by triggers that add
+or subtract the cost of each point as it changes. The table and triggers are
+created by migrations 0012 and 0013. The JSON array is still what the API
+returns; points_json_sql() builds it from the rows. Keys a client sends
+beyond the known columns are kept in extra and merged back.
+"""
+
+import json
+import sqlite3
+import logging
+from typing import Any, Dict, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# JSON key -> column, in the order the JSON object lists them
+POINT_FIELDS = {
+    'id': 'point_id',
+    'x': 'x',
+    'y': 'y',
+    'damage_type': 'damage_type',
+    'severity': 'severity',
+    'description': 'description',
+    'estimated_cost': 'estimated_cost',
+    'created_at': 'created_at',
+    'view': 'view',  # template view the point was marked on (side, front, rear, top)
+}
+
+POINT_COLUMNS = tuple(POINT_FIELDS.values()) + ('extra',)
+
+INSERT_POINT_SQL = f"""
+    INSERT INTO damage_points (report_id, {', '.join(POINT_COLUMNS)})
+    VALUES (?, {', '.join('?' for _ in POINT_COLUMNS)})
+"""
+
+UPDATE_POINT_SQL = f"""
+    UPDATE damage_points SET {', '.join(f'{column} = ?' for column in POINT_COLUMNS[1:])}
+    WHERE report_id = ? AND point_id = ?
+"""
+
+
+# ---------------------------------------------------------------------------
+# Rows <-> JSON
+# ---------------------------------------------------------------------------
+
+def point_values(point: Dict[str, Any]) -> Tuple:
+    """Column values (POINT_COLUMNS order) for a point in its JSON shape; ValueError if it is malformed"""
+    if not isinstance(point, dict):
+        raise ValueError("Damage point must be an object")
+    missing = [key for key in ('id', 'x', 'y', 'damage_type', 'severity') if point.get(key) is None]
+    if missing:
+        raise ValueError(f"Damage point is missing: {', '.join(missing)}")
+
+    created_at = point.get('created_at')
+    if created_at is not None and not isinstance(created_at, str):
+        created_at = created_at.isoformat()
+    extra = {key: value for key, value in point.items() if key not in POINT_FIELDS}
+
+    try:
+        x, y = float(point['x']), float(point['y'])
+        estimated_cost = float(point.get('estimated_cost') or 0.0)
+    except (TypeError, ValueError):
+        raise ValueError("Damage point x, y and estimated_cost must be numbers")
+
+    return (
+        str(point['id']),
+        x,
+        y,
+        point['damage_type'],
+        point['severity'],
+        point.get('description') or '',
+        estimated_cost,
+        created_at,
+        point.get('view') or None,
+        json.dumps(extra) if extra else None,
+    )
+
+
+def points_json_sql(report: str = 'dr') -> str:
+    """SQL expression: JSON array of the points of the report aliased as report
+
+    json_set rather than json_patch, which would drop the keys of NULL
+    columns (created_at, view) instead of returning them as null.
+    """
+    fields = ', '.join(f"'$.{key}', p.{column}" for key, column in POINT_FIELDS.items())
+    return (
+        f"(SELECT json_group_array(json_set(COALESCE(p.extra, '{{}}'), {fields})) "
+        f"FROM (SELECT * FROM damage_points WHERE report_id = {report}.id ORDER BY id) p)"
+    )
+
+
+def point_count_sql(report: str = 'dr') -> str:
+    """SQL expression: number of points of the report aliased as report"""
+    return f"(SELECT COUNT(*) FROM damage_points WHERE report_id = {report}.id)"
+
+
+# ---------------------------------------------------------------------------
+# Writes (run inside the caller's transaction)
+# ---------------------------------------------------------------------------
+
+def insert_points(conn: sqlite3.Connection, report_id: int, points: Iterable[Dict[str, Any]]):
+    """Add points to a report"""
+    conn.executemany(INSERT_POINT_SQL, [(report_id,) + point_values(point) for point in points])
+
+
+def replace_points(conn: sqlite3.Connection, report_id: int, points: Iterable[Dict[str, Any]]):
+    """Make points the report's complete list of points"""
+    values = [(report_id,) + point_values(point) for point in points]
+    conn.execute("DELETE FROM damage_points WHERE report_id = ?", (report_id,))
+    conn.executemany(INSERT_POINT_SQL, values)
+
+
+def update_point(conn: sqlite3.Connection, report_id: int, point: Dict[str, Any]) -> bool:
+    """Overwrite one point of a report; False if the report has no such point"""
+    values = point_values(point)
+    cursor = conn.execute(UPDATE_POINT_SQL, values[1:] + (report_id, values[0]))
+    return cursor.rowcount > 0
+
+
+def delete_point(conn: sqlite3.Connection, report_id: int, point_id: str) -> bool:
+    """Remove one point from a report; False if it had no such point"""
+    cursor = conn.execute("DELETE FROM damage_points WHERE report_id = ? AND point_id = ?",
+                          (report_id, point_id))
+    return cursor.rowcount > 0
+
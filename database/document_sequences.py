@@ -0,0 +1,150 @@
+# database/document_sequences.py
+"""
+Document number sequences (quotes, receipts, payments, insurance claims)
+
+Each kind of document numbers itself per period: Q25060001 is the first
+quote of June 2025, REC-20250614-0001 the first receipt of that day. The last
+number handed out for every (prefix, period) is kept in document_sequences
+and advanced by a single upsert
+
+    INSERT INTO document_sequences (prefix, period, last_value) VALUES (?, ?, 1)
+    ON CONFLICT (prefix, period) DO UPDATE SET last_value = last_value + 1
+    RETURNING last_value
+
+so allocating a number is one primary-key write, and two clerks can never
+receive the same number. SQLite before 3.35 has no RETURNING; the value is
+then read back in the same transaction.
+"""
+
+import re
+import sqlite3
+import logging
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from database.connection_manager import db_manager
+from database.write_coordinator import write_coordinator
+
+logger = logging.getLogger(__name__)
+
+RETURNING_SUPPORTED = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
+class Sequence(NamedTuple):
+    """How one kind of document is numbered"""
+    prefix: str
+    period_format: str   # strftime format of the period part
+    template: str        # str.format template over prefix, period and number
+    table: str           # where issued numbers live
+    column: str
+
+
+SEQUENCES: Dict[str, Sequence] = {
+    'quote': Sequence('Q', '%y%m', '{prefix}{period}{number:04d}', 'repair_quotes', 'quote_number'),
+    'receipt': Sequence('REC', '%Y%m%d', '{prefix}-{period}-{number:04d}', 'payments', 'receipt_number'),
+    'payment': Sequence('PAY', '%Y%m', '{prefix}-{period}-{number:05d}', 'payments', 'payment_number'),
+    'claim': Sequence('CLM', '%Y%m', '{prefix}-{period}-{number:04d}', 'insurance_claims', 'claim_number'),
+}
+
+
+# ---------------------------------------------------------------------------
+# Allocation
+# ---------------------------------------------------------------------------
+
+def _number_pattern(sequence: Sequence) -> re.Pattern:
+    """Regex matching numbers of sequence, capturing period and number"""
+    pattern = re.escape(sequence.template)
+    pattern = pattern.replace(re.escape('{prefix}'), re.escape(sequence.prefix))
+    period_digits = len(datetime(2000, 1, 1).strftime(sequence.period_format))
+    pattern = pattern.replace(re.escape('{period}'), rf'(?P<period>\d{{{period_digits}}})')
+    return re.compile('^' + re.sub(r'\\\{number:0?(\d+)d\\\}', r'(?P<number>\\d{\1,})', pattern) + '$')
+
+
+def period_of(name: str, when: Optional[datetime] = None) -> str:
+    """Period part of a document number issued at when (default now)"""
+    return (when or datetime.now()).strftime(SEQUENCES[name].period_format)
+
+
+def format_number(name: str, period: str, number: int) -> str:
+    sequence = SEQUENCES[name]
+    return sequence.template.format(prefix=sequence.prefix, period=period, number=number)
+
+
+def parse_number(name: str, number: str) -> Tuple[str, int]:
+    """Period and sequence number of a formatted document number; ValueError if it is not one"""
+    match = _number_pattern(SEQUENCES[name]).match(number) if isinstance(number, str) else None
+    if not match:
+        example = format_number(name, period_of(name), 1)
+        raise ValueError(f"Invalid {name} number: {number!r} (expected the format {example})")
+    return match.group('period'), int(match.group('number'))
+
+
+def allocate(conn: sqlite3.Connection, name: str, period: str, count: int = 1) -> int:
+    """Reserve count numbers in the caller's transaction and return the last of them"""
+    prefix = SEQUENCES[name].prefix
+    upsert = """
+        INSERT INTO document_sequences (prefix, period, last_value) VALUES (?, ?, ?)
+        ON CONFLICT (prefix, period) DO UPDATE SET last_value = last_value + excluded.last_value
+    """
+    if RETURNING_SUPPORTED:
+        return conn.execute(upsert + " RETURNING last_value", (prefix, period, count)).fetchone()[0]
+
+    # The upsert holds the write lock, so the value read back is still ours
+    conn.execute(upsert, (prefix, period, count))
+    return conn.execute(
+        "SELECT last_value FROM document_sequences WHERE prefix = ? AND period = ?", (prefix, period)
+    ).fetchone()[0]
+
+
+def peek(conn: sqlite3.Connection, name: str, period: str) -> int:
+    """Last number handed out for name in period, without reserving anything"""
+    row = conn.execute(
+        "SELECT last_value FROM document_sequences WHERE prefix = ? AND period = ?",
+        (SEQUENCES[name].prefix, period)
+    ).fetchone()
+    return row[0] if row else 0
+
+
+class DocumentNumbers:
+    """Issues formatted document numbers"""
+
+    def next(self, name: str, when: Optional[datetime] = None, conn: Optional[sqlite3.Connection] = None) -> str:
+        """Next number for a document of kind name
+
+        With conn the number is allocated in that connection's transaction, so
+        it is given back if the document insert rolls back; use this inside
+        write_coordinator jobs. Without conn the allocation is committed on its
+        own through the write queue.
+        """
+        period = period_of(name, when)
+
+        if conn is not None:
+            return format_number(name, period, allocate(conn, name, period))
+        return format_number(name, period, write_coordinator.run(allocate, name, period))
+
+    def record(self, name: str, number: str, conn: sqlite3.Connection) -> str:
+        """Advance the sequence past a number given with the document, in conn's transaction
+
+        Raises ValueError if number is not in the format of name. Like the
+        seeding in migration 0011, the sequence only ever moves forward.
+        """
+        period, value = parse_number(name, number)
+        conn.execute("""
+            INSERT INTO document_sequences (prefix, period, last_value) VALUES (?, ?, ?)
+            ON CONFLICT (prefix, period) DO UPDATE SET last_value = max(last_value, excluded.last_value)
+        """, (SEQUENCES[name].prefix, period, value))
+        return number
+
+    def preview(self, name: str, when: Optional[datetime] = None) -> str:
+        """The number the next document of kind name would most likely get
+
+        Nothing is reserved, so another clerk may still take it first; the
+        real number is allocated when the document is inserted.
+        """
+        period = period_of(name, when)
+        with db_manager.get_connection(row_factory=False) as conn:
+            return format_number(name, period, peek(conn, name, period) + 1)
+
+
+# Global instance
+document_numbers = DocumentNumbers()
@@ -0,0 +1,875 @@
+# database/index_advisor.py
+"""
+EXPLAIN QUERY PLAN index advisor for the OL Service POS database
+
+Extracts the SQL statements in application.py and database/*_db.py, builds a
+scratch database with the current schema and a realistically sized synthetic
+dataset, and runs EXPLAIN QUERY PLAN on every statement. ?fields= SELECT
+lists, keyset pages and search filters are expanded with the SQL their
+helpers generate on the scratch database. Full scans of large
+tables and temporary B-trees (sorting / grouping without an index) are
+flagged. For each flagged statement candidate indexes (equality columns,
+then ORDER BY / range columns, partial indexes for constant predicates,
+covering variants) are tried on the scratch database and the one that
+removes the most problems is recommended.
+
+Redundant indexes (a prefix of another index on the same table, including
+UNIQUE constraints) and CREATE INDEX statements repeated in the source are
+reported too. With --write-migration the recommendations are written as the
+next schema migration.
+
+Usage:
+    python -m database.index_advisor [--scale 1.0] [--show-all] [--write-migration]
+"""
+
+import re
+import ast
+import sys
+import time
+import random
+import shutil
+import sqlite3
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from database import search_index
+from database.schema_migrations import MIGRATIONS_DIR, apply_migrations, discover_migrations
+from utils.field_selection import FieldSelector
+from utils.pagination import Keyset
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SOURCE_PATTERNS = ['application.py', 'database/*_db.py']
+SCHEMA_SOURCES = ['database/migrations/*.py']
+
+# Rows generated per table at --scale 1.0 (other tables get DEFAULT_ROWS)
+DATASET_ROWS = {
+    'customers': 5000,
+    'vehicles': 7000,
+    'services': 25000,
+    'service_items': 30000,
+    'vehicle_photos': 30000,
+    'photo_sessions': 8000,
+    'session_photos': 20000,
+    'photos': 5000,
+    'damage_reports': 5000,
+    'work_orders': 5000,
+    'appointments': 5000,
+    'material_forms': 5000,
+    'material_form_items': 15000,
+    'repair_quotes': 5000,
+    'repair_quote_items': 15000,
+    'truck_parts_inventory': 2000,
+    'payments': 15000,
+    'insurance_claims': 2000,
+    'installment_plans': 2000,
+    'installment_payments': 8000,
+    'quality_checks': 3000,
+    'warranties': 2000,
+    'users': 20,
+}
+DEFAULT_ROWS = 500
+SKIP_TABLES = {'settings'}
+
+STATUS_VALUES = (['completed'] * 14 + ['pending'] * 3 + ['in_progress'] * 2 + ['cancelled'])
+ROLE_VALUES = ['admin', 'manager', 'mechanic', 'mechanic', 'mechanic']
+FIRST_NAMES = ['Somchai', 'Somsak', 'Malee', 'Niran', 'Suda', 'Anan', 'Pim', 'Kitti', 'John', 'Mary']
+LAST_NAMES = ['Srisuk', 'Chaiyaporn', 'Wongsa', 'Rattanakul', 'Smith', 'Jones', 'Boonmee', 'Saetang']
+
+SQL_START = re.compile(r'^\s*(SELECT|WITH|UPDATE|DELETE)\s')
+TABLE_REF = re.compile(r'\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+PLAN_LOOP = re.compile(r'^(SCAN|SEARCH)\s+(?:TABLE\s+)?(\w+)(?:\s+AS\s+(\w+))?(.*)$')
+CREATE_INDEX = re.compile(r'CREATE\s+(?:UNIQUE\s+)?INDEX\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)', re.IGNORECASE)
+SQL_KEYWORDS = {
+    'where', 'left', 'right', 'inner', 'outer', 'cross', 'join', 'on', 'order', 'group', 'limit',
+    'union', 'set', 'using', 'natural', 'having', 'values', 'select', 'as', 'and', 'or',
+}
+
+
+class SqlStatement(NamedTuple):
+    """A SQL statement found in the source"""
+    source: str
+    lineno: int
+    sql: str
+    variant: str
+
+
+class IndexSpec(NamedTuple):
+    """A (possibly partial) index on one table"""
+    table: str
+    columns: Tuple[str, ...]
+    where: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        cols = '_'.join(c.split()[0] for c in self.columns)
+        suffix = ''
+        if self.where:
+            suffix = '_where_' + '_'.join(re.findall(r'([a-z_]+)\s*=', self.where))
+        return f"idx_{self.table}_{cols}{suffix}"
+
+    def create_sql(self, name: Optional[str] = None) -> str:
+        sql = f"CREATE INDEX IF NOT EXISTS {name or self.name} ON {self.table}({', '.join(self.columns)})"
+        if self.where:
+            sql += f" WHERE {self.where}"
+        return sql
+
+
+# ---------------------------------------------------------------------------
+# SQL extraction
+# ---------------------------------------------------------------------------
+
+# Stand-in for the search term passed to search_index filters
+SAMPLE_SEARCH_TERM = 'somchai'
+UPDATE_SET = re.compile(r'UPDATE\s+(\w+)\s+SET\s*$', re.IGNORECASE)
+FORMAT_FIELD = re.compile(r'\{(\w+)\}')
+
+
+class _Expander:
+    """Representative SQL for the dynamic pieces of a query
+
+    Field lists (FieldSelector.select_sql), keyset fragments and search
+    filters are produced by the real helpers against the scratch database,
+    so the statements analyzed are the ones those routes actually run.
+    Anything else interpolated becomes a ? placeholder.
+    """
+
+    def __init__(self, conn: Optional[sqlite3.Connection], env: Optional[Dict[str, Any]] = None):
+        self.conn = conn
+        self.env = dict(env or {})
+
+    @staticmethod
+    def construct(node: ast.AST) -> Any:
+        """FieldSelector / Keyset built from a call with literal arguments, else None"""
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)):
+            return None
+        factory = {'FieldSelector': FieldSelector, 'Keyset': Keyset}.get(node.func.id)
+        if factory is None:
+            return None
+        try:
+            args = [ast.literal_eval(arg) for arg in node.args]
+            kwargs = {kw.arg: ast.literal_eval(kw.value) for kw in node.keywords}
+            return factory(*args, **kwargs)
+        except (ValueError, TypeError, SyntaxError):
+            return None
+
+    def bind(self, node: ast.AST):
+        """Remember objects and filter SQL assigned in node (NAME = ..., sql, params = ...)"""
+        if not (isinstance(node, ast.Assign) and len(node.targets) == 1):
+            return
+        target = node.targets[0]
+        if isinstance(target, ast.Name):
+            value = self.construct(node.value)
+            if value is not None:
+                self.env[target.id] = value
+        elif isinstance(target, ast.Tuple) and target.elts and isinstance(target.elts[0], ast.Name):
+            sql = self._filter_sql(node.value)
+            if sql is not None:
+                self.env[target.elts[0].id] = sql
+
+    def _filter_sql(self, node: ast.AST) -> Optional[str]:
+        """Condition returned by a search_index.*_filter(conn, term, ...) call"""
+        if self.conn is None or not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                                     and isinstance(node.func.value, ast.Name)
+                                     and node.func.value.id == 'search_index'
+                                     and node.func.attr.endswith('_filter')):
+            return None
+        try:
+            extra = [ast.literal_eval(arg) for arg in node.args[2:]]
+            return getattr(search_index, node.func.attr)(self.conn, SAMPLE_SEARCH_TERM, *extra)[0]
+        except (ValueError, TypeError, SyntaxError, AttributeError, sqlite3.Error):
+            return None
+
+    def keyset_of(self, node: ast.AST) -> Optional[Keyset]:
+        """The Keyset a `<keyset>.apply(...)` call uses"""
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == 'apply' \
+                and isinstance(node.func.value, ast.Name) and isinstance(self.env.get(node.func.value.id), Keyset):
+            return self.env[node.func.value.id]
+        return None
+
+    @staticmethod
+    def keyset_pieces(keyset: Keyset, call: ast.Call) -> List[Tuple[str, bool]]:
+        """Keyset.apply() as query pieces: the optional cursor condition, then ORDER BY and LIMIT"""
+        prefix = ' AND '
+        for kw in call.keywords:
+            if kw.arg == 'where_prefix' and isinstance(kw.value, ast.Constant):
+                prefix = kw.value.value
+        condition, _ = keyset.where_sql([0] * len(keyset.columns))
+        return [(prefix + condition, True), (keyset.order_sql() + " LIMIT ?", False)]
+
+    def fragment(self, node: ast.AST, preceding: str) -> str:
+        """SQL for one f-string interpolation"""
+        if isinstance(node, ast.Name) and isinstance(self.env.get(node.id), str):
+            return self.env[node.id]
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) \
+                and isinstance(node.func.value, ast.Name):
+            target, method = self.env.get(node.func.value.id), node.func.attr
+            if isinstance(target, FieldSelector) and method == 'select_sql' and self.conn is not None:
+                return target.select_sql(self.conn, None)
+            if isinstance(target, Keyset) and method in ('select_sql', 'order_sql'):
+                return getattr(target, method)()
+
+        # SET {', '.join(update_fields)}: assign one real column
+        match = UPDATE_SET.search(preceding)
+        if match and self.conn is not None:
+            columns = [row[1] for row in self.conn.execute(f"PRAGMA table_info({match.group(1)})") if not row[5]]
+            if columns:
+                column = 'updated_at' if 'updated_at' in columns else columns[0]
+                return f"{column} = ?"
+        return '?'
+
+    def literal_sql(self, node: ast.AST) -> Optional[str]:
+        """SQL text of a string constant or f-string with its interpolations expanded"""
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            # str.format() templates: fill {name} from what the function assigns
+            return FORMAT_FIELD.sub(lambda m: self.env[m.group(1)] if isinstance(self.env.get(m.group(1)), str)
+                                    else m.group(0), node.value)
+        if isinstance(node, ast.JoinedStr):
+            parts = []
+            for value in node.values:
+                if isinstance(value, ast.Constant):
+                    parts.append(value.value)
+                else:
+                    parts.append(self.fragment(value.value, ''.join(parts)))
+            return ''.join(parts)
+        return None
+
+
+def _function_statements(func: ast.AST, source: str, expander: _Expander) -> List[SqlStatement]:
+    """Queries built in one function, including `query += ...` variants
+
+    Pieces appended inside an if-block are optional filters; every filter is
+    emitted as its own variant next to the unfiltered query. A Keyset.apply()
+    call adds its ORDER BY and LIMIT, with the cursor condition as a filter.
+    """
+    statements = []
+    built: Dict[str, Dict[str, Any]] = {}
+
+    for node in ast.walk(func):
+        expander.bind(node)
+
+    def visit(node, conditional):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                continue
+            if isinstance(child, ast.Assign) and len(child.targets) == 1 \
+                    and isinstance(child.targets[0], ast.Name):
+                sql = expander.literal_sql(child.value)
+                if sql is not None and SQL_START.match(sql):
+                    built[child.targets[0].id] = {'lineno': child.lineno, 'base': sql, 'pieces': []}
+                    continue
+            elif isinstance(child, ast.Assign) and len(child.targets) == 1 \
+                    and isinstance(child.targets[0], ast.Tuple) and child.targets[0].elts \
+                    and isinstance(child.targets[0].elts[0], ast.Name) and expander.keyset_of(child.value):
+                # query, params = keyset.apply(query or literal SQL, params, page)
+                name, call = child.targets[0].elts[0].id, child.value
+                pieces = expander.keyset_pieces(expander.keyset_of(call), call)
+                base = expander.literal_sql(call.args[0]) if call.args else None
+                if base is not None and SQL_START.match(base):
+                    built[name] = {'lineno': child.lineno, 'base': base, 'pieces': pieces}
+                    continue
+                if call.args and isinstance(call.args[0], ast.Name) and call.args[0].id in built:
+                    built[call.args[0].id]['pieces'].extend(pieces)
+                    continue
+            elif isinstance(child, ast.AugAssign) and isinstance(child.target, ast.Name) \
+                    and isinstance(child.op, ast.Add) and child.target.id in built:
+                sql = expander.literal_sql(child.value)
+                if sql is not None:
+                    built[child.target.id]['pieces'].append((sql, conditional))
+                    continue
+            elif not isinstance(child, ast.stmt):
+                sql = expander.literal_sql(child)
+                if sql is not None and SQL_START.match(sql):
+                    statements.append(SqlStatement(source, child.lineno, sql, 'inline'))
+                if sql is not None:
+                    continue  # the pieces of an f-string are not statements of their own
+            visit(child, conditional or isinstance(child, (ast.If, ast.For, ast.While, ast.ExceptHandler)))
+
+    visit(func, False)
+
+    for info in built.values():
+        pieces = info['pieces']
+        fixed = ''.join(sql for sql, optional in pieces if not optional)
+        statements.append(SqlStatement(source, info['lineno'], info['base'] + fixed, 'base'))
+        for index, (sql, optional) in enumerate(pieces):
+            if not optional:
+                continue
+            variant = ''.join(p for i, (p, opt) in enumerate(pieces) if not opt or i == index)
+            statements.append(SqlStatement(source, info['lineno'], info['base'] + variant,
+                                           f"filter: {sql.strip()}"))
+    return statements
+
+
+def extract_statements(patterns: List[str] = None, conn: Optional[sqlite3.Connection] = None) -> List[SqlStatement]:
+    """Every SELECT/UPDATE/DELETE statement in the application source
+
+    With conn (the scratch database) dynamic SELECT lists, keyset fragments
+    and search filters are expanded into the SQL they produce there.
+    """
+    statements = []
+    for pattern in patterns or SOURCE_PATTERNS:
+        for path in sorted(PROJECT_ROOT.glob(pattern)):
+            source = str(path.relative_to(PROJECT_ROOT))
+            tree = ast.parse(path.read_text(encoding='utf-8'))
+            module = _Expander(conn)
+            for node in tree.body:
+                module.bind(node)
+            for node in ast.walk(tree):
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    statements.extend(_function_statements(node, source, _Expander(conn, module.env)))
+
+    unique = {}
+    for statement in statements:
+        key = ' '.join(statement.sql.split())
+        unique.setdefault(key, statement)
+    return list(unique.values())
+
+
+def find_duplicate_index_statements(patterns: List[str] = None) -> List[Tuple[str, str, int]]:
+    """CREATE INDEX statements for the same index name repeated in the schema source"""
+    duplicates = []
+    for pattern in patterns or SCHEMA_SOURCES:
+        for path in sorted(PROJECT_ROOT.glob(pattern)):
+            seen = set()
+            for lineno, line in enumerate(path.read_text(encoding='utf-8').splitlines(), 1):
+                match = CREATE_INDEX.search(line)
+                if match:
+                    if match.group(1) in seen:
+                        duplicates.append((str(path.relative_to(PROJECT_ROOT)), match.group(1), lineno))
+                    seen.add(match.group(1))
+    return duplicates
+
+
+# ---------------------------------------------------------------------------
+# Scratch dataset
+# ---------------------------------------------------------------------------
+
+def _table_order(conn: sqlite3.Connection, tables: List[str]) -> List[str]:
+    """Tables ordered so that parents come before children"""
+    parents = {
+        table: {row[2] for row in conn.execute(f"PRAGMA foreign_key_list({table})")} & set(tables)
+        for table in tables
+    }
+    ordered, placed = [], set()
+    while len(ordered) < len(tables):
+        ready = [t for t in tables if t not in placed and parents[t] - {t} <= placed]
+        if not ready:  # cycle - place the rest as-is
+            ready = [t for t in tables if t not in placed]
+        for table in ready:
+            ordered.append(table)
+            placed.add(table)
+    return ordered
+
+
+def _column_value(name: str, col_type: str, i: int, now: datetime, rng: random.Random) -> Any:
+    """Synthetic value for a column, shaped by its name and type"""
+    col_type = col_type.upper()
+    if name == 'status':
+        return rng.choice(STATUS_VALUES)
+    if name == 'role':
+        return rng.choice(ROLE_VALUES)
+    if name == 'first_name':
+        return rng.choice(FIRST_NAMES)
+    if name == 'last_name':
+        return rng.choice(LAST_NAMES)
+    if name.startswith('is_') or 'BOOL' in col_type:
+        return 1 if rng.random() < 0.1 else 0
+    if name.endswith('_at') or name == 'timestamp' or 'TIMESTAMP' in col_type or 'DATETIME' in col_type:
+        moment = now - timedelta(seconds=rng.randint(0, 730 * 86400))
+        return moment.strftime('%Y-%m-%d %H:%M:%S')
+    if name.endswith('date') or name.endswith('_time') or col_type == 'DATE':
+        return (now - timedelta(days=rng.randint(0, 730))).strftime('%Y-%m-%d')
+    if name.endswith(('type', 'category', 'method', 'class', 'priority', 'severity')):
+        return f"{name}_{rng.randint(1, 6)}"
+    if name == 'thai_id_number':
+        return f"{1100000000000 + i}"
+    if any(t in col_type for t in ('REAL', 'DECIMAL', 'NUMERIC', 'FLOAT', 'DOUBLE')):
+        return round(rng.uniform(0, 10000), 2)
+    if 'INT' in col_type:
+        return rng.randint(0, 100)
+    return f"{name}-{i:07d}"
+
+
+def build_dataset(path: str, scale: float = 1.0, seed: int = 42) -> sqlite3.Connection:
+    """Create the current schema at path and fill it with synthetic rows"""
+    conn = sqlite3.connect(path)
+    conn.isolation_level = None
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    apply_migrations(conn)
+
+    rng = random.Random(seed)
+    now = datetime.now()
+    tables = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' "
+        "AND sql NOT LIKE 'CREATE VIRTUAL%'")]
+    try:
+        shadow = {row[1] for row in conn.execute("PRAGMA table_list") if row[2] == 'shadow'}
+    except sqlite3.Error:  # SQLite < 3.37
+        shadow = set()
+    tables = [t for t in tables if t not in SKIP_TABLES and t not in shadow]
+
+    counts: Dict[str, int] = {}
+    conn.execute("PRAGMA foreign_keys = OFF")
+    conn.execute("BEGIN")
+    for table in _table_order(conn, tables):
+        existing = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        wanted = int(DATASET_ROWS.get(table, DEFAULT_ROWS) * scale) - existing
+        foreign = {row[3]: row[2] for row in conn.execute(f"PRAGMA foreign_key_list({table})")}
+        info = list(conn.execute(f"PRAGMA table_xinfo({table})"))
+        pk = [row for row in info if row[5]]
+        rowid = pk[0][1] if len(pk) == 1 and (pk[0][2] or '').upper() == 'INTEGER' else None
+        columns = [row for row in info if row[6] == 0 and row[1] != rowid]
+        if wanted <= 0 or not columns:
+            counts[table] = existing
+            continue
+
+        rows = []
+        for i in range(existing + 1, existing + wanted + 1):
+            values = []
+            for _, name, col_type, _, _, _, _ in columns:
+                parent = foreign.get(name)
+                if parent and counts.get(parent):
+                    # Skewed towards low ids: a few customers have many visits
+                    values.append(int(counts[parent] * rng.random() ** 2) + 1)
+                else:
+                    values.append(_column_value(name, col_type or '', i, now, rng))
+            rows.append(values)
+
+        names = ', '.join(col[1] for col in columns)
+        placeholders = ', '.join('?' for _ in columns)
+        try:
+            conn.executemany(f"INSERT INTO {table} ({names}) VALUES ({placeholders})", rows)
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not populate {table}: {e}")
+        counts[table] = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    conn.execute("COMMIT")
+    conn.execute("ANALYZE")
+    return conn
+
+
+# ---------------------------------------------------------------------------
+# Plan analysis
+# ---------------------------------------------------------------------------
+
+def _table_aliases(sql: str, tables: set) -> Dict[str, str]:
+    """Map each alias (and table name) used in the statement to its table"""
+    aliases = {}
+    for table, alias in TABLE_REF.findall(sql):
+        if table.lower() not in tables:
+            continue
+        aliases[table.lower()] = table.lower()
+        if alias and alias.lower() not in SQL_KEYWORDS:
+            aliases[alias.lower()] = table.lower()
+    match = re.match(r'\s*(?:UPDATE|DELETE\s+FROM)\s+(\w+)', sql, re.IGNORECASE)
+    if match and match.group(1).lower() in tables:
+        aliases[match.group(1).lower()] = match.group(1).lower()
+    return aliases
+
+
+def _sample_params(conn: sqlite3.Connection, sql: str, aliases: Dict[str, str]) -> tuple:
+    """Realistic values for each ? placeholder, taken from the dataset"""
+    params = []
+    for match in re.finditer(r'\?', sql):
+        before = sql[:match.start()]
+        column = re.search(r'(?:(\w+)\.)?(\w+)\)?\s*(=|>=|<=|>|<|!=|LIKE)\s*$', before, re.IGNORECASE)
+        if re.search(r'\b(LIMIT|OFFSET)\s*$', before, re.IGNORECASE):
+            params.append(0 if before.rstrip().upper().endswith('OFFSET') else 50)
+            continue
+        if re.search(r'\bMATCH\s*$', before, re.IGNORECASE):
+            params.append(search_index.build_filter(SAMPLE_SEARCH_TERM)[1][0])
+            continue
+        value = None
+        if column:
+            prefix, name, operator = column.group(1), column.group(2), column.group(3)
+            candidates = [aliases[prefix.lower()]] if prefix and prefix.lower() in aliases else \
+                sorted(set(aliases.values()))
+            for table in candidates:
+                try:
+                    row = conn.execute(
+                        f"SELECT {name} FROM {table} WHERE {name} IS NOT NULL LIMIT 1 OFFSET ?",
+                        (len(params) * 37 % 101,)).fetchone()
+                except sqlite3.Error:
+                    continue
+                if row:
+                    value = row[0]
+                    if operator.upper() == 'LIKE':
+                        value = f"%{str(value)[:3]}%"
+                    break
+        params.append(value)
+    return tuple(params)
+
+
+def explain(conn: sqlite3.Connection, sql: str, params: tuple) -> List[Tuple[int, int, str]]:
+    """EXPLAIN QUERY PLAN rows as (id, parent, detail)"""
+    return [(row[0], row[1], row[3]) for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def find_problems(plan: List[Tuple[int, int, str]], aliases: Dict[str, str],
+                  row_counts: Dict[str, int], min_rows: int) -> List[Tuple[str, str]]:
+    """Full scans of large tables and temp B-trees, as (kind, table)"""
+    problems = []
+    first_loop: Dict[int, str] = {}
+    for node_id, parent, detail in plan:
+        match = PLAN_LOOP.match(detail)
+        if match:
+            name = (match.group(3) or match.group(2)).lower()
+            table = aliases.get(name, name)
+            first_loop.setdefault(parent, table)
+            # SCAN ... USING INDEX still visits every row, just in index order;
+            # a virtual table (FTS) scan is a lookup through its own index
+            if match.group(1) == 'SCAN' and 'VIRTUAL TABLE' not in detail \
+                    and row_counts.get(table, 0) >= min_rows:
+                problems.append(('full scan', table))
+    for node_id, parent, detail in plan:
+        if detail.startswith('USE TEMP B-TREE'):
+            problems.append((detail[len('USE TEMP B-TREE FOR '):].lower(), first_loop.get(parent, '?')))
+    return problems
+
+
+def time_statement(conn: sqlite3.Connection, sql: str, params: tuple, repeat: int = 3) -> Optional[float]:
+    """Best-of-n execution time in milliseconds (SELECT statements only)"""
+    if not re.match(r'\s*(SELECT|WITH)\b', sql, re.IGNORECASE):
+        return None
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 3)
+
+
+def _table_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_xinfo({table})")]
+
+
+def _existing_indexes(conn: sqlite3.Connection, table: str) -> List[Dict[str, Any]]:
+    """Indexes on a table with their key columns"""
+    indexes = []
+    for _, name, unique, origin, partial in conn.execute(f"PRAGMA index_list({table})"):
+        keys = [(row[2], row[3]) for row in conn.execute(f"PRAGMA index_xinfo({name})") if row[5]]
+        indexes.append({'name': name, 'unique': bool(unique), 'origin': origin,
+                        'partial': bool(partial), 'keys': keys})
+    return indexes
+
+
+def candidate_indexes(conn: sqlite3.Connection, sql: str, table: str,
+                      aliases: Dict[str, str]) -> List[IndexSpec]:
+    """Plausible indexes on table for the statement, most specific first"""
+    columns = set(_table_columns(conn, table))
+    # The rowid is already the last key of every index
+    rowid = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")
+             if row[5] and (row[2] or '').upper() == 'INTEGER'}
+    columns -= rowid
+    own = {a for a, t in aliases.items() if t == table}
+    single_table = len(set(aliases.values())) == 1
+
+    def owned(prefix, name):
+        if name.lower() not in columns:
+            return False
+        return (prefix.lower() in own) if prefix else (single_table or name.lower() not in
+                                                        {c for t in set(aliases.values()) - {table}
+                                                         for c in _table_columns(conn, t)})
+
+    equality, literals, ranges, joins = [], [], [], []
+    for prefix, name, value in re.findall(
+            r"(?:(\w+)\.)?(\w+)\s*=\s*(\?|'[^']*'|\d+\b)", sql):
+        if not owned(prefix, name):
+            continue
+        if value == '?':
+            if name not in equality:
+                equality.append(name)
+        elif f"{name} = {value}" not in literals:
+            literals.append(f"{name} = {value}")
+    for left_prefix, left, right_prefix, right in re.findall(r"(\w+)\.(\w+)\s*=\s*(\w+)\.(\w+)", sql):
+        for prefix, name in ((left_prefix, left), (right_prefix, right)):
+            if owned(prefix, name) and name not in joins:
+                joins.append(name)
+    for prefix, name in re.findall(r"(?:(\w+)\.)?(\w+)\s*(?:>=|<=|>|<|LIKE)\s*\?", sql, re.IGNORECASE):
+        if owned(prefix, name) and name not in equality and name not in ranges:
+            ranges.append(name)
+
+    ordering = []
+    match = re.search(r'\b(?:ORDER|GROUP)\s+BY\s+(.+?)(?:\bLIMIT\b|\bHAVING\b|\)|$)', sql,
+                      re.IGNORECASE | re.DOTALL)
+    if match:
+        for term in match.group(1).split(','):
+            term_match = re.match(r'\s*(?:(\w+)\.)?(\w+)\s*(ASC|DESC)?\s*$', term, re.IGNORECASE)
+            if not term_match or not owned(term_match.group(1), term_match.group(2)):
+                ordering = []
+                break
+            direction = ' DESC' if (term_match.group(3) or '').upper() == 'DESC' else ''
+            ordering.append(term_match.group(2) + direction)
+    if ordering and all(term.endswith(' DESC') for term in ordering):
+        ordering = [term[:-5] for term in ordering]  # SQLite walks the index backwards
+
+    # Covering variant: the selected columns of this table follow the keys
+    selected = []
+    select_match = re.match(r'\s*SELECT\s+(.+?)\s+FROM\s', sql, re.IGNORECASE | re.DOTALL)
+    if select_match:
+        for term in select_match.group(1).split(','):
+            term_match = re.match(r'\s*(?:(\w+)\.)?(\w+|\*)\s*$', term)
+            if term_match and term_match.group(2) == '*' and \
+                    (not term_match.group(1) or term_match.group(1).lower() in own):
+                selected = []
+                break
+            if term_match and owned(term_match.group(1), term_match.group(2)):
+                selected.append(term_match.group(2))
+    covering = list(dict.fromkeys(equality + ordering + ranges[:1] + selected))
+
+    where = ' AND '.join(literals) or None
+    candidates = []
+    for cols, predicate in [
+        (equality + ordering, where),
+        (equality + ranges[:1], where),
+        (equality, where),
+        (equality + ordering, None),
+        (equality, None),
+        (ordering, where),
+        (ordering, None),
+        (ranges[:1], None),
+        ([lit.split(' = ')[0] for lit in literals] + ordering, None),
+    ] + [([column], None) for column in joins] + \
+            ([(covering, where)] if selected and len(covering) <= 6 else []):
+        spec = IndexSpec(table, tuple(dict.fromkeys(cols)), predicate)
+        if spec.columns and spec not in candidates:
+            candidates.append(spec)
+    return candidates
+
+
+def _covers(existing: List[Dict[str, Any]], spec: IndexSpec) -> bool:
+    """True if an existing index already starts with the candidate's columns"""
+    wanted = [(c.split()[0], 1 if c.endswith(' DESC') else 0) for c in spec.columns]
+    for index in existing:
+        if index['partial'] and not spec.where:
+            continue
+        if index['keys'][:len(wanted)] == wanted and not spec.where:
+            return True
+    return False
+
+
+def find_redundant_indexes(conn: sqlite3.Connection) -> List[Tuple[str, str, str]]:
+    """Non-unique indexes whose keys are a prefix of another index, as (table, index, covered_by)"""
+    redundant = []
+    tables = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")]
+    for table in tables:
+        indexes = _existing_indexes(conn, table)
+        for index in indexes:
+            if index['unique'] or index['partial'] or index['origin'] != 'c':
+                continue
+            for other in indexes:
+                if other is index or other['partial']:
+                    continue
+                if other['keys'][:len(index['keys'])] == index['keys'] and \
+                        (len(other['keys']) > len(index['keys']) or other['unique'] or
+                         other['name'] < index['name']):
+                    redundant.append((table, index['name'], other['name']))
+                    break
+    return redundant
+
+
+# ---------------------------------------------------------------------------
+# Advisor
+# ---------------------------------------------------------------------------
+
+def _analyze(conn, statement, row_counts, min_rows, tables):
+    aliases = _table_aliases(statement.sql, tables)
+    params = _sample_params(conn, statement.sql, aliases)
+    plan = explain(conn, statement.sql, params)
+    return aliases, params, plan, find_problems(plan, aliases, row_counts, min_rows)
+
+
+def _choose_index(trials: List[Tuple[IndexSpec, int, Optional[float]]], problems: int,
+                  before_ms: Optional[float]) -> Optional[IndexSpec]:
+    """Pick the narrowest index that removes the most problems
+
+    An index that removes no problem is only chosen if it at least halves
+    the execution time; timing noise between similar candidates is ignored.
+    """
+    fewest = min((count for _, count, _ in trials), default=problems)
+    if fewest < problems:
+        # Removing a scan is no win if the index makes the statement slower
+        pool = [(spec, ms) for spec, count, ms in trials if count == fewest and
+                (ms is None or before_ms is None or ms <= before_ms * 1.25 + 0.5)]
+    elif before_ms is not None:
+        pool = [(spec, ms) for spec, count, ms in trials
+                if ms is not None and ms < before_ms / 2 and before_ms - ms > 1.0]
+    else:
+        pool = []
+    if not pool:
+        return None
+
+    timed = [ms for _, ms in pool if ms is not None]
+    fastest = min(timed) if timed else None
+    if fastest is not None:
+        pool = [(spec, ms) for spec, ms in pool if ms is None or ms <= fastest * 1.2 + 0.05]
+    return min(pool, key=lambda item: (len(item[0].columns), item[1] or 0))[0]
+
+
+def advise(conn: sqlite3.Connection, statements: List[SqlStatement], min_rows: int = 1000) -> Dict[str, Any]:
+    """Analyze every statement and choose indexes for the problematic ones"""
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    row_counts = {t: conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in tables}
+
+    results, skipped = [], []
+    for statement in statements:
+        try:
+            aliases, params, plan, problems = _analyze(conn, statement, row_counts, min_rows, tables)
+        except sqlite3.Error as e:
+            skipped.append((statement, str(e)))
+            continue
+        result = {'statement': statement, 'aliases': aliases, 'params': params,
+                  'problems': problems, 'plan': [d for _, _, d in plan],
+                  'before_ms': time_statement(conn, statement.sql, params), 'index': None}
+        results.append(result)
+        if not problems:
+            continue
+
+        trials = []
+        for table in dict.fromkeys(t for _, t in problems if t in tables):
+            existing = _existing_indexes(conn, table)
+            for spec in candidate_indexes(conn, statement.sql, table, aliases):
+                if _covers(existing, spec):
+                    continue
+                conn.execute(spec.create_sql('index_advisor_candidate'))
+                try:
+                    trial_plan = explain(conn, statement.sql, params)
+                    trial = find_problems(trial_plan, aliases, row_counts, min_rows)
+                    trials.append((spec, len(trial), time_statement(conn, statement.sql, params)))
+                finally:
+                    conn.execute("DROP INDEX index_advisor_candidate")
+        best = _choose_index(trials, len(problems), result['before_ms'])
+        result['index'] = best
+
+    # Merge: keep one index per column list; drop ones that are a prefix of another
+    chosen = list(dict.fromkeys(r['index'] for r in results if r['index']))
+    recommended = []
+    for spec in chosen:
+        wider = [o for o in chosen if o is not spec and o.table == spec.table and o.where == spec.where
+                 and len(o.columns) > len(spec.columns) and o.columns[:len(spec.columns)] == spec.columns]
+        if not wider:
+            recommended.append(spec)
+
+    for spec in recommended:
+        conn.execute(spec.create_sql())
+    conn.execute("ANALYZE")
+    for result in results:
+        if result['problems']:
+            plan = explain(conn, result['statement'].sql, result['params'])
+            result['after_problems'] = find_problems(plan, result['aliases'], row_counts, min_rows)
+            result['after_plan'] = [d for _, _, d in plan]
+            result['after_ms'] = time_statement(conn, result['statement'].sql, result['params'])
+
+    return {
+        'results': results,
+        'skipped': skipped,
+        'recommended': recommended,
+        'redundant': find_redundant_indexes(conn),
+        'row_counts': row_counts,
+    }
+
+
+def render_migration(recommended: List[IndexSpec], redundant: List[Tuple[str, str, str]]) -> Path:
+    """Write the recommendations as the next numbered migration script"""
+    version = max([m.version for m in discover_migrations()] + [0]) + 1
+    path = MIGRATIONS_DIR / f"{version:04d}_advisor_indexes.py"
+
+    lines = [
+        f"# database/migrations/{path.name}",
+        '"""Indexes recommended by the index advisor (python -m database.index_advisor)"""',
+        '',
+        '# Redundant: each is a prefix of another index on the same table',
+        'DROP_INDEXES = [',
+    ]
+    lines += [f"    '{name}',  # covered by {other}" for _, name, other in redundant]
+    lines += [']', '', 'CREATE_INDEXES = [']
+    lines += [f'    "{spec.create_sql()}",' for spec in recommended]
+    lines += [
+        ']',
+        '',
+        '',
+        'def upgrade(conn):',
+        '    """Drop redundant indexes and create the recommended ones"""',
+        '    for name in DROP_INDEXES:',
+        '        conn.execute(f"DROP INDEX IF EXISTS {name}")',
+        '    for statement in CREATE_INDEXES:',
+        '        conn.execute(statement)',
+        '',
+    ]
+    path.write_text('\n'.join(lines), encoding='utf-8')
+    return path
+
+
+def print_report(report: Dict[str, Any], show_all: bool = False):
+    """Print flagged statements with before/after timings"""
+    flagged = [r for r in report['results'] if r['problems']]
+    for result in report['results'] if show_all else flagged:
+        statement = result['statement']
+        print(f"\n{statement.source}:{statement.lineno} ({statement.variant})")
+        print(f"  {' '.join(statement.sql.split())[:160]}")
+        print(f"  plan: {' | '.join(result['plan'])}")
+        for kind, table in result['problems']:
+            print(f"  ⚠️ {kind} on {table}")
+        if result['problems']:
+            after = result.get('after_problems', result['problems'])
+            before_ms, after_ms = result['before_ms'], result.get('after_ms')
+            timing = f"{before_ms:.2f} ms -> {after_ms:.2f} ms" if before_ms is not None and after_ms is not None \
+                else "not timed"
+            status = '✅ resolved' if not after else f"{len(after)} problem(s) remain"
+            print(f"  {status}; {timing}")
+
+    print(f"\nStatements analyzed: {len(report['results'])}, flagged: {len(flagged)}, "
+          f"skipped: {len(report['skipped'])}")
+    for statement, error in report['skipped']:
+        print(f"  skipped {statement.source}:{statement.lineno}: {error}")
+
+    print("\nRecommended indexes:")
+    for spec in report['recommended']:
+        print(f"  {spec.create_sql()}")
+    if report['redundant']:
+        print("\nRedundant indexes:")
+        for table, name, other in report['redundant']:
+            print(f"  {table}.{name} (covered by {other})")
+    duplicates = find_duplicate_index_statements()
+    if duplicates:
+        print("\nDuplicate CREATE INDEX statements:")
+        for source, name, lineno in duplicates:
+            print(f"  {source}:{lineno} {name}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="EXPLAIN QUERY PLAN index advisor")
+    parser.add_argument('--scale', type=float, default=1.0, help="Dataset size multiplier")
+    parser.add_argument('--min-rows', type=int, default=1000, help="Ignore full scans of smaller tables")
+    parser.add_argument('--show-all', action='store_true', help="Also list statements without problems")
+    parser.add_argument('--write-migration', action='store_true',
+                        help="Write the recommendations as the next schema migration")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='index_advisor_')
+    try:
+        print("🔧 Building scratch dataset...")
+        conn = build_dataset(str(Path(workdir) / 'advisor.db'), scale=args.scale)
+        statements = extract_statements(conn=conn)
+        print(f"🔍 Analyzing {len(statements)} statements...")
+        report = advise(conn, statements, min_rows=args.min_rows)
+        conn.close()
+        print_report(report, show_all=args.show_all)
+
+        if args.write_migration:
+            if report['recommended'] or report['redundant']:
+                print(f"\n📝 Wrote {render_migration(report['recommended'], report['redundant'])}")
+            else:
+                print("\nNothing to migrate")
+        return 0
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,674 @@
+# database/migrations/0001_initial_schema.py
+"""Create the core POS, photo, truck repair and payment tables"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Schema as of this migration; later changes need a migration of their own
+CREATE_STATEMENTS = [
+    # Users table for authentication
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        password_hash TEXT NOT NULL,
+        role TEXT NOT NULL DEFAULT 'user',
+        full_name TEXT,
+        email TEXT,
+        phone TEXT,
+        specialization TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        last_login TEXT,
+        is_active INTEGER DEFAULT 1,
+        notes TEXT
+    )
+    """,
+    # Customers table
+    """
+    CREATE TABLE IF NOT EXISTS customers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        first_name TEXT NOT NULL,
+        last_name TEXT NOT NULL,
+        name TEXT GENERATED ALWAYS AS (first_name || ' ' || last_name) STORED,
+        email TEXT,
+        phone TEXT,
+        address TEXT,
+        city TEXT,
+        state TEXT,
+        zip_code TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        notes TEXT
+    )
+    """,
+    # Services table - Core service management
+    """
+    CREATE TABLE IF NOT EXISTS services (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        customer_id INTEGER NOT NULL,
+        vehicle_id INTEGER NOT NULL,
+        service_type TEXT NOT NULL,
+        description TEXT,
+        status TEXT DEFAULT 'pending',
+        priority TEXT DEFAULT 'normal',
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        scheduled_date TEXT,
+        completed_date TEXT,
+        estimated_cost REAL DEFAULT 0.0,
+        actual_cost REAL DEFAULT 0.0,
+        labor_hours REAL DEFAULT 0.0,
+        technician_id INTEGER,
+        service_bay TEXT,
+        mileage_in INTEGER,
+        mileage_out INTEGER,
+        customer_complaints TEXT,
+        work_performed TEXT,
+        quality_check_status TEXT DEFAULT 'pending',
+        customer_satisfaction INTEGER,
+        warranty_info TEXT,
+        insurance_info TEXT,
+        notes TEXT,
+        tags TEXT,
+        FOREIGN KEY (customer_id) REFERENCES customers (id),
+        FOREIGN KEY (vehicle_id) REFERENCES vehicles (id),
+        FOREIGN KEY (technician_id) REFERENCES users (id)
+    )
+    """,
+    # Service Items table for detailed service breakdown
+    """
+    CREATE TABLE IF NOT EXISTS service_items (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        service_id INTEGER NOT NULL,
+        item_name TEXT NOT NULL,
+        description TEXT,
+        quantity REAL DEFAULT 1.0,
+        unit_price REAL DEFAULT 0.0,
+        total_price REAL DEFAULT 0.0,
+        category TEXT DEFAULT 'service',
+        part_number TEXT,
+        supplier TEXT,
+        warranty_period INTEGER,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (service_id) REFERENCES services (id) ON DELETE CASCADE
+    )
+    """,
+    # Work Orders table for detailed task management
+    """
+    CREATE TABLE IF NOT EXISTS work_orders (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        work_order_number TEXT UNIQUE NOT NULL,
+        service_id INTEGER NOT NULL,
+        status TEXT DEFAULT 'created',
+        priority TEXT DEFAULT 'normal',
+        assigned_technician INTEGER,
+        created_by TEXT,
+        instructions TEXT,
+        estimated_time INTEGER,
+        actual_time INTEGER,
+        materials TEXT,
+        steps TEXT,
+        quality_checkpoints TEXT,
+        notes TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        completed_at TEXT,
+        FOREIGN KEY (service_id) REFERENCES services (id) ON DELETE CASCADE,
+        FOREIGN KEY (assigned_technician) REFERENCES users (id)
+    )
+    """,
+    # Appointments table for scheduling
+    """
+    CREATE TABLE IF NOT EXISTS appointments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        customer_id INTEGER NOT NULL,
+        vehicle_id INTEGER NOT NULL,
+        service_id INTEGER,
+        appointment_date TEXT NOT NULL,
+        appointment_time TEXT NOT NULL,
+        estimated_duration INTEGER DEFAULT 120,
+        service_type TEXT NOT NULL,
+        description TEXT,
+        status TEXT DEFAULT 'scheduled',
+        assigned_technician INTEGER,
+        assigned_bay TEXT,
+        reminder_sent INTEGER DEFAULT 0,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        notes TEXT,
+        FOREIGN KEY (customer_id) REFERENCES customers (id),
+        FOREIGN KEY (vehicle_id) REFERENCES vehicles (id),
+        FOREIGN KEY (service_id) REFERENCES services (id),
+        FOREIGN KEY (assigned_technician) REFERENCES users (id)
+    )
+    """,
+    # Vehicles table
+    """
+    CREATE TABLE IF NOT EXISTS vehicles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        customer_id INTEGER NOT NULL,
+        make TEXT NOT NULL,
+        model TEXT NOT NULL,
+        year INTEGER,
+        vin TEXT UNIQUE,
+        license_plate TEXT,
+        color TEXT,
+        mileage INTEGER,
+        vehicle_type TEXT DEFAULT 'car',
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        notes TEXT,
+        FOREIGN KEY (customer_id) REFERENCES customers (id)
+    )
+    """,
+    # Enhanced Vehicle Photos Table
+    """
+    CREATE TABLE IF NOT EXISTS vehicle_photos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        vehicle_id INTEGER NOT NULL,
+        customer_id INTEGER NOT NULL,
+        service_id INTEGER,
+        category VARCHAR(50) NOT NULL DEFAULT 'general',
+        angle VARCHAR(100),
+        description TEXT,
+        filename VARCHAR(255) NOT NULL,
+        file_path VARCHAR(500) NOT NULL,
+        file_size INTEGER,
+        mime_type VARCHAR(100) DEFAULT 'image/jpeg',
+        thumbnail_path VARCHAR(500),
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        created_by VARCHAR(100),
+        metadata TEXT,
+        image_width INTEGER,
+        image_height INTEGER,
+        is_damage_photo INTEGER DEFAULT 0,
+        damage_severity TEXT,
+        repair_required INTEGER DEFAULT 0,
+        FOREIGN KEY (vehicle_id) REFERENCES vehicles(id) ON DELETE CASCADE,
+        FOREIGN KEY (customer_id) REFERENCES customers(id) ON DELETE CASCADE,
+        FOREIGN KEY (service_id) REFERENCES services(id) ON DELETE SET NULL
+    )
+    """,
+    # Photo Sessions Table
+    """
+    CREATE TABLE IF NOT EXISTS photo_sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        vehicle_id INTEGER NOT NULL,
+        customer_id INTEGER NOT NULL,
+        service_id INTEGER,
+        session_type VARCHAR(50) NOT NULL,
+        session_name VARCHAR(200),
+        start_time DATETIME DEFAULT CURRENT_TIMESTAMP,
+        end_time DATETIME,
+        created_by VARCHAR(100),
+        notes TEXT,
+        total_photos INTEGER DEFAULT 0,
+        status VARCHAR(50) DEFAULT 'active',
+        location TEXT,
+        weather_conditions TEXT,
+        lighting_conditions TEXT,
+        FOREIGN KEY (vehicle_id) REFERENCES vehicles(id) ON DELETE CASCADE,
+        FOREIGN KEY (customer_id) REFERENCES customers(id) ON DELETE CASCADE,
+        FOREIGN KEY (service_id) REFERENCES services(id) ON DELETE SET NULL
+    )
+    """,
+    # Link photos to sessions
+    """
+    CREATE TABLE IF NOT EXISTS session_photos (
+        session_id INTEGER NOT NULL,
+        photo_id INTEGER NOT NULL,
+        sequence_order INTEGER DEFAULT 0,
+        photo_purpose TEXT,
+        PRIMARY KEY (session_id, photo_id),
+        FOREIGN KEY (session_id) REFERENCES photo_sessions(id) ON DELETE CASCADE,
+        FOREIGN KEY (photo_id) REFERENCES vehicle_photos(id) ON DELETE CASCADE
+    )
+    """,
+    # Photos table (keeping for backwards compatibility)
+    """
+    CREATE TABLE IF NOT EXISTS photos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        vehicle_id INTEGER,
+        service_id INTEGER,
+        file_path TEXT NOT NULL,
+        filename TEXT NOT NULL,
+        description TEXT,
+        photo_type TEXT DEFAULT 'general',
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        file_size INTEGER,
+        image_width INTEGER,
+        image_height INTEGER,
+        FOREIGN KEY (vehicle_id) REFERENCES vehicles (id),
+        FOREIGN KEY (service_id) REFERENCES services (id)
+    )
+    """,
+    # Damage Reports table
+    """
+    CREATE TABLE IF NOT EXISTS damage_reports (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        customer_id INTEGER NOT NULL,
+        vehicle_id INTEGER NOT NULL,
+        service_id INTEGER,
+        vehicle_type TEXT NOT NULL,
+        damage_points TEXT DEFAULT '[]',
+        total_estimated_cost REAL DEFAULT 0.0,
+        inspector_name TEXT,
+        inspection_date TEXT DEFAULT CURRENT_TIMESTAMP,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        notes TEXT DEFAULT '',
+        status TEXT DEFAULT 'active',
+        severity_level TEXT DEFAULT 'minor',
+        repair_priority TEXT DEFAULT 'normal',
+        insurance_claim_number TEXT,
+        FOREIGN KEY (customer_id) REFERENCES customers (id),
+        FOREIGN KEY (vehicle_id) REFERENCES vehicles (id),
+        FOREIGN KEY (service_id) REFERENCES services (id)
+    )
+    """,
+    # TRUCK REPAIR MANAGEMENT TABLES
+    # Material Forms table
+    """
+    CREATE TABLE IF NOT EXISTS material_forms (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        form_number TEXT UNIQUE,
+        vehicle_registration TEXT,
+        chassis_number TEXT,
+        engine_number TEXT,
+        date TEXT NOT NULL,
+        requester_name TEXT NOT NULL,
+        requester_department TEXT,
+        recipient_name TEXT,
+        recipient_department TEXT,
+        total_items INTEGER DEFAULT 0,
+        total_cost REAL DEFAULT 0.0,
+        service_id INTEGER,
+        project_code TEXT,
+        approval_status TEXT DEFAULT 'pending',
+        approved_by TEXT,
+        approved_date TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        status TEXT DEFAULT 'pending',
+        notes TEXT,
+        FOREIGN KEY (service_id) REFERENCES services (id)
+    )
+    """,
+    # Material Form Items table
+    """
+    CREATE TABLE IF NOT EXISTS material_form_items (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        form_id INTEGER NOT NULL,
+        item_number INTEGER,
+        material_description TEXT NOT NULL,
+        material_code TEXT,
+        thai_description TEXT,
+        quantity INTEGER DEFAULT 0,
+        unit TEXT DEFAULT 'pieces',
+        unit_cost REAL DEFAULT 0.0,
+        total_cost REAL DEFAULT 0.0,
+        supplier TEXT,
+        part_category TEXT,
+        location_code TEXT,
+        minimum_stock INTEGER DEFAULT 0,
+        current_stock INTEGER DEFAULT 0,
+        lead_time_days INTEGER DEFAULT 0,
+        notes TEXT,
+        FOREIGN KEY (form_id) REFERENCES material_forms (id) ON DELETE CASCADE
+    )
+    """,
+    # Repair Quotes table
+    """
+    CREATE TABLE IF NOT EXISTS repair_quotes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        quote_number TEXT UNIQUE NOT NULL,
+        vehicle_registration TEXT,
+        chassis_number TEXT,
+        engine_number TEXT,
+        damage_date TEXT,
+        quote_date TEXT NOT NULL,
+        valid_until TEXT,
+        customer_name TEXT,
+        customer_contact TEXT,
+        customer_address TEXT,
+        vehicle_make TEXT,
+        vehicle_model TEXT,
+        vehicle_year INTEGER,
+        vehicle_color TEXT,
+        vehicle_mileage INTEGER,
+        repair_type TEXT DEFAULT 'general',
+        damage_description TEXT,
+        repair_method TEXT,
+        parts_subtotal REAL DEFAULT 0,
+        labor_subtotal REAL DEFAULT 0,
+        paint_subtotal REAL DEFAULT 0,
+        total_amount REAL DEFAULT 0,
+        tax_rate REAL DEFAULT 7.0,
+        tax_amount REAL DEFAULT 0,
+        discount_amount REAL DEFAULT 0,
+        final_amount REAL DEFAULT 0,
+        status TEXT DEFAULT 'new',
+        service_id INTEGER,
+        prepared_by TEXT,
+        approved_by TEXT,
+        approved_date TEXT,
+        estimated_completion_days INTEGER DEFAULT 7,
+        warranty_period INTEGER DEFAULT 90,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        notes TEXT,
+        FOREIGN KEY (service_id) REFERENCES services (id)
+    )
+    """,
+    # Repair Quote Items table
+    """
+    CREATE TABLE IF NOT EXISTS repair_quote_items (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        quote_id INTEGER NOT NULL,
+        item_number INTEGER,
+        category TEXT DEFAULT 'parts',
+        part_code TEXT,
+        description TEXT NOT NULL,
+        thai_description TEXT,
+        color TEXT,
+        side TEXT,
+        condition_type TEXT,
+        quantity INTEGER DEFAULT 1,
+        unit TEXT DEFAULT 'piece',
+        unit_price REAL DEFAULT 0,
+        labor_hours REAL DEFAULT 0,
+        labor_rate REAL DEFAULT 0,
+        total_price REAL DEFAULT 0,
+        supplier TEXT,
+        part_origin TEXT,
+        estimated_delivery_days INTEGER DEFAULT 3,
+        warranty_period INTEGER DEFAULT 30,
+        notes TEXT,
+        FOREIGN KEY (quote_id) REFERENCES repair_quotes (id) ON DELETE CASCADE
+    )
+    """,
+    # Truck Parts Inventory table (for parts management)
+    """
+    CREATE TABLE IF NOT EXISTS truck_parts_inventory (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        part_code TEXT UNIQUE NOT NULL,
+        part_name_thai TEXT NOT NULL,
+        part_name_english TEXT,
+        category TEXT,
+        supplier TEXT,
+        cost_price REAL DEFAULT 0,
+        selling_price REAL DEFAULT 0,
+        quantity_in_stock INTEGER DEFAULT 0,
+        min_stock_level INTEGER DEFAULT 0,
+        location TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        is_active INTEGER DEFAULT 1
+    )
+    """,
+    # PAYMENT SYSTEM TABLES
+    # Payments table
+    """
+    CREATE TABLE IF NOT EXISTS payments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        payment_number TEXT UNIQUE,
+        service_id INTEGER NOT NULL,
+        customer_id INTEGER NOT NULL,
+        vehicle_id INTEGER,
+        payment_method TEXT NOT NULL,
+        amount REAL NOT NULL,
+        fees REAL DEFAULT 0.0,
+        tax_amount REAL DEFAULT 0.0,
+        discount_amount REAL DEFAULT 0.0,
+        total_amount REAL NOT NULL,
+        currency TEXT DEFAULT 'THB',
+        exchange_rate REAL DEFAULT 1.0,
+        status TEXT DEFAULT 'pending',
+        processed_date TEXT,
+        due_date TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        receipt_number TEXT,
+        reference_number TEXT,
+        bank_reference TEXT,
+        processed_by TEXT,
+        payment_gateway TEXT,
+        gateway_transaction_id TEXT,
+        notes TEXT,
+        FOREIGN KEY (service_id) REFERENCES services (id),
+        FOREIGN KEY (customer_id) REFERENCES customers (id),
+        FOREIGN KEY (vehicle_id) REFERENCES vehicles (id)
+    )
+    """,
+    # Insurance Claims table
+    """
+    CREATE TABLE IF NOT EXISTS insurance_claims (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        claim_number TEXT UNIQUE NOT NULL,
+        service_id INTEGER,
+        customer_id INTEGER NOT NULL,
+        vehicle_id INTEGER NOT NULL,
+        insurance_company TEXT NOT NULL,
+        policy_number TEXT,
+        claim_type TEXT DEFAULT 'repair',
+        incident_date TEXT,
+        incident_location TEXT,
+        incident_description TEXT,
+        police_report_number TEXT,
+        claim_amount REAL DEFAULT 0.0,
+        approved_amount REAL DEFAULT 0.0,
+        deductible REAL DEFAULT 0.0,
+        excess_amount REAL DEFAULT 0.0,
+        status TEXT DEFAULT 'pending',
+        adjuster_name TEXT,
+        adjuster_contact TEXT,
+        submitted_date TEXT,
+        approved_date TEXT,
+        settlement_date TEXT,
+        payment_date TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        documents_submitted TEXT,
+        notes TEXT,
+        FOREIGN KEY (service_id) REFERENCES services (id),
+        FOREIGN KEY (customer_id) REFERENCES customers (id),
+        FOREIGN KEY (vehicle_id) REFERENCES vehicles (id)
+    )
+    """,
+    # Installment Plans table
+    """
+    CREATE TABLE IF NOT EXISTS installment_plans (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        plan_number TEXT UNIQUE,
+        service_id INTEGER NOT NULL,
+        customer_id INTEGER NOT NULL,
+        vehicle_id INTEGER,
+        total_amount REAL NOT NULL,
+        down_payment REAL DEFAULT 0.0,
+        financed_amount REAL NOT NULL,
+        monthly_payment REAL NOT NULL,
+        number_of_months INTEGER NOT NULL,
+        interest_rate REAL DEFAULT 0.0,
+        processing_fee REAL DEFAULT 0.0,
+        insurance_fee REAL DEFAULT 0.0,
+        plan_start_date TEXT,
+        plan_end_date TEXT,
+        next_payment_date TEXT,
+        payments_made INTEGER DEFAULT 0,
+        remaining_balance REAL,
+        status TEXT DEFAULT 'active',
+        bank_name TEXT,
+        account_number TEXT,
+        approval_reference TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        notes TEXT,
+        FOREIGN KEY (service_id) REFERENCES services (id),
+        FOREIGN KEY (customer_id) REFERENCES customers (id),
+        FOREIGN KEY (vehicle_id) REFERENCES vehicles (id)
+    )
+    """,
+    # Installment Payments table
+    """
+    CREATE TABLE IF NOT EXISTS installment_payments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        plan_id INTEGER NOT NULL,
+        payment_number INTEGER NOT NULL,
+        due_date TEXT NOT NULL,
+        amount_due REAL NOT NULL,
+        amount_paid REAL DEFAULT 0.0,
+        late_fee REAL DEFAULT 0.0,
+        payment_date TEXT,
+        payment_method TEXT,
+        reference_number TEXT,
+        status TEXT DEFAULT 'pending',
+        notes TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (plan_id) REFERENCES installment_plans (id) ON DELETE CASCADE
+    )
+    """,
+    # Quality Checks table
+    """
+    CREATE TABLE IF NOT EXISTS quality_checks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        service_id INTEGER NOT NULL,
+        work_order_id INTEGER,
+        inspector_id INTEGER,
+        checklist_items TEXT,
+        overall_score INTEGER DEFAULT 0,
+        status TEXT DEFAULT 'pending',
+        issues_found TEXT,
+        recommendations TEXT,
+        customer_signature_required INTEGER DEFAULT 1,
+        customer_signature_received INTEGER DEFAULT 0,
+        completed_at TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        notes TEXT,
+        FOREIGN KEY (service_id) REFERENCES services (id),
+        FOREIGN KEY (work_order_id) REFERENCES work_orders (id),
+        FOREIGN KEY (inspector_id) REFERENCES users (id)
+    )
+    """,
+    # Warranties table
+    """
+    CREATE TABLE IF NOT EXISTS warranties (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        warranty_number TEXT UNIQUE,
+        service_id INTEGER NOT NULL,
+        vehicle_id INTEGER NOT NULL,
+        customer_id INTEGER NOT NULL,
+        warranty_type TEXT NOT NULL,
+        description TEXT,
+        coverage_start_date TEXT,
+        coverage_end_date TEXT,
+        mileage_coverage INTEGER,
+        current_mileage INTEGER,
+        terms_and_conditions TEXT,
+        exclusions TEXT,
+        status TEXT DEFAULT 'active',
+        claims_count INTEGER DEFAULT 0,
+        max_claims INTEGER DEFAULT 999,
+        transferable INTEGER DEFAULT 0,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        notes TEXT,
+        FOREIGN KEY (service_id) REFERENCES services (id),
+        FOREIGN KEY (vehicle_id) REFERENCES vehicles (id),
+        FOREIGN KEY (customer_id) REFERENCES customers (id)
+    )
+    """,
+    # Photo system indexes
+    "CREATE INDEX IF NOT EXISTS idx_vehicle_photos_vehicle_id ON vehicle_photos(vehicle_id)",
+    "CREATE INDEX IF NOT EXISTS idx_vehicle_photos_customer_id ON vehicle_photos(customer_id)",
+    "CREATE INDEX IF NOT EXISTS idx_vehicle_photos_category ON vehicle_photos(category)",
+    "CREATE INDEX IF NOT EXISTS idx_vehicle_photos_timestamp ON vehicle_photos(timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_photo_sessions_vehicle_id ON photo_sessions(vehicle_id)",
+    "CREATE INDEX IF NOT EXISTS idx_photo_sessions_session_type ON photo_sessions(session_type)",
+    "CREATE INDEX IF NOT EXISTS idx_session_photos_session_id ON session_photos(session_id)",
+    # Truck repair indexes
+    "CREATE INDEX IF NOT EXISTS idx_material_forms_date ON material_forms(date)",
+    "CREATE INDEX IF NOT EXISTS idx_material_forms_status ON material_forms(status)",
+    "CREATE INDEX IF NOT EXISTS idx_material_forms_service_id ON material_forms(service_id)",
+    "CREATE INDEX IF NOT EXISTS idx_repair_quotes_quote_number ON repair_quotes(quote_number)",
+    "CREATE INDEX IF NOT EXISTS idx_repair_quotes_status ON repair_quotes(status)",
+    "CREATE INDEX IF NOT EXISTS idx_repair_quotes_service_id ON repair_quotes(service_id)",
+    "CREATE INDEX IF NOT EXISTS idx_truck_parts_part_code ON truck_parts_inventory(part_code)",
+    "CREATE INDEX IF NOT EXISTS idx_truck_parts_category ON truck_parts_inventory(category)",
+    # Payment system indexes
+    "CREATE INDEX IF NOT EXISTS idx_payments_service_id ON payments(service_id)",
+    "CREATE INDEX IF NOT EXISTS idx_payments_customer_id ON payments(customer_id)",
+    "CREATE INDEX IF NOT EXISTS idx_payments_status ON payments(status)",
+    "CREATE INDEX IF NOT EXISTS idx_payments_payment_method ON payments(payment_method)",
+    "CREATE INDEX IF NOT EXISTS idx_payments_created_at ON payments(created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_insurance_claims_customer_id ON insurance_claims(customer_id)",
+    "CREATE INDEX IF NOT EXISTS idx_insurance_claims_status ON insurance_claims(status)",
+    "CREATE INDEX IF NOT EXISTS idx_installment_plans_customer_id ON installment_plans(customer_id)",
+    "CREATE INDEX IF NOT EXISTS idx_installment_plans_status ON installment_plans(status)",
+    # Insurance claims indexes
+    "CREATE INDEX IF NOT EXISTS idx_insurance_claims_service_id ON insurance_claims(service_id)",
+    "CREATE INDEX IF NOT EXISTS idx_insurance_claims_vehicle_id ON insurance_claims(vehicle_id)",
+    "CREATE INDEX IF NOT EXISTS idx_insurance_claims_claim_number ON insurance_claims(claim_number)",
+    "CREATE INDEX IF NOT EXISTS idx_insurance_claims_insurance_company ON insurance_claims(insurance_company)",
+    "CREATE INDEX IF NOT EXISTS idx_insurance_claims_submitted_date ON insurance_claims(submitted_date)",
+    "CREATE INDEX IF NOT EXISTS idx_insurance_claims_approved_date ON insurance_claims(approved_date)",
+    # Installment plans indexes
+    "CREATE INDEX IF NOT EXISTS idx_installment_plans_service_id ON installment_plans(service_id)",
+    "CREATE INDEX IF NOT EXISTS idx_installment_plans_vehicle_id ON installment_plans(vehicle_id)",
+    "CREATE INDEX IF NOT EXISTS idx_installment_plans_next_payment_date ON installment_plans(next_payment_date)",
+    "CREATE INDEX IF NOT EXISTS idx_installment_plans_created_at ON installment_plans(created_at)",
+]
+
+SETTINGS_TABLE = """
+    CREATE TABLE settings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        category TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value TEXT,
+        description TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(category, key)
+    )
+"""
+SETTINGS_COLUMNS = {'category', 'key', 'value', 'description', 'created_at', 'updated_at'}
+
+
+def fix_settings_table(conn):
+    """Create settings, or rebuild a pre-category settings table keeping its values"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='settings'")
+    if not cursor.fetchone():
+        cursor.execute(SETTINGS_TABLE)
+        return
+
+    cursor.execute("PRAGMA table_info(settings)")
+    old_columns = [col[1] for col in cursor.fetchall()]
+    if SETTINGS_COLUMNS.issubset(old_columns):
+        return
+
+    logger.info("Migrating settings table to the category/key schema")
+    cursor.execute("SELECT * FROM settings")
+    existing_data = cursor.fetchall()
+    cursor.execute("DROP TABLE settings")
+    cursor.execute(SETTINGS_TABLE)
+
+    for row in existing_data:
+        old_row = dict(zip(old_columns, row))
+        key = old_row.get('key', old_row.get('name', f"setting_{old_row.get('id', 'unknown')}"))
+        try:
+            cursor.execute("""
+                INSERT INTO settings (category, key, value, description)
+                VALUES (?, ?, ?, ?)
+            """, (old_row.get('category', 'system'), key, old_row.get('value', ''),
+                  old_row.get('description', '')))
+        except Exception as e:
+            logger.warning(f"Could not migrate setting {key}: {e}")
+
+
+def upgrade(conn):
+    """Create all tables and indexes (safe on databases that already have them)"""
+    for statement in CREATE_STATEMENTS:
+        conn.execute(statement)
+    fix_settings_table(conn)
@@ -0,0 +1,27 @@
+# database/migrations/0002_customer_document_fields.py
+"""Add Thai ID card and driver license columns to customers"""
+
+CUSTOMER_DOCUMENT_COLUMNS = [
+    ('thai_id_number', 'TEXT'),
+    ('thai_name', 'TEXT'),
+    ('english_name', 'TEXT'),
+    ('date_of_birth', 'TEXT'),
+    ('id_card_address', 'TEXT'),
+    ('issue_date', 'TEXT'),
+    ('expiry_date', 'TEXT'),
+    ('driver_license_number', 'TEXT'),
+    ('license_class', 'TEXT'),
+    ('english_address', 'TEXT'),
+    ('document_type', 'TEXT')
+]
+
+
+def upgrade(conn):
+    """Add any document columns the customers table is missing"""
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(customers)")
+    columns = {col[1] for col in cursor.fetchall()}
+
+    for column_name, column_type in CUSTOMER_DOCUMENT_COLUMNS:
+        if column_name not in columns:
+            cursor.execute(f"ALTER TABLE customers ADD COLUMN {column_name} {column_type}")
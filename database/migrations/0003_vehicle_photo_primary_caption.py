@@ -0,0 +1,14 @@
+# database/migrations/0003_vehicle_photo_primary_caption.py
+"""Add primary photo flag and caption to vehicle_photos"""
+
+
+def upgrade(conn):
+    """Add is_primary and caption columns if they are missing"""
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(vehicle_photos)")
+    columns = {col[1] for col in cursor.fetchall()}
+
+    if 'is_primary' not in columns:
+        cursor.execute("ALTER TABLE vehicle_photos ADD COLUMN is_primary INTEGER DEFAULT 0")
+    if 'caption' not in columns:
+        cursor.execute("ALTER TABLE vehicle_photos ADD COLUMN caption TEXT")
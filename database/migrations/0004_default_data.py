@@ -0,0 +1,84 @@
+# database/migrations/0004_default_data.py
+"""Seed default users, settings and the truck parts inventory"""
+
+import bcrypt
+
+# Seed data as of this migration; each table is only seeded while empty
+# (username, password, role, full_name, email)
+DEFAULT_USERS = [
+    ("admin", "admin123", "admin", "System Administrator", "admin@olservice.com"),
+    ("mechanic", "mech123", "technician", "John Mechanic", "mechanic@olservice.com"),
+    ("manager", "manager123", "manager", "Service Manager", "manager@olservice.com"),
+]
+
+# (category, key, value, description)
+DEFAULT_SETTINGS = [
+    ("ui", "theme", "default", "Application theme"),
+    ("ui", "window_width", "1200", "Main window width"),
+    ("ui", "window_height", "800", "Main window height"),
+    ("camera", "default_camera", "0", "Default camera device ID"),
+    ("camera", "photo_quality", "high", "Default photo quality setting"),
+    ("camera", "auto_thumbnail", "true", "Generate thumbnails automatically"),
+    ("photos", "required_angles", "front,rear,driver_side,passenger_side", "Required photo angles for check-in"),
+    ("photos", "max_file_size", "10485760", "Maximum photo file size in bytes (10MB)"),
+    ("truck_repair", "default_tax_rate", "7", "Default tax rate percentage for quotes"),
+    ("truck_repair", "quote_validity_days", "30", "Quote validity period in days"),
+    ("truck_repair", "auto_generate_quote_number", "true", "Auto-generate quote numbers"),
+    ("truck_repair", "require_approval", "true", "Require approval for material forms"),
+    ("system", "backup_enabled", "true", "Enable automatic backups"),
+    ("system", "backup_interval", "24", "Backup interval in hours"),
+]
+
+# (part_code, part_name_thai, part_name_english, category, supplier,
+#  cost_price, selling_price, quantity_in_stock, min_stock_level, location)
+TRUCK_PARTS = [
+    ("MIR1", "ขากระจก", "Mirror Bracket", "exterior", "Local Supplier", 150.0, 300.0, 50, 10, "A-01"),
+    ("HEA1", "ไฟหน้า", "Headlight", "lighting", "OEM Parts", 800.0, 1500.0, 20, 5, "B-02"),
+    ("DOO1", "ประตู", "Door", "body", "Body Parts Co", 2500.0, 4500.0, 10, 2, "C-01"),
+    ("WIN1", "กระจก", "Window/Glass", "glass", "Glass Specialist", 600.0, 1200.0, 15, 3, "D-01"),
+    ("TAI1", "ไฟท้าย", "Tail Light", "lighting", "OEM Parts", 450.0, 850.0, 25, 5, "B-03"),
+    ("FRO1", "กระจังหน้า", "Front Grille", "exterior", "Local Supplier", 1200.0, 2200.0, 8, 2, "A-02"),
+    ("FRO2", "กันชนหน้า", "Front Bumper", "body", "Body Parts Co", 3500.0, 6000.0, 6, 1, "C-02"),
+    ("TUR1", "ไฟเลี้ยว", "Turn Signal", "lighting", "OEM Parts", 250.0, 480.0, 30, 8, "B-04"),
+    ("DOO2", "เบ้ามือโด", "Door Handle Housing", "hardware", "Hardware Plus", 180.0, 350.0, 40, 10, "E-01"),
+    ("WIN2", "ที่ปัดน้ำฝน", "Windshield Wiper", "maintenance", "Auto Parts", 120.0, 250.0, 60, 15, "F-01"),
+    ("LIG1", "แก้มไฟหรือหน้า", "Light Panel or Front Cover", "lighting", "OEM Parts", 350.0, 650.0, 18, 4, "B-05"),
+    ("REA1", "พลาสติกบังฝุ่นหลัง", "Rear Dust Cover (Plastic)", "exterior", "Plastic Parts", 95.0, 190.0, 35, 8, "A-03"),
+    ("BUM1", "พลาสติกมุมกันชน", "Bumper Corner Plastic", "body", "Plastic Parts", 220.0, 420.0, 22, 5, "C-03"),
+    ("BUM2", "พลาสติกปิดมุมกันชน", "Bumper Corner Cover", "body", "Plastic Parts", 180.0, 350.0, 28, 6, "C-04"),
+    ("BUM3", "ไฟในกันชน", "Bumper Light", "lighting", "OEM Parts", 320.0, 600.0, 16, 4, "B-06"),
+    ("BUM4", "พลาสติกปิดกันชน", "Bumper Cover", "body", "Plastic Parts", 450.0, 850.0, 12, 3, "C-05"),
+    ("WAS1", "กระป๋องดีดน้ำ", "Washer Fluid Container", "maintenance", "Auto Parts", 85.0, 170.0, 45, 10, "F-02"),
+    ("BRA1", "แป้นจ่ายเบรคตรัซ", "Brake/Clutch Pedal", "brake_system", "Brake Specialist", 280.0, 520.0, 14, 3, "G-01"),
+    ("FRO3", "มือจับแยงหน้า", "Front Handle", "hardware", "Hardware Plus", 130.0, 260.0, 38, 8, "E-02"),
+    ("DOO3", "กันสาดประตู", "Door Visor/Rain Guard", "exterior", "Accessories", 75.0, 150.0, 55, 12, "A-04"),
+]
+
+
+def _is_empty(conn, table):
+    return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == 0
+
+
+def upgrade(conn):
+    """Insert default data into empty tables"""
+    if _is_empty(conn, 'users'):
+        conn.executemany("""
+            INSERT INTO users (username, password_hash, role, full_name, email)
+            VALUES (?, ?, ?, ?, ?)
+        """, [(username, bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8'),
+               role, full_name, email)
+              for username, password, role, full_name, email in DEFAULT_USERS])
+
+    if _is_empty(conn, 'settings'):
+        conn.executemany("""
+            INSERT OR IGNORE INTO settings (category, key, value, description)
+            VALUES (?, ?, ?, ?)
+        """, DEFAULT_SETTINGS)
+
+    if _is_empty(conn, 'truck_parts_inventory'):
+        conn.executemany("""
+            INSERT INTO truck_parts_inventory (
+                part_code, part_name_thai, part_name_english, category, supplier,
+                cost_price, selling_price, quantity_in_stock, min_stock_level, location
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, TRUCK_PARTS)
@@ -0,0 +1,61 @@
+# database/migrations/0005_advisor_indexes.py
+"""Indexes recommended by the index advisor (python -m database.index_advisor)"""
+
+# Redundant: each is a prefix of another index on the same table
+DROP_INDEXES = [
+    'idx_vehicle_photos_vehicle_id',  # covered by idx_vehicle_photos_vehicle_id_category_timestamp
+    'idx_session_photos_session_id',  # covered by sqlite_autoindex_session_photos_1
+    'idx_repair_quotes_quote_number',  # covered by sqlite_autoindex_repair_quotes_1
+    'idx_truck_parts_part_code',  # covered by sqlite_autoindex_truck_parts_inventory_1
+    'idx_payments_payment_method',  # covered by idx_payments_payment_method_created_at
+    'idx_payments_status',  # covered by idx_payments_status_created_at
+    'idx_payments_customer_id',  # covered by idx_payments_customer_id_created_at
+    'idx_insurance_claims_claim_number',  # covered by sqlite_autoindex_insurance_claims_1
+]
+
+CREATE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_customers_thai_id_number ON customers(thai_id_number)",
+    "CREATE INDEX IF NOT EXISTS idx_vehicles_customer_id ON vehicles(customer_id)",
+    "CREATE INDEX IF NOT EXISTS idx_services_customer_id_created_at ON services(customer_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_services_vehicle_id_created_at ON services(vehicle_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_services_created_at ON services(created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_services_status_created_at ON services(status, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_services_service_type_created_at ON services(service_type, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_service_items_service_id ON service_items(service_id)",
+    "CREATE INDEX IF NOT EXISTS idx_vehicle_photos_service_id ON vehicle_photos(service_id)",
+    "CREATE INDEX IF NOT EXISTS idx_vehicle_photos_vehicle_id_timestamp ON vehicle_photos(vehicle_id, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_vehicle_photos_vehicle_id_category_timestamp ON vehicle_photos(vehicle_id, category, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_material_form_items_form_id_item_number ON material_form_items(form_id, item_number)",
+    "CREATE INDEX IF NOT EXISTS idx_repair_quote_items_quote_id_item_number ON repair_quote_items(quote_id, item_number)",
+    "CREATE INDEX IF NOT EXISTS idx_repair_quotes_created_at ON repair_quotes(created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_truck_parts_inventory_is_active_part_name_thai ON truck_parts_inventory(is_active, part_name_thai)",
+    "CREATE INDEX IF NOT EXISTS idx_truck_parts_inventory_category_part_name_thai_where_is_active ON truck_parts_inventory(category, part_name_thai) WHERE is_active = 1",
+    "CREATE INDEX IF NOT EXISTS idx_damage_reports_created_at ON damage_reports(created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_damage_reports_customer_id_created_at ON damage_reports(customer_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_damage_reports_vehicle_id_created_at ON damage_reports(vehicle_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_vehicles_vehicle_type ON vehicles(vehicle_type)",
+    "CREATE INDEX IF NOT EXISTS idx_material_forms_created_at ON material_forms(created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_payments_status_created_at ON payments(status, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_payments_customer_id_created_at ON payments(customer_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_payments_payment_method_created_at ON payments(payment_method, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_insurance_claims_created_at ON insurance_claims(created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_users_full_name_where_is_active ON users(full_name) WHERE is_active = 1",
+    "CREATE INDEX IF NOT EXISTS idx_work_orders_created_at ON work_orders(created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_warranties_created_at ON warranties(created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_damage_reports_inspection_date ON damage_reports(inspection_date)",
+    "CREATE INDEX IF NOT EXISTS idx_quality_checks_created_at ON quality_checks(created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_customers_name_first_name_last_name ON customers(name, first_name, last_name)",
+    "CREATE INDEX IF NOT EXISTS idx_customers_driver_license_number ON customers(driver_license_number)",
+    "CREATE INDEX IF NOT EXISTS idx_photos_vehicle_id ON photos(vehicle_id)",
+    "CREATE INDEX IF NOT EXISTS idx_customers_document_type ON customers(document_type)",
+    "CREATE INDEX IF NOT EXISTS idx_customers_email ON customers(email)",
+    "CREATE INDEX IF NOT EXISTS idx_vehicles_make ON vehicles(make)",
+]
+
+
+def upgrade(conn):
+    """Drop redundant indexes and create the recommended ones"""
+    for name in DROP_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    for statement in CREATE_INDEXES:
+        conn.execute(statement)
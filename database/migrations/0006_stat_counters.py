@@ -0,0 +1,415 @@
+# database/migrations/0006_stat_counters.py
+"""Trigger-maintained statistics counters (see database/stat_counters.py)"""
+
+STAT_COUNTERS_TABLE = """
+    CREATE TABLE IF NOT EXISTS stat_counters (
+        name TEXT PRIMARY KEY,
+        value NUMERIC NOT NULL DEFAULT 0
+    ) WITHOUT ROWID
+"""
+
+# Trigger definitions as of this migration; later changes need a migration of their own
+TRIGGERS = {
+    'trg_stat_customers_insert': """
+        AFTER INSERT ON customers
+        BEGIN
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.total', +(1) WHERE ('customers.total') IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.with_thai_id', +((NEW.thai_id_number IS NOT NULL AND NEW.thai_id_number != '')) WHERE ('customers.with_thai_id') IS NOT NULL AND ((NEW.thai_id_number IS NOT NULL AND NEW.thai_id_number != '')) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.with_driver_license', +((NEW.driver_license_number IS NOT NULL AND NEW.driver_license_number != '')) WHERE ('customers.with_driver_license') IS NOT NULL AND ((NEW.driver_license_number IS NOT NULL AND NEW.driver_license_number != '')) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.with_phone', +((NEW.phone IS NOT NULL AND NEW.phone != '')) WHERE ('customers.with_phone') IS NOT NULL AND ((NEW.phone IS NOT NULL AND NEW.phone != '')) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.with_email', +((NEW.email IS NOT NULL AND NEW.email != '')) WHERE ('customers.with_email') IS NOT NULL AND ((NEW.email IS NOT NULL AND NEW.email != '')) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.document_type:' || NEW.document_type, +(1) WHERE ('customers.document_type:' || NEW.document_type) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.created_day:' || date(NEW.created_at), +(1) WHERE ('customers.created_day:' || date(NEW.created_at)) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+        END
+    """,
+    'trg_stat_customers_delete': """
+        AFTER DELETE ON customers
+        BEGIN
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.total', -(1) WHERE ('customers.total') IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.with_thai_id', -((OLD.thai_id_number IS NOT NULL AND OLD.thai_id_number != '')) WHERE ('customers.with_thai_id') IS NOT NULL AND ((OLD.thai_id_number IS NOT NULL AND OLD.thai_id_number != '')) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.with_driver_license', -((OLD.driver_license_number IS NOT NULL AND OLD.driver_license_number != '')) WHERE ('customers.with_driver_license') IS NOT NULL AND ((OLD.driver_license_number IS NOT NULL AND OLD.driver_license_number != '')) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.with_phone', -((OLD.phone IS NOT NULL AND OLD.phone != '')) WHERE ('customers.with_phone') IS NOT NULL AND ((OLD.phone IS NOT NULL AND OLD.phone != '')) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.with_email', -((OLD.email IS NOT NULL AND OLD.email != '')) WHERE ('customers.with_email') IS NOT NULL AND ((OLD.email IS NOT NULL AND OLD.email != '')) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.document_type:' || OLD.document_type, -(1) WHERE ('customers.document_type:' || OLD.document_type) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.created_day:' || date(OLD.created_at), -(1) WHERE ('customers.created_day:' || date(OLD.created_at)) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+        END
+    """,
+    'trg_stat_customers_update': """
+        AFTER UPDATE OF created_at, document_type, driver_license_number, email, phone, thai_id_number ON customers
+        BEGIN
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.with_thai_id', -((OLD.thai_id_number IS NOT NULL AND OLD.thai_id_number != '')) WHERE ('customers.with_thai_id') IS NOT NULL AND ((OLD.thai_id_number IS NOT NULL AND OLD.thai_id_number != '')) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.with_driver_license', -((OLD.driver_license_number IS NOT NULL AND OLD.driver_license_number != '')) WHERE ('customers.with_driver_license') IS NOT NULL AND ((OLD.driver_license_number IS NOT NULL AND OLD.driver_license_number != '')) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.with_phone', -((OLD.phone IS NOT NULL AND OLD.phone != '')) WHERE ('customers.with_phone') IS NOT NULL AND ((OLD.phone IS NOT NULL AND OLD.phone != '')) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.with_email', -((OLD.email IS NOT NULL AND OLD.email != '')) WHERE ('customers.with_email') IS NOT NULL AND ((OLD.email IS NOT NULL AND OLD.email != '')) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.document_type:' || OLD.document_type, -(1) WHERE ('customers.document_type:' || OLD.document_type) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.created_day:' || date(OLD.created_at), -(1) WHERE ('customers.created_day:' || date(OLD.created_at)) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.with_thai_id', +((NEW.thai_id_number IS NOT NULL AND NEW.thai_id_number != '')) WHERE ('customers.with_thai_id') IS NOT NULL AND ((NEW.thai_id_number IS NOT NULL AND NEW.thai_id_number != '')) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.with_driver_license', +((NEW.driver_license_number IS NOT NULL AND NEW.driver_license_number != '')) WHERE ('customers.with_driver_license') IS NOT NULL AND ((NEW.driver_license_number IS NOT NULL AND NEW.driver_license_number != '')) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.with_phone', +((NEW.phone IS NOT NULL AND NEW.phone != '')) WHERE ('customers.with_phone') IS NOT NULL AND ((NEW.phone IS NOT NULL AND NEW.phone != '')) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.with_email', +((NEW.email IS NOT NULL AND NEW.email != '')) WHERE ('customers.with_email') IS NOT NULL AND ((NEW.email IS NOT NULL AND NEW.email != '')) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.document_type:' || NEW.document_type, +(1) WHERE ('customers.document_type:' || NEW.document_type) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'customers.created_day:' || date(NEW.created_at), +(1) WHERE ('customers.created_day:' || date(NEW.created_at)) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+        END
+    """,
+    'trg_stat_material_forms_insert': """
+        AFTER INSERT ON material_forms
+        BEGIN
+            INSERT INTO stat_counters (name, value)
+            SELECT 'material_forms.total', +(1) WHERE ('material_forms.total') IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+        END
+    """,
+    'trg_stat_material_forms_delete': """
+        AFTER DELETE ON material_forms
+        BEGIN
+            INSERT INTO stat_counters (name, value)
+            SELECT 'material_forms.total', -(1) WHERE ('material_forms.total') IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+        END
+    """,
+    'trg_stat_payments_insert': """
+        AFTER INSERT ON payments
+        BEGIN
+            INSERT INTO stat_counters (name, value)
+            SELECT 'payments.total', +(1) WHERE ('payments.total') IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'payments.created_day:' || date(NEW.created_at), +(1) WHERE ('payments.created_day:' || date(NEW.created_at)) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'payments.completed_amount_day:' || date(NEW.created_at), +(CASE WHEN NEW.status = 'completed' THEN COALESCE(NEW.total_amount, 0) ELSE 0 END) WHERE ('payments.completed_amount_day:' || date(NEW.created_at)) IS NOT NULL AND (CASE WHEN NEW.status = 'completed' THEN COALESCE(NEW.total_amount, 0) ELSE 0 END) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+        END
+    """,
+    'trg_stat_payments_delete': """
+        AFTER DELETE ON payments
+        BEGIN
+            INSERT INTO stat_counters (name, value)
+            SELECT 'payments.total', -(1) WHERE ('payments.total') IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'payments.created_day:' || date(OLD.created_at), -(1) WHERE ('payments.created_day:' || date(OLD.created_at)) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'payments.completed_amount_day:' || date(OLD.created_at), -(CASE WHEN OLD.status = 'completed' THEN COALESCE(OLD.total_amount, 0) ELSE 0 END) WHERE ('payments.completed_amount_day:' || date(OLD.created_at)) IS NOT NULL AND (CASE WHEN OLD.status = 'completed' THEN COALESCE(OLD.total_amount, 0) ELSE 0 END) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+        END
+    """,
+    'trg_stat_payments_update': """
+        AFTER UPDATE OF created_at, status, total_amount ON payments
+        BEGIN
+            INSERT INTO stat_counters (name, value)
+            SELECT 'payments.created_day:' || date(OLD.created_at), -(1) WHERE ('payments.created_day:' || date(OLD.created_at)) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'payments.completed_amount_day:' || date(OLD.created_at), -(CASE WHEN OLD.status = 'completed' THEN COALESCE(OLD.total_amount, 0) ELSE 0 END) WHERE ('payments.completed_amount_day:' || date(OLD.created_at)) IS NOT NULL AND (CASE WHEN OLD.status = 'completed' THEN COALESCE(OLD.total_amount, 0) ELSE 0 END) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'payments.created_day:' || date(NEW.created_at), +(1) WHERE ('payments.created_day:' || date(NEW.created_at)) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'payments.completed_amount_day:' || date(NEW.created_at), +(CASE WHEN NEW.status = 'completed' THEN COALESCE(NEW.total_amount, 0) ELSE 0 END) WHERE ('payments.completed_amount_day:' || date(NEW.created_at)) IS NOT NULL AND (CASE WHEN NEW.status = 'completed' THEN COALESCE(NEW.total_amount, 0) ELSE 0 END) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+        END
+    """,
+    'trg_stat_photo_sessions_insert': """
+        AFTER INSERT ON photo_sessions
+        BEGIN
+            INSERT INTO stat_counters (name, value)
+            SELECT 'photo_sessions.total', +(1) WHERE ('photo_sessions.total') IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+        END
+    """,
+    'trg_stat_photo_sessions_delete': """
+        AFTER DELETE ON photo_sessions
+        BEGIN
+            INSERT INTO stat_counters (name, value)
+            SELECT 'photo_sessions.total', -(1) WHERE ('photo_sessions.total') IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+        END
+    """,
+    'trg_stat_repair_quotes_insert': """
+        AFTER INSERT ON repair_quotes
+        BEGIN
+            INSERT INTO stat_counters (name, value)
+            SELECT 'repair_quotes.total', +(1) WHERE ('repair_quotes.total') IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'repair_quotes.approved_revenue', +(CASE WHEN NEW.status = 'approved' THEN COALESCE(NEW.final_amount, 0) ELSE 0 END) WHERE ('repair_quotes.approved_revenue') IS NOT NULL AND (CASE WHEN NEW.status = 'approved' THEN COALESCE(NEW.final_amount, 0) ELSE 0 END) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+        END
+    """,
+    'trg_stat_repair_quotes_delete': """
+        AFTER DELETE ON repair_quotes
+        BEGIN
+            INSERT INTO stat_counters (name, value)
+            SELECT 'repair_quotes.total', -(1) WHERE ('repair_quotes.total') IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'repair_quotes.approved_revenue', -(CASE WHEN OLD.status = 'approved' THEN COALESCE(OLD.final_amount, 0) ELSE 0 END) WHERE ('repair_quotes.approved_revenue') IS NOT NULL AND (CASE WHEN OLD.status = 'approved' THEN COALESCE(OLD.final_amount, 0) ELSE 0 END) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+        END
+    """,
+    'trg_stat_repair_quotes_update': """
+        AFTER UPDATE OF final_amount, status ON repair_quotes
+        BEGIN
+            INSERT INTO stat_counters (name, value)
+            SELECT 'repair_quotes.approved_revenue', -(CASE WHEN OLD.status = 'approved' THEN COALESCE(OLD.final_amount, 0) ELSE 0 END) WHERE ('repair_quotes.approved_revenue') IS NOT NULL AND (CASE WHEN OLD.status = 'approved' THEN COALESCE(OLD.final_amount, 0) ELSE 0 END) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'repair_quotes.approved_revenue', +(CASE WHEN NEW.status = 'approved' THEN COALESCE(NEW.final_amount, 0) ELSE 0 END) WHERE ('repair_quotes.approved_revenue') IS NOT NULL AND (CASE WHEN NEW.status = 'approved' THEN COALESCE(NEW.final_amount, 0) ELSE 0 END) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+        END
+    """,
+    'trg_stat_services_insert': """
+        AFTER INSERT ON services
+        BEGIN
+            INSERT INTO stat_counters (name, value)
+            SELECT 'services.total', +(1) WHERE ('services.total') IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'services.status:' || NEW.status, +(1) WHERE ('services.status:' || NEW.status) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'services.service_type:' || NEW.service_type, +(1) WHERE ('services.service_type:' || NEW.service_type) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'services.completed_revenue', +(CASE WHEN NEW.status = 'completed' THEN COALESCE(NEW.actual_cost, 0) ELSE 0 END) WHERE ('services.completed_revenue') IS NOT NULL AND (CASE WHEN NEW.status = 'completed' THEN COALESCE(NEW.actual_cost, 0) ELSE 0 END) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'services.created_day:' || date(NEW.created_at), +(1) WHERE ('services.created_day:' || date(NEW.created_at)) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+        END
+    """,
+    'trg_stat_services_delete': """
+        AFTER DELETE ON services
+        BEGIN
+            INSERT INTO stat_counters (name, value)
+            SELECT 'services.total', -(1) WHERE ('services.total') IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'services.status:' || OLD.status, -(1) WHERE ('services.status:' || OLD.status) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'services.service_type:' || OLD.service_type, -(1) WHERE ('services.service_type:' || OLD.service_type) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'services.completed_revenue', -(CASE WHEN OLD.status = 'completed' THEN COALESCE(OLD.actual_cost, 0) ELSE 0 END) WHERE ('services.completed_revenue') IS NOT NULL AND (CASE WHEN OLD.status = 'completed' THEN COALESCE(OLD.actual_cost, 0) ELSE 0 END) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'services.created_day:' || date(OLD.created_at), -(1) WHERE ('services.created_day:' || date(OLD.created_at)) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+        END
+    """,
+    'trg_stat_services_update': """
+        AFTER UPDATE OF actual_cost, created_at, service_type, status ON services
+        BEGIN
+            INSERT INTO stat_counters (name, value)
+            SELECT 'services.status:' || OLD.status, -(1) WHERE ('services.status:' || OLD.status) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'services.service_type:' || OLD.service_type, -(1) WHERE ('services.service_type:' || OLD.service_type) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'services.completed_revenue', -(CASE WHEN OLD.status = 'completed' THEN COALESCE(OLD.actual_cost, 0) ELSE 0 END) WHERE ('services.completed_revenue') IS NOT NULL AND (CASE WHEN OLD.status = 'completed' THEN COALESCE(OLD.actual_cost, 0) ELSE 0 END) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'services.created_day:' || date(OLD.created_at), -(1) WHERE ('services.created_day:' || date(OLD.created_at)) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'services.status:' || NEW.status, +(1) WHERE ('services.status:' || NEW.status) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'services.service_type:' || NEW.service_type, +(1) WHERE ('services.service_type:' || NEW.service_type) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'services.completed_revenue', +(CASE WHEN NEW.status = 'completed' THEN COALESCE(NEW.actual_cost, 0) ELSE 0 END) WHERE ('services.completed_revenue') IS NOT NULL AND (CASE WHEN NEW.status = 'completed' THEN COALESCE(NEW.actual_cost, 0) ELSE 0 END) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'services.created_day:' || date(NEW.created_at), +(1) WHERE ('services.created_day:' || date(NEW.created_at)) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+        END
+    """,
+    'trg_stat_vehicle_photos_insert': """
+        AFTER INSERT ON vehicle_photos
+        BEGIN
+            INSERT INTO stat_counters (name, value)
+            SELECT 'vehicle_photos.total', +(1) WHERE ('vehicle_photos.total') IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+        END
+    """,
+    'trg_stat_vehicle_photos_delete': """
+        AFTER DELETE ON vehicle_photos
+        BEGIN
+            INSERT INTO stat_counters (name, value)
+            SELECT 'vehicle_photos.total', -(1) WHERE ('vehicle_photos.total') IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+        END
+    """,
+    'trg_stat_vehicles_insert': """
+        AFTER INSERT ON vehicles
+        BEGIN
+            INSERT INTO stat_counters (name, value)
+            SELECT 'vehicles.total', +(1) WHERE ('vehicles.total') IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'vehicles.vehicle_type:' || NEW.vehicle_type, +(1) WHERE ('vehicles.vehicle_type:' || NEW.vehicle_type) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+        END
+    """,
+    'trg_stat_vehicles_delete': """
+        AFTER DELETE ON vehicles
+        BEGIN
+            INSERT INTO stat_counters (name, value)
+            SELECT 'vehicles.total', -(1) WHERE ('vehicles.total') IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'vehicles.vehicle_type:' || OLD.vehicle_type, -(1) WHERE ('vehicles.vehicle_type:' || OLD.vehicle_type) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+        END
+    """,
+    'trg_stat_vehicles_update': """
+        AFTER UPDATE OF vehicle_type ON vehicles
+        BEGIN
+            INSERT INTO stat_counters (name, value)
+            SELECT 'vehicles.vehicle_type:' || OLD.vehicle_type, -(1) WHERE ('vehicles.vehicle_type:' || OLD.vehicle_type) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+            INSERT INTO stat_counters (name, value)
+            SELECT 'vehicles.vehicle_type:' || NEW.vehicle_type, +(1) WHERE ('vehicles.vehicle_type:' || NEW.vehicle_type) IS NOT NULL AND (1) != 0
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+        END
+    """,
+}
+
+# Counts of the rows that existed before the triggers did
+BACKFILL = [
+    """INSERT INTO stat_counters (name, value)
+       SELECT 'customers.total', SUM(1) FROM customers AS r
+       WHERE ('customers.total') IS NOT NULL GROUP BY 1 HAVING SUM(1) != 0""",
+    """INSERT INTO stat_counters (name, value)
+       SELECT 'customers.with_thai_id', SUM((r.thai_id_number IS NOT NULL AND r.thai_id_number != '')) FROM customers AS r
+       WHERE ('customers.with_thai_id') IS NOT NULL GROUP BY 1 HAVING SUM((r.thai_id_number IS NOT NULL AND r.thai_id_number != '')) != 0""",
+    """INSERT INTO stat_counters (name, value)
+       SELECT 'customers.with_driver_license', SUM((r.driver_license_number IS NOT NULL AND r.driver_license_number != '')) FROM customers AS r
+       WHERE ('customers.with_driver_license') IS NOT NULL GROUP BY 1 HAVING SUM((r.driver_license_number IS NOT NULL AND r.driver_license_number != '')) != 0""",
+    """INSERT INTO stat_counters (name, value)
+       SELECT 'customers.with_phone', SUM((r.phone IS NOT NULL AND r.phone != '')) FROM customers AS r
+       WHERE ('customers.with_phone') IS NOT NULL GROUP BY 1 HAVING SUM((r.phone IS NOT NULL AND r.phone != '')) != 0""",
+    """INSERT INTO stat_counters (name, value)
+       SELECT 'customers.with_email', SUM((r.email IS NOT NULL AND r.email != '')) FROM customers AS r
+       WHERE ('customers.with_email') IS NOT NULL GROUP BY 1 HAVING SUM((r.email IS NOT NULL AND r.email != '')) != 0""",
+    """INSERT INTO stat_counters (name, value)
+       SELECT 'customers.document_type:' || r.document_type, SUM(1) FROM customers AS r
+       WHERE ('customers.document_type:' || r.document_type) IS NOT NULL GROUP BY 1 HAVING SUM(1) != 0""",
+    """INSERT INTO stat_counters (name, value)
+       SELECT 'customers.created_day:' || date(r.created_at), SUM(1) FROM customers AS r
+       WHERE ('customers.created_day:' || date(r.created_at)) IS NOT NULL GROUP BY 1 HAVING SUM(1) != 0""",
+    """INSERT INTO stat_counters (name, value)
+       SELECT 'vehicles.total', SUM(1) FROM vehicles AS r
+       WHERE ('vehicles.total') IS NOT NULL GROUP BY 1 HAVING SUM(1) != 0""",
+    """INSERT INTO stat_counters (name, value)
+       SELECT 'vehicles.vehicle_type:' || r.vehicle_type, SUM(1) FROM vehicles AS r
+       WHERE ('vehicles.vehicle_type:' || r.vehicle_type) IS NOT NULL GROUP BY 1 HAVING SUM(1) != 0""",
+    """INSERT INTO stat_counters (name, value)
+       SELECT 'services.total', SUM(1) FROM services AS r
+       WHERE ('services.total') IS NOT NULL GROUP BY 1 HAVING SUM(1) != 0""",
+    """INSERT INTO stat_counters (name, value)
+       SELECT 'services.status:' || r.status, SUM(1) FROM services AS r
+       WHERE ('services.status:' || r.status) IS NOT NULL GROUP BY 1 HAVING SUM(1) != 0""",
+    """INSERT INTO stat_counters (name, value)
+       SELECT 'services.service_type:' || r.service_type, SUM(1) FROM services AS r
+       WHERE ('services.service_type:' || r.service_type) IS NOT NULL GROUP BY 1 HAVING SUM(1) != 0""",
+    """INSERT INTO stat_counters (name, value)
+       SELECT 'services.completed_revenue', SUM(CASE WHEN r.status = 'completed' THEN COALESCE(r.actual_cost, 0) ELSE 0 END) FROM services AS r
+       WHERE ('services.completed_revenue') IS NOT NULL GROUP BY 1 HAVING SUM(CASE WHEN r.status = 'completed' THEN COALESCE(r.actual_cost, 0) ELSE 0 END) != 0""",
+    """INSERT INTO stat_counters (name, value)
+       SELECT 'services.created_day:' || date(r.created_at), SUM(1) FROM services AS r
+       WHERE ('services.created_day:' || date(r.created_at)) IS NOT NULL GROUP BY 1 HAVING SUM(1) != 0""",
+    """INSERT INTO stat_counters (name, value)
+       SELECT 'vehicle_photos.total', SUM(1) FROM vehicle_photos AS r
+       WHERE ('vehicle_photos.total') IS NOT NULL GROUP BY 1 HAVING SUM(1) != 0""",
+    """INSERT INTO stat_counters (name, value)
+       SELECT 'photo_sessions.total', SUM(1) FROM photo_sessions AS r
+       WHERE ('photo_sessions.total') IS NOT NULL GROUP BY 1 HAVING SUM(1) != 0""",
+    """INSERT INTO stat_counters (name, value)
+       SELECT 'material_forms.total', SUM(1) FROM material_forms AS r
+       WHERE ('material_forms.total') IS NOT NULL GROUP BY 1 HAVING SUM(1) != 0""",
+    """INSERT INTO stat_counters (name, value)
+       SELECT 'repair_quotes.total', SUM(1) FROM repair_quotes AS r
+       WHERE ('repair_quotes.total') IS NOT NULL GROUP BY 1 HAVING SUM(1) != 0""",
+    """INSERT INTO stat_counters (name, value)
+       SELECT 'repair_quotes.approved_revenue', SUM(CASE WHEN r.status = 'approved' THEN COALESCE(r.final_amount, 0) ELSE 0 END) FROM repair_quotes AS r
+       WHERE ('repair_quotes.approved_revenue') IS NOT NULL GROUP BY 1 HAVING SUM(CASE WHEN r.status = 'approved' THEN COALESCE(r.final_amount, 0) ELSE 0 END) != 0""",
+    """INSERT INTO stat_counters (name, value)
+       SELECT 'payments.total', SUM(1) FROM payments AS r
+       WHERE ('payments.total') IS NOT NULL GROUP BY 1 HAVING SUM(1) != 0""",
+    """INSERT INTO stat_counters (name, value)
+       SELECT 'payments.created_day:' || date(r.created_at), SUM(1) FROM payments AS r
+       WHERE ('payments.created_day:' || date(r.created_at)) IS NOT NULL GROUP BY 1 HAVING SUM(1) != 0""",
+    """INSERT INTO stat_counters (name, value)
+       SELECT 'payments.completed_amount_day:' || date(r.created_at), SUM(CASE WHEN r.status = 'completed' THEN COALESCE(r.total_amount, 0) ELSE 0 END) FROM payments AS r
+       WHERE ('payments.completed_amount_day:' || date(r.created_at)) IS NOT NULL GROUP BY 1 HAVING SUM(CASE WHEN r.status = 'completed' THEN COALESCE(r.total_amount, 0) ELSE 0 END) != 0""",
+]
+
+
+def upgrade(conn):
+    """Create stat_counters and its triggers, then count the existing rows"""
+    conn.execute(STAT_COUNTERS_TABLE)
+    for name, body in TRIGGERS.items():
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        conn.execute(f"CREATE TRIGGER {name} {body.strip()}")
+    conn.execute("DELETE FROM stat_counters")
+    for statement in BACKFILL:
+        conn.execute(statement)
@@ -0,0 +1,35 @@
+# database/migrations/0007_table_versions.py
+"""Per-table data versions for cache invalidation (see database/table_versions.py)"""
+
+TABLE_VERSIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS table_versions (
+        name TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    ) WITHOUT ROWID
+"""
+
+# Application tables as of this migration; tables added later get their triggers from their own migration
+TRACKED_TABLES = [
+    'appointments', 'customers', 'damage_reports', 'installment_payments', 'installment_plans',
+    'insurance_claims', 'material_form_items', 'material_forms', 'payments', 'photo_sessions', 'photos',
+    'quality_checks', 'repair_quote_items', 'repair_quotes', 'service_items', 'services', 'session_photos',
+    'settings', 'truck_parts_inventory', 'users', 'vehicle_photos', 'vehicles', 'warranties', 'work_orders',
+]
+
+VERSION_TRIGGER = """
+    CREATE TRIGGER trg_version_{table}_{event} AFTER {operation} ON {table}
+    BEGIN
+        INSERT INTO table_versions (name, version) VALUES ('{table}', 1)
+        ON CONFLICT(name) DO UPDATE SET version = version + 1;
+    END
+"""
+
+
+def upgrade(conn):
+    """Create table_versions and its triggers"""
+    conn.execute(TABLE_VERSIONS_TABLE)
+    for table in TRACKED_TABLES:
+        for event in ('insert', 'update', 'delete'):
+            conn.execute(f"DROP TRIGGER IF EXISTS trg_version_{table}_{event}")
+            conn.execute(VERSION_TRIGGER.format(table=table, event=event, operation=event.upper()))
+        conn.execute("INSERT OR IGNORE INTO table_versions (name, version) VALUES (?, 0)", (table,))
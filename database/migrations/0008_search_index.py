@@ -0,0 +1,232 @@
+# database/migrations/0008_search_index.py
+"""Unified FTS5 trigram search index (see database/search_index.py)"""
+
+import sqlite3
+import logging
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_TABLE = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+        kind UNINDEXED, ref_id UNINDEXED, customer_id UNINDEXED, title UNINDEXED,
+        names, contact, identifiers,
+        tokenize = 'trigram'
+    )
+"""
+
+# Trigger definitions as of this migration; later changes need a migration of their own.
+# A document's rowid is the source id * 8 + its kind code (1 customer, 2 vehicle, 3 quote, 4 claim).
+TRIGGERS = {
+    'trg_search_customers_insert': """
+        AFTER INSERT ON customers
+        BEGIN
+            INSERT INTO search_index (rowid, kind, ref_id, customer_id, title, names, contact, identifiers)
+            SELECT NEW.id * 8 + 1,
+                   'customer',
+                   NEW.id,
+                   NEW.id,
+                   trim(COALESCE(NEW.first_name, '') || ' ' || COALESCE(NEW.last_name, '')),
+                   trim(COALESCE(NEW.first_name, '') || ' ' || COALESCE(NEW.last_name, '') || ' ' || COALESCE(NEW.thai_name, '') || ' ' || COALESCE(NEW.english_name, '') || ' ' || COALESCE(NEW.english_address, '')),
+                   trim(COALESCE(NEW.phone, '') || ' ' || COALESCE(replace(replace(replace(NEW.phone, '-', ''), ' ', ''), '.', ''), '') || ' ' || COALESCE(NEW.email, '')),
+                   trim(COALESCE(NEW.thai_id_number, '') || ' ' || COALESCE(NEW.driver_license_number, ''));
+        END
+    """,
+    'trg_search_customers_update': """
+        AFTER UPDATE OF id, first_name, last_name, thai_name, english_name, english_address, phone, email, thai_id_number, driver_license_number
+        ON customers
+        BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * 8 + 1;
+            INSERT INTO search_index (rowid, kind, ref_id, customer_id, title, names, contact, identifiers)
+            SELECT NEW.id * 8 + 1,
+                   'customer',
+                   NEW.id,
+                   NEW.id,
+                   trim(COALESCE(NEW.first_name, '') || ' ' || COALESCE(NEW.last_name, '')),
+                   trim(COALESCE(NEW.first_name, '') || ' ' || COALESCE(NEW.last_name, '') || ' ' || COALESCE(NEW.thai_name, '') || ' ' || COALESCE(NEW.english_name, '') || ' ' || COALESCE(NEW.english_address, '')),
+                   trim(COALESCE(NEW.phone, '') || ' ' || COALESCE(replace(replace(replace(NEW.phone, '-', ''), ' ', ''), '.', ''), '') || ' ' || COALESCE(NEW.email, '')),
+                   trim(COALESCE(NEW.thai_id_number, '') || ' ' || COALESCE(NEW.driver_license_number, ''));
+        END
+    """,
+    'trg_search_customers_delete': """
+        AFTER DELETE ON customers
+        BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * 8 + 1;
+        END
+    """,
+    'trg_search_vehicles_insert': """
+        AFTER INSERT ON vehicles
+        BEGIN
+            INSERT INTO search_index (rowid, kind, ref_id, customer_id, title, names, contact, identifiers)
+            SELECT NEW.id * 8 + 2,
+                   'vehicle',
+                   NEW.id,
+                   NEW.customer_id,
+                   trim(COALESCE(NEW.license_plate, '') || ' ' || COALESCE(NEW.make, '') || ' ' || COALESCE(NEW.model, '')),
+                   trim(COALESCE(NEW.make, '') || ' ' || COALESCE(NEW.model, '')),
+                   '',
+                   trim(COALESCE(NEW.license_plate, '') || ' ' || COALESCE(replace(NEW.license_plate, ' ', ''), '') || ' ' || COALESCE(NEW.vin, ''));
+        END
+    """,
+    'trg_search_vehicles_update': """
+        AFTER UPDATE OF id, customer_id, make, model, license_plate, vin ON vehicles
+        BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * 8 + 2;
+            INSERT INTO search_index (rowid, kind, ref_id, customer_id, title, names, contact, identifiers)
+            SELECT NEW.id * 8 + 2,
+                   'vehicle',
+                   NEW.id,
+                   NEW.customer_id,
+                   trim(COALESCE(NEW.license_plate, '') || ' ' || COALESCE(NEW.make, '') || ' ' || COALESCE(NEW.model, '')),
+                   trim(COALESCE(NEW.make, '') || ' ' || COALESCE(NEW.model, '')),
+                   '',
+                   trim(COALESCE(NEW.license_plate, '') || ' ' || COALESCE(replace(NEW.license_plate, ' ', ''), '') || ' ' || COALESCE(NEW.vin, ''));
+        END
+    """,
+    'trg_search_vehicles_delete': """
+        AFTER DELETE ON vehicles
+        BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * 8 + 2;
+        END
+    """,
+    'trg_search_repair_quotes_insert': """
+        AFTER INSERT ON repair_quotes
+        BEGIN
+            INSERT INTO search_index (rowid, kind, ref_id, customer_id, title, names, contact, identifiers)
+            SELECT NEW.id * 8 + 3,
+                   'quote',
+                   NEW.id,
+                   (SELECT customer_id FROM services WHERE id = NEW.service_id),
+                   trim(COALESCE(NEW.quote_number, '') || ' ' || COALESCE(NEW.customer_name, '')),
+                   trim(COALESCE(NEW.customer_name, '') || ' ' || COALESCE(NEW.vehicle_make, '') || ' ' || COALESCE(NEW.vehicle_model, '')),
+                   trim(COALESCE(NEW.customer_contact, '') || ' ' || COALESCE(replace(replace(replace(NEW.customer_contact, '-', ''), ' ', ''), '.', ''), '')),
+                   trim(COALESCE(NEW.quote_number, '') || ' ' || COALESCE(NEW.vehicle_registration, '') || ' ' || COALESCE(NEW.chassis_number, ''));
+        END
+    """,
+    'trg_search_repair_quotes_update': """
+        AFTER UPDATE OF id, service_id, quote_number, customer_name, vehicle_make, vehicle_model, customer_contact, vehicle_registration, chassis_number
+        ON repair_quotes
+        BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * 8 + 3;
+            INSERT INTO search_index (rowid, kind, ref_id, customer_id, title, names, contact, identifiers)
+            SELECT NEW.id * 8 + 3,
+                   'quote',
+                   NEW.id,
+                   (SELECT customer_id FROM services WHERE id = NEW.service_id),
+                   trim(COALESCE(NEW.quote_number, '') || ' ' || COALESCE(NEW.customer_name, '')),
+                   trim(COALESCE(NEW.customer_name, '') || ' ' || COALESCE(NEW.vehicle_make, '') || ' ' || COALESCE(NEW.vehicle_model, '')),
+                   trim(COALESCE(NEW.customer_contact, '') || ' ' || COALESCE(replace(replace(replace(NEW.customer_contact, '-', ''), ' ', ''), '.', ''), '')),
+                   trim(COALESCE(NEW.quote_number, '') || ' ' || COALESCE(NEW.vehicle_registration, '') || ' ' || COALESCE(NEW.chassis_number, ''));
+        END
+    """,
+    'trg_search_repair_quotes_delete': """
+        AFTER DELETE ON repair_quotes
+        BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * 8 + 3;
+        END
+    """,
+    'trg_search_insurance_claims_insert': """
+        AFTER INSERT ON insurance_claims
+        BEGIN
+            INSERT INTO search_index (rowid, kind, ref_id, customer_id, title, names, contact, identifiers)
+            SELECT NEW.id * 8 + 4,
+                   'claim',
+                   NEW.id,
+                   NEW.customer_id,
+                   trim(COALESCE(NEW.claim_number, '') || ' ' || COALESCE(NEW.insurance_company, '')),
+                   trim(COALESCE(NEW.insurance_company, '') || ' ' || COALESCE(NEW.adjuster_name, '')),
+                   trim(COALESCE(NEW.adjuster_contact, '')),
+                   trim(COALESCE(NEW.claim_number, '') || ' ' || COALESCE(NEW.policy_number, '') || ' ' || COALESCE(NEW.police_report_number, ''));
+        END
+    """,
+    'trg_search_insurance_claims_update': """
+        AFTER UPDATE OF id, customer_id, claim_number, insurance_company, adjuster_name, adjuster_contact, policy_number, police_report_number
+        ON insurance_claims
+        BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * 8 + 4;
+            INSERT INTO search_index (rowid, kind, ref_id, customer_id, title, names, contact, identifiers)
+            SELECT NEW.id * 8 + 4,
+                   'claim',
+                   NEW.id,
+                   NEW.customer_id,
+                   trim(COALESCE(NEW.claim_number, '') || ' ' || COALESCE(NEW.insurance_company, '')),
+                   trim(COALESCE(NEW.insurance_company, '') || ' ' || COALESCE(NEW.adjuster_name, '')),
+                   trim(COALESCE(NEW.adjuster_contact, '')),
+                   trim(COALESCE(NEW.claim_number, '') || ' ' || COALESCE(NEW.policy_number, '') || ' ' || COALESCE(NEW.police_report_number, ''));
+        END
+    """,
+    'trg_search_insurance_claims_delete': """
+        AFTER DELETE ON insurance_claims
+        BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * 8 + 4;
+        END
+    """,
+}
+
+# Documents for the rows that existed before the triggers did
+REBUILD = [
+    """
+    INSERT INTO search_index (rowid, kind, ref_id, customer_id, title, names, contact, identifiers)
+    SELECT r.id * 8 + 1,
+           'customer',
+           r.id,
+           r.id,
+           trim(COALESCE(r.first_name, '') || ' ' || COALESCE(r.last_name, '')),
+           trim(COALESCE(r.first_name, '') || ' ' || COALESCE(r.last_name, '') || ' ' || COALESCE(r.thai_name, '') || ' ' || COALESCE(r.english_name, '') || ' ' || COALESCE(r.english_address, '')),
+           trim(COALESCE(r.phone, '') || ' ' || COALESCE(replace(replace(replace(r.phone, '-', ''), ' ', ''), '.', ''), '') || ' ' || COALESCE(r.email, '')),
+           trim(COALESCE(r.thai_id_number, '') || ' ' || COALESCE(r.driver_license_number, ''))
+    FROM customers AS r
+    """,
+    """
+    INSERT INTO search_index (rowid, kind, ref_id, customer_id, title, names, contact, identifiers)
+    SELECT r.id * 8 + 2,
+           'vehicle',
+           r.id,
+           r.customer_id,
+           trim(COALESCE(r.license_plate, '') || ' ' || COALESCE(r.make, '') || ' ' || COALESCE(r.model, '')),
+           trim(COALESCE(r.make, '') || ' ' || COALESCE(r.model, '')),
+           '',
+           trim(COALESCE(r.license_plate, '') || ' ' || COALESCE(replace(r.license_plate, ' ', ''), '') || ' ' || COALESCE(r.vin, ''))
+    FROM vehicles AS r
+    """,
+    """
+    INSERT INTO search_index (rowid, kind, ref_id, customer_id, title, names, contact, identifiers)
+    SELECT r.id * 8 + 3,
+           'quote',
+           r.id,
+           (SELECT customer_id FROM services WHERE id = r.service_id),
+           trim(COALESCE(r.quote_number, '') || ' ' || COALESCE(r.customer_name, '')),
+           trim(COALESCE(r.customer_name, '') || ' ' || COALESCE(r.vehicle_make, '') || ' ' || COALESCE(r.vehicle_model, '')),
+           trim(COALESCE(r.customer_contact, '') || ' ' || COALESCE(replace(replace(replace(r.customer_contact, '-', ''), ' ', ''), '.', ''), '')),
+           trim(COALESCE(r.quote_number, '') || ' ' || COALESCE(r.vehicle_registration, '') || ' ' || COALESCE(r.chassis_number, ''))
+    FROM repair_quotes AS r
+    """,
+    """
+    INSERT INTO search_index (rowid, kind, ref_id, customer_id, title, names, contact, identifiers)
+    SELECT r.id * 8 + 4,
+           'claim',
+           r.id,
+           r.customer_id,
+           trim(COALESCE(r.claim_number, '') || ' ' || COALESCE(r.insurance_company, '')),
+           trim(COALESCE(r.insurance_company, '') || ' ' || COALESCE(r.adjuster_name, '')),
+           trim(COALESCE(r.adjuster_contact, '')),
+           trim(COALESCE(r.claim_number, '') || ' ' || COALESCE(r.policy_number, '') || ' ' || COALESCE(r.police_report_number, ''))
+    FROM insurance_claims AS r
+    """,
+]
+
+
+def upgrade(conn):
+    """Create search_index and its triggers, then index the existing rows"""
+    try:
+        conn.execute(SEARCH_INDEX_TABLE)
+    except sqlite3.OperationalError as e:
+        logger.error(f"Full-text search unavailable, falling back to LIKE search: {e}")
+        return
+
+    for name, body in TRIGGERS.items():
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        conn.execute(f"CREATE TRIGGER {name} {body.strip()}")
+    conn.execute("DELETE FROM search_index")
+    for statement in REBUILD:
+        conn.execute(statement)
+    conn.execute("INSERT INTO search_index (search_index) VALUES ('optimize')")
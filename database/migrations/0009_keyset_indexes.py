@@ -0,0 +1,15 @@
+# database/migrations/0009_keyset_indexes.py
+"""Indexes matching the keyset sort order of paginated list endpoints"""
+
+CREATE_INDEXES = [
+    # /api/customers: ORDER BY first_name, last_name, id
+    "CREATE INDEX IF NOT EXISTS idx_customers_first_name_last_name ON customers(first_name, last_name)",
+    # /api/payments without filters: ORDER BY created_at DESC, id DESC
+    "CREATE INDEX IF NOT EXISTS idx_payments_created_at ON payments(created_at)",
+]
+
+
+def upgrade(conn):
+    """Create the pagination indexes"""
+    for statement in CREATE_INDEXES:
+        conn.execute(statement)
@@ -0,0 +1,7 @@
+# database/migrations/0010_table_versions_epoch.py
+"""Random database epoch for version-based ETags (see database/table_versions.py)"""
+
+
+def upgrade(conn):
+    """Record the epoch for databases created before it existed"""
+    conn.execute("INSERT OR IGNORE INTO table_versions (name, version) VALUES ('_epoch', abs(random()))")
@@ -0,0 +1,53 @@
+# database/migrations/0011_document_sequences.py
+"""Atomic document number sequences (see database/document_sequences.py)"""
+
+import re
+import sqlite3
+import logging
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_SEQUENCES_TABLE = """
+    CREATE TABLE IF NOT EXISTS document_sequences (
+        prefix TEXT NOT NULL,
+        period TEXT NOT NULL,
+        last_value INTEGER NOT NULL,
+        PRIMARY KEY (prefix, period)
+    ) WITHOUT ROWID
+"""
+
+# Numbering as of this migration: (prefix, table, column, pattern capturing period and number)
+NUMBERED_COLUMNS = [
+    ('Q', 'repair_quotes', 'quote_number', r'^Q(?P<period>\d{4})(?P<number>\d{4,})$'),
+    ('REC', 'payments', 'receipt_number', r'^REC-(?P<period>\d{8})-(?P<number>\d{4,})$'),
+    ('PAY', 'payments', 'payment_number', r'^PAY-(?P<period>\d{6})-(?P<number>\d{5,})$'),
+    ('CLM', 'insurance_claims', 'claim_number', r'^CLM-(?P<period>\d{6})-(?P<number>\d{4,})$'),
+]
+
+
+def seed(conn):
+    """Start every sequence after the highest number already in use"""
+    for prefix, table, column, pattern in NUMBERED_COLUMNS:
+        try:
+            rows = conn.execute(f"SELECT {column} FROM {table} WHERE {column} LIKE ?", (f"{prefix}%",)).fetchall()
+        except sqlite3.OperationalError as e:
+            logger.error(f"Cannot seed {prefix} numbers from {table}: {e}")
+            continue
+
+        highest = {}
+        for (value,) in rows:
+            match = re.match(pattern, value or '')
+            if match:
+                period, number = match.group('period'), int(match.group('number'))
+                highest[period] = max(highest.get(period, 0), number)
+
+        conn.executemany("""
+            INSERT INTO document_sequences (prefix, period, last_value) VALUES (?, ?, ?)
+            ON CONFLICT (prefix, period) DO UPDATE SET last_value = max(last_value, excluded.last_value)
+        """, [(prefix, period, number) for period, number in highest.items()])
+
+
+def upgrade(conn):
+    """Create document_sequences and continue from the numbers already issued"""
+    conn.execute(DOCUMENT_SEQUENCES_TABLE)
+    seed(conn)
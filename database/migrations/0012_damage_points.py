@@ -0,0 +1,149 @@
+# database/migrations/0012_damage_points.py
+"""Damage points as rows instead of a JSON column (see database/damage_points.py)"""
+
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Point keys with a column as of this migration; any other key is kept in extra
+POINT_FIELDS = {
+    'id': 'point_id',
+    'x': 'x',
+    'y': 'y',
+    'damage_type': 'damage_type',
+    'severity': 'severity',
+    'description': 'description',
+    'estimated_cost': 'estimated_cost',
+    'created_at': 'created_at',
+}
+
+CREATE_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS damage_points (
+        id INTEGER PRIMARY KEY,
+        report_id INTEGER NOT NULL,
+        point_id TEXT NOT NULL,
+        x REAL NOT NULL,
+        y REAL NOT NULL,
+        damage_type TEXT NOT NULL,
+        severity TEXT NOT NULL,
+        description TEXT DEFAULT '',
+        estimated_cost REAL DEFAULT 0.0,
+        created_at TEXT,
+        extra TEXT,
+        UNIQUE (report_id, point_id),
+        FOREIGN KEY (report_id) REFERENCES damage_reports (id) ON DELETE CASCADE
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_damage_points_damage_type_severity ON damage_points(damage_type, severity)",
+    "CREATE INDEX IF NOT EXISTS idx_damage_points_severity ON damage_points(severity)",
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_damage_points_total_insert AFTER INSERT ON damage_points
+    BEGIN
+        UPDATE damage_reports SET total_estimated_cost = COALESCE(total_estimated_cost, 0) + COALESCE(NEW.estimated_cost, 0)
+        WHERE id = NEW.report_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_damage_points_total_delete AFTER DELETE ON damage_points
+    BEGIN
+        UPDATE damage_reports SET total_estimated_cost = COALESCE(total_estimated_cost, 0) - COALESCE(OLD.estimated_cost, 0)
+        WHERE id = OLD.report_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_damage_points_total_update AFTER UPDATE OF estimated_cost, report_id ON damage_points
+    BEGIN
+        UPDATE damage_reports SET total_estimated_cost = COALESCE(total_estimated_cost, 0) - COALESCE(OLD.estimated_cost, 0)
+        WHERE id = OLD.report_id;
+        UPDATE damage_reports SET total_estimated_cost = COALESCE(total_estimated_cost, 0) + COALESCE(NEW.estimated_cost, 0)
+        WHERE id = NEW.report_id;
+    END
+    """,
+]
+
+INSERT_POINT_SQL = f"""
+    INSERT INTO damage_points (report_id, {', '.join(POINT_FIELDS.values())}, extra)
+    VALUES (?, {', '.join('?' for _ in POINT_FIELDS)}, ?)
+    ON CONFLICT (report_id, point_id) DO NOTHING
+"""
+
+
+def point_values(point):
+    """INSERT_POINT_SQL values (after report_id) for a point in its JSON shape"""
+    missing = [key for key in ('id', 'x', 'y', 'damage_type', 'severity') if point.get(key) is None]
+    if missing:
+        raise ValueError(f"Damage point is missing: {', '.join(missing)}")
+
+    created_at = point.get('created_at')
+    if created_at is not None and not isinstance(created_at, str):
+        created_at = str(created_at)
+    extra = {key: value for key, value in point.items() if key not in POINT_FIELDS}
+
+    return (
+        str(point['id']),
+        float(point['x']),
+        float(point['y']),
+        point['damage_type'],
+        point['severity'],
+        point.get('description') or '',
+        float(point.get('estimated_cost') or 0.0),
+        created_at,
+        json.dumps(extra) if extra else None,
+    )
+
+
+def migrate_json(conn):
+    """Move points out of damage_reports.damage_points JSON into rows; returns points moved
+
+    Report totals are left as they were: the triggers add each moved point's
+    cost, so the stored total is written back afterwards.
+    """
+    rows = conn.execute("""
+        SELECT id, damage_points, total_estimated_cost FROM damage_reports
+        WHERE damage_points IS NOT NULL AND damage_points NOT IN ('', '[]')
+    """).fetchall()
+
+    moved = 0
+    for report_id, raw, total in rows:
+        try:
+            points = json.loads(raw)
+        except json.JSONDecodeError as e:
+            logger.error(f"Damage report {report_id} has unreadable damage points, left in place: {e}")
+            continue
+        if not isinstance(points, list):
+            logger.error(f"Damage report {report_id} damage points are not a list, left in place")
+            continue
+
+        values = []
+        for index, point in enumerate(points):
+            try:
+                if not isinstance(point, dict):
+                    raise ValueError("not an object")
+                point.setdefault('id', f"point_{report_id}_{index}")
+                values.append((report_id,) + point_values(point))
+            except (ValueError, TypeError) as e:
+                logger.error(f"Skipping damage point {index} of report {report_id}: {e}")
+
+        conn.executemany(INSERT_POINT_SQL, values)
+        conn.execute("UPDATE damage_reports SET damage_points = '[]', total_estimated_cost = ? WHERE id = ?",
+                     (total, report_id))
+        moved += len(values)
+    return moved
+
+
+def upgrade(conn):
+    """Create damage_points, move the existing JSON points into it and version the new table"""
+    for statement in CREATE_STATEMENTS:
+        conn.execute(statement)
+    migrate_json(conn)
+    for event in ('insert', 'update', 'delete'):
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_version_damage_points_{event} AFTER {event.upper()} ON damage_points
+            BEGIN
+                INSERT INTO table_versions (name, version) VALUES ('damage_points', 1)
+                ON CONFLICT(name) DO UPDATE SET version = version + 1;
+            END
+        """)
+    conn.execute("INSERT OR IGNORE INTO table_versions (name, version) VALUES ('damage_points', 0)")
@@ -0,0 +1,109 @@
+# database/migrations/0013_damage_heatmap.py
+"""Damage point views and per vehicle type heatmap grids (see database/damage_heatmap.py)"""
+
+# Point counts per (vehicle_type, view) in a 64 x 64 grid; 1.0 falls in the last cell
+CREATE_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS damage_heatmap_bins (
+        vehicle_type TEXT NOT NULL,
+        view TEXT NOT NULL,
+        bin_y INTEGER NOT NULL,
+        bin_x INTEGER NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (vehicle_type, view, bin_y, bin_x)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_heatmap_points_insert AFTER INSERT ON damage_points
+    BEGIN
+        INSERT INTO damage_heatmap_bins (vehicle_type, view, bin_y, bin_x, count)
+        SELECT dr.vehicle_type, COALESCE(NEW.view, 'unspecified'),
+               min(CAST(NEW.y * 64 AS INTEGER), 63), min(CAST(NEW.x * 64 AS INTEGER), 63), +1
+        FROM damage_reports dr WHERE dr.id = NEW.report_id
+        AND NEW.x BETWEEN 0 AND 1 AND NEW.y BETWEEN 0 AND 1
+        ON CONFLICT (vehicle_type, view, bin_y, bin_x) DO UPDATE SET count = count + excluded.count;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_heatmap_points_delete AFTER DELETE ON damage_points
+    BEGIN
+        INSERT INTO damage_heatmap_bins (vehicle_type, view, bin_y, bin_x, count)
+        SELECT dr.vehicle_type, COALESCE(OLD.view, 'unspecified'),
+               min(CAST(OLD.y * 64 AS INTEGER), 63), min(CAST(OLD.x * 64 AS INTEGER), 63), -1
+        FROM damage_reports dr WHERE dr.id = OLD.report_id
+        AND OLD.x BETWEEN 0 AND 1 AND OLD.y BETWEEN 0 AND 1
+        ON CONFLICT (vehicle_type, view, bin_y, bin_x) DO UPDATE SET count = count + excluded.count;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_heatmap_points_update AFTER UPDATE OF x, y, view, report_id ON damage_points
+    BEGIN
+        INSERT INTO damage_heatmap_bins (vehicle_type, view, bin_y, bin_x, count)
+        SELECT dr.vehicle_type, COALESCE(OLD.view, 'unspecified'),
+               min(CAST(OLD.y * 64 AS INTEGER), 63), min(CAST(OLD.x * 64 AS INTEGER), 63), -1
+        FROM damage_reports dr WHERE dr.id = OLD.report_id
+        AND OLD.x BETWEEN 0 AND 1 AND OLD.y BETWEEN 0 AND 1
+        ON CONFLICT (vehicle_type, view, bin_y, bin_x) DO UPDATE SET count = count + excluded.count;
+        INSERT INTO damage_heatmap_bins (vehicle_type, view, bin_y, bin_x, count)
+        SELECT dr.vehicle_type, COALESCE(NEW.view, 'unspecified'),
+               min(CAST(NEW.y * 64 AS INTEGER), 63), min(CAST(NEW.x * 64 AS INTEGER), 63), +1
+        FROM damage_reports dr WHERE dr.id = NEW.report_id
+        AND NEW.x BETWEEN 0 AND 1 AND NEW.y BETWEEN 0 AND 1
+        ON CONFLICT (vehicle_type, view, bin_y, bin_x) DO UPDATE SET count = count + excluded.count;
+    END
+    """,
+    # Replaced in 0015: deleting points here updated the report being deleted
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_heatmap_reports_delete BEFORE DELETE ON damage_reports
+    BEGIN
+        DELETE FROM damage_points WHERE report_id = OLD.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_heatmap_reports_vehicle_type
+    AFTER UPDATE OF vehicle_type ON damage_reports WHEN OLD.vehicle_type IS NOT NEW.vehicle_type
+    BEGIN
+        INSERT INTO damage_heatmap_bins (vehicle_type, view, bin_y, bin_x, count)
+        SELECT OLD.vehicle_type, COALESCE(p.view, 'unspecified'),
+               min(CAST(p.y * 64 AS INTEGER), 63), min(CAST(p.x * 64 AS INTEGER), 63), -COUNT(*)
+        FROM damage_points p WHERE p.report_id = NEW.id
+        AND p.x BETWEEN 0 AND 1 AND p.y BETWEEN 0 AND 1 GROUP BY 2, 3, 4
+        ON CONFLICT (vehicle_type, view, bin_y, bin_x) DO UPDATE SET count = count + excluded.count;
+        INSERT INTO damage_heatmap_bins (vehicle_type, view, bin_y, bin_x, count)
+        SELECT NEW.vehicle_type, COALESCE(p.view, 'unspecified'),
+               min(CAST(p.y * 64 AS INTEGER), 63), min(CAST(p.x * 64 AS INTEGER), 63), +COUNT(*)
+        FROM damage_points p WHERE p.report_id = NEW.id
+        AND p.x BETWEEN 0 AND 1 AND p.y BETWEEN 0 AND 1 GROUP BY 2, 3, 4
+        ON CONFLICT (vehicle_type, view, bin_y, bin_x) DO UPDATE SET count = count + excluded.count;
+    END
+    """,
+]
+
+
+def upgrade(conn):
+    """Give points a view column, build the heatmap grids and version the new table"""
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(damage_points)")]
+    if 'view' not in columns:
+        conn.execute("ALTER TABLE damage_points ADD COLUMN view TEXT")
+
+    # Points saved before the column existed kept their view among the extra keys
+    conn.execute("""
+        UPDATE damage_points
+        SET view = json_extract(extra, '$.view'),
+            extra = NULLIF(json_remove(extra, '$.view'), '{}')
+        WHERE extra IS NOT NULL AND json_extract(extra, '$.view') IS NOT NULL
+    """)
+
+    for statement in CREATE_STATEMENTS:
+        conn.execute(statement)
+
+    # Backfill the grids from the points already stored
+    conn.execute("DELETE FROM damage_heatmap_bins")
+    conn.execute("""
+        INSERT INTO damage_heatmap_bins (vehicle_type, view, bin_y, bin_x, count)
+        SELECT dr.vehicle_type, COALESCE(p.view, 'unspecified'),
+               min(CAST(p.y * 64 AS INTEGER), 63), min(CAST(p.x * 64 AS INTEGER), 63), COUNT(*)
+        FROM damage_points p JOIN damage_reports dr ON dr.id = p.report_id
+        WHERE p.x BETWEEN 0 AND 1 AND p.y BETWEEN 0 AND 1
+        GROUP BY 1, 2, 3, 4
+    """)
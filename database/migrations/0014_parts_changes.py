@@ -0,0 +1,44 @@
+# database/migrations/0014_parts_changes.py
+"""Change log of searchable truck part fields for the parts index (see database/parts_index.py)"""
+
+# Entries kept; an index further behind than this reloads in full
+RETAINED_CHANGES = 1000
+
+
+def upgrade(conn):
+    """Create truck_parts_changes and the triggers that fill it"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS truck_parts_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            part_id INTEGER NOT NULL
+        )
+    """)
+
+    # Price and stock updates are not logged: the index does not key them
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_parts_changes_insert AFTER INSERT ON truck_parts_inventory
+        BEGIN
+            INSERT INTO truck_parts_changes (part_id) VALUES (NEW.id);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_parts_changes_update
+        AFTER UPDATE OF id, part_code, part_name_thai, part_name_english, category, is_active
+        ON truck_parts_inventory
+        BEGIN
+            INSERT INTO truck_parts_changes (part_id) SELECT OLD.id WHERE OLD.id IS NOT NEW.id;
+            INSERT INTO truck_parts_changes (part_id) VALUES (NEW.id);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_parts_changes_delete AFTER DELETE ON truck_parts_inventory
+        BEGIN
+            INSERT INTO truck_parts_changes (part_id) VALUES (OLD.id);
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_parts_changes_prune AFTER INSERT ON truck_parts_changes
+        BEGIN
+            DELETE FROM truck_parts_changes WHERE seq <= NEW.seq - {RETAINED_CHANGES:d};
+        END
+    """)
@@ -0,0 +1,80 @@
+# database/migrations/0015_heatmap_report_delete.py
+"""Heatmap triggers that no longer delete points from a BEFORE DELETE trigger (see database/damage_heatmap.py)"""
+
+# Trigger definitions as of this migration; later changes need a migration of their own
+TRIGGERS = {
+    'trg_heatmap_points_delete': """
+        AFTER DELETE ON damage_points
+        BEGIN
+            INSERT INTO damage_heatmap_bins (vehicle_type, view, bin_y, bin_x, count)
+            SELECT dr.vehicle_type, COALESCE(OLD.view, 'unspecified'),
+                   min(CAST(OLD.y * 64 AS INTEGER), 63), min(CAST(OLD.x * 64 AS INTEGER), 63), -1
+            FROM damage_reports dr WHERE dr.id = OLD.report_id
+            AND OLD.x BETWEEN 0 AND 1 AND OLD.y BETWEEN 0 AND 1
+            ON CONFLICT (vehicle_type, view, bin_y, bin_x) DO UPDATE SET count = count + excluded.count;
+            DELETE FROM damage_heatmap_bins WHERE count = 0 AND (vehicle_type, view, bin_y, bin_x) IN (
+                SELECT dr.vehicle_type, COALESCE(OLD.view, 'unspecified'),
+                       min(CAST(OLD.y * 64 AS INTEGER), 63), min(CAST(OLD.x * 64 AS INTEGER), 63)
+                FROM damage_reports dr WHERE dr.id = OLD.report_id);
+        END
+    """,
+    'trg_heatmap_points_update': """
+        AFTER UPDATE OF x, y, view, report_id ON damage_points
+        BEGIN
+            INSERT INTO damage_heatmap_bins (vehicle_type, view, bin_y, bin_x, count)
+            SELECT dr.vehicle_type, COALESCE(OLD.view, 'unspecified'),
+                   min(CAST(OLD.y * 64 AS INTEGER), 63), min(CAST(OLD.x * 64 AS INTEGER), 63), -1
+            FROM damage_reports dr WHERE dr.id = OLD.report_id
+            AND OLD.x BETWEEN 0 AND 1 AND OLD.y BETWEEN 0 AND 1
+            ON CONFLICT (vehicle_type, view, bin_y, bin_x) DO UPDATE SET count = count + excluded.count;
+            DELETE FROM damage_heatmap_bins WHERE count = 0 AND (vehicle_type, view, bin_y, bin_x) IN (
+                SELECT dr.vehicle_type, COALESCE(OLD.view, 'unspecified'),
+                       min(CAST(OLD.y * 64 AS INTEGER), 63), min(CAST(OLD.x * 64 AS INTEGER), 63)
+                FROM damage_reports dr WHERE dr.id = OLD.report_id);
+            INSERT INTO damage_heatmap_bins (vehicle_type, view, bin_y, bin_x, count)
+            SELECT dr.vehicle_type, COALESCE(NEW.view, 'unspecified'),
+                   min(CAST(NEW.y * 64 AS INTEGER), 63), min(CAST(NEW.x * 64 AS INTEGER), 63), +1
+            FROM damage_reports dr WHERE dr.id = NEW.report_id
+            AND NEW.x BETWEEN 0 AND 1 AND NEW.y BETWEEN 0 AND 1
+            ON CONFLICT (vehicle_type, view, bin_y, bin_x) DO UPDATE SET count = count + excluded.count;
+        END
+    """,
+    'trg_heatmap_reports_delete': """
+        BEFORE DELETE ON damage_reports
+        BEGIN
+            INSERT INTO damage_heatmap_bins (vehicle_type, view, bin_y, bin_x, count)
+            SELECT OLD.vehicle_type, COALESCE(p.view, 'unspecified'),
+                   min(CAST(p.y * 64 AS INTEGER), 63), min(CAST(p.x * 64 AS INTEGER), 63), -COUNT(*)
+            FROM damage_points p WHERE p.report_id = OLD.id
+            AND p.x BETWEEN 0 AND 1 AND p.y BETWEEN 0 AND 1 GROUP BY 2, 3, 4
+            ON CONFLICT (vehicle_type, view, bin_y, bin_x) DO UPDATE SET count = count + excluded.count;
+            DELETE FROM damage_heatmap_bins WHERE vehicle_type = OLD.vehicle_type AND count = 0;
+        END
+    """,
+    'trg_heatmap_reports_vehicle_type': """
+        AFTER UPDATE OF vehicle_type ON damage_reports WHEN OLD.vehicle_type IS NOT NEW.vehicle_type
+        BEGIN
+            INSERT INTO damage_heatmap_bins (vehicle_type, view, bin_y, bin_x, count)
+            SELECT OLD.vehicle_type, COALESCE(p.view, 'unspecified'),
+                   min(CAST(p.y * 64 AS INTEGER), 63), min(CAST(p.x * 64 AS INTEGER), 63), -COUNT(*)
+            FROM damage_points p WHERE p.report_id = NEW.id
+            AND p.x BETWEEN 0 AND 1 AND p.y BETWEEN 0 AND 1 GROUP BY 2, 3, 4
+            ON CONFLICT (vehicle_type, view, bin_y, bin_x) DO UPDATE SET count = count + excluded.count;
+            DELETE FROM damage_heatmap_bins WHERE vehicle_type = OLD.vehicle_type AND count = 0;
+            INSERT INTO damage_heatmap_bins (vehicle_type, view, bin_y, bin_x, count)
+            SELECT NEW.vehicle_type, COALESCE(p.view, 'unspecified'),
+                   min(CAST(p.y * 64 AS INTEGER), 63), min(CAST(p.x * 64 AS INTEGER), 63), +COUNT(*)
+            FROM damage_points p WHERE p.report_id = NEW.id
+            AND p.x BETWEEN 0 AND 1 AND p.y BETWEEN 0 AND 1 GROUP BY 2, 3, 4
+            ON CONFLICT (vehicle_type, view, bin_y, bin_x) DO UPDATE SET count = count + excluded.count;
+        END
+    """,
+}
+
+
+def upgrade(conn):
+    """Recreate the heatmap triggers that changed and drop cells left at zero"""
+    for name, body in TRIGGERS.items():
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        conn.execute(f"CREATE TRIGGER {name} {body.strip()}")
+    conn.execute("DELETE FROM damage_heatmap_bins WHERE count = 0")
@@ -0,0 +1,7 @@
+# database/migrations/0016_customers_created_at.py
+"""Index for the first, partial day of rolling new-customer windows (see database/stat_counters.py)"""
+
+
+def upgrade(conn):
+    """Index customers by creation time"""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_customers_created_at ON customers(created_at)")
@@ -0,0 +1,8 @@
+# database/migrations/__init__.py
+"""
+Ordered schema migration scripts
+
+Each module is named NNNN_description.py and defines upgrade(conn). The
+number is the PRAGMA user_version the database has once the script has run.
+Run them with: python -m database.schema_migrations apply
+"""
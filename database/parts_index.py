@@ -0,0 +1,209 @@
+# database/parts_index.py
+"""
+In-memory prefix index over the truck parts inventory
+
+The quote editor asks for part suggestions on every keystroke. Instead of a
+leading-wildcard LIKE over truck_parts_inventory, the index keeps a sorted
+array of every suffix of each part's normalized Thai name, English name and
+code; a query is a binary search for the range of keys that start with it,
+which finds the same substrings LIKE '%q%' would.
+
+The index is checked against the table's data version (table_versions) on
+each lookup. When the version has moved, only the parts logged in
+truck_parts_changes since the last refresh are re-read and re-keyed in
+place. Triggers log changes to the keyed fields only, so stock and price
+updates cost a single empty log query. Selling price and stock are looked up
+for the returned parts at result time.
+"""
+
+import bisect
+import sqlite3
+import logging
+import threading
+import unicodedata
+from typing import Any, Dict, List, Optional, Tuple
+
+from database import table_versions
+
+logger = logging.getLogger(__name__)
+
+# Keyed in the index; prices and stock move too often and are read per result
+PART_COLUMNS = ('id', 'part_code', 'part_name_thai', 'part_name_english', 'category')
+LIVE_COLUMNS = ('selling_price', 'quantity_in_stock', 'min_stock_level', 'is_active')
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+# Match quality, best first
+EXACT_CODE, CODE_PREFIX, NAME_PREFIX, WORD_PREFIX, SUBSTRING = range(5)
+
+
+def normalize(text: Optional[str]) -> str:
+    """Case- and width-insensitive form used for keys and queries"""
+    if not text:
+        return ''
+    return ' '.join(unicodedata.normalize('NFKC', text).casefold().split())
+
+
+def _part_keys(part: Dict[str, Any]) -> List[Tuple[str, int, int]]:
+    """(key, part id, match quality) for every suffix of the part's searchable fields"""
+    part_id = part['id']
+    keys = []
+
+    code = normalize(part['part_code'])
+    for text, prefix_quality in ((code, CODE_PREFIX),
+                                 (normalize(part['part_name_thai']), NAME_PREFIX),
+                                 (normalize(part['part_name_english']), NAME_PREFIX)):
+        for start in range(len(text)):
+            if start == 0:
+                quality = prefix_quality
+            elif text[start - 1] in ' -/':
+                quality = WORD_PREFIX
+            else:
+                quality = SUBSTRING
+            keys.append((text[start:], part_id, quality))
+    return keys
+
+
+class PartsIndex:
+    """Version-invalidated suffix array over active truck parts"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._version: Optional[Tuple[int, ...]] = None
+        self._seq: Optional[int] = None  # last truck_parts_changes entry applied
+        self._parts: Dict[int, Dict[str, Any]] = {}
+        self._keys: List[Tuple[str, int, int]] = []
+        self._stats = {'lookups': 0, 'refreshes': 0, 'full_reloads': 0, 'parts_rekeyed': 0}
+
+    def refresh(self, conn: sqlite3.Connection, force: bool = False):
+        """Bring the index up to date with the table if its data version moved"""
+        version = table_versions.get_versions(conn, ['truck_parts_inventory'])
+        if not force and version == self._version:
+            return
+
+        with self._refresh_lock:
+            if not force and version == self._version:
+                return
+
+            newest, oldest = conn.execute("SELECT MAX(seq), MIN(seq) FROM truck_parts_changes").fetchone()
+            newest = newest or 0
+            # A full reload when forced, on first use or once the log was pruned past us
+            if force or self._seq is None or (oldest is not None and oldest > self._seq + 1):
+                self._reload(conn, newest)
+            elif newest > self._seq:
+                self._apply_changes(conn, newest)
+
+            with self._lock:
+                self._version = version
+                self._stats['refreshes'] += 1
+
+    def _select_parts(self, conn: sqlite3.Connection, part_ids: Optional[List[int]] = None) -> Dict[int, Dict[str, Any]]:
+        """Keyed fields of the active parts (all of them, or those in part_ids)"""
+        query = f"SELECT {', '.join(PART_COLUMNS)} FROM truck_parts_inventory WHERE is_active = 1"
+        if part_ids is not None:
+            query += f" AND id IN ({', '.join('?' for _ in part_ids)})"
+        rows = conn.execute(query, part_ids or ()).fetchall()
+        return {row[0]: dict(zip(PART_COLUMNS, row)) for row in rows}
+
+    def _reload(self, conn: sqlite3.Connection, seq: int):
+        """Key every active part from scratch"""
+        parts = self._select_parts(conn)
+        keys = [key for part in parts.values() for key in _part_keys(part)]
+        keys.sort()
+
+        with self._lock:
+            self._parts, self._keys, self._seq = parts, keys, seq
+            self._stats['full_reloads'] += 1
+            self._stats['parts_rekeyed'] += len(parts)
+
+    def _apply_changes(self, conn: sqlite3.Connection, newest: int):
+        """Re-key only the parts logged after the last applied change"""
+        part_ids = [row[0] for row in conn.execute(
+            "SELECT DISTINCT part_id FROM truck_parts_changes WHERE seq > ? AND seq <= ?", (self._seq, newest)
+        )]
+        current = self._select_parts(conn, part_ids)
+
+        # Lookups read the published lists without the lock, so change copies
+        parts, keys = dict(self._parts), list(self._keys)
+        rekeyed = 0
+        for part_id in part_ids:
+            old, new = parts.pop(part_id, None), current.get(part_id)
+            if old == new:
+                if new is not None:
+                    parts[part_id] = new
+                continue
+            if old is not None:
+                for key in _part_keys(old):
+                    del keys[bisect.bisect_left(keys, key)]
+            if new is not None:
+                for key in _part_keys(new):
+                    bisect.insort(keys, key)
+                parts[part_id] = new
+            rekeyed += 1
+
+        with self._lock:
+            self._parts, self._keys, self._seq = parts, keys, newest
+            self._stats['parts_rekeyed'] += rekeyed
+
+    def suggest(self, conn: sqlite3.Connection, query: str, limit: int = DEFAULT_LIMIT,
+                category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Best matching active parts for query, with their current price and stock"""
+        self.refresh(conn)
+        matches = self.lookup(query, limit, category)
+        if not matches:
+            return matches
+
+        rows = conn.execute(
+            f"SELECT id, {', '.join(LIVE_COLUMNS)} FROM truck_parts_inventory "
+            f"WHERE id IN ({', '.join('?' for _ in matches)})",
+            [part['id'] for part in matches]
+        ).fetchall()
+        live = {row[0]: dict(zip(LIVE_COLUMNS, row[1:])) for row in rows}
+        return [dict(part, **live[part['id']]) for part in matches if part['id'] in live]
+
+    def match_ids(self, conn: sqlite3.Connection, query: str) -> List[int]:
+        """Ids of every active part whose code or names contain query"""
+        self.refresh(conn)
+        return [part['id'] for part in self.lookup(query, limit=None)]
+
+    def lookup(self, query: str, limit: Optional[int] = DEFAULT_LIMIT,
+               category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Search the index as it stands (call refresh() first)"""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+
+        with self._lock:
+            keys, parts = self._keys, self._parts
+            self._stats['lookups'] += 1
+
+        best: Dict[int, int] = {}
+        position = bisect.bisect_left(keys, (prefix,))
+        while position < len(keys) and keys[position][0].startswith(prefix):
+            key, part_id, quality = keys[position]
+            position += 1
+            if quality == CODE_PREFIX and key == prefix:
+                quality = EXACT_CODE
+            if quality < best.get(part_id, SUBSTRING + 1):
+                best[part_id] = quality
+
+        matches = [parts[part_id] for part_id in best
+                   if category is None or parts[part_id]['category'] == category]
+        matches.sort(key=lambda part: (best[part['id']], part['part_name_thai'] or '', part['id']))
+        if limit is not None:
+            matches = matches[:max(1, min(limit, MAX_LIMIT))]
+        return [dict(part, match_rank=best[part['id']]) for part in matches]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Index size and refresh counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['parts'] = len(self._parts)
+            stats['keys'] = len(self._keys)
+        return stats
+
+
+# Global index instance
+parts_index = PartsIndex()
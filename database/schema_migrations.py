@@ -0,0 +1,218 @@
+# database/schema_migrations.py
+"""
+Versioned schema migrations for the OL Service POS database
+
+The schema version lives in PRAGMA user_version. Migration scripts in
+database/migrations are named NNNN_description.py and each defines
+upgrade(conn); a database at version N has had every script up to N applied.
+Startup only reads user_version and compares it with the newest script, so
+an up-to-date database costs a single PRAGMA read instead of re-probing
+every table.
+
+Usage:
+    python -m database.schema_migrations status
+    python -m database.schema_migrations dry-run [--target N]
+    python -m database.schema_migrations apply [--target N]
+"""
+
+import os
+import re
+import sys
+import sqlite3
+import logging
+import argparse
+import importlib
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from database.connection_manager import db_manager
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_PACKAGE = 'database.migrations'
+MIGRATIONS_DIR = Path(__file__).parent / 'migrations'
+_MIGRATION_NAME = re.compile(r'^(\d{4})_(\w+)\.py$')
+
+
+class Migration(NamedTuple):
+    """A single migration script"""
+    version: int
+    name: str
+    upgrade: Callable[[sqlite3.Connection], None]
+
+
+_migrations_cache: Optional[List[Migration]] = None
+_verified_pid: Optional[int] = None
+
+
+def discover_migrations() -> List[Migration]:
+    """Load the migration scripts in version order"""
+    global _migrations_cache
+    if _migrations_cache is not None:
+        return _migrations_cache
+
+    migrations = []
+    for path in sorted(MIGRATIONS_DIR.iterdir()):
+        match = _MIGRATION_NAME.match(path.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"{MIGRATIONS_PACKAGE}.{path.stem}")
+        migrations.append(Migration(int(match.group(1)), match.group(2), module.upgrade))
+
+    versions = [m.version for m in migrations]
+    if len(set(versions)) != len(versions):
+        raise RuntimeError(f"Duplicate migration versions in {MIGRATIONS_DIR}")
+
+    _migrations_cache = migrations
+    return migrations
+
+
+def get_latest_version() -> int:
+    """Version of the newest migration script"""
+    migrations = discover_migrations()
+    return migrations[-1].version if migrations else 0
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Read the schema version stored in the database"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def get_pending(conn: sqlite3.Connection, target: Optional[int] = None) -> List[Migration]:
+    """Migrations newer than the database and not newer than target"""
+    current = get_schema_version(conn)
+    target = get_latest_version() if target is None else target
+    return [m for m in discover_migrations() if current < m.version <= target]
+
+
+def apply_migrations(conn: sqlite3.Connection, target: Optional[int] = None) -> List[Migration]:
+    """Apply pending migrations on conn (isolation_level=None) in one write transaction"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Re-read under the write lock: another worker may have migrated already
+        pending = get_pending(conn, target)
+        for migration in pending:
+            logger.info(f"Applying schema migration {migration.version:04d} {migration.name}")
+            migration.upgrade(conn)
+            # user_version is transactional, so a failed script leaves it untouched
+            conn.execute(f"PRAGMA user_version = {migration.version:d}")
+        conn.execute("COMMIT")
+        return pending
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _open_migration_connection() -> sqlite3.Connection:
+    """Dedicated connection with explicit transaction control"""
+    conn = db_manager.connection_pool.create_connection(writer=True)
+    conn.isolation_level = None
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def migrate(target: Optional[int] = None) -> List[Migration]:
+    """Bring the database up to target (default: newest) and return what was applied"""
+    db_dir = os.path.dirname(db_manager.db_path)
+    if db_dir:
+        os.makedirs(db_dir, exist_ok=True)
+
+    conn = _open_migration_connection()
+    try:
+        return apply_migrations(conn, target)
+    finally:
+        conn.close()
+
+
+def dry_run(target: Optional[int] = None) -> Dict[str, Any]:
+    """Apply pending migrations to an in-memory copy of the database
+
+    Nothing is written to the real database file. Returns the versions before
+    and after and the migrations that would run; a failing script raises.
+    """
+    source = _open_migration_connection()
+    scratch = sqlite3.connect(':memory:')
+    try:
+        source.backup(scratch)
+        scratch.isolation_level = None
+        scratch.row_factory = sqlite3.Row
+        scratch.execute("PRAGMA foreign_keys = ON")
+
+        before = get_schema_version(scratch)
+        applied = apply_migrations(scratch, target)
+        return {
+            'from_version': before,
+            'to_version': get_schema_version(scratch),
+            'applied': [f"{m.version:04d}_{m.name}" for m in applied],
+        }
+    finally:
+        scratch.close()
+        source.close()
+
+
+def ensure_schema() -> bool:
+    """Migrate if the database is behind; cheap no-op once it is current
+
+    Returns True if any migration ran.
+    """
+    global _verified_pid
+    if _verified_pid == os.getpid():
+        return False
+
+    if os.path.exists(db_manager.db_path):
+        with db_manager.get_connection(row_factory=False) as conn:
+            if get_schema_version(conn) >= get_latest_version():
+                _verified_pid = os.getpid()
+                return False
+
+    applied = migrate()
+    _verified_pid = os.getpid()
+    return bool(applied)
+
+
+def get_status() -> Dict[str, Any]:
+    """Current schema version and pending migrations"""
+    with db_manager.get_connection(row_factory=False) as conn:
+        current = get_schema_version(conn)
+        pending = get_pending(conn)
+    return {
+        'database': db_manager.db_path,
+        'current_version': current,
+        'latest_version': get_latest_version(),
+        'pending': [f"{m.version:04d}_{m.name}" for m in pending],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="OL Service POS schema migrations")
+    parser.add_argument('command', choices=['status', 'apply', 'dry-run'])
+    parser.add_argument('--target', type=int, default=None, help="Stop at this schema version")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'status':
+            status = get_status()
+            print(f"Database: {status['database']}")
+            print(f"Schema version: {status['current_version']} (latest {status['latest_version']})")
+            for name in status['pending']:
+                print(f"  pending: {name}")
+        elif args.command == 'dry-run':
+            result = dry_run(args.target)
+            print(f"Dry run: version {result['from_version']} -> {result['to_version']}")
+            for name in result['applied']:
+                print(f"  would apply: {name}")
+        else:
+            applied = migrate(args.target)
+            for migration in applied:
+                print(f"Applied {migration.version:04d}_{migration.name}")
+            if not applied:
+                print("Schema is up to date")
+        return 0
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+# database/search_index.py
+"""
+Unified full-text search over customers, vehicles, repair quotes and claims
+
+A single FTS5 table with the trigram tokenizer indexes every searchable
+field. Trigrams match any substring of three or more characters, so Thai
+names (written without spaces between words), partial phone numbers and
+fragments of plates or ID numbers are all found without word segmentation.
+Triggers on the source tables (migration 0008) keep the index in sync;
+DOCUMENTS describes what they index, and changing it needs a migration
+that recreates them.
+
+Each document's rowid is derived from the source row (id * 8 + kind code),
+so a trigger can replace a document with a rowid lookup.
+"""
+
+import re
+import sqlite3
+import logging
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MIN_TOKEN_LENGTH = 3  # the trigram tokenizer cannot match shorter strings
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+# bm25 weights for (names, contact, identifiers): an exact ID or plate hit ranks first
+COLUMN_WEIGHTS = (2.0, 3.0, 5.0)
+
+
+class Document(NamedTuple):
+    """How rows of one source table become search documents
+
+    Field values are SQL expressions over a row aliased as {r}.
+    """
+    kind: str
+    code: int
+    table: str
+    customer_id: str
+    title: str
+    names: Tuple[str, ...]
+    contact: Tuple[str, ...]
+    identifiers: Tuple[str, ...]
+    columns: Tuple[str, ...]
+
+
+def _digits(column: str) -> str:
+    """Phone number with separators removed"""
+    return f"replace(replace(replace({column}, '-', ''), ' ', ''), '.', '')"
+
+
+DOCUMENTS: List[Document] = [
+    Document(
+        kind='customer', code=1, table='customers',
+        customer_id="{r}.id",
+        title="trim(COALESCE({r}.first_name, '') || ' ' || COALESCE({r}.last_name, ''))",
+        names=("{r}.first_name", "{r}.last_name", "{r}.thai_name", "{r}.english_name", "{r}.english_address"),
+        contact=("{r}.phone", _digits("{r}.phone"), "{r}.email"),
+        identifiers=("{r}.thai_id_number", "{r}.driver_license_number"),
+        columns=('first_name', 'last_name', 'thai_name', 'english_name', 'english_address', 'phone', 'email',
+                 'thai_id_number', 'driver_license_number'),
+    ),
+    Document(
+        kind='vehicle', code=2, table='vehicles',
+        customer_id="{r}.customer_id",
+        title="trim(COALESCE({r}.license_plate, '') || ' ' || COALESCE({r}.make, '') || ' ' || "
+              "COALESCE({r}.model, ''))",
+        names=("{r}.make", "{r}.model"),
+        contact=(),
+        identifiers=("{r}.license_plate", "replace({r}.license_plate, ' ', '')", "{r}.vin"),
+        columns=('customer_id', 'make', 'model', 'license_plate', 'vin'),
+    ),
+    Document(
+        kind='quote', code=3, table='repair_quotes',
+        customer_id="(SELECT customer_id FROM services WHERE id = {r}.service_id)",
+        title="trim(COALESCE({r}.quote_number, '') || ' ' || COALESCE({r}.customer_name, ''))",
+        names=("{r}.customer_name", "{r}.vehicle_make", "{r}.vehicle_model"),
+        contact=("{r}.customer_contact", _digits("{r}.customer_contact")),
+        identifiers=("{r}.quote_number", "{r}.vehicle_registration", "{r}.chassis_number"),
+        columns=('service_id', 'quote_number', 'customer_name', 'vehicle_make', 'vehicle_model',
+                 'customer_contact', 'vehicle_registration', 'chassis_number'),
+    ),
+    Document(
+        kind='claim', code=4, table='insurance_claims',
+        customer_id="{r}.customer_id",
+        title="trim(COALESCE({r}.claim_number, '') || ' ' || COALESCE({r}.insurance_company, ''))",
+        names=("{r}.insurance_company", "{r}.adjuster_name"),
+        contact=("{r}.adjuster_contact",),
+        identifiers=("{r}.claim_number", "{r}.policy_number", "{r}.police_report_number"),
+        columns=('customer_id', 'claim_number', 'insurance_company', 'adjuster_name',
+                 'adjuster_contact', 'policy_number', 'police_report_number'),
+    ),
+]
+
+DOCUMENT_KINDS = {doc.kind: doc for doc in DOCUMENTS}
+KIND_CODE_MODULUS = 8
+
+_available: Optional[bool] = None
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+def is_available(conn: sqlite3.Connection) -> bool:
+    """True if the search index exists in this database"""
+    global _available
+    if _available is None:
+        _available = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_index'"
+        ).fetchone() is not None
+    return _available
+
+
+def tokenize(term: str) -> List[str]:
+    """Split a search term into tokens, joining digit groups (081-234-5678 -> 0812345678)"""
+    term = re.sub(r'(?<=\d)[-\s.](?=\d)', '', term.strip())
+    return [token for token in term.split() if token]
+
+
+def build_filter(term: str, alias: str = 'search_index') -> Tuple[str, list]:
+    """WHERE clause over search_index matching every token of term
+
+    Tokens of three or more characters go through the trigram index; shorter
+    ones are checked with LIKE on the rows the index returns.
+    """
+    tokens = tokenize(term)
+    long_tokens = [t for t in tokens if len(t) >= MIN_TOKEN_LENGTH]
+    short_tokens = [t for t in tokens if len(t) < MIN_TOKEN_LENGTH]
+
+    clauses, params = [], []
+    if long_tokens:
+        clauses.append(f"{alias} MATCH ?")
+        params.append(' '.join('"' + t.replace('"', '""') + '"' for t in long_tokens))
+    for token in short_tokens:
+        clauses.append(f"({alias}.names || ' ' || {alias}.contact || ' ' || {alias}.identifiers) LIKE ?")
+        params.append(f"%{token}%")
+    return ' AND '.join(clauses) or '1 = 0', params
+
+
+def search(conn: sqlite3.Connection, term: str, kinds: Optional[Iterable[str]] = None,
+           limit: int = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
+    """Ranked matches across all document kinds (best first)"""
+    where, params = build_filter(term)
+    if kinds:
+        kinds = [k for k in kinds if k in DOCUMENT_KINDS]
+        where += f" AND kind IN ({', '.join('?' for _ in kinds)})"
+        params.extend(kinds)
+
+    rank = "bm25(search_index, 0, 0, 0, 0, {}, {}, {})".format(*COLUMN_WEIGHTS) \
+        if 'MATCH' in where else "0"
+    rows = conn.execute(f"""
+        SELECT kind, ref_id, customer_id, title, {rank} AS score
+        FROM search_index
+        WHERE {where}
+        ORDER BY score, rowid
+        LIMIT ?
+    """, params + [max(1, min(limit, MAX_LIMIT))]).fetchall()
+
+    return [{
+        'type': row[0],
+        'id': row[1],
+        'customer_id': row[2],
+        'title': row[3],
+        'score': round(-row[4], 4) if row[4] else 0.0,
+    } for row in rows]
+
+
+def customer_filter(conn: sqlite3.Connection, term: str, id_column: str = 'id') -> Tuple[str, list]:
+    """SQL condition on a customers query selecting customers whose own fields match term"""
+    if is_available(conn):
+        where, params = build_filter(term)
+        return (f"{id_column} IN (SELECT ref_id FROM search_index WHERE {where} AND kind = 'customer')",
+                params)
+
+    # No FTS5: the original substring scan
+    fields = DOCUMENT_KINDS['customer'].columns
+    prefix = id_column.rsplit('.', 1)[0] + '.' if '.' in id_column else ''
+    clause = ' OR '.join(f"{prefix}{field} LIKE ?" for field in fields)
+    return f"({clause})", [f"%{term.strip()}%"] * len(fields)
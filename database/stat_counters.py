@@ -0,0 +1,292 @@
+# database/stat_counters.py
+"""
+Trigger-maintained statistics counters
+
+Dashboard and customer statistics used to run a COUNT(*)/SUM over whole
+tables per figure on every refresh. The stat_counters table holds those
+figures instead, and SQLite triggers on the source tables (migration 0006)
+keep it up to date on every insert, update and delete, so reading the
+statistics is a handful of primary-key lookups. METRICS describes what the
+triggers count; changing it needs a migration that recreates them.
+
+Time-windowed figures ("new customers in the last 30 days") are kept in
+per-day buckets (e.g. customers.created_day:2024-05-01) and summed over a
+key range. Rolling windows add the part of their first day that falls
+inside the window from the source table, so they count exactly the rows
+created_at >= datetime('now', '-30 days') would.
+
+Counters can drift if rows are changed with triggers disabled or restored
+from a backup; reconcile() recomputes every counter from the source tables
+and repairs differences:
+    python -m database.stat_counters reconcile [--dry-run]
+"""
+
+import sys
+import sqlite3
+import logging
+import argparse
+from typing import Any, Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+DAY_KEY = "date({r}.created_at)"
+
+
+class Metric(NamedTuple):
+    """One family of counters on a source table
+
+    key and value are SQL expressions over a row aliased as {r}. Rows whose
+    key is NULL or whose value is 0 do not contribute.
+    """
+    table: str
+    key: str
+    value: str
+    columns: tuple
+
+
+METRICS: List[Metric] = [
+    # Customers
+    Metric('customers', "'customers.total'", "1", ()),
+    Metric('customers', "'customers.with_thai_id'",
+           "({r}.thai_id_number IS NOT NULL AND {r}.thai_id_number != '')", ('thai_id_number',)),
+    Metric('customers', "'customers.with_driver_license'",
+           "({r}.driver_license_number IS NOT NULL AND {r}.driver_license_number != '')",
+           ('driver_license_number',)),
+    Metric('customers', "'customers.with_phone'", "({r}.phone IS NOT NULL AND {r}.phone != '')", ('phone',)),
+    Metric('customers', "'customers.with_email'", "({r}.email IS NOT NULL AND {r}.email != '')", ('email',)),
+    Metric('customers', "'customers.document_type:' || {r}.document_type", "1", ('document_type',)),
+    Metric('customers', "'customers.created_day:' || " + DAY_KEY, "1", ('created_at',)),
+
+    # Vehicles
+    Metric('vehicles', "'vehicles.total'", "1", ()),
+    Metric('vehicles', "'vehicles.vehicle_type:' || {r}.vehicle_type", "1", ('vehicle_type',)),
+
+    # Services
+    Metric('services', "'services.total'", "1", ()),
+    Metric('services', "'services.status:' || {r}.status", "1", ('status',)),
+    Metric('services', "'services.service_type:' || {r}.service_type", "1", ('service_type',)),
+    Metric('services', "'services.completed_revenue'",
+           "CASE WHEN {r}.status = 'completed' THEN COALESCE({r}.actual_cost, 0) ELSE 0 END",
+           ('status', 'actual_cost')),
+    Metric('services', "'services.created_day:' || " + DAY_KEY, "1", ('created_at',)),
+
+    # Photos
+    Metric('vehicle_photos', "'vehicle_photos.total'", "1", ()),
+    Metric('photo_sessions', "'photo_sessions.total'", "1", ()),
+
+    # Truck repair
+    Metric('material_forms', "'material_forms.total'", "1", ()),
+    Metric('repair_quotes', "'repair_quotes.total'", "1", ()),
+    Metric('repair_quotes', "'repair_quotes.approved_revenue'",
+           "CASE WHEN {r}.status = 'approved' THEN COALESCE({r}.final_amount, 0) ELSE 0 END",
+           ('status', 'final_amount')),
+
+    # Payments
+    Metric('payments', "'payments.total'", "1", ()),
+    Metric('payments', "'payments.created_day:' || " + DAY_KEY, "1", ('created_at',)),
+    Metric('payments', "'payments.completed_amount_day:' || " + DAY_KEY,
+           "CASE WHEN {r}.status = 'completed' THEN COALESCE({r}.total_amount, 0) ELSE 0 END",
+           ('created_at', 'status', 'total_amount')),
+]
+
+COUNTER_TABLES = sorted({m.table for m in METRICS})
+SUM_TOLERANCE = 1e-6
+
+
+# ---------------------------------------------------------------------------
+# Reconciliation
+# ---------------------------------------------------------------------------
+
+def compute_counters(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """Recompute every counter from the source tables"""
+    expected: Dict[str, Any] = {}
+    for metric in METRICS:
+        key = metric.key.format(r='r')
+        value = metric.value.format(r='r')
+        rows = conn.execute(
+            f"SELECT {key} AS name, SUM({value}) AS value FROM {metric.table} AS r "
+            f"WHERE ({key}) IS NOT NULL GROUP BY 1"
+        ).fetchall()
+        for name, total in rows:
+            if total:
+                expected[name] = expected.get(name, 0) + total
+    return expected
+
+
+def find_drift(conn: sqlite3.Connection) -> Dict[str, Dict[str, Any]]:
+    """Counters whose stored value differs from a full recount"""
+    expected = compute_counters(conn)
+    stored = {row[0]: row[1] for row in conn.execute("SELECT name, value FROM stat_counters")}
+
+    drift = {}
+    for name in set(expected) | set(stored):
+        want, have = expected.get(name, 0), stored.get(name, 0)
+        if abs((want or 0) - (have or 0)) > SUM_TOLERANCE:
+            drift[name] = {'stored': have, 'expected': want}
+    return drift
+
+
+def repair(conn: sqlite3.Connection) -> Dict[str, Dict[str, Any]]:
+    """Fix drifted counters on conn (caller provides the write transaction)"""
+    drift = find_drift(conn)
+    for name, values in drift.items():
+        if values['expected']:
+            conn.execute(
+                "INSERT INTO stat_counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+                (name, values['expected']))
+        else:
+            conn.execute("DELETE FROM stat_counters WHERE name = ?", (name,))
+    return drift
+
+
+def reconcile(dry_run: bool = False) -> Dict[str, Dict[str, Any]]:
+    """Recompute all counters and repair drift through the single writer"""
+    from database.connection_manager import db_manager
+    from database.write_coordinator import write_coordinator
+
+    if dry_run:
+        with db_manager.get_connection(row_factory=False) as conn:
+            drift = find_drift(conn)
+    else:
+        # Runs inside the writer's transaction so no trigger update can interleave
+        drift = write_coordinator.run(repair, group=False)
+
+    if drift:
+        logger.warning(f"stat_counters drift in {len(drift)} counter(s): {sorted(drift)}")
+    return drift
+
+
+# ---------------------------------------------------------------------------
+# Reads
+# ---------------------------------------------------------------------------
+
+def read_counters(conn: sqlite3.Connection, names: List[str]) -> Dict[str, Any]:
+    """Fetch the given counters (missing counters are 0)"""
+    placeholders = ', '.join('?' for _ in names)
+    rows = conn.execute(f"SELECT name, value FROM stat_counters WHERE name IN ({placeholders})",
+                        names).fetchall()
+    values = {name: 0 for name in names}
+    values.update({row[0]: row[1] for row in rows})
+    return values
+
+
+def sum_days(conn: sqlite3.Connection, prefix: str, since: str) -> Any:
+    """Sum a per-day counter family over calendar days from a date modifier (e.g. 'start of month') to today
+
+    Buckets use SQLite's date('now'), matching the UTC CURRENT_TIMESTAMP
+    defaults on created_at, at whole-day granularity.
+    """
+    row = conn.execute(
+        "SELECT SUM(value) FROM stat_counters "
+        "WHERE name BETWEEN ? || date('now', ?) AND ? || date('now')",
+        (f"{prefix}:", since, f"{prefix}:")
+    ).fetchone()
+    return row[0] or 0
+
+
+def count_since(conn: sqlite3.Connection, table: str, since: str) -> int:
+    """Rows of table created since datetime('now', since), e.g. '-30 days'
+
+    Days after the window's first day are summed from the table's
+    created_day buckets; the first day is only partly inside the window, so
+    its rows are counted from the table itself (one day of an indexed range).
+    """
+    first_day = conn.execute("SELECT date('now', ?)", (since,)).fetchone()[0]
+    prefix = f"{table}.created_day"
+    # ';' sorts right after ':', so this is every later day of the family
+    later_days = conn.execute(
+        "SELECT SUM(value) FROM stat_counters WHERE name > ? AND name < ?",
+        (f"{prefix}:{first_day}", f"{prefix};")
+    ).fetchone()[0] or 0
+    first_day_part = conn.execute(
+        f"SELECT COUNT(*) FROM {table} "
+        f"WHERE created_at >= datetime('now', ?) AND created_at < date('now', ?, '+1 day')",
+        (since, since)
+    ).fetchone()[0]
+    return later_days + first_day_part
+
+
+def get_dashboard_stats(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """Statistics for /api/dashboard/stats"""
+    counters = read_counters(conn, [
+        'customers.total', 'vehicles.total', 'vehicles.vehicle_type:truck', 'services.total',
+        'services.status:pending', 'services.status:in_progress', 'services.status:completed',
+        'services.service_type:truck_repair', 'material_forms.total', 'repair_quotes.total',
+        'vehicle_photos.total', 'photo_sessions.total', 'services.completed_revenue',
+        'repair_quotes.approved_revenue',
+    ])
+    return {
+        'total_customers': counters['customers.total'],
+        'total_vehicles': counters['vehicles.total'],
+        'total_trucks': counters['vehicles.vehicle_type:truck'],
+        'total_services': counters['services.total'],
+        'pending_services': counters['services.status:pending'],
+        'active_services': counters['services.status:in_progress'],
+        'completed_services': counters['services.status:completed'],
+        'truck_repair_services': counters['services.service_type:truck_repair'],
+        'material_forms': counters['material_forms.total'],
+        'repair_quotes': counters['repair_quotes.total'],
+        'total_photos': counters['vehicle_photos.total'],
+        'photo_sessions': counters['photo_sessions.total'],
+        'total_revenue': counters['services.completed_revenue'],
+        'quote_revenue': counters['repair_quotes.approved_revenue'],
+        'services_this_week': count_since(conn, 'services', '-7 days'),
+        'new_customers_this_month': count_since(conn, 'customers', '-30 days'),
+    }
+
+
+def get_customer_statistics(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """Customer document and contact statistics"""
+    counters = read_counters(conn, [
+        'customers.total', 'customers.with_thai_id', 'customers.with_driver_license',
+        'customers.with_phone', 'customers.with_email',
+        'customers.document_type:thai_id', 'customers.document_type:driver_license',
+    ])
+    total = counters['customers.total']
+    stats = {
+        'total_customers': total,
+        'with_thai_id': counters['customers.with_thai_id'],
+        'with_driver_license': counters['customers.with_driver_license'],
+        'with_phone': counters['customers.with_phone'],
+        'with_email': counters['customers.with_email'],
+        'thai_id_only': counters['customers.document_type:thai_id'],
+        'driver_license_only': counters['customers.document_type:driver_license'],
+        'new_last_30_days': count_since(conn, 'customers', '-30 days'),
+        'new_last_90_days': count_since(conn, 'customers', '-90 days'),
+    }
+    stats['thai_id_percentage'] = round(stats['with_thai_id'] / total * 100, 1) if total else 0
+    stats['driver_license_percentage'] = round(stats['with_driver_license'] / total * 100, 1) if total else 0
+    return stats
+
+
+def get_payment_statistics(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """Revenue and payment counts for today and the current month"""
+    return {
+        'today_revenue': sum_days(conn, 'payments.completed_amount_day', '+0 days'),
+        'month_revenue': sum_days(conn, 'payments.completed_amount_day', 'start of month'),
+        'payments_today': sum_days(conn, 'payments.created_day', '+0 days'),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Statistics counters maintenance")
+    parser.add_argument('command', choices=['reconcile'])
+    parser.add_argument('--dry-run', action='store_true', help="Report drift without repairing it")
+    args = parser.parse_args(argv)
+
+    drift = reconcile(dry_run=args.dry_run)
+    for name, values in sorted(drift.items()):
+        print(f"  {name}: stored {values['stored']}, expected {values['expected']}")
+    if not drift:
+        print("✅ All counters match")
+    elif args.dry_run:
+        print(f"⚠️ {len(drift)} counter(s) drifted")
+    else:
+        print(f"✅ Repaired {len(drift)} counter(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
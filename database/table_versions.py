@@ -0,0 +1,39 @@
+# database/table_versions.py
+"""
+Per-table data versions
+
+Every application table gets AFTER INSERT/UPDATE/DELETE triggers that bump
+its row in table_versions. Readers that cache data derived from a table
+remember the versions they saw and treat the data as stale as soon as any
+of them moves. Because the versions live in the database, writes made by
+other gunicorn workers or the desktop app invalidate too.
+
+Migration 0007 creates the triggers on the tables that existed then; a
+migration that adds an application table creates its triggers as well.
+Bookkeeping tables (stat_counters, document_sequences, ...) and FTS tables
+have none.
+
+The row named EPOCH holds a random number fixed when the database is
+created, so validators built from versions (ETags) never match across a
+database that was recreated and counted back up from zero.
+"""
+
+import sqlite3
+import logging
+from typing import Dict, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Not a table: identifies this database file among ones with equal versions
+EPOCH = '_epoch'
+
+
+def get_versions(conn: sqlite3.Connection, tables: Iterable[str]) -> Tuple[int, ...]:
+    """Current versions of the given tables, in the order given (0 if never written)"""
+    tables = list(tables)
+    placeholders = ', '.join('?' for _ in tables)
+    rows = conn.execute(
+        f"SELECT name, version FROM table_versions WHERE name IN ({placeholders})", tables
+    ).fetchall()
+    versions: Dict[str, int] = {row[0]: row[1] for row in rows}
+    return tuple(versions.get(table, 0) for table in tables)
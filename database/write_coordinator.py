@@ -0,0 +1,314 @@
+# database/write_coordinator.py
+"""
+Single-writer commit queue for the OL Service POS database
+
+SQLite allows one writer at a time. With several gunicorn workers writing to
+the same file, plain connections race for the write lock and callers see
+"database is locked". The WriteCoordinator funnels writes from every thread
+in a process through one writer thread, and serializes writer threads across
+processes on the same host with a lock file next to the database.
+
+Small writes that arrive together are group committed: they run in a single
+BEGIN IMMEDIATE transaction, each inside its own savepoint so that one failing
+write does not take the others down with it.
+
+Only the hot-path inserts go through the coordinator: photos, payments,
+claims and new quotes. The remaining writes (customers, vehicles, services,
+quote updates, damage reports, settings) still commit on the request
+connection, which waits on SQLite's busy timeout instead. They share the
+database file with the writer thread but not the host lock file, so under
+heavy write load they can still see "database is locked" once that timeout
+runs out.
+"""
+
+import os
+import time
+import queue
+import random
+import sqlite3
+import logging
+import threading
+from concurrent.futures import Future, TimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows desktop installs run a single process
+    fcntl = None
+
+from database.connection_manager import db_manager
+
+logger = logging.getLogger(__name__)
+
+
+class _WriteJob:
+    """A unit of work queued for the writer thread"""
+
+    __slots__ = ('func', 'args', 'kwargs', 'group', 'future', 'enqueued_at')
+
+    def __init__(self, func: Callable, args: tuple, kwargs: dict, group: bool):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.group = group
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class WriteCoordinator:
+    """Per-host single-writer queue with group commit and bounded retry"""
+
+    def __init__(self, manager=None, max_batch: int = 32, group_window: float = 0.002,
+                 max_retries: int = 8, base_backoff: float = 0.01, max_backoff: float = 0.5,
+                 timeout: float = 30.0):
+        self.manager = manager or db_manager
+        self.max_batch = max_batch
+        self.group_window = group_window
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.lock_path = f"{self.manager.db_path}.writelock"
+
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._thread = None
+        self._conn = None
+        self._reset_stats()
+
+    def _reset_stats(self):
+        """Reset the metrics counters"""
+        self._stats = {
+            'jobs_submitted': 0,
+            'jobs_completed': 0,
+            'jobs_failed': 0,
+            'batches': 0,
+            'max_queue_depth': 0,
+            'lock_wait_total': 0.0,
+            'lock_wait_max': 0.0,
+            'queue_wait_total': 0.0,
+            'busy_retries': 0,
+            'busy_failures': 0,
+            'timeouts': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def run(self, func: Callable, *args, group: bool = True, timeout: Optional[float] = None,
+            **kwargs) -> Any:
+        """Run func(conn, *args, **kwargs) on the writer connection and return its result
+
+        The function runs inside a transaction that is committed by the writer
+        thread; it must use the connection it is given and must not commit or
+        roll back itself. Exceptions raised by the function are re-raised here
+        and only that function's changes are rolled back. Pass group=False for
+        large writes that should get a transaction of their own.
+
+        Waits at most timeout seconds (the coordinator's default when None)
+        and raises concurrent.futures.TimeoutError after that. A job that has
+        not started yet is cancelled; one that is already running still
+        commits.
+        """
+        if threading.current_thread() is self._thread:
+            # Already on the writer thread (nested call) - run inline
+            return func(self._conn, *args, **kwargs)
+
+        if timeout is None:
+            timeout = self.timeout
+
+        future = self.submit(func, *args, group=group, **kwargs)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            with self._stats_lock:
+                self._stats['timeouts'] += 1
+            logger.error(f"Write job timed out after {timeout}s")
+            raise
+
+    def submit(self, func: Callable, *args, group: bool = True, **kwargs) -> Future:
+        """Queue func(conn, *args, **kwargs) and return a Future for its result"""
+        self._ensure_started()
+
+        job = _WriteJob(func, args, kwargs, group)
+        self._queue.put(job)
+
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            self._stats['jobs_submitted'] += 1
+            if depth > self._stats['max_queue_depth']:
+                self._stats['max_queue_depth'] = depth
+        return job.future
+
+    def execute(self, query: str, params: tuple = ()) -> Dict[str, int]:
+        """Execute a single write statement and return its lastrowid and rowcount"""
+        def _execute(conn):
+            cursor = conn.execute(query, params)
+            return {'lastrowid': cursor.lastrowid, 'rowcount': cursor.rowcount}
+
+        return self.run(_execute)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return queue depth, lock wait and retry metrics"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        stats['queue_depth'] = self._queue.qsize() if self._queue else 0
+        finished = stats['jobs_completed'] + stats['jobs_failed']
+        stats['avg_batch_size'] = round(finished / stats['batches'], 2) if stats['batches'] else 0.0
+        stats['avg_lock_wait_ms'] = (
+            round(stats['lock_wait_total'] / stats['batches'] * 1000, 2) if stats['batches'] else 0.0
+        )
+        stats['avg_queue_wait_ms'] = (
+            round(stats['queue_wait_total'] / finished * 1000, 2) if finished else 0.0
+        )
+        stats['lock_wait_max_ms'] = round(stats.pop('lock_wait_max') * 1000, 2)
+        stats['lock_wait_total'] = round(stats['lock_wait_total'], 4)
+        stats['queue_wait_total'] = round(stats['queue_wait_total'], 4)
+        return stats
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _ensure_started(self):
+        """Start the writer thread for this process (again after a fork)"""
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+
+        with self._start_lock:
+            if self._pid == os.getpid() and self._thread is not None:
+                return
+
+            self._pid = os.getpid()
+            self._queue = queue.Queue()
+            self._reset_stats()
+            self._conn = self.manager.connection_pool.create_connection(writer=True)
+            self._conn.isolation_level = None  # transactions are managed explicitly
+            self._conn.row_factory = sqlite3.Row
+            self._thread = threading.Thread(target=self._writer_loop, name='db-writer', daemon=True)
+            self._thread.start()
+
+    def _writer_loop(self):
+        """Drain the queue, committing compatible jobs together"""
+        while True:
+            batch = self._next_batch()
+            try:
+                self._commit_batch(batch)
+            except Exception as e:
+                logger.error(f"Write batch failed: {e}")
+                for job in batch:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+                with self._stats_lock:
+                    self._stats['jobs_failed'] += len(batch)
+
+    def _next_batch(self) -> List[_WriteJob]:
+        """Block for the next job and gather any small jobs queued behind it"""
+        first = self._queue.get()
+        batch = [first]
+        if not first.group:
+            return batch
+
+        deadline = time.monotonic() + self.group_window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                job = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if not job.group:
+                # Large job - put it back at the end and commit what we have
+                self._queue.put(job)
+                break
+            batch.append(job)
+        return batch
+
+    def _commit_batch(self, batch: List[_WriteJob]):
+        """Run a batch inside one BEGIN IMMEDIATE transaction"""
+        lock_file, lock_wait = self._acquire_write_lock()
+        try:
+            results: List[Tuple[_WriteJob, bool, Any]] = []
+            for job in batch:
+                if not job.future.set_running_or_notify_cancel():
+                    continue  # the caller gave up waiting
+                self._conn.execute("SAVEPOINT write_job")
+                try:
+                    value = job.func(self._conn, *job.args, **job.kwargs)
+                    self._conn.execute("RELEASE write_job")
+                    results.append((job, True, value))
+                except Exception as e:
+                    self._conn.execute("ROLLBACK TO write_job")
+                    self._conn.execute("RELEASE write_job")
+                    results.append((job, False, e))
+
+            self._conn.execute("COMMIT")
+        except Exception:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            raise
+        finally:
+            self._release_write_lock(lock_file)
+
+        now = time.monotonic()
+        with self._stats_lock:
+            self._stats['batches'] += 1
+            self._stats['lock_wait_total'] += lock_wait
+            self._stats['lock_wait_max'] = max(self._stats['lock_wait_max'], lock_wait)
+            for job, ok, _ in results:
+                self._stats['jobs_completed' if ok else 'jobs_failed'] += 1
+                self._stats['queue_wait_total'] += now - job.enqueued_at
+
+        for job, ok, value in results:
+            if ok:
+                job.future.set_result(value)
+            else:
+                job.future.set_exception(value)
+
+    def _acquire_write_lock(self):
+        """Take the host lock file and BEGIN IMMEDIATE, retrying with backoff
+
+        Returns the open lock file (or None) and the seconds spent waiting.
+        """
+        started = time.monotonic()
+        lock_file = None
+        if fcntl is not None:
+            lock_file = open(self.lock_path, 'a')
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+        attempt = 0
+        while True:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                return lock_file, time.monotonic() - started
+            except sqlite3.OperationalError as e:
+                message = str(e).lower()
+                if 'locked' not in message and 'busy' not in message:
+                    self._release_write_lock(lock_file)
+                    raise
+                attempt += 1
+                if attempt > self.max_retries:
+                    with self._stats_lock:
+                        self._stats['busy_failures'] += 1
+                    self._release_write_lock(lock_file)
+                    raise
+                with self._stats_lock:
+                    self._stats['busy_retries'] += 1
+                delay = min(self.max_backoff, self.base_backoff * (2 ** (attempt - 1)))
+                time.sleep(delay * (0.5 + random.random() / 2))
+
+    def _release_write_lock(self, lock_file):
+        """Release the host lock file"""
+        if lock_file is not None:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            finally:
+                lock_file.close()
+
+
+# Global write coordinator instance
+write_coordinator = WriteCoordinator(timeout=float(os.getenv('DB_WRITE_TIMEOUT', 30)))
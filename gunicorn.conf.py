@@ -0,0 +1,17 @@
+# gunicorn.conf.py - Gunicorn settings for the OL Service POS web service
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', 1))
+
+# Load the app once in the master so workers fork with it already imported
+preload_app = True
+
+
+def on_starting(server):
+    """Bootstrap the database and precompress static assets once, before any worker is forked"""
+    from database.bootstrap import bootstrap_database
+    bootstrap_database()
+
+    from utils.compression import precompress
+    precompress(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static'))
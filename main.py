@@ -4,6 +4,7 @@ import sys
 import os
 from pathlib import Path
 import logging
+import threading
 from typing import Optional
 
 # Add project root to path
@@ -35,11 +36,10 @@ try:
     from utils.error_handler import error_handler, handle_errors, ErrorSeverity
     from PIL import Image, ImageTk, ImageDraw, ImageFont
 
-    # Import UI modules
+    # Import UI modules (the main menu and its screens load after login)
     from ui.login_screen import LoginScreen
-    from ui.main_menu import MainMenu
 
-    # Import services
+    # Import services (OpenCV/NumPy load on first camera or image use)
     from services.camera_service import camera_service
     from services.image_service import image_service
     from services.damage_service import damage_service
@@ -276,16 +276,23 @@ class ApplicationManager:
             )
             return False
 
-    @handle_errors("Services Initialization", ErrorSeverity.WARNING, show_user=False)
-    def initialize_services(self):
-        """Initialize application services"""
+    def probe_cameras(self):
+        """Detect cameras (slow: opens each device index)"""
         try:
-            # Initialize camera service
             available_cameras = camera_service.get_available_cameras()
             if available_cameras:
                 self.logger.info(f"Found {len(available_cameras)} camera(s): {available_cameras}")
             else:
                 self.logger.warning("No cameras detected")
+        except Exception as e:
+            self.logger.warning(f"Camera detection failed: {e}")
+
+    @handle_errors("Services Initialization", ErrorSeverity.WARNING, show_user=False)
+    def initialize_services(self):
+        """Initialize application services"""
+        try:
+            # Probe cameras in the background so the login window is not held up
+            threading.Thread(target=self.probe_cameras, name='camera-probe', daemon=True).start()
 
             # Test image service
             self.logger.info("Image service initialized")
@@ -372,6 +379,7 @@ class ApplicationManager:
                 self.current_screen.destroy()
 
             # Show main menu
+            from ui.main_menu import MainMenu
             self.current_screen = MainMenu(
                 self.root,
                 user,
@@ -1,9 +1,6 @@
 # services/camera_service.py
-import cv2
-import numpy as np
-import tkinter as tk
-from tkinter import messagebox
-from PIL import Image, ImageTk
+from __future__ import annotations
+
 import base64
 import io
 import logging
@@ -13,6 +10,16 @@ import threading
 import time
 from datetime import datetime
 
+from utils.lazy_import import lazy_module
+
+# OpenCV, NumPy, Pillow and Tk are loaded when a camera is first used
+cv2 = lazy_module('cv2')
+np = lazy_module('numpy')
+tk = lazy_module('tkinter')
+messagebox = lazy_module('tkinter.messagebox')
+Image = lazy_module('PIL.Image')
+ImageTk = lazy_module('PIL.ImageTk')
+
 logger = logging.getLogger(__name__)
 
 
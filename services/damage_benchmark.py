@@ -0,0 +1,127 @@
+# services/damage_benchmark.py
+"""
+Benchmark: vectorized DamageAnalyzer against the per-point loop it replaced
+
+Generates random reports, analyzes each one with the previous loop-based
+implementation (kept here as loop_analysis) and all of them at once with
+DamageAnalyzer.analyze_batch(), checks that both give the same results and
+prints the timings.
+
+Usage:
+    python -m services.damage_benchmark [--reports 2000] [--points 25] [--seed 1]
+"""
+
+import sys
+import time
+import random
+import argparse
+from typing import Any, Dict, List, Optional
+
+from services.damage_service import DamageAnalyzer, DamagePoint, np
+
+SEVERITIES = ['Minor', 'Moderate', 'Severe']
+
+
+def loop_analysis(analyzer: DamageAnalyzer, damage_points: List[DamagePoint]) -> Dict[str, Any]:
+    """analyze_damage_patterns() as it was before vectorization"""
+    if not damage_points:
+        return {'total_points': 0, 'insights': []}
+
+    analysis = {
+        'total_points': len(damage_points),
+        'damage_types': {},
+        'severity_distribution': {},
+        'cost_analysis': {},
+        'spatial_analysis': {},
+        'insights': []
+    }
+    for point in damage_points:
+        analysis['damage_types'][point.damage_type] = analysis['damage_types'].get(point.damage_type, 0) + 1
+    for point in damage_points:
+        analysis['severity_distribution'][point.severity] = \
+            analysis['severity_distribution'].get(point.severity, 0) + 1
+
+    total_cost = sum(analyzer.estimate_damage_cost(point) for point in damage_points)
+    analysis['cost_analysis'] = {
+        'total_estimated_cost': total_cost,
+        'average_cost_per_point': total_cost / len(damage_points),
+        'cost_by_type': {}
+    }
+    for damage_type in analysis['damage_types']:
+        type_points = [p for p in damage_points if p.damage_type == damage_type]
+        analysis['cost_analysis']['cost_by_type'][damage_type] = \
+            sum(analyzer.estimate_damage_cost(point) for point in type_points)
+
+    x_coords = [p.x for p in damage_points]
+    y_coords = [p.y for p in damage_points]
+    analysis['spatial_analysis'] = {
+        'center_x': sum(x_coords) / len(x_coords),
+        'center_y': sum(y_coords) / len(y_coords),
+        'spread_x': max(x_coords) - min(x_coords),
+        'spread_y': max(y_coords) - min(y_coords)
+    }
+    analysis['insights'] = analyzer._generate_insights(analysis, damage_points)
+    return analysis
+
+
+def make_reports(count: int, points: int, seed: int) -> Dict[int, List[DamagePoint]]:
+    """Random reports of 1..2*points damage points each"""
+    rng = random.Random(seed)
+    damage_types = list(DamageAnalyzer().damage_types)
+    return {
+        report_id: [
+            DamagePoint(id=f"p{report_id}_{i}", x=rng.random(), y=rng.random(),
+                        damage_type=rng.choice(damage_types), severity=rng.choice(SEVERITIES))
+            for i in range(rng.randint(1, 2 * points))
+        ]
+        for report_id in range(1, count + 1)
+    }
+
+
+def run(reports: int, points: int, seed: int) -> Dict[str, Any]:
+    analyzer = DamageAnalyzer()
+    data = make_reports(reports, points, seed)
+
+    started = time.perf_counter()
+    expected = {report_id: loop_analysis(analyzer, report_points) for report_id, report_points in data.items()}
+    loop_seconds = time.perf_counter() - started
+
+    # Columnar input, as DamageService.load_point_columns() reads it from damage_points
+    all_points = [(report_id, p) for report_id, report_points in data.items() for p in report_points]
+    report_ids = np.array([report_id for report_id, _ in all_points], dtype=np.int64)
+    damage_types, severities, x, y = analyzer.point_columns([p for _, p in all_points])
+
+    started = time.perf_counter()
+    actual = analyzer.analyze_batch(report_ids, damage_types, severities, x, y)
+    batch_seconds = time.perf_counter() - started
+
+    return {
+        'reports': reports,
+        'points': len(all_points),
+        'loop_seconds': loop_seconds,
+        'batch_seconds': batch_seconds,
+        'matches': actual == expected,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized damage analysis")
+    parser.add_argument('--reports', type=int, default=2000)
+    parser.add_argument('--points', type=int, default=25, help="average damage points per report")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    result = run(args.reports, args.points, args.seed)
+    speedup = result['loop_seconds'] / result['batch_seconds'] if result['batch_seconds'] else float('inf')
+    print(f"📊 {result['reports']} reports, {result['points']} damage points")
+    print(f"   per-point loop:   {result['loop_seconds'] * 1000:8.1f} ms")
+    print(f"   analyze_batch():  {result['batch_seconds'] * 1000:8.1f} ms  ({speedup:.1f}x)")
+    if not result['matches']:
+        print("❌ Results differ from the loop implementation")
+        return 1
+    print("✅ Results identical")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
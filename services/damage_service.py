@@ -12,6 +12,10 @@ from dataclasses import dataclass, asdict
 from pathlib import Path
 
 from database.connection_manager import db_manager
+from database import damage_points as point_rows
+from utils.lazy_import import lazy_module
+
+np = lazy_module('numpy')
 
 
 @dataclass
@@ -25,6 +29,7 @@ class DamagePoint:
     description: str = ""
     estimated_cost: float = 0.0
     created_at: Optional[datetime] = None
+    view: Optional[str] = None  # Template view: side, front, rear, top
 
     def __post_init__(self):
         if self.created_at is None:
@@ -39,7 +44,8 @@ class DamagePoint:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'DamagePoint':
-        """Create DamagePoint from dictionary"""
+        """Create DamagePoint from dictionary (keys it has no field for are ignored)"""
+        data = {key: value for key, value in data.items() if key in cls.__dataclass_fields__}
         if 'created_at' in data and isinstance(data['created_at'], str):
             data['created_at'] = datetime.fromisoformat(data['created_at'])
         return cls(**data)
@@ -121,55 +127,132 @@ class DamageAnalyzer:
         if not damage_points:
             return {'total_points': 0, 'insights': []}
 
-        analysis = {
-            'total_points': len(damage_points),
-            'damage_types': {},
-            'severity_distribution': {},
-            'cost_analysis': {},
-            'spatial_analysis': {},
-            'insights': []
-        }
-
-        # Analyze damage types
-        for point in damage_points:
-            damage_type = point.damage_type
-            analysis['damage_types'][damage_type] = analysis['damage_types'].get(damage_type, 0) + 1
-
-        # Analyze severity distribution
-        for point in damage_points:
-            severity = point.severity
-            analysis['severity_distribution'][severity] = analysis['severity_distribution'].get(severity, 0) + 1
-
-        # Cost analysis
-        total_cost = sum(self.estimate_damage_cost(point) for point in damage_points)
-        analysis['cost_analysis'] = {
-            'total_estimated_cost': total_cost,
-            'average_cost_per_point': total_cost / len(damage_points) if damage_points else 0,
-            'cost_by_type': {}
-        }
-
-        # Cost by damage type
-        for damage_type in analysis['damage_types']:
-            type_points = [p for p in damage_points if p.damage_type == damage_type]
-            type_cost = sum(self.estimate_damage_cost(point) for point in type_points)
-            analysis['cost_analysis']['cost_by_type'][damage_type] = type_cost
-
-        # Spatial analysis
-        x_coords = [p.x for p in damage_points]
-        y_coords = [p.y for p in damage_points]
-
-        analysis['spatial_analysis'] = {
-            'center_x': sum(x_coords) / len(x_coords),
-            'center_y': sum(y_coords) / len(y_coords),
-            'spread_x': max(x_coords) - min(x_coords) if x_coords else 0,
-            'spread_y': max(y_coords) - min(y_coords) if y_coords else 0
-        }
-
-        # Generate insights
-        insights = self._generate_insights(analysis, damage_points)
-        analysis['insights'] = insights
-
-        return analysis
+        return self.analyze_columns(*self.point_columns(damage_points))
+
+    @staticmethod
+    def point_columns(damage_points: List[DamagePoint]) -> Tuple[Any, Any, Any, Any]:
+        """Columnar (damage_type, severity, x, y) arrays of a list of points"""
+        return (
+            np.array([p.damage_type for p in damage_points], dtype=object),
+            np.array([p.severity for p in damage_points], dtype=object),
+            np.array([p.x for p in damage_points], dtype=float),
+            np.array([p.y for p in damage_points], dtype=float),
+        )
+
+    @staticmethod
+    def _factorize(values) -> Tuple[List[Any], Any]:
+        """(distinct values in first-seen order, code of each value)
+
+        A dictionary pass instead of np.unique: sorting object arrays of
+        strings costs more than the whole rest of the analysis.
+        """
+        index: Dict[Any, int] = {}
+        codes = np.fromiter((index.setdefault(value, len(index)) for value in values),
+                            dtype=np.intp, count=len(values))
+        return list(index), codes
+
+    def _costs(self, types: List[str], type_codes, levels: List[str], level_codes):
+        """Per-point costs from factorized damage types and severities"""
+        default = {'base_cost': 100, 'multiplier': 1.0}
+        type_costs = np.array([self.damage_types.get(t, default)['base_cost'] *
+                               self.damage_types.get(t, default)['multiplier'] for t in types], dtype=float)
+        level_multipliers = np.array([self.severity_multipliers.get(s, 1.0) for s in levels], dtype=float)
+        return np.round(type_costs[type_codes] * level_multipliers[level_codes], 2)
+
+    def estimate_costs(self, damage_types, severities):
+        """Vectorized estimate_damage_cost() over columnar type / severity arrays"""
+        types, type_codes = self._factorize(damage_types)
+        levels, level_codes = self._factorize(severities)
+        return self._costs(types, type_codes, levels, level_codes)
+
+    def analyze_columns(self, damage_types, severities, x, y) -> Dict[str, Any]:
+        """analyze_damage_patterns() over columnar arrays of one report's points"""
+        if len(damage_types) == 0:
+            return {'total_points': 0, 'insights': []}
+        return self.analyze_batch(np.zeros(len(damage_types), dtype=np.int64),
+                                  damage_types, severities, x, y)[0]
+
+    def analyze_batch(self, report_ids, damage_types, severities, x, y) -> Dict[int, Dict[str, Any]]:
+        """Analyze the points of many reports at once, keyed by report ID
+
+        The arguments are parallel arrays with one entry per point. Every
+        figure is computed for all reports together with bincount/reduceat
+        over the point arrays; only building the result dictionaries loops
+        per report. Each result matches analyze_damage_patterns() for that
+        report's points.
+        """
+        report_ids = np.asarray(report_ids)
+        if report_ids.size == 0:
+            return {}
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+
+        reports, report_codes = np.unique(report_ids, return_inverse=True)
+        report_codes = report_codes.ravel()
+        types, type_codes = self._factorize(damage_types)
+        levels, level_codes = self._factorize(severities)
+        costs = self._costs(types, type_codes, levels, level_codes)
+        n_reports, n_types, n_levels, n_points = len(reports), len(types), len(levels), len(costs)
+
+        # Per report
+        counts = np.bincount(report_codes, minlength=n_reports)
+        total_costs = np.bincount(report_codes, weights=costs, minlength=n_reports)
+        center_x = np.bincount(report_codes, weights=x, minlength=n_reports) / counts
+        center_y = np.bincount(report_codes, weights=y, minlength=n_reports) / counts
+
+        order = np.argsort(report_codes, kind='stable')
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        spread_x = np.maximum.reduceat(x[order], starts) - np.minimum.reduceat(x[order], starts)
+        spread_y = np.maximum.reduceat(y[order], starts) - np.minimum.reduceat(y[order], starts)
+
+        # Per report and type / severity, with each report's types and
+        # severities ordered by where they first appear in it
+        def per_report(codes, width, weights=None):
+            pair = report_codes * width + codes
+            tallies = np.bincount(pair, weights=weights, minlength=n_reports * width).reshape(n_reports, width)
+            first = np.full(n_reports * width, n_points)
+            np.minimum.at(first, pair, np.arange(n_points))
+            return tallies, np.argsort(first.reshape(n_reports, width), axis=1, kind='stable')
+
+        type_counts, type_order = per_report(type_codes, n_types)
+        type_costs = np.bincount(report_codes * n_types + type_codes, weights=costs,
+                                 minlength=n_reports * n_types).reshape(n_reports, n_types)
+        level_counts, level_order = per_report(level_codes, n_levels)
+
+        # Plain lists from here on: indexing numpy scalars per report is slow
+        counts, total_costs = counts.tolist(), total_costs.tolist()
+        center_x, center_y = center_x.tolist(), center_y.tolist()
+        spread_x, spread_y = spread_x.tolist(), spread_y.tolist()
+        type_counts, type_costs, type_order = type_counts.tolist(), type_costs.tolist(), type_order.tolist()
+        level_counts, level_order = level_counts.tolist(), level_order.tolist()
+
+        results = {}
+        for r, report_id in enumerate(reports.tolist()):
+            present_types = [t for t in type_order[r] if type_counts[r][t]]
+            total_cost = total_costs[r]
+
+            analysis = {
+                'total_points': counts[r],
+                'damage_types': {types[t]: type_counts[r][t] for t in present_types},
+                'severity_distribution': {levels[s]: level_counts[r][s]
+                                          for s in level_order[r] if level_counts[r][s]},
+                'cost_analysis': {
+                    'total_estimated_cost': total_cost,
+                    'average_cost_per_point': total_cost / counts[r],
+                    'cost_by_type': {types[t]: type_costs[r][t] for t in present_types}
+                },
+                'spatial_analysis': {
+                    'center_x': center_x[r],
+                    'center_y': center_y[r],
+                    'spread_x': spread_x[r],
+                    'spread_y': spread_y[r]
+                },
+                'insights': []
+            }
+            analysis['insights'] = self._generate_insights(analysis, [])
+            results[report_id] = analysis
+
+        return results
 
     def _generate_insights(self, analysis: Dict[str, Any], damage_points: List[DamagePoint]) -> List[str]:
         """Generate insights based on damage analysis"""
@@ -210,9 +293,41 @@ class DamageAnalyzer:
 class DamageService:
     """Main service for managing vehicle damage reports"""
 
+    # Report columns with the points as one JSON array (see database/damage_points.py)
+    REPORT_COLUMNS = f"""
+        dr.id, dr.customer_id, dr.vehicle_id, dr.vehicle_type, dr.total_estimated_cost,
+        dr.created_at, dr.updated_at, dr.notes,
+        {point_rows.points_json_sql('dr')} AS damage_points
+    """
+
+    # Report columns with a point count instead of the points, for summary listings
+    SUMMARY_COLUMNS = f"""
+        dr.id, dr.customer_id, dr.vehicle_id, dr.vehicle_type, dr.total_estimated_cost,
+        dr.created_at, dr.updated_at, dr.notes,
+        {point_rows.point_count_sql('dr')} AS damage_point_count
+    """
+
     def __init__(self):
         self.analyzer = DamageAnalyzer()
 
+    @staticmethod
+    def _report_from_row(row) -> DamageReport:
+        """Build a DamageReport from a damage_reports row, parsing its points once"""
+        damage_points_data = json.loads(row['damage_points'] or "[]")
+        damage_points = [DamagePoint.from_dict(point) for point in damage_points_data]
+
+        return DamageReport(
+            id=row['id'],
+            customer_id=row['customer_id'],
+            vehicle_id=row['vehicle_id'],
+            vehicle_type=row['vehicle_type'],
+            damage_points=damage_points,
+            total_estimated_cost=row['total_estimated_cost'] or 0.0,
+            created_at=datetime.fromisoformat(row['created_at']) if row['created_at'] else None,
+            updated_at=datetime.fromisoformat(row['updated_at']) if row['updated_at'] else None,
+            notes=row['notes'] or ""
+        )
+
     def create_damage_report(self, customer_id: int, vehicle_id: int, vehicle_type: str) -> Optional[int]:
         """Create a new damage report"""
         try:
@@ -242,53 +357,70 @@ class DamageService:
             with db_manager.get_connection() as conn:
                 cursor = conn.cursor()
 
-                cursor.execute("""
-                    SELECT * FROM damage_reports WHERE id = ?
+                cursor.execute(f"""
+                    SELECT {self.REPORT_COLUMNS} FROM damage_reports dr WHERE dr.id = ?
                 """, (report_id,))
 
                 row = cursor.fetchone()
                 if not row:
                     return None
 
-                # Parse damage points JSON
-                damage_points_data = json.loads(row['damage_points'] or "[]")
-                damage_points = [DamagePoint.from_dict(point) for point in damage_points_data]
-
-                return DamageReport(
-                    id=row['id'],
-                    customer_id=row['customer_id'],
-                    vehicle_id=row['vehicle_id'],
-                    vehicle_type=row['vehicle_type'],
-                    damage_points=damage_points,
-                    total_estimated_cost=row['total_estimated_cost'] or 0.0,
-                    created_at=datetime.fromisoformat(row['created_at']) if row['created_at'] else None,
-                    updated_at=datetime.fromisoformat(row['updated_at']) if row['updated_at'] else None,
-                    notes=row['notes'] or ""
-                )
+                return self._report_from_row(row)
 
         except Exception as e:
             print(f"Error retrieving damage report: {e}")
             return None
 
+    def get_damage_reports(self, report_ids: List[int]) -> Dict[int, DamageReport]:
+        """Retrieve several damage reports in one query, keyed by ID"""
+        report_ids = list(dict.fromkeys(report_ids))
+        if not report_ids:
+            return {}
+
+        try:
+            with db_manager.get_connection() as conn:
+                placeholders = ",".join("?" * len(report_ids))
+                rows = conn.execute(
+                    f"SELECT {self.REPORT_COLUMNS} FROM damage_reports dr WHERE dr.id IN ({placeholders})",
+                    report_ids
+                ).fetchall()
+                return {row['id']: self._report_from_row(row) for row in rows}
+
+        except Exception as e:
+            print(f"Error retrieving damage reports: {e}")
+            return {}
+
+    def _edit_points(self, report_id: int, edit) -> bool:
+        """Run edit(conn) on a report's points and touch the report, in one transaction
+
+        edit returns False to report that nothing matched. The report total
+        follows the points through the damage_points triggers.
+        """
+        with db_manager.get_connection() as conn:
+            try:
+                cursor = conn.execute("UPDATE damage_reports SET updated_at = ? WHERE id = ?",
+                                      (datetime.now().isoformat(), report_id))
+                if cursor.rowcount == 0 or not edit(conn):
+                    conn.rollback()
+                    return False
+                conn.commit()
+                return True
+            except Exception:
+                conn.rollback()
+                raise
+
     def add_damage_point(self, report_id: int, damage_point: DamagePoint) -> bool:
         """Add a damage point to an existing report"""
         try:
-            # Get current report
-            report = self.get_damage_report(report_id)
-            if not report:
-                return False
-
             # Estimate cost for the damage point
             if damage_point.estimated_cost == 0.0:
                 damage_point.estimated_cost = self.analyzer.estimate_damage_cost(damage_point)
 
-            # Add the new damage point
-            report.damage_points.append(damage_point)
-            report.calculate_total_cost()
-            report.updated_at = datetime.now()
+            def insert(conn):
+                point_rows.insert_points(conn, report_id, [damage_point.to_dict()])
+                return True
 
-            # Save updated report
-            return self._save_damage_report(report)
+            return self._edit_points(report_id, insert)
 
         except Exception as e:
             print(f"Error adding damage point: {e}")
@@ -297,16 +429,7 @@ class DamageService:
     def remove_damage_point(self, report_id: int, damage_point_id: str) -> bool:
         """Remove a damage point from a report"""
         try:
-            report = self.get_damage_report(report_id)
-            if not report:
-                return False
-
-            # Remove the damage point
-            report.damage_points = [p for p in report.damage_points if p.id != damage_point_id]
-            report.calculate_total_cost()
-            report.updated_at = datetime.now()
-
-            return self._save_damage_report(report)
+            return self._edit_points(report_id, lambda conn: point_rows.delete_point(conn, report_id, damage_point_id))
 
         except Exception as e:
             print(f"Error removing damage point: {e}")
@@ -315,69 +438,39 @@ class DamageService:
     def update_damage_point(self, report_id: int, damage_point: DamagePoint) -> bool:
         """Update an existing damage point"""
         try:
-            report = self.get_damage_report(report_id)
-            if not report:
-                return False
-
-            # Find and update the damage point
-            for i, point in enumerate(report.damage_points):
-                if point.id == damage_point.id:
-                    # Re-estimate cost if needed
-                    if damage_point.estimated_cost == 0.0:
-                        damage_point.estimated_cost = self.analyzer.estimate_damage_cost(damage_point)
-
-                    report.damage_points[i] = damage_point
-                    break
-            else:
-                return False  # Damage point not found
-
-            report.calculate_total_cost()
-            report.updated_at = datetime.now()
+            # Re-estimate cost if needed
+            if damage_point.estimated_cost == 0.0:
+                damage_point.estimated_cost = self.analyzer.estimate_damage_cost(damage_point)
 
-            return self._save_damage_report(report)
+            return self._edit_points(report_id, lambda conn: point_rows.update_point(conn, report_id,
+                                                                                     damage_point.to_dict()))
 
         except Exception as e:
             print(f"Error updating damage point: {e}")
             return False
 
-    def _save_damage_report(self, report: DamageReport) -> bool:
-        """Save a damage report to the database"""
-        try:
-            with db_manager.get_connection() as conn:
-                cursor = conn.cursor()
-
-                # Convert damage points to JSON
-                damage_points_json = json.dumps([point.to_dict() for point in report.damage_points])
-
-                cursor.execute("""
-                    UPDATE damage_reports 
-                    SET damage_points = ?, total_estimated_cost = ?, updated_at = ?, notes = ?
-                    WHERE id = ?
-                """, (
-                    damage_points_json, report.total_estimated_cost,
-                    report.updated_at.isoformat(), report.notes, report.id
-                ))
-
-                conn.commit()
-                return True
-
-        except Exception as e:
-            print(f"Error saving damage report: {e}")
-            return False
+    def _load_reports(self, column: str, value: int) -> List[DamageReport]:
+        """All reports whose column equals value, newest first, in one query"""
+        with db_manager.get_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT {self.REPORT_COLUMNS} FROM damage_reports dr WHERE dr.{column} = ?
+                ORDER BY dr.created_at DESC
+            """, (value,)).fetchall()
+            return [self._report_from_row(row) for row in rows]
+
+    def _load_summaries(self, column: str, value: int) -> List[Dict[str, Any]]:
+        """Report summaries (no damage points) whose column equals value, newest first"""
+        with db_manager.get_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT {self.SUMMARY_COLUMNS} FROM damage_reports dr WHERE dr.{column} = ?
+                ORDER BY dr.created_at DESC
+            """, (value,)).fetchall()
+            return [dict(row) for row in rows]
 
     def get_reports_by_customer(self, customer_id: int) -> List[DamageReport]:
         """Get all damage reports for a customer"""
         try:
-            with db_manager.get_connection() as conn:
-                cursor = conn.cursor()
-
-                cursor.execute("""
-                    SELECT id FROM damage_reports WHERE customer_id = ?
-                    ORDER BY created_at DESC
-                """, (customer_id,))
-
-                report_ids = [row['id'] for row in cursor.fetchall()]
-                return [self.get_damage_report(rid) for rid in report_ids if self.get_damage_report(rid)]
+            return self._load_reports('customer_id', customer_id)
 
         except Exception as e:
             print(f"Error retrieving customer reports: {e}")
@@ -386,19 +479,28 @@ class DamageService:
     def get_reports_by_vehicle(self, vehicle_id: int) -> List[DamageReport]:
         """Get all damage reports for a vehicle"""
         try:
-            with db_manager.get_connection() as conn:
-                cursor = conn.cursor()
+            return self._load_reports('vehicle_id', vehicle_id)
 
-                cursor.execute("""
-                    SELECT id FROM damage_reports WHERE vehicle_id = ?
-                    ORDER BY created_at DESC
-                """, (vehicle_id,))
+        except Exception as e:
+            print(f"Error retrieving vehicle reports: {e}")
+            return []
 
-                report_ids = [row['id'] for row in cursor.fetchall()]
-                return [self.get_damage_report(rid) for rid in report_ids if self.get_damage_report(rid)]
+    def get_report_summaries_by_customer(self, customer_id: int) -> List[Dict[str, Any]]:
+        """List a customer's reports with point counts but without parsing their points"""
+        try:
+            return self._load_summaries('customer_id', customer_id)
 
         except Exception as e:
-            print(f"Error retrieving vehicle reports: {e}")
+            print(f"Error retrieving customer report summaries: {e}")
+            return []
+
+    def get_report_summaries_by_vehicle(self, vehicle_id: int) -> List[Dict[str, Any]]:
+        """List a vehicle's reports with point counts but without parsing their points"""
+        try:
+            return self._load_summaries('vehicle_id', vehicle_id)
+
+        except Exception as e:
+            print(f"Error retrieving vehicle report summaries: {e}")
             return []
 
     def delete_damage_report(self, report_id: int) -> bool:
@@ -407,6 +509,7 @@ class DamageService:
             with db_manager.get_connection() as conn:
                 cursor = conn.cursor()
 
+                cursor.execute("DELETE FROM damage_points WHERE report_id = ?", (report_id,))
                 cursor.execute("DELETE FROM damage_reports WHERE id = ?", (report_id,))
                 conn.commit()
 
@@ -416,6 +519,72 @@ class DamageService:
             print(f"Error deleting damage report: {e}")
             return False
 
+    def load_point_columns(self, customer_id: Optional[int] = None, vehicle_id: Optional[int] = None,
+                           start_date: Optional[str] = None, end_date: Optional[str] = None) -> Dict[str, Any]:
+        """Points of the matching reports as parallel arrays, read in one query
+
+        Returns report_id, damage_type, severity, x and y arrays plus the IDs
+        of every matching report (including those without points). Dates
+        filter on the report's created_at (YYYY-MM-DD, end inclusive).
+        """
+        conditions, params = [], []
+        if customer_id is not None:
+            conditions.append("dr.customer_id = ?")
+            params.append(customer_id)
+        if vehicle_id is not None:
+            conditions.append("dr.vehicle_id = ?")
+            params.append(vehicle_id)
+        if start_date:
+            conditions.append("dr.created_at >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("date(dr.created_at) <= date(?)")
+            params.append(end_date)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with db_manager.get_connection(row_factory=False) as conn:
+            rows = conn.execute(f"""
+                SELECT dr.id, p.damage_type, p.severity, p.x, p.y
+                FROM damage_reports dr
+                LEFT JOIN damage_points p ON p.report_id = dr.id
+                {where}
+                ORDER BY dr.id, p.id
+            """, params).fetchall()
+
+        points = [row for row in rows if row[1] is not None]
+        report_ids, damage_types, severities, xs, ys = zip(*points) if points else ((), (), (), (), ())
+        return {
+            'reports': list(dict.fromkeys(row[0] for row in rows)),
+            'report_id': np.array(report_ids, dtype=np.int64),
+            'damage_type': np.array(damage_types, dtype=object),
+            'severity': np.array(severities, dtype=object),
+            'x': np.array(xs, dtype=float),
+            'y': np.array(ys, dtype=float),
+        }
+
+    def analyze_reports(self, customer_id: Optional[int] = None, vehicle_id: Optional[int] = None,
+                        start_date: Optional[str] = None, end_date: Optional[str] = None) -> Dict[str, Any]:
+        """Analyze every matching report at once, e.g. a fleet customer's inspections or a date range
+
+        Returns the per-report analyses keyed by report ID and one analysis of
+        all their points together.
+        """
+        try:
+            columns = self.load_point_columns(customer_id, vehicle_id, start_date, end_date)
+            analyses = self.analyzer.analyze_batch(columns['report_id'], columns['damage_type'],
+                                                   columns['severity'], columns['x'], columns['y'])
+            return {
+                'report_count': len(columns['reports']),
+                'reports': {report_id: analyses.get(report_id, {'total_points': 0, 'insights': []})
+                            for report_id in columns['reports']},
+                'overall': self.analyzer.analyze_columns(columns['damage_type'], columns['severity'],
+                                                         columns['x'], columns['y']),
+            }
+
+        except Exception as e:
+            print(f"Error analyzing damage reports: {e}")
+            return {'report_count': 0, 'reports': {}, 'overall': {'total_points': 0, 'insights': []}}
+
     def generate_damage_summary(self, report: DamageReport) -> Dict[str, Any]:
         """Generate a comprehensive damage summary"""
         analysis = self.analyzer.analyze_damage_patterns(report.damage_points)
@@ -0,0 +1,57 @@
+# services/heatmap_renderer.py
+"""
+Render damage heatmap grids as PNG overlays on vehicle templates
+
+The grid (rows are y, columns x, as database.damage_heatmap.load_grid()
+returns it) is colour mapped at its own resolution, yellow for few points
+to red for the most, then scaled up to the template with bilinear filtering
+and composited over it.
+"""
+
+from __future__ import annotations
+
+import io
+from typing import Optional
+
+from services.vehicle_templates import template_cache
+from utils.lazy_import import lazy_module
+
+np = lazy_module('numpy')
+Image = lazy_module('PIL.Image')
+
+DEFAULT_SIZE = (800, 600)  # size of the generated templates
+DEFAULT_OPACITY = 0.6
+
+
+def colorize(grid, opacity: float = DEFAULT_OPACITY):
+    """RGBA uint8 array for a count grid; empty cells are fully transparent"""
+    grid = np.asarray(grid, dtype=np.float64)
+    peak = grid.max() if grid.size else 0
+    heat = np.sqrt(grid / peak) if peak > 0 else np.zeros_like(grid)  # sqrt keeps sparse spots visible
+
+    rgba = np.zeros(grid.shape + (4,), dtype=np.uint8)
+    rgba[..., 0] = 255
+    rgba[..., 1] = np.round(220 * (1.0 - heat)).astype(np.uint8)
+    rgba[..., 3] = np.where(grid > 0, np.round(255 * opacity * (0.35 + 0.65 * heat)), 0).astype(np.uint8)
+    return rgba
+
+
+def render_overlay(grid, template_path: Optional[str] = None, width: Optional[int] = None,
+                   opacity: float = DEFAULT_OPACITY) -> bytes:
+    """PNG bytes of the heatmap over the template (a blank canvas when there is none)"""
+    if template_path:
+        # Decoded once and resized from the nearest mip level
+        template = template_cache.source(template_path)
+        if width and width != template.width:
+            template = template_cache.sized(template_path, width,
+                                            max(1, round(template.height * width / template.width)))
+        base = template.convert('RGBA')
+    else:
+        base = Image.new('RGBA', DEFAULT_SIZE, (255, 255, 255, 255))
+        if width and width != base.width:
+            base = base.resize((width, max(1, round(base.height * width / base.width))), Image.BILINEAR)
+
+    overlay = Image.fromarray(colorize(grid, opacity), 'RGBA').resize(base.size, Image.BILINEAR)
+    output = io.BytesIO()
+    Image.alpha_composite(base, overlay).save(output, format='PNG', optimize=True)
+    return output.getvalue()
@@ -1,7 +1,6 @@
 # services/image_service.py
-import cv2
-import numpy as np
-from PIL import Image, ImageDraw, ImageFont, ImageEnhance, ImageFilter
+from __future__ import annotations
+
 import base64
 import io
 import logging
@@ -11,6 +10,17 @@ import hashlib
 from datetime import datetime
 import json
 
+from utils.lazy_import import lazy_module
+
+# Heavy imaging libraries are loaded on first use
+cv2 = lazy_module('cv2')
+np = lazy_module('numpy')
+Image = lazy_module('PIL.Image')
+ImageDraw = lazy_module('PIL.ImageDraw')
+ImageFont = lazy_module('PIL.ImageFont')
+ImageEnhance = lazy_module('PIL.ImageEnhance')
+ImageFilter = lazy_module('PIL.ImageFilter')
+
 logger = logging.getLogger(__name__)
 
 
@@ -413,10 +423,14 @@ class ImageService:
         self.processor = ImageProcessor()
         self.storage_dir = Path("media/photos")
         self.temp_dir = Path("media/temp")
+        self._dirs_ready = False
 
-        # Ensure directories exist
-        self.storage_dir.mkdir(parents=True, exist_ok=True)
-        self.temp_dir.mkdir(parents=True, exist_ok=True)
+    def _ensure_directories(self):
+        """Create the storage directories on first write rather than at import"""
+        if not self._dirs_ready:
+            self.storage_dir.mkdir(parents=True, exist_ok=True)
+            self.temp_dir.mkdir(parents=True, exist_ok=True)
+            self._dirs_ready = True
 
     def process_vehicle_photo(self, image: np.ndarray, vehicle_id: int,
                               service_id: Optional[int] = None,
@@ -453,6 +467,7 @@ class ImageService:
             thumb_filename = f"{base_filename}_thumb.jpg"
 
             # Save main image
+            self._ensure_directories()
             main_path = self.storage_dir / main_filename
             main_bytes = self.processor.compress_image(watermarked, quality=90)
             with open(main_path, 'wb') as f:
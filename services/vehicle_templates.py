@@ -0,0 +1,503 @@
+# services/vehicle_templates.py
+"""
+Vehicle outline templates (per vehicle type and view) for damage marking
+
+Shared by the desktop damage inspector and the web damage heatmap, so it
+depends on Pillow only.
+
+The template images are drawn ahead of time, as a build step:
+    python -m services.vehicle_templates [directory] [--force]
+A template that is still missing at runtime is drawn when first asked for.
+
+template_cache holds every template decoded once, with a mip pyramid of
+halved copies, so screens that redisplay a template at a new size resize
+from the nearest level instead of decoding and resampling the full image.
+"""
+
+from __future__ import annotations
+
+import sys
+import logging
+import argparse
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.lazy_import import lazy_module
+
+Image = lazy_module('PIL.Image')
+ImageDraw = lazy_module('PIL.ImageDraw')
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / 'assets' / 'vehicle_templates'
+
+# Pyramid levels are halved down to this size (shorter side, pixels)
+MIP_MIN_SIZE = 64
+
+
+class TemplateCache:
+    """Decoded template images and their mip pyramids, shared by every screen
+
+    A display size is served from the smallest pyramid level at least that
+    large, so the final resize is a bilinear one by less than half. The most
+    recently used display sizes are kept as they are.
+    """
+
+    def __init__(self, max_sized: int = 16):
+        self.max_sized = max_sized
+        self._pyramids: Dict[str, List[Image.Image]] = {}
+        self._sized: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _open(path: str) -> Image.Image:
+        image = Image.open(path)
+        image.load()
+        if image.mode not in ('L', 'RGB', 'RGBA'):
+            image = image.convert('RGBA')
+        return image
+
+    def _pyramid(self, key: str, loader: Optional[Callable[[], Image.Image]]) -> List[Image.Image]:
+        levels = self._pyramids.get(key)
+        if levels is None:
+            levels = [loader() if loader else self._open(key)]
+            while min(levels[-1].size) >= 2 * MIP_MIN_SIZE:
+                levels.append(levels[-1].reduce(2))
+            self._pyramids[key] = levels
+        return levels
+
+    def source(self, key: str, loader: Optional[Callable[[], Image.Image]] = None) -> Image.Image:
+        """Full size image for key (a file path, or any name when loader draws it)"""
+        with self._lock:
+            return self._pyramid(key, loader)[0]
+
+    def sized(self, key: str, width: int, height: int,
+              loader: Optional[Callable[[], Image.Image]] = None) -> Image.Image:
+        """Image for key at exactly width x height; callers must not modify it"""
+        sized_key = (key, width, height)
+        with self._lock:
+            image = self._sized.get(sized_key)
+            if image is not None:
+                self._sized.move_to_end(sized_key)
+                return image
+
+            levels = self._pyramid(key, loader)
+            level = next((level for level in reversed(levels)
+                          if level.width >= width and level.height >= height), levels[0])
+            image = level if level.size == (width, height) else level.resize((width, height), Image.BILINEAR)
+
+            self._sized[sized_key] = image
+            if len(self._sized) > self.max_sized:
+                self._sized.popitem(last=False)
+            return image
+
+    def levels(self, key: str) -> List[Tuple[int, int]]:
+        """Sizes of the cached pyramid levels for key (empty if not loaded)"""
+        with self._lock:
+            return [level.size for level in self._pyramids.get(key, [])]
+
+    def clear(self):
+        with self._lock:
+            self._pyramids.clear()
+            self._sized.clear()
+
+
+class VehicleTemplateManager:
+    """Manages vehicle template images"""
+
+    def __init__(self, templates_dir: Optional[str] = None):
+        self.templates_dir = Path(templates_dir) if templates_dir else TEMPLATES_DIR
+        self.templates = self._load_templates()
+
+    def _load_templates(self) -> Dict[str, Dict[str, str]]:
+        """Load available vehicle templates"""
+        return {
+            'truck': {
+                'side': 'truck_side.png',
+                'front': 'truck_front.png',
+                'rear': 'truck_rear.png',
+                'top': 'truck_top.png'
+            },
+            'car': {
+                'side': 'car_side.png',
+                'front': 'car_front.png',
+                'rear': 'car_rear.png',
+                'top': 'car_top.png'
+            },
+            'van': {
+                'side': 'van_side.png',
+                'front': 'van_front.png',
+                'rear': 'van_rear.png',
+                'top': 'van_top.png'
+            },
+            'motorcycle': {
+                'side': 'motorcycle_side.png',
+                'front': 'motorcycle_front.png'
+            }
+        }
+
+    def build_templates(self, force: bool = False) -> int:
+        """Draw the template images (only missing ones unless force); returns the number written"""
+        written = 0
+        for vehicle_type, views in self.templates.items():
+            for view, filename in views.items():
+                filepath = self.templates_dir / filename
+                if force or not filepath.exists():
+                    written += self._create_default_template(filepath, vehicle_type, view)
+        return written
+
+    def _create_default_template(self, filepath: Path, vehicle_type: str, view: str) -> bool:
+        """Create a default vehicle template"""
+        try:
+            filepath.parent.mkdir(parents=True, exist_ok=True)
+
+            # Create a basic vehicle outline
+            width, height = 800, 600
+            img = Image.new('RGBA', (width, height), (255, 255, 255, 255))
+            draw = ImageDraw.Draw(img)
+
+            # Draw basic vehicle outline based on type and view
+            if vehicle_type == 'truck':
+                if view == 'side':
+                    self._draw_truck_side(draw, width, height)
+                elif view == 'front':
+                    self._draw_truck_front(draw, width, height)
+                elif view == 'rear':
+                    self._draw_truck_rear(draw, width, height)
+                elif view == 'top':
+                    self._draw_truck_top(draw, width, height)
+            elif vehicle_type == 'car':
+                if view == 'side':
+                    self._draw_car_side(draw, width, height)
+                elif view == 'front':
+                    self._draw_car_front(draw, width, height)
+                elif view == 'rear':
+                    self._draw_car_rear(draw, width, height)
+                elif view == 'top':
+                    self._draw_car_top(draw, width, height)
+            elif vehicle_type == 'van':
+                if view == 'side':
+                    self._draw_van_side(draw, width, height)
+                elif view == 'front':
+                    self._draw_van_front(draw, width, height)
+                elif view == 'rear':
+                    self._draw_van_rear(draw, width, height)
+                elif view == 'top':
+                    self._draw_van_top(draw, width, height)
+
+            img.save(filepath, optimize=True)
+            logger.info(f"Created default template: {filepath}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to create template {filepath}: {e}")
+            return False
+
+    def _draw_truck_side(self, draw: ImageDraw.Draw, width: int, height: int):
+        """Draw truck side view"""
+        # Main cab
+        cab_x1, cab_y1 = width * 0.1, height * 0.3
+        cab_x2, cab_y2 = width * 0.35, height * 0.7
+        draw.rectangle([cab_x1, cab_y1, cab_x2, cab_y2], outline='black', width=3)
+
+        # Trailer
+        trailer_x1, trailer_y1 = width * 0.35, height * 0.25
+        trailer_x2, trailer_y2 = width * 0.85, height * 0.7
+        draw.rectangle([trailer_x1, trailer_y1, trailer_x2, trailer_y2], outline='black', width=3)
+
+        # Wheels
+        wheel_y = height * 0.7
+        wheel_radius = 25
+        # Cab wheels
+        draw.ellipse([width * 0.15 - wheel_radius, wheel_y - wheel_radius,
+                      width * 0.15 + wheel_radius, wheel_y + wheel_radius],
+                     outline='black', width=3)
+        draw.ellipse([width * 0.28 - wheel_radius, wheel_y - wheel_radius,
+                      width * 0.28 + wheel_radius, wheel_y + wheel_radius],
+                     outline='black', width=3)
+        # Trailer wheels
+        draw.ellipse([width * 0.65 - wheel_radius, wheel_y - wheel_radius,
+                      width * 0.65 + wheel_radius, wheel_y + wheel_radius],
+                     outline='black', width=3)
+        draw.ellipse([width * 0.75 - wheel_radius, wheel_y - wheel_radius,
+                      width * 0.75 + wheel_radius, wheel_y + wheel_radius],
+                     outline='black', width=3)
+
+    def _draw_truck_front(self, draw: ImageDraw.Draw, width: int, height: int):
+        """Draw truck front view"""
+        # Main outline
+        truck_x1, truck_y1 = width * 0.2, height * 0.2
+        truck_x2, truck_y2 = width * 0.8, height * 0.8
+        draw.rectangle([truck_x1, truck_y1, truck_x2, truck_y2], outline='black', width=3)
+
+        # Windshield
+        wind_x1, wind_y1 = width * 0.25, height * 0.25
+        wind_x2, wind_y2 = width * 0.75, height * 0.45
+        draw.rectangle([wind_x1, wind_y1, wind_x2, wind_y2], outline='black', width=2)
+
+        # Grille
+        grille_x1, grille_y1 = width * 0.3, height * 0.5
+        grille_x2, grille_y2 = width * 0.7, height * 0.65
+        draw.rectangle([grille_x1, grille_y1, grille_x2, grille_y2], outline='black', width=2)
+
+        # Headlights
+        draw.ellipse([width * 0.22, height * 0.55, width * 0.28, height * 0.62],
+                     outline='black', width=2)
+        draw.ellipse([width * 0.72, height * 0.55, width * 0.78, height * 0.62],
+                     outline='black', width=2)
+
+    def _draw_truck_rear(self, draw: ImageDraw.Draw, width: int, height: int):
+        """Draw truck rear view"""
+        # Main outline (similar to front)
+        truck_x1, truck_y1 = width * 0.2, height * 0.2
+        truck_x2, truck_y2 = width * 0.8, height * 0.8
+        draw.rectangle([truck_x1, truck_y1, truck_x2, truck_y2], outline='black', width=3)
+
+        # Rear doors
+        door_x = width * 0.5
+        draw.line([door_x, truck_y1, door_x, truck_y2], fill='black', width=2)
+
+        # Tail lights
+        draw.rectangle([width * 0.22, height * 0.6, width * 0.28, height * 0.7],
+                       outline='red', width=2)
+        draw.rectangle([width * 0.72, height * 0.6, width * 0.78, height * 0.7],
+                       outline='red', width=2)
+
+    def _draw_truck_top(self, draw: ImageDraw.Draw, width: int, height: int):
+        """Draw truck top view"""
+        # Cab
+        cab_x1, cab_y1 = width * 0.2, height * 0.1
+        cab_x2, cab_y2 = width * 0.8, height * 0.35
+        draw.rectangle([cab_x1, cab_y1, cab_x2, cab_y2], outline='black', width=3)
+
+        # Trailer
+        trailer_x1, trailer_y1 = width * 0.15, height * 0.35
+        trailer_x2, trailer_y2 = width * 0.85, height * 0.9
+        draw.rectangle([trailer_x1, trailer_y1, trailer_x2, trailer_y2], outline='black', width=3)
+
+    def _draw_van_side(self, draw: ImageDraw.Draw, width: int, height: int):
+        """Draw van side view"""
+        # Main body
+        body_x1, body_y1 = width * 0.1, height * 0.3
+        body_x2, body_y2 = width * 0.85, height * 0.7
+        draw.rectangle([body_x1, body_y1, body_x2, body_y2], outline='black', width=3)
+
+        # Front section
+        front_x1, front_y1 = width * 0.05, height * 0.35
+        front_x2, front_y2 = width * 0.15, height * 0.65
+        draw.rectangle([front_x1, front_y1, front_x2, front_y2], outline='black', width=3)
+
+        # Windshield
+        draw.line([front_x2, front_y1, front_x2 + 30, front_y1 - 20], fill='black', width=2)
+        draw.line([front_x2 + 30, front_y1 - 20, body_x1 + 50, body_y1], fill='black', width=2)
+
+        # Wheels
+        wheel_y = height * 0.7
+        wheel_radius = 25
+        draw.ellipse([width * 0.2 - wheel_radius, wheel_y - wheel_radius,
+                      width * 0.2 + wheel_radius, wheel_y + wheel_radius],
+                     outline='black', width=3)
+        draw.ellipse([width * 0.7 - wheel_radius, wheel_y - wheel_radius,
+                      width * 0.7 + wheel_radius, wheel_y + wheel_radius],
+                     outline='black', width=3)
+
+        # Side door
+        door_x = width * 0.5
+        draw.line([door_x, body_y1, door_x, body_y2], fill='black', width=2)
+
+    def _draw_van_front(self, draw: ImageDraw.Draw, width: int, height: int):
+        """Draw van front view"""
+        # Main outline
+        van_x1, van_y1 = width * 0.2, height * 0.25
+        van_x2, van_y2 = width * 0.8, height * 0.8
+        draw.rectangle([van_x1, van_y1, van_x2, van_y2], outline='black', width=3)
+
+        # Windshield
+        wind_x1, wind_y1 = width * 0.25, height * 0.15
+        wind_x2, wind_y2 = width * 0.75, height * 0.3
+        draw.rectangle([wind_x1, wind_y1, wind_x2, wind_y2], outline='black', width=2)
+
+        # Grille
+        grille_x1, grille_y1 = width * 0.35, height * 0.5
+        grille_x2, grille_y2 = width * 0.65, height * 0.65
+        draw.rectangle([grille_x1, grille_y1, grille_x2, grille_y2], outline='black', width=2)
+
+        # Headlights
+        draw.ellipse([width * 0.25, height * 0.55, width * 0.32, height * 0.62],
+                     outline='black', width=2)
+        draw.ellipse([width * 0.68, height * 0.55, width * 0.75, height * 0.62],
+                     outline='black', width=2)
+
+    def _draw_van_rear(self, draw: ImageDraw.Draw, width: int, height: int):
+        """Draw van rear view"""
+        # Main outline
+        van_x1, van_y1 = width * 0.2, height * 0.25
+        van_x2, van_y2 = width * 0.8, height * 0.8
+        draw.rectangle([van_x1, van_y1, van_x2, van_y2], outline='black', width=3)
+
+        # Rear doors
+        door_x = width * 0.5
+        draw.line([door_x, van_y1, door_x, van_y2], fill='black', width=2)
+
+        # Door handles
+        draw.rectangle([door_x - 20, (van_y1 + van_y2) // 2 - 3,
+                        door_x - 15, (van_y1 + van_y2) // 2 + 3], fill='black')
+        draw.rectangle([door_x + 15, (van_y1 + van_y2) // 2 - 3,
+                        door_x + 20, (van_y1 + van_y2) // 2 + 3], fill='black')
+
+        # Tail lights
+        draw.rectangle([width * 0.22, height * 0.6, width * 0.28, height * 0.7],
+                       outline='red', width=2)
+        draw.rectangle([width * 0.72, height * 0.6, width * 0.78, height * 0.7],
+                       outline='red', width=2)
+
+    def _draw_van_top(self, draw: ImageDraw.Draw, width: int, height: int):
+        """Draw van top view"""
+        # Main body
+        body_x1, body_y1 = width * 0.25, height * 0.1
+        body_x2, body_y2 = width * 0.75, height * 0.9
+        draw.rectangle([body_x1, body_y1, body_x2, body_y2], outline='black', width=3)
+
+        # Front section
+        front_x1, front_y1 = width * 0.3, height * 0.05
+        front_x2, front_y2 = width * 0.7, height * 0.15
+        draw.rectangle([front_x1, front_y1, front_x2, front_y2], outline='black', width=2)
+
+        # Side doors (lines)
+        door_y1 = height * 0.4
+        door_y2 = height * 0.7
+        draw.line([body_x1, door_y1, body_x1 - 10, door_y1], fill='black', width=2)
+        draw.line([body_x1, door_y2, body_x1 - 10, door_y2], fill='black', width=2)
+        draw.line([body_x2, door_y1, body_x2 + 10, door_y1], fill='black', width=2)
+        draw.line([body_x2, door_y2, body_x2 + 10, door_y2], fill='black', width=2)
+
+    def _draw_car_side(self, draw: ImageDraw.Draw, width: int, height: int):
+        """Draw car side view"""
+        # Main body
+        body_x1, body_y1 = width * 0.15, height * 0.4
+        body_x2, body_y2 = width * 0.85, height * 0.7
+        draw.rectangle([body_x1, body_y1, body_x2, body_y2], outline='black', width=3)
+
+        # Roof
+        roof_x1, roof_y1 = width * 0.25, height * 0.25
+        roof_x2, roof_y2 = width * 0.75, height * 0.4
+        draw.rectangle([roof_x1, roof_y1, roof_x2, roof_y2], outline='black', width=3)
+
+        # Windows
+        draw.rectangle([width * 0.28, height * 0.28, width * 0.45, height * 0.38],
+                       outline='black', width=2)
+        draw.rectangle([width * 0.55, height * 0.28, width * 0.72, height * 0.38],
+                       outline='black', width=2)
+
+        # Wheels
+        wheel_y = height * 0.7
+        wheel_radius = 20
+        draw.ellipse([width * 0.25 - wheel_radius, wheel_y - wheel_radius,
+                      width * 0.25 + wheel_radius, wheel_y + wheel_radius],
+                     outline='black', width=3)
+        draw.ellipse([width * 0.75 - wheel_radius, wheel_y - wheel_radius,
+                      width * 0.75 + wheel_radius, wheel_y + wheel_radius],
+                     outline='black', width=3)
+
+    def _draw_car_front(self, draw: ImageDraw.Draw, width: int, height: int):
+        """Draw car front view"""
+        # Main outline
+        car_x1, car_y1 = width * 0.25, height * 0.3
+        car_x2, car_y2 = width * 0.75, height * 0.8
+        draw.rectangle([car_x1, car_y1, car_x2, car_y2], outline='black', width=3)
+
+        # Windshield
+        wind_x1, wind_y1 = width * 0.3, height * 0.2
+        wind_x2, wind_y2 = width * 0.7, height * 0.35
+        draw.polygon([wind_x1, wind_y1, wind_x2, wind_y1,
+                      car_x2, car_y1, car_x1, car_y1], outline='black', width=2)
+
+        # Grille
+        grille_x1, grille_y1 = width * 0.35, height * 0.5
+        grille_x2, grille_y2 = width * 0.65, height * 0.65
+        draw.rectangle([grille_x1, grille_y1, grille_x2, grille_y2], outline='black', width=2)
+
+        # Headlights
+        draw.ellipse([width * 0.28, height * 0.55, width * 0.33, height * 0.62],
+                     outline='black', width=2)
+        draw.ellipse([width * 0.67, height * 0.55, width * 0.72, height * 0.62],
+                     outline='black', width=2)
+
+    def _draw_car_rear(self, draw: ImageDraw.Draw, width: int, height: int):
+        """Draw car rear view"""
+        # Similar to front but with tail lights
+        car_x1, car_y1 = width * 0.25, height * 0.3
+        car_x2, car_y2 = width * 0.75, height * 0.8
+        draw.rectangle([car_x1, car_y1, car_x2, car_y2], outline='black', width=3)
+
+        # Rear window
+        wind_x1, wind_y1 = width * 0.3, height * 0.2
+        wind_x2, wind_y2 = width * 0.7, height * 0.35
+        draw.polygon([wind_x1, wind_y1, wind_x2, wind_y1,
+                      car_x2, car_y1, car_x1, car_y1], outline='black', width=2)
+
+        # Tail lights
+        draw.rectangle([width * 0.27, height * 0.6, width * 0.32, height * 0.7],
+                       outline='red', width=2)
+        draw.rectangle([width * 0.68, height * 0.6, width * 0.73, height * 0.7],
+                       outline='red', width=2)
+
+    def _draw_car_top(self, draw: ImageDraw.Draw, width: int, height: int):
+        """Draw car top view"""
+        # Main body
+        body_x1, body_y1 = width * 0.3, height * 0.15
+        body_x2, body_y2 = width * 0.7, height * 0.85
+        draw.rectangle([body_x1, body_y1, body_x2, body_y2], outline='black', width=3)
+
+        # Hood
+        hood_x1, hood_y1 = width * 0.32, height * 0.1
+        hood_x2, hood_y2 = width * 0.68, height * 0.25
+        draw.rectangle([hood_x1, hood_y1, hood_x2, hood_y2], outline='black', width=2)
+
+        # Trunk
+        trunk_x1, trunk_y1 = width * 0.32, height * 0.75
+        trunk_x2, trunk_y2 = width * 0.68, height * 0.9
+        draw.rectangle([trunk_x1, trunk_y1, trunk_x2, trunk_y2], outline='black', width=2)
+
+    def get_template_path(self, vehicle_type: str, view: str) -> Optional[Path]:
+        """Get path to template file, or None if there is none and it cannot be drawn"""
+        if vehicle_type in self.templates and view in self.templates[vehicle_type]:
+            filepath = self.templates_dir / self.templates[vehicle_type][view]
+            if not filepath.exists():
+                logger.warning(f"Template {filepath} was not pre-rendered, drawing it now "
+                               f"(python -m services.vehicle_templates)")
+                if not self._create_default_template(filepath, vehicle_type, view):
+                    return None
+            return filepath
+        return None
+
+    def get_available_types(self) -> List[str]:
+        """Get list of available vehicle types"""
+        return list(self.templates.keys())
+
+    def get_available_views(self, vehicle_type: str) -> List[str]:
+        """Get list of available views for a vehicle type"""
+        return list(self.templates.get(vehicle_type, {}).keys())
+
+
+# Global template cache instance
+template_cache = TemplateCache()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Pre-render the vehicle template images")
+    parser.add_argument('directory', nargs='?', default=str(TEMPLATES_DIR))
+    parser.add_argument('--force', action='store_true', help="redraw templates that already exist")
+    args = parser.parse_args(argv)
+
+    manager = VehicleTemplateManager(args.directory)
+    written = manager.build_templates(force=args.force)
+    total = sum(len(views) for views in manager.templates.values())
+    print(f"✅ {written} written, {total - written} already present ({args.directory})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,8 @@
 class APIClient {
     constructor() {
         this.baseURL = window.Config?.API_BASE || '';
+        // GET url -> { etag, body } for If-None-Match revalidation
+        this.validators = new Map();
     }
 
     // Add the missing init method
@@ -17,16 +19,76 @@ class APIClient {
             ...options
         };
 
+        const method = (config.method || 'GET').toUpperCase();
+        const cached = method === 'GET' ? this.validators.get(url) : null;
+        if (cached) {
+            config.headers = { ...config.headers, 'If-None-Match': cached.etag };
+        }
+
         try {
             const response = await fetch(url, config);
+            if (response.status === 304 && cached) return JSON.parse(cached.body);
             if (!response.ok) throw new Error(`HTTP ${response.status}`);
-            return await response.json();
+
+            const body = await response.text();
+            const etag = response.headers.get('ETag');
+            if (method === 'GET' && etag) {
+                this.validators.set(url, { etag, body });
+            }
+            return JSON.parse(body);
         } catch (error) {
             console.error(`API Error [${endpoint}]:`, error);
             throw error;
         }
     }
 
+    // Paginated lists: yields one page (array) at a time, following next_cursor
+    async *paginate(endpoint, { limit = 100, key = null, params = {} } = {}) {
+        let cursor = null;
+        do {
+            const query = new URLSearchParams({ ...params, limit });
+            if (cursor) query.set('cursor', cursor);
+            const separator = endpoint.includes('?') ? '&' : '?';
+
+            const data = await this.request(`${endpoint}${separator}${query}`);
+            yield (key ? data[key] : Object.values(data).find(Array.isArray)) || [];
+            cursor = data.next_cursor;
+        } while (cursor);
+    }
+
+    async fetchAllPages(endpoint, options = {}) {
+        const items = [];
+        for await (const page of this.paginate(endpoint, options)) {
+            items.push(...page);
+        }
+        return items;
+    }
+
+    // Streamed lists (NDJSON): yields each row as soon as its line arrives
+    async *streamRows(endpoint) {
+        const response = await fetch(`${this.baseURL}${endpoint}`, {
+            headers: { 'Accept': 'application/x-ndjson' }
+        });
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        for (;;) {
+            const { done, value } = await reader.read();
+            buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+            const lines = buffer.split('\n');
+            buffer = done ? '' : lines.pop();
+            for (const line of lines) {
+                if (!line.trim()) continue;
+                const row = JSON.parse(line);
+                if ('next_cursor' in row && Object.keys(row).length === 1) continue;
+                yield row;
+            }
+            if (done) return;
+        }
+    }
+
     // Customer endpoints
     getCustomers() {
         return this.request('/api/customers');
@@ -102,6 +164,15 @@ class APIClient {
         });
     }
 
+    // Batch create (kind: 'customers', 'vehicles' or 'services'): one request, one commit.
+    // Customers may carry a vehicles array. Partial failures come back as HTTP 207 with per-item results.
+    batchCreate(kind, items, { atomic = false } = {}) {
+        return this.request(`/api/batch/${kind}`, {
+            method: 'POST',
+            body: JSON.stringify({ items, atomic })
+        });
+    }
+
     // Health check
     async healthCheck() {
         return this.request('/api');
@@ -9,6 +9,7 @@ import os
 import traceback
 from pathlib import Path
 import sqlite3
+from contextlib import contextmanager
 
 # Add project root to path
 project_root = Path(__file__).parent
@@ -30,6 +31,30 @@ def print_test(test_name, status, details=""):
         print(f"   → {details}")
 
 
+@contextmanager
+def count_queries():
+    """Collect the SQL statements run on pooled connections inside the block"""
+    from database.connection_manager import db_manager
+
+    queries = []
+    get_connection = db_manager.get_connection
+
+    @contextmanager
+    def traced_connection(*args, **kwargs):
+        with get_connection(*args, **kwargs) as conn:
+            conn.set_trace_callback(queries.append)
+            try:
+                yield conn
+            finally:
+                conn.set_trace_callback(None)
+
+    db_manager.get_connection = traced_connection
+    try:
+        yield queries
+    finally:
+        del db_manager.get_connection
+
+
 def test_camera_service():
     """Test camera service functionality with better error handling"""
     print_header("TESTING CAMERA SERVICE")
@@ -283,6 +308,393 @@ def test_database_components():
     return all_passed
 
 
+def test_schema_migrations():
+    """Test migrations on a fresh database, an upgrade from an older version and a dry run"""
+    print_header("TESTING SCHEMA MIGRATIONS")
+
+    tests = []
+
+    try:
+        import json
+        import tempfile
+        from database import schema_migrations
+        from database.connection_manager import db_manager
+
+        latest = schema_migrations.get_latest_version()
+
+        def open_database(path):
+            conn = sqlite3.connect(path)
+            conn.isolation_level = None
+            conn.execute("PRAGMA foreign_keys = ON")
+            return conn
+
+        def schema(conn):
+            return {row[0]: ' '.join((row[1] or '').split()) for row in conn.execute(
+                "SELECT type || ' ' || name, sql FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'")}
+
+        fresh = open_database(':memory:')
+        applied = schema_migrations.apply_migrations(fresh)
+        tests.append(("Fresh Database", [m.version for m in applied] == list(range(1, latest + 1))
+                      and schema_migrations.get_schema_version(fresh) == latest,
+                      f"Applied {len(applied)} migrations up to version {latest}"))
+
+        with tempfile.TemporaryDirectory() as directory:
+            # A database left at version 11, with damage points still in the JSON column
+            old_path = os.path.join(directory, 'old.db')
+            old = open_database(old_path)
+            schema_migrations.apply_migrations(old, target=11)
+            old.execute("INSERT INTO customers (first_name, last_name) VALUES ('Migration', 'Test')")
+            old.execute("INSERT INTO vehicles (customer_id, make, model) VALUES (1, 'Isuzu', 'D-Max')")
+            old.execute("INSERT INTO damage_reports (customer_id, vehicle_id, vehicle_type, damage_points, "
+                        "total_estimated_cost) VALUES (1, 1, 'truck', ?, 100)",
+                        (json.dumps([{'id': 'p1', 'x': 0.5, 'y': 0.5, 'damage_type': 'Dent', 'severity': 'Minor',
+                                      'estimated_cost': 100, 'view': 'side'}]),))
+
+            # The dry run works on a copy and leaves the file as it was
+            pool = db_manager.connection_pool
+            real_path = pool.db_path
+            pool.db_path = old_path
+            try:
+                preview = schema_migrations.dry_run()
+            finally:
+                pool.db_path = real_path
+            tests.append(("Migration Dry Run", preview['from_version'] == 11 and preview['to_version'] == latest
+                          and len(preview['applied']) == latest - 11
+                          and schema_migrations.get_schema_version(old) == 11,
+                          f"Would apply {', '.join(preview['applied'])}"))
+
+            applied = schema_migrations.apply_migrations(old)
+            point = old.execute("SELECT view, total_estimated_cost FROM damage_points "
+                                "JOIN damage_reports ON damage_reports.id = report_id").fetchone()
+            tests.append(("Upgrade From Version 11", [m.version for m in applied] == list(range(12, latest + 1))
+                          and schema(old) == schema(fresh) and point == ('side', 100),
+                          "Upgraded schema matches a fresh one; JSON points moved to rows"))
+            old.close()
+        fresh.close()
+
+    except Exception as e:
+        tests.append(("Schema Migration Functionality", False, str(e)))
+
+    # Print results
+    all_passed = True
+    for test_name, passed, details in tests:
+        print_test(test_name, passed, details)
+        if not passed:
+            all_passed = False
+
+    return all_passed
+
+
+def test_connection_pool():
+    """Test nested checkouts and checkin ownership of the connection pool"""
+    print_header("TESTING CONNECTION POOL")
+
+    tests = []
+
+    try:
+        import threading
+        from database.connection_manager import db_manager
+
+        def committed_names():
+            conn = db_manager.connection_pool.create_connection()
+            try:
+                return [row[0] for row in conn.execute("SELECT name FROM pool_test ORDER BY name")]
+            finally:
+                conn.close()
+
+        with db_manager.get_connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS pool_test (name TEXT)")
+            conn.execute("DELETE FROM pool_test")
+            conn.commit()
+
+        # An inner write's commit must not commit the outer caller's pending work
+        with db_manager.get_connection() as conn:
+            conn.execute("INSERT INTO pool_test (name) VALUES ('outer')")
+            db_manager.execute_query("INSERT INTO pool_test (name) VALUES (?)", ('inner',))
+            visible_before = committed_names()
+            conn.rollback()
+        tests.append(("Nested Write", visible_before == [] and committed_names() == [],
+                      "Inner commit stayed inside the outer transaction"))
+
+        # An inner error must only undo the inner block
+        with db_manager.get_connection() as conn:
+            conn.execute("INSERT INTO pool_test (name) VALUES ('outer')")
+            try:
+                with db_manager.get_connection() as inner:
+                    inner.execute("INSERT INTO pool_test (name) VALUES ('inner')")
+                    inner.execute("INSERT INTO no_such_table VALUES (1)")
+            except Exception:
+                pass
+            conn.commit()
+        tests.append(("Nested Error", committed_names() == ['outer'], "Outer work kept, inner work undone"))
+
+        # A transaction nested in an open one runs as a savepoint
+        with db_manager.get_connection() as conn:
+            conn.execute("DELETE FROM pool_test")
+            nested_ok = db_manager.execute_transaction([
+                ("INSERT INTO pool_test (name) VALUES (?)", ('a',)),
+                ("INSERT INTO pool_test (name) VALUES (?)", ('b',)),
+            ])
+            conn.commit()
+        tests.append(("Nested Transaction", nested_ok and committed_names() == ['a', 'b'],
+                      "execute_transaction inside an open transaction"))
+
+        # Checking in another thread's connection is an error, not a silent leak
+        pool = db_manager.connection_pool
+        conn = pool.checkout()
+        errors = []
+        worker = threading.Thread(target=lambda: errors.append(_raises(pool.checkin, conn)))
+        worker.start()
+        worker.join()
+        pool.checkin(conn)
+        stats = pool.get_stats()
+        tests.append(("Cross-Thread Checkin", errors == [RuntimeError] and stats['checkouts'] == stats['checkins'],
+                      "Foreign checkin raised; the owner returned the connection"))
+
+        with db_manager.get_connection() as conn:
+            conn.execute("DROP TABLE pool_test")
+            conn.commit()
+
+        # The read-replica profile's query_only binds readers, not the writer; unknown names fail
+        import tempfile
+        from config.settings_manager import settings_manager
+        from database.connection_manager import ConnectionPool
+        with tempfile.TemporaryDirectory() as tmp:
+            replica = ConnectionPool(os.path.join(tmp, 'replica.db'),
+                                     pragmas=settings_manager.get_database_pragmas('read-replica'))
+            writer, reader = replica.create_connection(writer=True), replica.create_connection()
+            writer.execute("CREATE TABLE replica_test (name TEXT)")
+            outcome = [_raises(writer.execute, "INSERT INTO replica_test VALUES ('w')"),
+                       _raises(reader.execute, "INSERT INTO replica_test VALUES ('r')")]
+            writer.close()
+            reader.close()
+        unknown = _raises(settings_manager.get_database_pragmas, 'no-such-profile')
+        tests.append(("PRAGMA Profiles", outcome == [None, sqlite3.OperationalError] and unknown is ValueError,
+                      "query_only on readers only; unknown profile rejected"))
+
+    except Exception as e:
+        tests.append(("Connection Pool Functionality", False, str(e)))
+
+    # Print results
+    all_passed = True
+    for test_name, passed, details in tests:
+        print_test(test_name, passed, details)
+        if not passed:
+            all_passed = False
+
+    return all_passed
+
+
+def test_write_coordinator():
+    """Test concurrent writers through the write coordinator"""
+    print_header("TESTING WRITE COORDINATOR")
+
+    tests = []
+
+    try:
+        import threading
+        import time
+        from concurrent.futures import TimeoutError
+        from database.write_coordinator import WriteCoordinator, write_coordinator
+
+        write_coordinator.execute("CREATE TABLE IF NOT EXISTS writer_test (writer TEXT, n INTEGER)")
+        write_coordinator.execute("DELETE FROM writer_test")
+
+        # A second coordinator stands in for another worker process on the host
+        other = WriteCoordinator(timeout=10)
+        errors = []
+
+        def writer(coordinator, name):
+            for n in range(25):
+                try:
+                    coordinator.execute("INSERT INTO writer_test (writer, n) VALUES (?, ?)", (name, n))
+                except Exception as e:
+                    errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(coordinator, f"{label}{i}"))
+                   for i in range(4) for label, coordinator in (('a', write_coordinator), ('b', other))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        count = write_coordinator.run(lambda conn: conn.execute("SELECT COUNT(*) FROM writer_test").fetchone()[0])
+        tests.append(("Concurrent Writers", not errors and count == 200,
+                      f"{count} rows from 8 threads on 2 coordinators, {len(errors)} errors"))
+
+        # A caller that times out gives up its queued job
+        blocker = write_coordinator.submit(lambda conn: time.sleep(0.3))
+        timed_out = _raises(write_coordinator.run, lambda conn: conn.execute(
+            "INSERT INTO writer_test (writer, n) VALUES ('late', 0)"), timeout=0.05) is TimeoutError
+        blocker.result()
+        late = write_coordinator.run(lambda conn: conn.execute(
+            "SELECT COUNT(*) FROM writer_test WHERE writer = 'late'").fetchone()[0])
+        tests.append(("Write Timeout", timed_out and late == 0, "Timed-out job was cancelled before it ran"))
+
+        write_coordinator.execute("DROP TABLE writer_test")
+
+    except Exception as e:
+        tests.append(("Write Coordinator Functionality", False, str(e)))
+
+    # Print results
+    all_passed = True
+    for test_name, passed, details in tests:
+        print_test(test_name, passed, details)
+        if not passed:
+            all_passed = False
+
+    return all_passed
+
+
+def test_document_sequences():
+    """Test document number allocation under concurrency and with rollbacks"""
+    print_header("TESTING DOCUMENT SEQUENCES")
+
+    tests = []
+
+    try:
+        import threading
+        from datetime import datetime
+        from database import document_sequences
+        from database.bootstrap import bootstrap_database
+        from database.connection_manager import db_manager
+        from database.document_sequences import DocumentNumbers
+        from database.write_coordinator import write_coordinator
+
+        bootstrap_database()  # the suite may start from an empty data directory
+
+        when = datetime(2099, 1, 1)  # a period no real document uses
+        period = document_sequences.period_of('quote', when)
+
+        def reset():
+            write_coordinator.execute("DELETE FROM document_sequences WHERE period = ?", (period,))
+
+        def last_value():
+            with db_manager.get_connection(row_factory=False) as conn:
+                return document_sequences.peek(conn, 'quote', period)
+
+        def allocate_many(numbers, issued, count=25):
+            for _ in range(count):
+                issued.append(numbers.next('quote', when=when))
+
+        reset()
+
+        # Threads allocating straight from the table never share a number
+        issued = []
+        single = DocumentNumbers()
+        threads = [threading.Thread(target=allocate_many, args=(single, issued)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        tests.append(("Concurrent Allocation", len(issued) == 200 and len(set(issued)) == 200
+                      and last_value() == 200, f"{len(set(issued))} unique of {len(issued)} numbers"))
+
+        # A number allocated in a write job that fails is given back
+        def insert_and_fail(conn):
+            single.next('quote', when=when, conn=conn)
+            raise ValueError("document insert failed")
+
+        before = last_value()
+        failed = _raises(write_coordinator.run, insert_and_fail)
+        tests.append(("Rolled Back Allocation", failed is ValueError and last_value() == before,
+                      f"Sequence stayed at {last_value()}"))
+
+        # A preview reserves nothing
+        before = last_value()
+        preview = single.preview('quote', when=when)
+        tests.append(("Number Preview",
+                      preview == document_sequences.format_number('quote', period, before + 1)
+                      and last_value() == before, f"Previewed {preview}"))
+
+        reset()
+
+    except Exception as e:
+        tests.append(("Document Sequence Functionality", False, str(e)))
+
+    # Print results
+    all_passed = True
+    for test_name, passed, details in tests:
+        print_test(test_name, passed, details)
+        if not passed:
+            all_passed = False
+
+    return all_passed
+
+
+def _raises(func, *args, **kwargs):
+    """Exception type func(*args) raised, or None"""
+    try:
+        func(*args, **kwargs)
+    except Exception as e:
+        return type(e)
+    return None
+
+
+def test_stat_counters():
+    """Test trigger-maintained counters against a full recount and the old window queries"""
+    print_header("TESTING STATISTICS COUNTERS")
+
+    tests = []
+
+    try:
+        from database import stat_counters
+        from database.bootstrap import bootstrap_database
+        from database.connection_manager import db_manager
+
+        bootstrap_database()  # the suite may start from an empty data directory
+
+        # Customers either side of the 7, 30 and 90 day window edges, in both timestamp formats
+        offsets = [('-1 hours', '+0 days'), ('-6 days', '+0 days'), ('-8 days', '+0 days'),
+                   ('-29 days', '+0 days'), ('-30 days', '+1 hours'), ('-30 days', '-1 hours'),
+                   ('-89 days', '+0 days'), ('-91 days', '+0 days')]
+        with db_manager.get_connection() as conn:
+            for offset in offsets:
+                conn.execute("INSERT INTO customers (first_name, last_name, created_at) "
+                             "VALUES ('Counter', 'Test', datetime('now', ?, ?))", offset)
+                conn.execute("INSERT INTO customers (first_name, last_name, created_at) "
+                             "VALUES ('Counter', 'Test', strftime('%Y-%m-%dT%H:%M:%f', 'now', ?, ?))", offset)
+            conn.commit()
+
+        drift = stat_counters.reconcile(dry_run=True)
+        tests.append(("Counter Reconciliation", drift == {}, f"{len(drift)} counter(s) drifted from a full recount"))
+
+        with db_manager.get_connection() as conn:
+            statistics = stat_counters.get_customer_statistics(conn)
+            dashboard = stat_counters.get_dashboard_stats(conn)
+            windows = {
+                'new_last_30_days': conn.execute(
+                    "SELECT COUNT(*) FROM customers WHERE created_at >= datetime('now', '-30 days')").fetchone()[0],
+                'new_last_90_days': conn.execute(
+                    "SELECT COUNT(*) FROM customers WHERE created_at >= datetime('now', '-90 days')").fetchone()[0],
+                'services_this_week': conn.execute(
+                    "SELECT COUNT(*) FROM services WHERE created_at >= datetime('now', '-7 days')").fetchone()[0],
+            }
+        counted = {
+            'new_last_30_days': statistics['new_last_30_days'],
+            'new_last_90_days': statistics['new_last_90_days'],
+            'services_this_week': dashboard['services_this_week'],
+        }
+        tests.append(("Rolling Windows", counted == windows and dashboard['new_customers_this_month'] ==
+                      windows['new_last_30_days'], f"Counters {counted}, queries {windows}"))
+
+        with db_manager.get_connection() as conn:
+            conn.execute("DELETE FROM customers WHERE first_name = 'Counter' AND last_name = 'Test'")
+            conn.commit()
+
+    except Exception as e:
+        tests.append(("Statistics Counter Functionality", False, str(e)))
+
+    # Print results
+    all_passed = True
+    for test_name, passed, details in tests:
+        print_test(test_name, passed, details)
+        if not passed:
+            all_passed = False
+
+    return all_passed
+
+
 def test_image_service():
     """Test image processing service"""
     print_header("TESTING IMAGE SERVICE")
@@ -344,30 +756,93 @@ def test_damage_service():
 
     # Test damage report creation
     try:
-        report_id = damage_service.create_damage_report(1, 1, "van")
-        if report_id:
-            tests.append(("Damage Report Creation", True, f"Created report ID: {report_id}"))
-
-            # Test damage point addition
-            damage_point = DamagePoint(
-                id="test_damage_1",
-                x=0.5, y=0.3,
-                damage_type="Scratch",
-                severity="Minor",
-                description="Test damage point"
-            )
-
-            result = damage_service.add_damage_point(report_id, damage_point)
-            tests.append(("Damage Point Addition", result, "Added test damage point"))
-
-            # Test damage analysis
-            report = damage_service.get_damage_report(report_id)
-            if report and report.damage_points:
-                analysis = damage_service.analyzer.analyze_damage_patterns(report.damage_points)
-                tests.append(("Damage Analysis", len(analysis) > 0, f"Analysis completed: {len(analysis)} metrics"))
+        from database.bootstrap import bootstrap_database
+        from database.connection_manager import db_manager
+
+        bootstrap_database()  # the suite may start from an empty data directory
+
+        # Reports reference a customer and a vehicle of their own, so the counts below are exact
+        with db_manager.get_connection() as conn:
+            customer_id = conn.execute(
+                "INSERT INTO customers (first_name, last_name) VALUES ('Damage', 'Test')").lastrowid
+            vehicle_id = conn.execute(
+                "INSERT INTO vehicles (customer_id, make, model, vehicle_type) VALUES (?, 'Toyota', 'Hiace', 'van')",
+                (customer_id,)).lastrowid
+            conn.commit()
+
+        report_id = damage_service.create_damage_report(customer_id, vehicle_id, "van")
+        tests.append(("Damage Report Creation", bool(report_id), f"Created report ID: {report_id}"))
+
+        # Test damage point addition
+        damage_point = DamagePoint(
+            id="test_damage_1",
+            x=0.5, y=0.3,
+            damage_type="Scratch",
+            severity="Minor",
+            description="Test damage point"
+        )
+
+        result = damage_service.add_damage_point(report_id, damage_point)
+        tests.append(("Damage Point Addition", result, "Added test damage point"))
+
+        # Test damage analysis
+        report = damage_service.get_damage_report(report_id)
+        if report and report.damage_points:
+            analysis = damage_service.analyzer.analyze_damage_patterns(report.damage_points)
+            tests.append(("Damage Analysis", len(analysis) > 0, f"Analysis completed: {len(analysis)} metrics"))
+
+            # Test the vectorized batch analysis agrees with the per-report one
+            batch = damage_service.analyze_reports(vehicle_id=vehicle_id)
+            tests.append(("Batch Damage Analysis", batch['reports'].get(report_id) == analysis,
+                          f"Analyzed {batch['report_count']} reports at once"))
+
+        # Test report listings load in one query however long the history
+        for _ in range(5):
+            extra_id = damage_service.create_damage_report(customer_id, vehicle_id, "van")
+            damage_service.add_damage_point(extra_id, DamagePoint(
+                id=f"test_damage_{extra_id}", x=0.2, y=0.4, damage_type="Dent", severity="Moderate"))
+
+        with count_queries() as queries:
+            reports = damage_service.get_reports_by_vehicle(vehicle_id)
+        tests.append(("Vehicle Report Listing", len(queries) == 1 and len(reports) == 6,
+                      f"{len(reports)} reports in {len(queries)} query"))
+
+        with count_queries() as queries:
+            reports = damage_service.get_reports_by_customer(customer_id)
+        tests.append(("Customer Report Listing", len(queries) == 1 and len(reports) == 6,
+                      f"{len(reports)} reports in {len(queries)} query"))
+
+        with count_queries() as queries:
+            summaries = damage_service.get_report_summaries_by_vehicle(vehicle_id)
+        counts_match = {s['id']: s['damage_point_count'] for s in summaries} == \
+            {r.id: len(r.damage_points) for r in reports if r.vehicle_id == vehicle_id}
+        tests.append(("Report Summaries", len(queries) == 1 and counts_match,
+                      f"{len(summaries)} summaries in {len(queries)} query"))
+
+        with count_queries() as queries:
+            loaded = damage_service.get_damage_reports([r.id for r in reports])
+        tests.append(("Batch Report Loading", len(queries) == 1 and len(loaded) == len(reports),
+                      f"{len(loaded)} reports in {len(queries)} query"))
+
+        # Test the trigger-maintained heatmap bins match a full recomputation
+        from database import damage_heatmap
+        with db_manager.get_connection() as conn:
+            grid = damage_heatmap.load_grid(conn, "van", damage_heatmap.UNSPECIFIED_VIEW)
+            expected = damage_heatmap.compute_grids(conn).get(("van", damage_heatmap.UNSPECIFIED_VIEW))
+        tests.append(("Damage Heatmap", expected is not None and (grid == expected).all(),
+                      f"{int(grid.sum())} points binned"))
+
+        # Deleting a report takes its points out of the grid and leaves no empty cells
+        marked_id = damage_service.create_damage_report(customer_id, vehicle_id, "heatmap-test")
+        damage_service.add_damage_point(marked_id, DamagePoint(
+            id="test_damage_heatmap", x=0.9, y=0.9, damage_type="Dent", severity="Minor"))
+        deleted = damage_service.delete_damage_report(marked_id)
+        with db_manager.get_connection() as conn:
+            leftover = conn.execute("SELECT COUNT(*) FROM damage_heatmap_bins "
+                                    "WHERE vehicle_type = 'heatmap-test' OR count = 0").fetchone()[0]
+        tests.append(("Heatmap Report Deletion", deleted and leftover == 0,
+                      f"{leftover} stale or empty cells left"))
 
-        else:
-            tests.append(("Damage Report Creation", False, "Failed to create report"))
     except Exception as e:
         tests.append(("Damage Service Functionality", False, str(e)))
 
@@ -381,6 +856,187 @@ def test_damage_service():
     return all_passed
 
 
+def test_web_api():
+    """Test web API behaviour through the Flask test client"""
+    print_header("TESTING WEB API")
+
+    tests = []
+
+    try:
+        import uuid
+        from datetime import datetime
+        from application import app
+        client = app.test_client()
+        run_id = uuid.uuid4().hex[:8].upper()  # VINs are unique, and the suite may run again
+
+        # A batch with good and bad items commits the good ones and reports the rest
+        response = client.post('/api/batch/customers', json={'items': [
+            {'name': 'Batch Fleet', 'vehicles': [{'make': 'Hino', 'model': '500', 'vin': f'BATCH{run_id}1'}]},
+            {'name': 'Batch Bad Vehicle', 'vehicles': [{'make': 'Isuzu', 'model': 'FRR', 'vin': f'BATCH{run_id}2'}, 'van']},
+            {'phone': '0812345678'},
+        ]})
+        body = response.get_json()
+        results = body.get('results', [])
+        tests.append(("Batch Partial Success",
+                      response.status_code == 207 and body['created'] == 1 and body['failed'] == 2
+                      and [result['success'] for result in results] == [True, False, False]
+                      and len(results[0].get('vehicle_ids', [])) == 1
+                      and results[1]['error'] == "vehicles[1]: vehicle must be an object",
+                      f"HTTP {response.status_code}: {body.get('created')} created, {body.get('failed')} failed"))
+
+        # Items with fields of the wrong type are rejected one by one; a body that is not an object is a 400
+        response = client.post('/api/batch/customers', json={'items': [{'name': 123}, {'first_name': ['x']}]})
+        errors = [result.get('error') for result in (response.get_json() or {}).get('results', [])]
+        statuses = [client.post('/api/batch/customers', data=body, content_type='application/json').status_code
+                    for body in ('null', '[{"name": "Bare List"}]', '"items"')]
+        tests.append(("Batch Invalid Items",
+                      response.status_code == 207
+                      and errors == ["name must be a string", "first_name must be a string"]
+                      and statuses == [400, 400, 400],
+                      f"HTTP {response.status_code}: {errors}, bodies HTTP {statuses}"))
+
+        # Keyset pages walk the whole list once, in order, across ties and NULL sort keys
+        from database.connection_manager import db_manager
+        customer_id, vehicle_id = results[0]['id'], results[0]['vehicle_ids'][0]
+        with db_manager.get_connection() as conn:
+            conn.executemany("INSERT INTO customers (first_name, last_name) VALUES ('Keyset', 'Tie')",
+                             [()] * 7)
+            conn.executemany("INSERT INTO services (customer_id, vehicle_id, service_type, created_at) "
+                             "VALUES (?, ?, 'keyset', ?)",
+                             [(customer_id, vehicle_id, created_at)
+                              for created_at in ['2024-01-01'] * 5 + [None] * 3 + ['2024-01-02'] * 2])
+            conn.commit()
+
+        def walk(url, key, **args):
+            ids, cursor, pages = [], None, 0
+            while pages < 1000:
+                query = dict(args, limit=3, **({'cursor': cursor} if cursor else {}))
+                page = client.get(url, query_string=query).get_json()
+                ids += [row['id'] for row in page[key]]
+                pages += 1
+                cursor = page['next_cursor']
+                if not cursor:
+                    break
+            everything = [row['id'] for row in client.get(url, query_string=args).get_json()[key]]
+            return ids == everything and len(set(ids)) == len(ids), pages
+
+        for url, key, args in (('/api/customers', 'customers', {}),
+                               ('/api/services', 'services', {'customer_id': customer_id})):
+            complete, pages = walk(url, key, **args)
+            tests.append((f"Keyset Pages {url}", complete, f"{pages} pages match the unpaginated list"))
+
+        statuses = [client.get('/api/customers', query_string={'cursor': cursor}).status_code
+                    for cursor in ('not-a-cursor', 'e30')]  # garbage, and valid base64 of {}
+        tests.append(("Invalid Cursor", statuses == [400, 400], f"HTTP {statuses}"))
+
+        # ?fields= trims responses to what was asked for (plus id) and rejects anything else
+        response = client.get('/api/customers', query_string={'fields': 'phone,vehicle_count'})
+        keys = {key for row in response.get_json()['customers'] for key in row}
+        tests.append(("Field Selection", response.status_code == 200 and keys == {'id', 'phone', 'vehicle_count'},
+                      f"HTTP {response.status_code}: {sorted(keys)}"))
+
+        response = client.get(f'/api/vehicles/{vehicle_id}', query_string={'fields': 'make,photo_url'})
+        keys = set(response.get_json() or {})
+        tests.append(("Field Selection Detail", response.status_code == 200 and keys <= {'id', 'make', 'photo_url'}
+                      and {'id', 'make'} <= keys, f"HTTP {response.status_code}: {sorted(keys)}"))
+
+        # The detail view shows the primary photo even when a newer one exists
+        with db_manager.get_connection() as conn:
+            photo_ids = [conn.execute("INSERT INTO vehicle_photos (vehicle_id, customer_id, filename, file_path, "
+                                      "is_primary, timestamp) VALUES (?, ?, 'detail.jpg', 'detail.jpg', ?, ?)",
+                                      (vehicle_id, customer_id, primary, taken)).lastrowid
+                         for primary, taken in ((1, '2024-01-01 08:00:00'), (0, '2024-02-01 08:00:00'))]
+            conn.commit()
+        response = client.get(f'/api/vehicles/{vehicle_id}/details')
+        details = (response.get_json() or {}).get('vehicle', {})
+        tests.append(("Vehicle Details", response.status_code == 200
+                      and details.get('photo_url') == f'/api/photos/{photo_ids[0]}' and details.get('photo_count') == 2,
+                      f"HTTP {response.status_code}: {details.get('photo_url')}, {details.get('photo_count')} photos"))
+
+        # Malformed damage points are a 400, and the detail route returns the points as an array
+        report = {'customer_id': customer_id, 'vehicle_id': vehicle_id, 'vehicle_type': 'truck'}
+        point = {'id': 'api_point', 'x': 0.5, 'y': 0.5, 'damage_type': 'Dent', 'severity': 'Minor'}
+        statuses = [client.post('/api/damage-reports', json=dict(report, damage_points=points)).status_code
+                    for points in (['dent'], [dict(point, x=[1])])]
+        created = client.post('/api/damage-reports', json=dict(report, damage_points=[point])).get_json()['report']
+        points = client.get(f"/api/damage-reports/{created['id']}").get_json().get('damage_points')
+        tests.append(("Damage Report Points", statuses == [400, 400] and isinstance(points, list)
+                      and [p['id'] for p in points] == ['api_point'], f"HTTP {statuses}, detail points {points}"))
+
+        statuses = [client.get(url, query_string={'fields': fields}).status_code
+                    for url, fields in (('/api/customers', 'id,bogus'), ('/api/customers', ''),
+                                        ('/api/customers', 'id,name FROM users--'),
+                                        (f'/api/vehicles/{vehicle_id}', 'nope'))]
+        tests.append(("Invalid Fields", statuses == [400] * 4, f"HTTP {statuses}"))
+
+        # A matching ETag (strong, or the weak one a compressed body carries) gets an empty 304
+        # until one of the route's tables changes
+        etag = client.get('/api/customers').headers.get('ETag')
+        cached = client.get('/api/customers', headers={'If-None-Match': etag})
+        cached_weak = client.get('/api/customers', headers={'If-None-Match': f'W/{etag}'})
+        with db_manager.get_connection() as conn:
+            conn.execute("INSERT INTO customers (first_name, last_name) VALUES ('ETag', 'Bump')")
+            conn.commit()
+        changed = client.get('/api/customers', headers={'If-None-Match': etag})
+        tests.append(("Conditional GET",
+                      bool(etag) and cached.status_code == 304 and not cached.get_data()
+                      and cached.headers.get('ETag') == etag and cached_weak.status_code == 304
+                      and changed.status_code == 200 and changed.headers.get('ETag') != etag,
+                      f"HTTP {cached.status_code}, {cached_weak.status_code}, then {changed.status_code} after a write"))
+
+        # Responses are compressed with the best encoding both sides support; br falls back
+        # to identity (or gzip when also accepted) without the optional brotli package
+        import gzip
+        from application import compressor
+        from utils.compression import available_encodings
+        plain = client.get('/api/customers').get_data()
+        gzipped = client.get('/api/customers', headers={'Accept-Encoding': 'gzip'})
+        tests.append(("Gzip Response",
+                      len(plain) >= compressor.min_size and gzipped.headers.get('Content-Encoding') == 'gzip'
+                      and gzip.decompress(gzipped.get_data()) == plain
+                      and 'Accept-Encoding' in gzipped.headers.get('Vary', '')
+                      and gzipped.headers.get('ETag', '').startswith('W/'),
+                      f"{len(plain)} -> {len(gzipped.get_data())} bytes"))
+
+        encodings = [client.get('/api/customers', headers={'Accept-Encoding': accept}).headers.get('Content-Encoding')
+                     for accept in ('br', 'br, gzip;q=0.5', 'identity')]
+        expected = ['br', 'br', None] if 'br' in available_encodings() else [None, 'gzip', None]
+        small = client.get('/api/customers', query_string={'limit': 1, 'fields': 'id'},
+                           headers={'Accept-Encoding': 'gzip'})
+        tests.append(("Encoding Negotiation",
+                      encodings == expected and 'Content-Encoding' not in small.headers,
+                      f"{encodings}, small body {small.headers.get('Content-Encoding', 'identity')}"))
+
+        # A quote saved with the previewed number moves the sequence past it, so the
+        # next preview and a quote sent without a number get the following one
+        quote = {'quote_date': datetime.now().strftime('%Y-%m-%d'), 'items': [{'description': 'Sequence check'}]}
+        first = client.get('/api/quotes/generate-number').get_json()['quote_number']
+        with_number = client.post('/api/quotes', json=dict(quote, quote_number=first))
+        second = client.get('/api/quotes/generate-number').get_json()['quote_number']
+        without_number = client.post('/api/quotes', json=quote)
+        tests.append(("Quote Numbers",
+                      with_number.status_code == 201 and with_number.get_json()['quote_number'] == first
+                      and second != first and without_number.status_code == 201
+                      and without_number.get_json()['quote_number'] == second,
+                      f"{first} -> HTTP {with_number.status_code}, {second} -> HTTP {without_number.status_code}"))
+
+        statuses = [client.post('/api/quotes', json=dict(quote, quote_number=number)).status_code
+                    for number in ('QUOTE-1', 'Q99')]
+        tests.append(("Invalid Quote Number", statuses == [400, 400], f"HTTP {statuses}"))
+
+    except Exception as e:
+        tests.append(("Web API Functionality", False, str(e)))
+
+    # Print results
+    all_passed = True
+    for test_name, passed, details in tests:
+        print_test(test_name, passed, details)
+        if not passed:
+            all_passed = False
+
+    return all_passed
+
+
 def test_ui_components():
     """Test UI component imports"""
     print_header("TESTING UI COMPONENTS")
@@ -546,9 +1202,15 @@ def run_full_test_suite():
         test_project_structure(),
         test_configuration(),
         test_database_components(),
+        test_schema_migrations(),
+        test_connection_pool(),
+        test_write_coordinator(),
+        test_document_sequences(),
+        test_stat_counters(),
         test_camera_service(),  # Updated with better error handling
         test_image_service(),
         test_damage_service(),
+        test_web_api(),
         test_ui_components(),
         test_application_startup()
     ]
@@ -12,6 +12,9 @@ from datetime import datetime
 import math
 import uuid
 
+from services.vehicle_templates import VehicleTemplateManager, template_cache
+from ui.screen.inspection.point_grid import PointGrid, rescale_items
+
 logger = logging.getLogger(__name__)
 
 
@@ -82,379 +85,6 @@ class DamagePoint:
         return self.estimated_cost
 
 
-class VehicleTemplateManager:
-    """Manages vehicle template images"""
-
-    def __init__(self, templates_dir: str = "assets/vehicle_templates"):
-        self.templates_dir = Path(templates_dir)
-        self.templates = self._load_templates()
-
-    def _load_templates(self) -> Dict[str, Dict[str, str]]:
-        """Load available vehicle templates"""
-        templates = {
-            'truck': {
-                'side': 'truck_side.png',
-                'front': 'truck_front.png',
-                'rear': 'truck_rear.png',
-                'top': 'truck_top.png'
-            },
-            'car': {
-                'side': 'car_side.png',
-                'front': 'car_front.png',
-                'rear': 'car_rear.png',
-                'top': 'car_top.png'
-            },
-            'van': {
-                'side': 'van_side.png',
-                'front': 'van_front.png',
-                'rear': 'van_rear.png',
-                'top': 'van_top.png'
-            },
-            'motorcycle': {
-                'side': 'motorcycle_side.png',
-                'front': 'motorcycle_front.png'
-            }
-        }
-
-        # Create default templates if they don't exist
-        self._ensure_templates_exist()
-        return templates
-
-    def _ensure_templates_exist(self):
-        """Create default vehicle templates if they don't exist"""
-        self.templates_dir.mkdir(parents=True, exist_ok=True)
-
-        # Create simple vehicle outlines if templates don't exist
-        for vehicle_type, views in self.templates.items():
-            for view, filename in views.items():
-                filepath = self.templates_dir / filename
-                if not filepath.exists():
-                    self._create_default_template(filepath, vehicle_type, view)
-
-    def _create_default_template(self, filepath: Path, vehicle_type: str, view: str):
-        """Create a default vehicle template"""
-        try:
-            # Create a basic vehicle outline
-            width, height = 800, 600
-            img = Image.new('RGBA', (width, height), (255, 255, 255, 255))
-            draw = ImageDraw.Draw(img)
-
-            # Draw basic vehicle outline based on type and view
-            if vehicle_type == 'truck':
-                if view == 'side':
-                    self._draw_truck_side(draw, width, height)
-                elif view == 'front':
-                    self._draw_truck_front(draw, width, height)
-                elif view == 'rear':
-                    self._draw_truck_rear(draw, width, height)
-                elif view == 'top':
-                    self._draw_truck_top(draw, width, height)
-            elif vehicle_type == 'car':
-                if view == 'side':
-                    self._draw_car_side(draw, width, height)
-                elif view == 'front':
-                    self._draw_car_front(draw, width, height)
-                elif view == 'rear':
-                    self._draw_car_rear(draw, width, height)
-                elif view == 'top':
-                    self._draw_car_top(draw, width, height)
-            elif vehicle_type == 'van':
-                if view == 'side':
-                    self._draw_van_side(draw, width, height)
-                elif view == 'front':
-                    self._draw_van_front(draw, width, height)
-                elif view == 'rear':
-                    self._draw_van_rear(draw, width, height)
-                elif view == 'top':
-                    self._draw_van_top(draw, width, height)
-
-            img.save(filepath)
-            logger.info(f"Created default template: {filepath}")
-
-        except Exception as e:
-            logger.error(f"Failed to create template {filepath}: {e}")
-
-    def _draw_truck_side(self, draw: ImageDraw.Draw, width: int, height: int):
-        """Draw truck side view"""
-        # Main cab
-        cab_x1, cab_y1 = width * 0.1, height * 0.3
-        cab_x2, cab_y2 = width * 0.35, height * 0.7
-        draw.rectangle([cab_x1, cab_y1, cab_x2, cab_y2], outline='black', width=3)
-
-        # Trailer
-        trailer_x1, trailer_y1 = width * 0.35, height * 0.25
-        trailer_x2, trailer_y2 = width * 0.85, height * 0.7
-        draw.rectangle([trailer_x1, trailer_y1, trailer_x2, trailer_y2], outline='black', width=3)
-
-        # Wheels
-        wheel_y = height * 0.7
-        wheel_radius = 25
-        # Cab wheels
-        draw.ellipse([width * 0.15 - wheel_radius, wheel_y - wheel_radius,
-                      width * 0.15 + wheel_radius, wheel_y + wheel_radius],
-                     outline='black', width=3)
-        draw.ellipse([width * 0.28 - wheel_radius, wheel_y - wheel_radius,
-                      width * 0.28 + wheel_radius, wheel_y + wheel_radius],
-                     outline='black', width=3)
-        # Trailer wheels
-        draw.ellipse([width * 0.65 - wheel_radius, wheel_y - wheel_radius,
-                      width * 0.65 + wheel_radius, wheel_y + wheel_radius],
-                     outline='black', width=3)
-        draw.ellipse([width * 0.75 - wheel_radius, wheel_y - wheel_radius,
-                      width * 0.75 + wheel_radius, wheel_y + wheel_radius],
-                     outline='black', width=3)
-
-    def _draw_truck_front(self, draw: ImageDraw.Draw, width: int, height: int):
-        """Draw truck front view"""
-        # Main outline
-        truck_x1, truck_y1 = width * 0.2, height * 0.2
-        truck_x2, truck_y2 = width * 0.8, height * 0.8
-        draw.rectangle([truck_x1, truck_y1, truck_x2, truck_y2], outline='black', width=3)
-
-        # Windshield
-        wind_x1, wind_y1 = width * 0.25, height * 0.25
-        wind_x2, wind_y2 = width * 0.75, height * 0.45
-        draw.rectangle([wind_x1, wind_y1, wind_x2, wind_y2], outline='black', width=2)
-
-        # Grille
-        grille_x1, grille_y1 = width * 0.3, height * 0.5
-        grille_x2, grille_y2 = width * 0.7, height * 0.65
-        draw.rectangle([grille_x1, grille_y1, grille_x2, grille_y2], outline='black', width=2)
-
-        # Headlights
-        draw.ellipse([width * 0.22, height * 0.55, width * 0.28, height * 0.62],
-                     outline='black', width=2)
-        draw.ellipse([width * 0.72, height * 0.55, width * 0.78, height * 0.62],
-                     outline='black', width=2)
-
-    def _draw_truck_rear(self, draw: ImageDraw.Draw, width: int, height: int):
-        """Draw truck rear view"""
-        # Main outline (similar to front)
-        truck_x1, truck_y1 = width * 0.2, height * 0.2
-        truck_x2, truck_y2 = width * 0.8, height * 0.8
-        draw.rectangle([truck_x1, truck_y1, truck_x2, truck_y2], outline='black', width=3)
-
-        # Rear doors
-        door_x = width * 0.5
-        draw.line([door_x, truck_y1, door_x, truck_y2], fill='black', width=2)
-
-        # Tail lights
-        draw.rectangle([width * 0.22, height * 0.6, width * 0.28, height * 0.7],
-                       outline='red', width=2)
-        draw.rectangle([width * 0.72, height * 0.6, width * 0.78, height * 0.7],
-                       outline='red', width=2)
-
-    def _draw_truck_top(self, draw: ImageDraw.Draw, width: int, height: int):
-        """Draw truck top view"""
-        # Cab
-        cab_x1, cab_y1 = width * 0.2, height * 0.1
-        cab_x2, cab_y2 = width * 0.8, height * 0.35
-        draw.rectangle([cab_x1, cab_y1, cab_x2, cab_y2], outline='black', width=3)
-
-        # Trailer
-        trailer_x1, trailer_y1 = width * 0.15, height * 0.35
-        trailer_x2, trailer_y2 = width * 0.85, height * 0.9
-        draw.rectangle([trailer_x1, trailer_y1, trailer_x2, trailer_y2], outline='black', width=3)
-
-    def _draw_van_side(self, draw: ImageDraw.Draw, width: int, height: int):
-        """Draw van side view"""
-        # Main body
-        body_x1, body_y1 = width * 0.1, height * 0.3
-        body_x2, body_y2 = width * 0.85, height * 0.7
-        draw.rectangle([body_x1, body_y1, body_x2, body_y2], outline='black', width=3)
-
-        # Front section
-        front_x1, front_y1 = width * 0.05, height * 0.35
-        front_x2, front_y2 = width * 0.15, height * 0.65
-        draw.rectangle([front_x1, front_y1, front_x2, front_y2], outline='black', width=3)
-
-        # Windshield
-        draw.line([front_x2, front_y1, front_x2 + 30, front_y1 - 20], fill='black', width=2)
-        draw.line([front_x2 + 30, front_y1 - 20, body_x1 + 50, body_y1], fill='black', width=2)
-
-        # Wheels
-        wheel_y = height * 0.7
-        wheel_radius = 25
-        draw.ellipse([width * 0.2 - wheel_radius, wheel_y - wheel_radius,
-                      width * 0.2 + wheel_radius, wheel_y + wheel_radius],
-                     outline='black', width=3)
-        draw.ellipse([width * 0.7 - wheel_radius, wheel_y - wheel_radius,
-                      width * 0.7 + wheel_radius, wheel_y + wheel_radius],
-                     outline='black', width=3)
-
-        # Side door
-        door_x = width * 0.5
-        draw.line([door_x, body_y1, door_x, body_y2], fill='black', width=2)
-
-    def _draw_van_front(self, draw: ImageDraw.Draw, width: int, height: int):
-        """Draw van front view"""
-        # Main outline
-        van_x1, van_y1 = width * 0.2, height * 0.25
-        van_x2, van_y2 = width * 0.8, height * 0.8
-        draw.rectangle([van_x1, van_y1, van_x2, van_y2], outline='black', width=3)
-
-        # Windshield
-        wind_x1, wind_y1 = width * 0.25, height * 0.15
-        wind_x2, wind_y2 = width * 0.75, height * 0.3
-        draw.rectangle([wind_x1, wind_y1, wind_x2, wind_y2], outline='black', width=2)
-
-        # Grille
-        grille_x1, grille_y1 = width * 0.35, height * 0.5
-        grille_x2, grille_y2 = width * 0.65, height * 0.65
-        draw.rectangle([grille_x1, grille_y1, grille_x2, grille_y2], outline='black', width=2)
-
-        # Headlights
-        draw.ellipse([width * 0.25, height * 0.55, width * 0.32, height * 0.62],
-                     outline='black', width=2)
-        draw.ellipse([width * 0.68, height * 0.55, width * 0.75, height * 0.62],
-                     outline='black', width=2)
-
-    def _draw_van_rear(self, draw: ImageDraw.Draw, width: int, height: int):
-        """Draw van rear view"""
-        # Main outline
-        van_x1, van_y1 = width * 0.2, height * 0.25
-        van_x2, van_y2 = width * 0.8, height * 0.8
-        draw.rectangle([van_x1, van_y1, van_x2, van_y2], outline='black', width=3)
-
-        # Rear doors
-        door_x = width * 0.5
-        draw.line([door_x, van_y1, door_x, van_y2], fill='black', width=2)
-
-        # Door handles
-        draw.rectangle([door_x - 20, (van_y1 + van_y2) // 2 - 3,
-                        door_x - 15, (van_y1 + van_y2) // 2 + 3], fill='black')
-        draw.rectangle([door_x + 15, (van_y1 + van_y2) // 2 - 3,
-                        door_x + 20, (van_y1 + van_y2) // 2 + 3], fill='black')
-
-        # Tail lights
-        draw.rectangle([width * 0.22, height * 0.6, width * 0.28, height * 0.7],
-                       outline='red', width=2)
-        draw.rectangle([width * 0.72, height * 0.6, width * 0.78, height * 0.7],
-                       outline='red', width=2)
-
-    def _draw_van_top(self, draw: ImageDraw.Draw, width: int, height: int):
-        """Draw van top view"""
-        # Main body
-        body_x1, body_y1 = width * 0.25, height * 0.1
-        body_x2, body_y2 = width * 0.75, height * 0.9
-        draw.rectangle([body_x1, body_y1, body_x2, body_y2], outline='black', width=3)
-
-        # Front section
-        front_x1, front_y1 = width * 0.3, height * 0.05
-        front_x2, front_y2 = width * 0.7, height * 0.15
-        draw.rectangle([front_x1, front_y1, front_x2, front_y2], outline='black', width=2)
-
-        # Side doors (lines)
-        door_y1 = height * 0.4
-        door_y2 = height * 0.7
-        draw.line([body_x1, door_y1, body_x1 - 10, door_y1], fill='black', width=2)
-        draw.line([body_x1, door_y2, body_x1 - 10, door_y2], fill='black', width=2)
-        draw.line([body_x2, door_y1, body_x2 + 10, door_y1], fill='black', width=2)
-        draw.line([body_x2, door_y2, body_x2 + 10, door_y2], fill='black', width=2)
-
-    def _draw_car_side(self, draw: ImageDraw.Draw, width: int, height: int):
-        """Draw car side view"""
-        # Main body
-        body_x1, body_y1 = width * 0.15, height * 0.4
-        body_x2, body_y2 = width * 0.85, height * 0.7
-        draw.rectangle([body_x1, body_y1, body_x2, body_y2], outline='black', width=3)
-
-        # Roof
-        roof_x1, roof_y1 = width * 0.25, height * 0.25
-        roof_x2, roof_y2 = width * 0.75, height * 0.4
-        draw.rectangle([roof_x1, roof_y1, roof_x2, roof_y2], outline='black', width=3)
-
-        # Windows
-        draw.rectangle([width * 0.28, height * 0.28, width * 0.45, height * 0.38],
-                       outline='black', width=2)
-        draw.rectangle([width * 0.55, height * 0.28, width * 0.72, height * 0.38],
-                       outline='black', width=2)
-
-        # Wheels
-        wheel_y = height * 0.7
-        wheel_radius = 20
-        draw.ellipse([width * 0.25 - wheel_radius, wheel_y - wheel_radius,
-                      width * 0.25 + wheel_radius, wheel_y + wheel_radius],
-                     outline='black', width=3)
-        draw.ellipse([width * 0.75 - wheel_radius, wheel_y - wheel_radius,
-                      width * 0.75 + wheel_radius, wheel_y + wheel_radius],
-                     outline='black', width=3)
-
-    def _draw_car_front(self, draw: ImageDraw.Draw, width: int, height: int):
-        """Draw car front view"""
-        # Main outline
-        car_x1, car_y1 = width * 0.25, height * 0.3
-        car_x2, car_y2 = width * 0.75, height * 0.8
-        draw.rectangle([car_x1, car_y1, car_x2, car_y2], outline='black', width=3)
-
-        # Windshield
-        wind_x1, wind_y1 = width * 0.3, height * 0.2
-        wind_x2, wind_y2 = width * 0.7, height * 0.35
-        draw.polygon([wind_x1, wind_y1, wind_x2, wind_y1,
-                      car_x2, car_y1, car_x1, car_y1], outline='black', width=2)
-
-        # Grille
-        grille_x1, grille_y1 = width * 0.35, height * 0.5
-        grille_x2, grille_y2 = width * 0.65, height * 0.65
-        draw.rectangle([grille_x1, grille_y1, grille_x2, grille_y2], outline='black', width=2)
-
-        # Headlights
-        draw.ellipse([width * 0.28, height * 0.55, width * 0.33, height * 0.62],
-                     outline='black', width=2)
-        draw.ellipse([width * 0.67, height * 0.55, width * 0.72, height * 0.62],
-                     outline='black', width=2)
-
-    def _draw_car_rear(self, draw: ImageDraw.Draw, width: int, height: int):
-        """Draw car rear view"""
-        # Similar to front but with tail lights
-        car_x1, car_y1 = width * 0.25, height * 0.3
-        car_x2, car_y2 = width * 0.75, height * 0.8
-        draw.rectangle([car_x1, car_y1, car_x2, car_y2], outline='black', width=3)
-
-        # Rear window
-        wind_x1, wind_y1 = width * 0.3, height * 0.2
-        wind_x2, wind_y2 = width * 0.7, height * 0.35
-        draw.polygon([wind_x1, wind_y1, wind_x2, wind_y1,
-                      car_x2, car_y1, car_x1, car_y1], outline='black', width=2)
-
-        # Tail lights
-        draw.rectangle([width * 0.27, height * 0.6, width * 0.32, height * 0.7],
-                       outline='red', width=2)
-        draw.rectangle([width * 0.68, height * 0.6, width * 0.73, height * 0.7],
-                       outline='red', width=2)
-
-    def _draw_car_top(self, draw: ImageDraw.Draw, width: int, height: int):
-        """Draw car top view"""
-        # Main body
-        body_x1, body_y1 = width * 0.3, height * 0.15
-        body_x2, body_y2 = width * 0.7, height * 0.85
-        draw.rectangle([body_x1, body_y1, body_x2, body_y2], outline='black', width=3)
-
-        # Hood
-        hood_x1, hood_y1 = width * 0.32, height * 0.1
-        hood_x2, hood_y2 = width * 0.68, height * 0.25
-        draw.rectangle([hood_x1, hood_y1, hood_x2, hood_y2], outline='black', width=2)
-
-        # Trunk
-        trunk_x1, trunk_y1 = width * 0.32, height * 0.75
-        trunk_x2, trunk_y2 = width * 0.68, height * 0.9
-        draw.rectangle([trunk_x1, trunk_y1, trunk_x2, trunk_y2], outline='black', width=2)
-
-    def get_template_path(self, vehicle_type: str, view: str) -> Optional[Path]:
-        """Get path to template file"""
-        if vehicle_type in self.templates and view in self.templates[vehicle_type]:
-            return self.templates_dir / self.templates[vehicle_type][view]
-        return None
-
-    def get_available_types(self) -> List[str]:
-        """Get list of available vehicle types"""
-        return list(self.templates.keys())
-
-    def get_available_views(self, vehicle_type: str) -> List[str]:
-        """Get list of available views for a vehicle type"""
-        return list(self.templates.get(vehicle_type, {}).keys())
-
-
 class DamageCanvas(tk.Canvas):
     """Interactive canvas for marking damage on vehicle templates"""
 
@@ -467,12 +97,21 @@ class DamageCanvas(tk.Canvas):
         self.drawing_mode = False
         self.drawing_path: List[Tuple[int, int]] = []
         self.template_image = None
+        self.template_key = None  # template_cache key of the loaded template
         self.template_photo = None
         self.canvas_width = 800
         self.canvas_height = 600
         self.scale_factor = 1.0
         self.offset_x = 0
         self.offset_y = 0
+        self.marker_scale = 1.0  # markers grow and shrink with the template when the canvas is resized
+
+        # Hit-testing index and the canvas items drawn for each point, so a change
+        # to one point only touches that point's items
+        self.point_index = PointGrid()
+        self._point_items: Dict[DamagePoint, Tuple[int, ...]] = {}
+        self._dragged_point: Optional[DamagePoint] = None
+        self._resize_job = None
 
         # Colors for different damage types
         self.damage_colors = {
@@ -503,6 +142,7 @@ class DamageCanvas(tk.Canvas):
         self.bind("<ButtonRelease-1>", self._on_release)
         self.bind("<Button-3>", self._on_right_click)  # Right click for context menu
         self.bind("<Double-Button-1>", self._on_double_click)
+        self.bind("<Configure>", self._on_resize)
 
         # Enable focus for keyboard events
         self.focus_set()
@@ -515,32 +155,14 @@ class DamageCanvas(tk.Canvas):
                 logger.warning(f"Template not found: {template_path}")
                 return False
 
-            # Load and resize image to fit canvas
-            self.template_image = Image.open(template_path)
-
-            # Calculate scale to fit canvas while maintaining aspect ratio
-            img_width, img_height = self.template_image.size
-            scale_w = self.canvas_width / img_width
-            scale_h = self.canvas_height / img_height
-            self.scale_factor = min(scale_w, scale_h) * 0.9  # 90% to leave some margin
-
-            # Resize image
-            new_width = int(img_width * self.scale_factor)
-            new_height = int(img_height * self.scale_factor)
-            resized_image = self.template_image.resize((new_width, new_height),
-                                                       Image.Resampling.LANCZOS)
-
-            # Center image on canvas
-            self.offset_x = (self.canvas_width - new_width) // 2
-            self.offset_y = (self.canvas_height - new_height) // 2
-
-            # Convert to PhotoImage
-            self.template_photo = ImageTk.PhotoImage(resized_image)
+            # Decoded once per template and shared with every other canvas
+            self.template_key = str(template_path)
+            self.template_image = template_cache.source(self.template_key)
 
             # Clear canvas and draw template
             self.delete("all")
-            self.create_image(self.offset_x, self.offset_y, anchor=tk.NW,
-                              image=self.template_photo, tags="template")
+            self.marker_scale = 1.0
+            self._fit_template()
 
             # Redraw damage points
             self._redraw_damage_points()
@@ -552,6 +174,56 @@ class DamageCanvas(tk.Canvas):
             logger.error(f"Failed to load template: {e}")
             return False
 
+    def _fit_template(self):
+        """Scale the template to the canvas and (re)place it"""
+        # Calculate scale to fit canvas while maintaining aspect ratio
+        img_width, img_height = self.template_image.size
+        scale_w = self.canvas_width / img_width
+        scale_h = self.canvas_height / img_height
+        self.scale_factor = min(scale_w, scale_h) * 0.9  # 90% to leave some margin
+
+        # Resize image
+        new_width = int(img_width * self.scale_factor)
+        new_height = int(img_height * self.scale_factor)
+        resized_image = template_cache.sized(self.template_key, new_width, new_height)
+
+        # Center image on canvas
+        self.offset_x = (self.canvas_width - new_width) // 2
+        self.offset_y = (self.canvas_height - new_height) // 2
+
+        # Convert to PhotoImage
+        self.template_photo = ImageTk.PhotoImage(resized_image)
+
+        self.delete("template")
+        self.create_image(self.offset_x, self.offset_y, anchor=tk.NW,
+                          image=self.template_photo, tags="template")
+        self.tag_lower("template")
+
+    def _on_resize(self, event):
+        """Handle canvas resize - refit the template once the size settles"""
+        inset = 2 * (int(self.cget("highlightthickness")) + int(self.cget("borderwidth")))
+        width, height = event.width - inset, event.height - inset
+        if (width, height) == (self.canvas_width, self.canvas_height) or width <= 1 or height <= 1:
+            return
+
+        self.canvas_width, self.canvas_height = width, height
+        if self._resize_job:
+            self.after_cancel(self._resize_job)
+        self._resize_job = self.after(50, self._apply_resize)
+
+    def _apply_resize(self):
+        """Refit the template and rescale the existing damage point items to match"""
+        self._resize_job = None
+        if not self.template_image:
+            return
+
+        old_scale, old_offset = self.scale_factor, (self.offset_x, self.offset_y)
+        self._fit_template()
+
+        factor = self.scale_factor / old_scale
+        self.marker_scale *= factor
+        rescale_items(self, "damage_point", old_offset, (self.offset_x, self.offset_y), factor)
+
     def _canvas_to_relative(self, canvas_x: int, canvas_y: int) -> Tuple[float, float]:
         """Convert canvas coordinates to relative coordinates (0-1)"""
         if not self.template_image:
@@ -583,8 +255,8 @@ class DamageCanvas(tk.Canvas):
             # Start drawing path
             self.drawing_path = [(event.x, event.y)]
         else:
-            # Add damage point
-            self._add_damage_point(event.x, event.y)
+            # Add damage point; dragging before release moves it
+            self._dragged_point = self._add_damage_point(event.x, event.y)
 
     def _on_drag(self, event):
         """Handle mouse drag"""
@@ -599,9 +271,13 @@ class DamageCanvas(tk.Canvas):
                 self.create_line(x1, y1, x2, y2,
                                  fill=self.damage_colors[self.current_damage_type],
                                  width=3, tags="drawing")
+        elif self._dragged_point:
+            rel_x, rel_y = self._canvas_to_relative(event.x, event.y)
+            self.move_damage_point(self._dragged_point, rel_x, rel_y)
 
     def _on_release(self, event):
         """Handle mouse release"""
+        self._dragged_point = None
         if self.drawing_mode and self.drawing_path:
             # Finish drawing and create damage area
             self._create_damage_area_from_path()
@@ -635,7 +311,7 @@ class DamageCanvas(tk.Canvas):
             self.delete("drawing")
             self.drawing_path = []
 
-    def _add_damage_point(self, canvas_x: int, canvas_y: int):
+    def _add_damage_point(self, canvas_x: int, canvas_y: int) -> Optional[DamagePoint]:
         """Add a damage point at the specified location"""
         try:
             # Convert to relative coordinates
@@ -653,14 +329,17 @@ class DamageCanvas(tk.Canvas):
             damage_point.estimate_repair_cost()
 
             self.damage_points.append(damage_point)
+            self.point_index.add(damage_point)
 
             # Draw the damage point
             self._draw_damage_point(damage_point)
 
             logger.info(f"Added damage point: {damage_point.damage_type} at ({rel_x:.3f}, {rel_y:.3f})")
+            return damage_point
 
         except Exception as e:
             logger.error(f"Failed to add damage point: {e}")
+            return None
 
     def _draw_damage_point(self, damage_point: DamagePoint):
         """Draw a damage point on the canvas"""
@@ -670,7 +349,7 @@ class DamageCanvas(tk.Canvas):
 
             # Get color and size
             color = self.damage_colors.get(damage_point.damage_type, "#FF0000")
-            size = self.severity_sizes.get(damage_point.severity, 20)
+            size = max(2, int(self.severity_sizes.get(damage_point.severity, 20) * self.marker_scale))
 
             # Draw circle
             circle_id = self.create_oval(
@@ -682,7 +361,7 @@ class DamageCanvas(tk.Canvas):
 
             # Draw severity indicator (inner circle)
             inner_size = max(3, size // 4)
-            self.create_oval(
+            inner_id = self.create_oval(
                 canvas_x - inner_size // 2, canvas_y - inner_size // 2,
                 canvas_x + inner_size // 2, canvas_y + inner_size // 2,
                 fill="white", outline="black", width=1,
@@ -690,38 +369,66 @@ class DamageCanvas(tk.Canvas):
             )
 
             # Add damage type text
-            self.create_text(
-                canvas_x, canvas_y + size // 2 + 15,
+            text_id = self.create_text(
+                canvas_x, canvas_y + size // 2 + int(15 * self.marker_scale),
                 text=damage_point.damage_type[:3].upper(),
                 font=("Arial", 8, "bold"),
                 fill="black",
                 tags=("damage_point", damage_point.id)
             )
 
+            self._point_items[damage_point] = (circle_id, inner_id, text_id)
+
         except Exception as e:
             logger.error(f"Failed to draw damage point: {e}")
 
+    def _erase_damage_point(self, damage_point: DamagePoint):
+        """Delete the canvas items of one damage point"""
+        items = self._point_items.pop(damage_point, None)
+        if items:
+            self.delete(*items)
+
     def _redraw_damage_points(self):
-        """Redraw all damage points"""
+        """Redraw all damage points (after the template or the whole point list changed)"""
         # Remove existing damage point drawings
         self.delete("damage_point")
+        self._point_items.clear()
+        self.point_index.clear()
 
         # Redraw all points
         for damage_point in self.damage_points:
+            self.point_index.add(damage_point)
             self._draw_damage_point(damage_point)
 
+    def _refresh_damage_point(self, damage_point: DamagePoint):
+        """Redraw one damage point after its type or severity changed"""
+        self._erase_damage_point(damage_point)
+        self.point_index.add(damage_point)
+        self._draw_damage_point(damage_point)
+
+    def move_damage_point(self, damage_point: DamagePoint, rel_x: float, rel_y: float):
+        """Move a damage point to a new relative position"""
+        old_x, old_y = self._relative_to_canvas(damage_point.x, damage_point.y)
+        damage_point.x, damage_point.y = rel_x, rel_y
+        new_x, new_y = self._relative_to_canvas(rel_x, rel_y)
+
+        self.point_index.add(damage_point)
+        for item in self._point_items.get(damage_point, ()):
+            self.move(item, new_x - old_x, new_y - old_y)
+
     def _find_damage_point_at(self, canvas_x: int, canvas_y: int) -> Optional[DamagePoint]:
-        """Find damage point near the specified canvas coordinates"""
+        """Find the damage point nearest the specified canvas coordinates"""
         threshold = 30  # pixels
 
-        for damage_point in self.damage_points:
-            point_x, point_y = self._relative_to_canvas(damage_point.x, damage_point.y)
-            distance = math.sqrt((canvas_x - point_x) ** 2 + (canvas_y - point_y) ** 2)
+        if not self.template_image:
+            return None
 
-            if distance <= threshold:
-                return damage_point
+        width = self.template_image.width * self.scale_factor
+        height = self.template_image.height * self.scale_factor
+        rel_x = (canvas_x - self.offset_x) / width
+        rel_y = (canvas_y - self.offset_y) / height
 
-        return None
+        return self.point_index.nearest(rel_x, rel_y, width, height, threshold)
 
     def _show_damage_context_menu(self, event, damage_point: DamagePoint):
         """Show context menu for damage point"""
@@ -764,12 +471,10 @@ class DamageCanvas(tk.Canvas):
             # Remove from list
             if damage_point in self.damage_points:
                 self.damage_points.remove(damage_point)
+            self.point_index.remove(damage_point)
 
             # Remove from canvas
-            self.delete(damage_point.id)
-
-            # Redraw to ensure clean state
-            self._redraw_damage_points()
+            self._erase_damage_point(damage_point)
 
             logger.info(f"Removed damage point: {damage_point.id}")
 
@@ -793,7 +498,7 @@ class DamageCanvas(tk.Canvas):
     def _on_damage_point_updated(self, damage_point: DamagePoint):
         """Handle damage point update"""
         damage_point.estimate_repair_cost()
-        self._redraw_damage_points()
+        self._refresh_damage_point(damage_point)
 
     def _create_damage_area_from_path(self):
         """Create damage area from drawing path"""
@@ -1215,7 +920,7 @@ class DamageInspector:
 
         # Create damage canvas
         self.damage_canvas = DamageCanvas(canvas_frame, width=800, height=600)
-        self.damage_canvas.pack(padx=10, pady=10)
+        self.damage_canvas.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
 
         # Instructions
         instructions = tk.Label(
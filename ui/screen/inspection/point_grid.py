@@ -0,0 +1,79 @@
+# ui/screens/inspection/point_grid.py
+"""
+Grid bucket index of damage points for hit-testing
+
+Points are filed under the cell of a CELLS x CELLS grid over their relative
+(0-1) position, so finding the point under a click or touch only looks at
+the few cells within the hit radius instead of every point. Relative
+positions do not change when the canvas is resized, so neither does the
+index. Points are kept by identity, so duplicate point ids do no harm.
+"""
+
+import math
+from typing import Any, Dict, Optional, Set, Tuple
+
+
+class PointGrid:
+    """Damage points bucketed by relative position"""
+
+    def __init__(self, cells: int = 32):
+        self.cells = cells
+        self._buckets: Dict[Tuple[int, int], Set[Any]] = {}
+        self._point_cells: Dict[Any, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._point_cells)
+
+    def _cell_index(self, value: float) -> int:
+        return min(max(int(value * self.cells), 0), self.cells - 1)
+
+    def add(self, point):
+        """Index a point (or re-index it after it moved)"""
+        self.remove(point)
+        cell = (self._cell_index(point.x), self._cell_index(point.y))
+        self._buckets.setdefault(cell, set()).add(point)
+        self._point_cells[point] = cell
+
+    def remove(self, point):
+        """Drop a point from the index; no-op if it is not indexed"""
+        cell = self._point_cells.pop(point, None)
+        if cell is not None:
+            bucket = self._buckets[cell]
+            bucket.discard(point)
+            if not bucket:
+                del self._buckets[cell]
+
+    def clear(self):
+        self._buckets.clear()
+        self._point_cells.clear()
+
+    def nearest(self, x: float, y: float, width: float, height: float, radius: float) -> Optional[Any]:
+        """Closest point within radius pixels of relative (x, y) on a width x height pixel image"""
+        if width <= 0 or height <= 0:
+            return None
+
+        reach_x, reach_y = radius / width, radius / height
+        x_cells = range(self._cell_index(x - reach_x), self._cell_index(x + reach_x) + 1)
+        y_cells = range(self._cell_index(y - reach_y), self._cell_index(y + reach_y) + 1)
+
+        best, best_distance = None, radius
+        for cell_x in x_cells:
+            for cell_y in y_cells:
+                for point in self._buckets.get((cell_x, cell_y), ()):
+                    distance = math.hypot((point.x - x) * width, (point.y - y) * height)
+                    if distance <= best_distance:
+                        best, best_distance = point, distance
+        return best
+
+
+def rescale_items(canvas, tag: str, old_offset: Tuple[float, float], new_offset: Tuple[float, float],
+                  factor: float):
+    """Move and scale the canvas items tagged tag from one template placement to another
+
+    Three canvas commands whatever the number of items, instead of deleting
+    and redrawing each of them. Outline widths and text sizes stay as drawn.
+    """
+    canvas.move(tag, -old_offset[0], -old_offset[1])
+    if factor != 1.0:
+        canvas.scale(tag, 0, 0, factor, factor)
+    canvas.move(tag, new_offset[0], new_offset[1])
@@ -9,6 +9,9 @@ from pathlib import Path
 from datetime import datetime
 import logging
 
+from services.vehicle_templates import template_cache
+from ui.screen.inspection.point_grid import PointGrid, rescale_items
+
 logger = logging.getLogger(__name__)
 
 
@@ -70,12 +73,21 @@ class TouchFriendlyDamageMarker:
 
         # Vehicle template
         self.vehicle_image = None
+        self.template_key = None  # template_cache key of the vehicle image
         self.vehicle_photo = None
         self.canvas_width = 900
         self.canvas_height = 600
         self.scale_factor = 1.0
         self.offset_x = 0
         self.offset_y = 0
+        self.marker_scale = 1.0  # markers grow and shrink with the vehicle image when the canvas is resized
+
+        # Hit-testing index and the canvas items drawn for each point, so a change
+        # to one point only touches that point's items
+        self.point_index = PointGrid()
+        self._point_items: Dict[SimpleDamagePoint, Tuple[int, ...]] = {}
+        self._dragged_point: Optional[SimpleDamagePoint] = None
+        self._resize_job = None
 
         # Colors for damage severity
         self.severity_colors = {
@@ -195,10 +207,13 @@ class TouchFriendlyDamageMarker:
             highlightthickness=1,
             highlightbackground="#34495e"
         )
-        self.canvas.pack(pady=10)
+        self.canvas.pack(pady=10, fill=tk.BOTH, expand=True)
 
         # Bind events - make it touch/click friendly
         self.canvas.bind("<Button-1>", self._on_canvas_click)
+        self.canvas.bind("<B1-Motion>", self._on_canvas_drag)  # slide a new mark into place
+        self.canvas.bind("<ButtonRelease-1>", self._on_canvas_release)
+        self.canvas.bind("<Configure>", self._on_canvas_resize)
         self.canvas.bind("<Button-3>", self._on_canvas_right_click)  # Right click for context menu
         self.canvas.bind("<Double-Button-1>", self._on_canvas_double_click)
 
@@ -411,19 +426,23 @@ class TouchFriendlyDamageMarker:
     def _load_vehicle_template(self):
         """Load default vehicle template"""
         try:
-            # Create a simple van template if no image exists
-            self._create_simple_van_template()
+            # Drawn once per process and shared by every marker screen
+            self.template_key = "touch:simple_van"
+            self.vehicle_image = template_cache.source(self.template_key, self._create_simple_van_template)
 
         except Exception as e:
             logger.error(f"Failed to load vehicle template: {e}")
-            self._create_fallback_template()
+            self.template_key = "touch:fallback"
+            self.vehicle_image = template_cache.source(self.template_key, self._create_fallback_template)
 
-    def _create_simple_van_template(self):
+        self._resize_and_display_image()
+
+    def _create_simple_van_template(self) -> Image.Image:
         """Create a simple van outline template"""
         # Create image
         img_width, img_height = 700, 400
-        self.vehicle_image = Image.new('RGB', (img_width, img_height), 'white')
-        draw = ImageDraw.Draw(self.vehicle_image)
+        image = Image.new('RGB', (img_width, img_height), 'white')
+        draw = ImageDraw.Draw(image)
 
         # Draw van outline (side view)
         # Main body
@@ -483,27 +502,35 @@ class TouchFriendlyDamageMarker:
         draw.text((100, 350), "Front", fill='#7f8c8d', anchor="mm")
         draw.text((500, 350), "Rear", fill='#7f8c8d', anchor="mm")
 
-        # Convert to display format
-        self._resize_and_display_image()
+        return image
 
-    def _create_fallback_template(self):
+    def _create_fallback_template(self) -> Image.Image:
         """Create a simple fallback template"""
         img_width, img_height = 600, 300
-        self.vehicle_image = Image.new('RGB', (img_width, img_height), 'white')
-        draw = ImageDraw.Draw(self.vehicle_image)
+        image = Image.new('RGB', (img_width, img_height), 'white')
+        draw = ImageDraw.Draw(image)
 
         # Simple rectangle for vehicle
         draw.rectangle([50, 50, 550, 250], outline='#2c3e50', width=3)
         draw.text((300, 150), "Vehicle Template", fill='#2c3e50', anchor="mm")
         draw.text((300, 30), "Click anywhere to mark damage", fill='#7f8c8d', anchor="mm")
 
-        self._resize_and_display_image()
+        return image
 
     def _resize_and_display_image(self):
         """Resize and display the vehicle image"""
         if not self.vehicle_image:
             return
 
+        self.canvas.delete("all")
+        self.marker_scale = 1.0
+        self._fit_image()
+
+        # Redraw damage points
+        self._redraw_damage_points()
+
+    def _fit_image(self):
+        """Scale the vehicle image to the canvas and (re)place it"""
         # Calculate scale to fit canvas
         img_width, img_height = self.vehicle_image.size
         scale_w = (self.canvas_width - 40) / img_width
@@ -513,7 +540,7 @@ class TouchFriendlyDamageMarker:
         # Resize image
         new_width = int(img_width * self.scale_factor)
         new_height = int(img_height * self.scale_factor)
-        resized_image = self.vehicle_image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        resized_image = template_cache.sized(self.template_key, new_width, new_height)
 
         # Center on canvas
         self.offset_x = (self.canvas_width - new_width) // 2
@@ -523,16 +550,39 @@ class TouchFriendlyDamageMarker:
         self.vehicle_photo = ImageTk.PhotoImage(resized_image)
 
         # Display on canvas
-        self.canvas.delete("all")
+        self.canvas.delete("vehicle_template")
         self.canvas.create_image(
             self.offset_x, self.offset_y,
             anchor=tk.NW,
             image=self.vehicle_photo,
             tags="vehicle_template"
         )
+        self.canvas.tag_lower("vehicle_template")
 
-        # Redraw damage points
-        self._redraw_damage_points()
+    def _on_canvas_resize(self, event):
+        """Handle canvas resize - refit the vehicle image once the size settles"""
+        inset = 2 * (int(self.canvas.cget("highlightthickness")) + int(self.canvas.cget("borderwidth")))
+        width, height = event.width - inset, event.height - inset
+        if (width, height) == (self.canvas_width, self.canvas_height) or width <= 40 or height <= 40:
+            return
+
+        self.canvas_width, self.canvas_height = width, height
+        if self._resize_job:
+            self.canvas.after_cancel(self._resize_job)
+        self._resize_job = self.canvas.after(50, self._apply_resize)
+
+    def _apply_resize(self):
+        """Refit the vehicle image and rescale the existing damage point items to match"""
+        self._resize_job = None
+        if not self.vehicle_image:
+            return
+
+        old_scale, old_offset = self.scale_factor, (self.offset_x, self.offset_y)
+        self._fit_image()
+
+        factor = self.scale_factor / old_scale
+        self.marker_scale *= factor
+        rescale_items(self.canvas, "damage_point", old_offset, (self.offset_x, self.offset_y), factor)
 
     def _canvas_to_relative(self, canvas_x: int, canvas_y: int) -> Tuple[float, float]:
         """Convert canvas coordinates to relative coordinates (0-1)"""
@@ -567,10 +617,20 @@ class TouchFriendlyDamageMarker:
 
             # Only add point if it's on the vehicle template
             if 0 <= rel_x <= 1 and 0 <= rel_y <= 1:
-                self._add_damage_point(rel_x, rel_y)
+                self._dragged_point = self._add_damage_point(rel_x, rel_y)
         except Exception as e:
             logger.error(f"Error handling canvas click: {e}")
 
+    def _on_canvas_drag(self, event):
+        """Handle drag - move the point just added"""
+        if self._dragged_point:
+            rel_x, rel_y = self._canvas_to_relative(event.x, event.y)
+            self._move_damage_point(self._dragged_point, rel_x, rel_y)
+
+    def _on_canvas_release(self, event):
+        """Handle release - finish placing the point"""
+        self._dragged_point = None
+
     def _on_canvas_right_click(self, event):
         """Handle right click - remove nearby damage point"""
         # Find damage point near click
@@ -584,7 +644,7 @@ class TouchFriendlyDamageMarker:
         if damage_point:
             self._edit_damage_point(damage_point)
 
-    def _add_damage_point(self, rel_x: float, rel_y: float):
+    def _add_damage_point(self, rel_x: float, rel_y: float) -> Optional[SimpleDamagePoint]:
         """Add a damage point"""
         try:
             # Create damage point
@@ -597,18 +657,22 @@ class TouchFriendlyDamageMarker:
 
             # Add to list
             self.damage_points.append(damage_point)
+            self.point_index.add(damage_point)
             self.next_damage_number += 1
 
             # Draw on canvas
             self._draw_damage_point(damage_point)
 
             # Update damage list
-            self._update_damage_list()
+            self._insert_damage_row(damage_point)
+            self._update_summary()
 
             logger.info(f"Added damage point #{damage_point.number}")
+            return damage_point
 
         except Exception as e:
             logger.error(f"Failed to add damage point: {e}")
+            return None
 
     def _draw_damage_point(self, damage_point: SimpleDamagePoint):
         """Draw a damage point on the canvas"""
@@ -622,7 +686,7 @@ class TouchFriendlyDamageMarker:
 
             # Size based on severity
             sizes = {"Minor": 20, "Moderate": 25, "Severe": 30, "Critical": 35}
-            size = sizes.get(damage_point.severity, 20)
+            size = max(2, int(sizes.get(damage_point.severity, 20) * self.marker_scale))
 
             # Draw outer circle (severity color)
             outer_id = self.canvas.create_oval(
@@ -654,30 +718,52 @@ class TouchFriendlyDamageMarker:
                 tags=(f"damage_{damage_point.id}", "damage_point")
             )
 
+            self._point_items[damage_point] = (outer_id, inner_id, number_id)
+
         except Exception as e:
             logger.error(f"Failed to draw damage point: {e}")
 
+    def _erase_damage_point(self, damage_point: SimpleDamagePoint):
+        """Delete the canvas items of one damage point"""
+        items = self._point_items.pop(damage_point, None)
+        if items:
+            self.canvas.delete(*items)
+
     def _redraw_damage_points(self):
-        """Redraw all damage points"""
+        """Redraw all damage points (after the image or the whole point list changed)"""
         # Clear existing damage points
         self.canvas.delete("damage_point")
+        self._point_items.clear()
+        self.point_index.clear()
 
         # Redraw all points
         for damage_point in self.damage_points:
+            self.point_index.add(damage_point)
             self._draw_damage_point(damage_point)
 
+    def _move_damage_point(self, damage_point: SimpleDamagePoint, rel_x: float, rel_y: float):
+        """Move a damage point to a new relative position"""
+        old_x, old_y = self._relative_to_canvas(damage_point.x, damage_point.y)
+        damage_point.x, damage_point.y = rel_x, rel_y
+        new_x, new_y = self._relative_to_canvas(rel_x, rel_y)
+
+        self.point_index.add(damage_point)
+        for item in self._point_items.get(damage_point, ()):
+            self.canvas.move(item, new_x - old_x, new_y - old_y)
+
     def _find_damage_point_near(self, canvas_x: int, canvas_y: int) -> Optional[SimpleDamagePoint]:
-        """Find damage point near canvas coordinates"""
+        """Find the damage point nearest canvas coordinates"""
         threshold = 30  # pixels
 
-        for damage_point in self.damage_points:
-            point_x, point_y = self._relative_to_canvas(damage_point.x, damage_point.y)
-            distance = math.sqrt((canvas_x - point_x) ** 2 + (canvas_y - point_y) ** 2)
+        if not self.vehicle_image:
+            return None
 
-            if distance <= threshold:
-                return damage_point
+        width = self.vehicle_image.width * self.scale_factor
+        height = self.vehicle_image.height * self.scale_factor
+        rel_x = (canvas_x - self.offset_x) / width
+        rel_y = (canvas_y - self.offset_y) / height
 
-        return None
+        return self.point_index.nearest(rel_x, rel_y, width, height, threshold)
 
     def _remove_damage_point(self, damage_point: SimpleDamagePoint):
         """Remove a damage point"""
@@ -685,12 +771,15 @@ class TouchFriendlyDamageMarker:
             # Remove from list
             if damage_point in self.damage_points:
                 self.damage_points.remove(damage_point)
+            self.point_index.remove(damage_point)
 
             # Remove from canvas
-            self.canvas.delete(f"damage_{damage_point.id}")
+            self._erase_damage_point(damage_point)
 
             # Update damage list
-            self._update_damage_list()
+            if self.damage_tree.exists(str(id(damage_point))):
+                self.damage_tree.delete(str(id(damage_point)))
+            self._update_summary()
 
             logger.info(f"Removed damage point #{damage_point.number}")
 
@@ -703,33 +792,42 @@ class TouchFriendlyDamageMarker:
 
     def _on_damage_point_updated(self, damage_point: SimpleDamagePoint):
         """Handle damage point update"""
-        self._redraw_damage_points()
-        self._update_damage_list()
+        self._erase_damage_point(damage_point)
+        self._draw_damage_point(damage_point)
+
+        row_id = str(id(damage_point))
+        if self.damage_tree.exists(row_id):
+            self.damage_tree.item(row_id, values=self._damage_row_values(damage_point))
+
+    def _damage_row_values(self, damage_point: SimpleDamagePoint) -> Tuple:
+        """Damage list columns for a point"""
+        time_str = datetime.fromisoformat(damage_point.timestamp).strftime("%H:%M")
+        return damage_point.number, damage_point.damage_type, damage_point.severity, time_str
+
+    def _insert_damage_row(self, damage_point: SimpleDamagePoint):
+        """Append a point to the damage list (new points have the highest number)"""
+        self.damage_tree.insert(
+            "",
+            tk.END,
+            iid=str(id(damage_point)),
+            values=self._damage_row_values(damage_point),
+            tags=(damage_point.id,)
+        )
+
+    def _update_summary(self):
+        """Update the damage point count"""
+        self.summary_label.config(text=f"Total damage points: {len(self.damage_points)}")
 
     def _update_damage_list(self):
         """Update the damage points list"""
         # Clear existing items
-        for item in self.damage_tree.get_children():
-            self.damage_tree.delete(item)
+        self.damage_tree.delete(*self.damage_tree.get_children())
 
         # Add damage points
         for damage_point in sorted(self.damage_points, key=lambda p: p.number):
-            time_str = datetime.fromisoformat(damage_point.timestamp).strftime("%H:%M")
-
-            self.damage_tree.insert(
-                "",
-                tk.END,
-                values=(
-                    damage_point.number,
-                    damage_point.damage_type,
-                    damage_point.severity,
-                    time_str
-                ),
-                tags=(damage_point.id,)
-            )
+            self._insert_damage_row(damage_point)
 
-        # Update summary
-        self.summary_label.config(text=f"Total damage points: {len(self.damage_points)}")
+        self._update_summary()
 
     def _on_damage_type_change(self):
         """Handle damage type change"""
@@ -747,7 +845,7 @@ class TouchFriendlyDamageMarker:
         if messagebox.askyesno("Clear All", f"Remove all {len(self.damage_points)} damage points?"):
             self.damage_points.clear()
             self.next_damage_number = 1
-            self.canvas.delete("damage_point")
+            self._redraw_damage_points()
             self._update_damage_list()
 
     def _undo_last_damage(self):
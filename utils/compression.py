@@ -0,0 +1,264 @@
+# utils/compression.py
+"""
+Negotiated gzip / brotli compression for API responses and static files
+
+ResponseCompressor.compress() runs as an after_request hook. JSON and text
+responses at or above min_size are compressed with the best encoding the
+client accepts (br when the optional brotli package is installed, else
+gzip). Streamed responses are compressed chunk by chunk with a sync flush,
+so rows still arrive as they are produced.
+
+Static files are not compressed per request. precompress() writes .gz (and
+.br) variants next to each asset ahead of time (python -m utils.compression),
+and static_variant() picks the variant a request can use.
+
+Environment:
+    COMPRESSION_ENABLED    default true
+    COMPRESSION_MIN_SIZE   bytes, default 1024
+    COMPRESSION_LEVEL      gzip level 1-9, default 6
+    BROTLI_QUALITY         brotli quality 0-11, default 5
+"""
+
+import os
+import sys
+import gzip
+import zlib
+import logging
+import argparse
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+from flask import Response, request
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'application/x-ndjson', 'application/javascript', 'application/xml',
+    'application/manifest+json', 'image/svg+xml',
+}
+
+# Static assets worth precompressing, and the smallest size that pays off
+STATIC_EXTENSIONS = {'.js', '.css', '.html', '.json', '.svg', '.txt', '.xml'}
+STATIC_MIN_SIZE = 512
+
+# Content-Encoding -> file suffix, best first
+ENCODING_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+def available_encodings() -> List[str]:
+    """Encodings this process can produce, best first"""
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def is_compressible(mimetype: Optional[str]) -> bool:
+    return bool(mimetype) and (mimetype.startswith('text/') or mimetype in COMPRESSIBLE_MIMETYPES)
+
+
+def negotiate(accept_encodings, offered: Iterable[str]) -> Optional[str]:
+    """Best of the offered encodings the client accepts (None for identity)"""
+    offered = list(offered)
+    best = accept_encodings.best_match(offered) if offered else None
+    return best if best in offered else None
+
+
+class _StreamEncoder:
+    """Incremental compressor flushing after every chunk"""
+
+    def __init__(self, encoding: str, level: int, quality: int):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=quality)
+        else:
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == 'br':
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == 'br':
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class ResponseCompressor:
+    """Compresses eligible Flask responses for the current request"""
+
+    def __init__(self, min_size: int = 1024, level: int = 6, quality: int = 5):
+        self.min_size = min_size
+        self.level = max(1, min(level, 9))
+        self.quality = max(0, min(quality, 11))
+        self.enabled = True
+
+        self._lock = threading.Lock()
+        self._stats = {
+            'compressed': 0,
+            'streamed': 0,
+            'skipped_small': 0,
+            'bytes_in': 0,
+            'bytes_out': 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> 'ResponseCompressor':
+        compressor = cls(min_size=int(os.getenv('COMPRESSION_MIN_SIZE', 1024)),
+                         level=int(os.getenv('COMPRESSION_LEVEL', 6)),
+                         quality=int(os.getenv('BROTLI_QUALITY', 5)))
+        compressor.enabled = os.getenv('COMPRESSION_ENABLED', 'True').lower() in ['true', '1', 'yes']
+        return compressor
+
+    def _count(self, **amounts: int):
+        with self._lock:
+            for name, amount in amounts.items():
+                self._stats[name] += amount
+
+    def encode(self, data: bytes, encoding: str) -> bytes:
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.quality)
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def compress(self, response: Response) -> Response:
+        """after_request hook: compress the response if it is eligible"""
+        if (not self.enabled or response.direct_passthrough or response.status_code < 200
+                or response.status_code in (204, 206) or response.status_code >= 300
+                or 'Content-Encoding' in response.headers or not is_compressible(response.mimetype)):
+            return response
+
+        encoding = negotiate(request.accept_encodings, available_encodings())
+        response.vary.add('Accept-Encoding')
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            self._compress_stream(response, encoding)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                self._count(skipped_small=1)
+                return response
+            body = self.encode(data, encoding)
+            response.set_data(body)
+            self._count(compressed=1, bytes_in=len(data), bytes_out=len(body))
+
+        response.headers['Content-Encoding'] = encoding
+        # The encoded body is a different representation of the same data
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    def _compress_stream(self, response: Response, encoding: str):
+        encoder = _StreamEncoder(encoding, self.level, self.quality)
+        chunks = response.response
+
+        def generate() -> Iterator[bytes]:
+            try:
+                yield b''  # primed below, so close() reaches the wrapped iterable
+                for chunk in chunks:
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode('utf-8')
+                    if chunk:
+                        yield encoder.chunk(chunk)
+                yield encoder.finish()
+            finally:
+                if hasattr(chunks, 'close'):
+                    chunks.close()
+
+        body = generate()
+        next(body)
+        response.response = body
+        response.headers.pop('Content-Length', None)
+        self._count(streamed=1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Responses compressed and bytes saved"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['ratio'] = round(stats['bytes_out'] / stats['bytes_in'], 3) if stats['bytes_in'] else 0.0
+        stats['encodings'] = available_encodings()
+        stats['enabled'] = self.enabled
+        return stats
+
+
+# ---------------------------------------------------------------------------
+# Precompressed static assets
+# ---------------------------------------------------------------------------
+
+def static_variant(directory: str, path: str) -> Tuple[str, Optional[str]]:
+    """(file to send, Content-Encoding) for a static path and the current request
+
+    A variant is only used while it is at least as new as the original.
+    """
+    original = Path(directory) / path
+    try:
+        original_mtime = original.stat().st_mtime
+    except OSError:
+        return path, None
+
+    offered = []
+    for encoding, suffix in ENCODING_SUFFIXES.items():
+        try:
+            if os.stat(f"{original}{suffix}").st_mtime >= original_mtime:
+                offered.append(encoding)
+        except OSError:
+            continue
+
+    encoding = negotiate(request.accept_encodings, offered)
+    if encoding is None:
+        return path, None
+    return path + ENCODING_SUFFIXES[encoding], encoding
+
+
+def precompress(directory: str, level: int = 9, quality: int = 11, force: bool = False) -> Dict[str, int]:
+    """Write .gz (and .br) next to every compressible asset under directory"""
+    counts = {'written': 0, 'up_to_date': 0, 'skipped': 0}
+    encodings = available_encodings()
+
+    for original in sorted(Path(directory).rglob('*')):
+        if not original.is_file() or original.suffix not in STATIC_EXTENSIONS:
+            continue
+        data = original.read_bytes()
+        if len(data) < STATIC_MIN_SIZE:
+            counts['skipped'] += 1
+            continue
+
+        for encoding in encodings:
+            target = Path(f"{original}{ENCODING_SUFFIXES[encoding]}")
+            if not force and target.exists() and target.stat().st_mtime >= original.stat().st_mtime:
+                counts['up_to_date'] += 1
+                continue
+            if encoding == 'br':
+                body = brotli.compress(data, quality=quality)
+            else:
+                body = gzip.compress(data, compresslevel=level, mtime=0)
+            if len(body) >= len(data):
+                counts['skipped'] += 1
+                continue
+            target.write_bytes(body)
+            counts['written'] += 1
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Precompress static assets (.gz / .br)")
+    parser.add_argument('directory', nargs='?', default=str(Path(__file__).resolve().parent.parent / 'static'))
+    parser.add_argument('--force', action='store_true', help="rewrite variants that are up to date")
+    args = parser.parse_args(argv)
+
+    if brotli is None:
+        print("⚠️ brotli not installed - writing .gz variants only")
+    counts = precompress(args.directory, force=args.force)
+    print(f"✅ {counts['written']} written, {counts['up_to_date']} up to date, "
+          f"{counts['skipped']} skipped ({args.directory})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
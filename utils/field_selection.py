@@ -0,0 +1,106 @@
+# utils/field_selection.py
+"""
+Sparse field selection (?fields=) for list and detail endpoints
+
+    GET /api/customers?fields=id,name,phone,vehicle_count
+
+Requested fields are checked against a per-endpoint whitelist (the table's
+columns plus the endpoint's computed fields) and pushed into the SELECT list,
+so large columns such as notes or damage_points are neither read nor
+serialized unless asked for. Requests without fields= get every field as
+before. The row id is always included.
+"""
+
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+_columns_cache: Dict[str, List[str]] = {}
+_columns_lock = threading.Lock()
+
+
+def parse_fields(args: Mapping[str, str]) -> Optional[List[str]]:
+    """Field names from ?fields=a,b,c (None when not given); raises ValueError if empty"""
+    raw = args.get('fields')
+    if raw is None:
+        return None
+    fields = list(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+    if not fields:
+        raise ValueError("fields must name at least one field")
+    return fields
+
+
+def table_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    """Column names of a table, including generated columns (cached per process)"""
+    columns = _columns_cache.get(table)
+    if columns is None:
+        # hidden = 1 marks virtual table internals; 2 and 3 are generated columns
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_xinfo({table})") if row[6] != 1]
+        with _columns_lock:
+            _columns_cache[table] = columns
+    return columns
+
+
+class FieldSelector:
+    """Whitelist of the fields one endpoint can return
+
+    computed maps extra field names to SQL expressions (a name that is also a
+    column replaces that column); derived names fields the endpoint adds in
+    Python (URLs, nested lists), which are allowed in fields= but not
+    selected. required are selected whenever fields= is used because the
+    endpoint itself needs them.
+    """
+
+    def __init__(self, table: str, alias: Optional[str] = None, computed: Optional[Dict[str, str]] = None,
+                 derived: Iterable[str] = (), required: Iterable[str] = ()):
+        self.table = table
+        self.alias = alias
+        self.computed = computed or {}
+        self.derived = set(derived)
+        self.required = list(required)
+
+    def whitelist(self, conn: sqlite3.Connection) -> Dict[str, str]:
+        """Selectable field name -> SQL expression"""
+        prefix = f"{self.alias}." if self.alias else ''
+        fields = {column: f"{prefix}{column}" for column in table_columns(conn, self.table)}
+        fields.update(self.computed)
+        return fields
+
+    def validate(self, conn: sqlite3.Connection, fields: Optional[List[str]]):
+        """Raise ValueError naming any field the endpoint does not offer"""
+        if fields is None:
+            return
+        allowed = set(self.whitelist(conn)) | self.derived
+        unknown = [name for name in fields if name not in allowed]
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(sorted(allowed))}")
+
+    def select_sql(self, conn: sqlite3.Connection, fields: Optional[List[str]]) -> str:
+        """SELECT list for the requested fields (every column when fields= was not given)"""
+        if fields is None:
+            columns = table_columns(conn, self.table)
+            if any(name in self.computed for name in columns):
+                # A computed field replaces the column of the same name
+                whitelist = self.whitelist(conn)
+                names = list(dict.fromkeys(columns + list(self.computed)))
+                return ', '.join(f"{whitelist[name]} AS {name}" for name in names)
+            star = f"{self.alias}.*" if self.alias else '*'
+            return ', '.join([star] + [f"{expr} AS {name}" for name, expr in self.computed.items()])
+        self.validate(conn, fields)
+
+        whitelist = self.whitelist(conn)
+        names = ['id'] + [name for name in fields + self.required if name in whitelist]
+        names = list(dict.fromkeys(names))
+        return ', '.join(f"{whitelist[name]} AS {name}" for name in names)
+
+    @staticmethod
+    def wants(fields: Optional[List[str]], name: str) -> bool:
+        """True if the response should include name"""
+        return fields is None or name in fields
+
+    @staticmethod
+    def project(item: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+        """Drop anything not requested (helper columns, unrequested derived fields)"""
+        if fields is None:
+            return item
+        return {key: value for key, value in item.items() if key == 'id' or key in fields}
@@ -0,0 +1,57 @@
+# utils/lazy_import.py
+"""
+Deferred imports for heavy optional modules (cv2, numpy, PIL, tkinter)
+
+    np = lazy_module('numpy')
+
+binds a placeholder whose first attribute access imports the real module.
+Modules that only touch the name inside functions no longer pay the import
+cost at import time. Use `from __future__ import annotations` in modules that
+name lazy types in annotations, so they are not evaluated at definition time.
+"""
+
+import importlib
+import threading
+from types import ModuleType
+
+
+class LazyModule(ModuleType):
+    """Module placeholder that imports the real module on first attribute access"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_module'] = None
+        self.__dict__['_lazy_lock'] = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            with self.__dict__['_lazy_lock']:
+                module = self.__dict__['_lazy_module']
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.__dict__['_lazy_module'] is not None else 'not loaded'
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    """Return a placeholder for the named module that imports it on first use"""
+    return LazyModule(name)
+
+
+def is_loaded(module) -> bool:
+    """True if a lazy placeholder has been imported (always True for real modules)"""
+    if isinstance(module, LazyModule):
+        return module.__dict__['_lazy_module'] is not None
+    return True
+
@@ -0,0 +1,146 @@
+# utils/pagination.py
+"""
+Keyset (cursor) pagination for list endpoints
+
+A page is requested with ?limit=N and continued with ?cursor=<next_cursor>
+from the previous response. The cursor encodes the sort key of the last row
+returned, and the next page starts strictly after it:
+
+    WHERE created_at <= ? AND (created_at < ? OR id < ?)
+    ORDER BY created_at DESC, id DESC LIMIT N + 1
+
+so every page costs an index range read of N rows, however deep into the
+list it is, and rows inserted meanwhile never shift or repeat a page the way
+OFFSET does. Requests without limit or cursor get the whole list as before.
+"""
+
+import json
+import base64
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class PageRequest(NamedTuple):
+    """Parsed pagination parameters (limit None means unpaginated)"""
+    limit: Optional[int]
+    after: Optional[list]
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Opaque URL-safe cursor for a sort key"""
+    raw = json.dumps(values, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> list:
+    """Sort key from a cursor; raises ValueError if it is malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+    if not isinstance(values, list):
+        raise ValueError("Invalid pagination cursor")
+    return values
+
+
+def parse_page_args(args: Mapping[str, str], default_limit: int = DEFAULT_PAGE_SIZE,
+                    max_limit: int = MAX_PAGE_SIZE) -> PageRequest:
+    """Read limit and cursor from request args; raises ValueError on bad input"""
+    limit = args.get('limit')
+    cursor = args.get('cursor')
+    if limit is None and cursor is None:
+        return PageRequest(None, None)
+
+    try:
+        limit = int(limit) if limit is not None else default_limit
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    limit = max(1, min(limit, max_limit))
+    return PageRequest(limit, decode_cursor(cursor) if cursor else None)
+
+
+class Keyset:
+    """Stable sort order ending in a unique column
+
+        keyset = Keyset('s.created_at', 's.id', descending=True)
+        keyset = Keyset('v.id')
+
+    The leading column may contain NULLs (sorted last when descending, first
+    when ascending); middle columns must be NOT NULL.
+    """
+
+    def __init__(self, *columns: str, descending: bool = True):
+        if not columns:
+            raise ValueError("Keyset needs at least one column")
+        self.columns = columns
+        self.descending = descending
+
+    def select_sql(self) -> str:
+        """Extra SELECT items carrying the sort key (removed from the rows by page())"""
+        return ''.join(f", {column} AS _page_key{i}" for i, column in enumerate(self.columns))
+
+    def order_sql(self) -> str:
+        direction = 'DESC' if self.descending else 'ASC'
+        return ' ORDER BY ' + ', '.join(f"{column} {direction}" for column in self.columns)
+
+    def where_sql(self, after: Optional[list]) -> Tuple[str, list]:
+        """Condition selecting rows strictly after the given sort key ('' if first page)"""
+        if after is None:
+            return '', []
+        if len(after) != len(self.columns):
+            raise ValueError("Invalid pagination cursor")
+
+        lead, rest = self.columns[0], self.columns[1:]
+        op = '<' if self.descending else '>'
+        if not rest:
+            return f"{lead} {op} ?", [after[0]]
+
+        rest_row = f"({', '.join(rest)})" if len(rest) > 1 else rest[0]
+        rest_values = f"({', '.join('?' for _ in rest)})" if len(rest) > 1 else '?'
+
+        if after[0] is None:
+            # Inside the NULL group of the leading column
+            condition = f"({lead} IS NULL AND {rest_row} {op} {rest_values})"
+            if not self.descending:
+                condition = f"({condition} OR {lead} IS NOT NULL)"
+            return condition, list(after[1:])
+
+        # Leading-column range first so an index on it bounds the search
+        condition = f"{lead} {op}= ? AND ({lead} {op} ? OR {rest_row} {op} {rest_values})"
+        if self.descending:
+            condition = f"(({condition}) OR {lead} IS NULL)"
+        else:
+            condition = f"({condition})"
+        return condition, [after[0], after[0]] + list(after[1:])
+
+    def page(self, rows: List[Mapping[str, Any]], limit: Optional[int]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Strip the sort key from rows fetched with LIMIT limit + 1 and build next_cursor"""
+        has_more = limit is not None and len(rows) > limit
+        if has_more:
+            rows = rows[:limit]
+
+        items, last_key = [], None
+        for row in rows:
+            item, last_key = self.split_key(row)
+            items.append(item)
+        return items, (encode_cursor(last_key) if has_more else None)
+
+    def split_key(self, row: Mapping[str, Any]) -> Tuple[Dict[str, Any], list]:
+        """Row as a dict without its sort key, and the sort key"""
+        item = dict(row)
+        return item, [item.pop(f"_page_key{i}") for i in range(len(self.columns))]
+
+    def apply(self, query: str, params: list, page: PageRequest, where_prefix: str = ' AND ') -> Tuple[str, list]:
+        """Append the keyset condition, ORDER BY and LIMIT to a query ending in its WHERE clause"""
+        condition, condition_params = self.where_sql(page.after)
+        if condition:
+            query += where_prefix + condition
+            params = list(params) + condition_params
+        query += self.order_sql()
+        if page.limit is not None:
+            query += " LIMIT ?"
+            params = list(params) + [page.limit + 1]
+        return query, params
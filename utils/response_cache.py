@@ -0,0 +1,183 @@
+# utils/response_cache.py
+"""
+In-process response cache with single-flight request coalescing
+
+Expensive aggregate endpoints are polled by every tablet. Each cached route
+declares the tables it reads; an entry is served while it is younger than its
+TTL and none of those tables' data versions (database/table_versions.py) has
+moved since it was computed. When several requests miss on the same key at
+once, one of them computes the response and the others wait for its result
+instead of running the same queries in parallel.
+
+    @app.route('/api/dashboard/stats')
+    @response_cache.cached(tables=['customers', 'services'], ttl=15)
+    def get_dashboard_stats(): ...
+"""
+
+import time
+import logging
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from flask import Response, request
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry(NamedTuple):
+    """A cached response"""
+    body: bytes
+    status: int
+    mimetype: str
+    versions: Tuple[int, ...]
+    created_at: float
+
+
+class _Flight:
+    """A computation in progress that other requests can wait for"""
+
+    __slots__ = ('done', 'entry', 'response')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry: Optional[_Entry] = None
+        self.response = None
+
+
+class ResponseCache:
+    """TTL + table-version response cache with single-flight misses"""
+
+    def __init__(self, versions: Callable[[Iterable[str]], Tuple[int, ...]], max_entries: int = 256,
+                 wait_timeout: float = 30.0):
+        self.versions = versions
+        self.max_entries = max_entries
+        self.wait_timeout = wait_timeout
+        self.enabled = True
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}
+        self._flights: Dict[str, _Flight] = {}
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'stale_version': 0,
+            'stale_ttl': 0,
+            'uncacheable': 0,
+            'evictions': 0,
+        }
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _lookup(self, key: str, versions: Tuple[int, ...], ttl: float) -> Optional[_Entry]:
+        """Return a fresh entry for key, dropping it if stale"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.versions != versions:
+                self._stats['stale_version'] += 1
+            elif time.monotonic() - entry.created_at > ttl:
+                self._stats['stale_ttl'] += 1
+            else:
+                return entry
+            del self._entries[key]
+            return None
+
+    def _store(self, key: str, entry: _Entry):
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                # Evict the oldest entry
+                oldest = min(self._entries, key=lambda k: self._entries[k].created_at)
+                del self._entries[oldest]
+                self._stats['evictions'] += 1
+            self._entries[key] = entry
+
+    @staticmethod
+    def _to_response(entry: _Entry) -> Response:
+        return Response(entry.body, status=entry.status, mimetype=entry.mimetype)
+
+    def get_or_compute(self, key: str, tables: Iterable[str], ttl: float, compute: Callable) -> Any:
+        """Serve key from the cache or compute it once for all concurrent callers"""
+        if not self.enabled:
+            return compute()
+
+        # Read versions before computing: a write that lands mid-computation
+        # moves the version past the one stored, so the next lookup misses
+        versions = self.versions(tables)
+
+        entry = self._lookup(key, versions, ttl)
+        if entry is not None:
+            self._count('hits')
+            return self._to_response(entry)
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            if flight.done.wait(self.wait_timeout) and flight.entry is not None:
+                self._count('coalesced')
+                return self._to_response(flight.entry)
+            # The leader failed or produced an uncacheable response - compute our own
+            self._count('misses')
+            return compute()
+
+        self._count('misses')
+        try:
+            response = compute()
+            flight.response = response
+            entry = self._make_entry(response, versions)
+            if entry is None:
+                self._count('uncacheable')
+            else:
+                flight.entry = entry
+                self._store(key, entry)
+            return response
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    @staticmethod
+    def _make_entry(response, versions: Tuple[int, ...]) -> Optional[_Entry]:
+        """Snapshot a successful Flask response (errors are never cached)"""
+        if isinstance(response, tuple) or not isinstance(response, Response):
+            return None
+        if response.status_code != 200 or response.direct_passthrough or response.is_streamed:
+            return None
+        return _Entry(response.get_data(), response.status_code, response.mimetype,
+                      versions, time.monotonic())
+
+    def cached(self, tables: Iterable[str], ttl: float = 15.0):
+        """Decorator caching a GET route's response per path and query string"""
+        tables = tuple(sorted(tables))
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                key = f"{view.__name__}:{request.full_path}"
+                return self.get_or_compute(key, tables, ttl, lambda: view(*args, **kwargs))
+            return wrapper
+        return decorator
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit, miss and coalesce counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['in_flight'] = len(self._flights)
+        lookups = stats['hits'] + stats['misses'] + stats['coalesced']
+        stats['hit_rate'] = round((stats['hits'] + stats['coalesced']) / lookups, 3) if lookups else 0.0
+        stats['enabled'] = self.enabled
+        return stats
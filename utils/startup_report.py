@@ -0,0 +1,132 @@
+# utils/startup_report.py
+"""
+Startup import-time report for the web and desktop entry points
+
+Imports an entry point in a fresh interpreter with `-X importtime`, prints
+the slowest imports and fails when the total exceeds the time budget or when
+the web entry point pulls in desktop-only libraries.
+
+Usage:
+    python -m utils.startup_report web [--budget-ms 1500] [--top 20]
+    python -m utils.startup_report desktop [--budget-ms 3000]
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+ENTRY_POINTS = {
+    'web': 'application',
+    'desktop': 'main',
+}
+
+DEFAULT_BUDGETS_MS = {
+    'web': 1500,
+    'desktop': 3000,
+}
+
+# Libraries that must stay out of the web worker's import graph
+WEB_FORBIDDEN_MODULES = {'cv2', 'numpy', 'tkinter', 'pandas', 'matplotlib'}
+
+
+def measure_imports(module: str) -> Dict[str, Any]:
+    """Import module in a child interpreter and parse its -X importtime output"""
+    started = time.monotonic()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=str(PROJECT_ROOT),
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, PYTHONDONTWRITEBYTECODE='1'),
+    )
+    wall_ms = (time.monotonic() - started) * 1000
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '[us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        imports.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000,
+        })
+
+    errors = [line for line in result.stderr.splitlines() if not line.startswith('import time:')]
+    return {
+        'module': module,
+        'returncode': result.returncode,
+        'wall_ms': round(wall_ms, 1),
+        'import_ms': round(sum(i['self_ms'] for i in imports), 1),
+        'imports': imports,
+        'errors': errors,
+    }
+
+
+def check_budget(report: Dict[str, Any], target: str, budget_ms: float) -> List[str]:
+    """Return a list of problems with the measured startup"""
+    problems = []
+    if report['returncode'] != 0:
+        problems.append(f"import {report['module']} failed (exit code {report['returncode']})")
+    if report['import_ms'] > budget_ms:
+        problems.append(f"import time {report['import_ms']:.0f} ms exceeds budget of {budget_ms:.0f} ms")
+
+    if target == 'web':
+        loaded = {i['module'].split('.')[0] for i in report['imports']}
+        for name in sorted(loaded & WEB_FORBIDDEN_MODULES):
+            problems.append(f"web entry point imports desktop-only module '{name}'")
+    return problems
+
+
+def print_report(report: Dict[str, Any], budget_ms: float, top: int):
+    """Print the slowest imports and the totals"""
+    print(f"Startup report for '{report['module']}'")
+    print(f"{'self ms':>9} {'cumul ms':>9}  module")
+
+    slowest = sorted(report['imports'], key=lambda i: i['cumulative_ms'], reverse=True)[:top]
+    for item in slowest:
+        indent = '  ' * item['depth']
+        print(f"{item['self_ms']:9.1f} {item['cumulative_ms']:9.1f}  {indent}{item['module']}")
+
+    print(f"\nModules imported: {len(report['imports'])}")
+    print(f"Import time: {report['import_ms']:.1f} ms (budget {budget_ms:.0f} ms)")
+    print(f"Interpreter wall time: {report['wall_ms']:.1f} ms")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Import-time startup report")
+    parser.add_argument('target', choices=sorted(ENTRY_POINTS), help="Entry point to measure")
+    parser.add_argument('--budget-ms', type=float, default=None, help="Fail above this import time")
+    parser.add_argument('--top', type=int, default=20, help="Number of slowest imports to show")
+    args = parser.parse_args(argv)
+
+    budget_ms = args.budget_ms
+    if budget_ms is None:
+        budget_ms = float(os.getenv(f'STARTUP_BUDGET_{args.target.upper()}_MS',
+                                    DEFAULT_BUDGETS_MS[args.target]))
+
+    report = measure_imports(ENTRY_POINTS[args.target])
+    print_report(report, budget_ms, args.top)
+
+    problems = check_budget(report, args.target, budget_ms)
+    if problems:
+        for line in report['errors'][-5:]:
+            print(f"  {line}")
+        for problem in problems:
+            print(f"❌ {problem}")
+        return 1
+
+    print("✅ Startup within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
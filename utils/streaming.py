@@ -0,0 +1,133 @@
+# utils/streaming.py
+"""
+Streamed responses for collection endpoints
+
+    GET /api/customers?stream=1                          chunked JSON, same shape as usual
+    GET /api/services  (Accept: application/x-ndjson)    one JSON object per line
+    GET /api/payments?stream=ndjson
+
+Instead of fetchall() + jsonify, rows are read from the open cursor with
+fetchmany() and written out batch by batch, so memory stays flat however
+many rows an export returns and the first bytes leave as soon as the first
+batch is read. Paginated requests (limit/cursor) stream the page; in NDJSON
+the next_cursor, if any, is sent as a last {"next_cursor": ...} line.
+
+The cursor outlives the view function, so the caller hands over a release
+callback that returns its connection once the last row is written (or the
+client goes away).
+"""
+
+import json
+import logging
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional
+
+from flask import Response
+
+from utils.pagination import Keyset, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+STREAM_BATCH_SIZE = 200
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Same output as jsonify's compact mode, usable after the request context is gone
+_dumps = partial(json.dumps, separators=(',', ':'), sort_keys=True)
+
+
+def stream_format(req) -> Optional[str]:
+    """'json' or 'ndjson' if the request asked for a streamed response, else None"""
+    stream = req.args.get('stream', '').strip().lower()
+    if stream == 'ndjson' or NDJSON_MIMETYPE in req.headers.get('Accept', ''):
+        return 'ndjson'
+    if stream in ('1', 'true', 'yes', 'json'):
+        return 'json'
+    return None
+
+
+def iter_rows(cursor, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[List[Any]]:
+    """Batches of rows from an executed cursor"""
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield rows
+
+
+def stream_collection(cursor, key: str, fmt: str, keyset: Optional[Keyset] = None,
+                      limit: Optional[int] = None,
+                      transform: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+                      head: Optional[Mapping[str, Any]] = None, count_key: Optional[str] = None,
+                      release: Optional[Callable[[bool], None]] = None,
+                      batch_size: int = STREAM_BATCH_SIZE) -> Response:
+    """Stream the rows of an executed cursor as {**head, key: [...], next_cursor} or NDJSON
+
+    keyset/limit strip the sort key and stop after limit rows as Keyset.page()
+    does; transform post-processes each row dict; count_key adds the number of
+    rows sent (JSON only); release(failed) is called when streaming ends.
+    """
+    ndjson = fmt == 'ndjson'
+    page = {'next_cursor': None}
+
+    def rows() -> Iterator[Dict[str, Any]]:
+        """Row dicts, setting page['next_cursor'] when rows remain past limit"""
+        count, last_key = 0, None
+        for batch in iter_rows(cursor, batch_size):
+            for row in batch:
+                if limit is not None and count == limit:
+                    page['next_cursor'] = encode_cursor(last_key)
+                    return
+                if keyset is not None:
+                    item, last_key = keyset.split_key(row)
+                else:
+                    item = dict(row)
+                yield transform(item) if transform else item
+                count += 1
+
+    def generate() -> Iterator[str]:
+        failed = True
+        try:
+            yield ''  # primed below, so close() runs the cleanup even if nothing is sent
+            if not ndjson:
+                opening = _dumps(dict(head or {}))[:-1]
+                yield opening + (', ' if head else '') + _dumps(key) + ': ['
+
+            chunk, count = [], 0
+            for item in rows():
+                if ndjson:
+                    chunk.append(_dumps(item) + '\n')
+                else:
+                    chunk.append((', ' if count else '') + _dumps(item))
+                count += 1
+                if len(chunk) >= batch_size:
+                    yield ''.join(chunk)
+                    chunk = []
+            if chunk:
+                yield ''.join(chunk)
+
+            if ndjson:
+                if page['next_cursor'] is not None:
+                    yield _dumps({'next_cursor': page['next_cursor']}) + '\n'
+            else:
+                tail = {}
+                if count_key:
+                    tail[count_key] = count
+                if keyset is not None:
+                    tail['next_cursor'] = page['next_cursor']
+                yield ']' + ''.join(f", {_dumps(name)}: {_dumps(value)}" for name, value in tail.items()) + '}\n'
+            failed = False
+        except Exception as e:
+            # Headers are already sent; cutting the body short tells the client
+            logger.error(f"Error streaming {key}: {e}")
+            raise
+        finally:
+            cursor.close()
+            if release is not None:
+                release(failed)
+
+    body = generate()
+    next(body)
+    response = Response(body, mimetype=NDJSON_MIMETYPE if ndjson else 'application/json')
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response